@@ -9,8 +9,16 @@ Classes:
 """
 
 import os
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
+import time
+import asyncio
+from typing import Dict, Any, Optional, List, Tuple
+from dataclasses import dataclass, asdict
+
+from utils.deadline import Deadline
+from utils.parse_cache import ParseCache, get_parse_cache
+from utils.parse_jobs import ParseJobRunner
+from utils.pdf_preflight import PreflightResult, analyze_pdf, build_local_parse_response
+from utils.pdf_split import count_pdf_pages
 
 
 @dataclass
@@ -41,6 +49,11 @@ class DocumentAgent:
     
     Attributes:
         client: Upstage API 클라이언트
+        cache: Document Parse 결과 디스크 캐시 (None이면 캐시 미사용)
+        preflight: 텍스트 레이어 사전 분석으로 OCR 모드 결정 여부
+        allow_local_text: 모든 페이지에 텍스트 레이어가 있으면 API 없이 로컬 추출할지 여부
+        async_job_pages: 이 페이지 수 이상인 문서는 비동기 Document Parse 작업으로 처리 (0이면 미사용)
+        jobs: 비동기 작업 실행기 (등록/폴링/재개)
     
     Example:
         >>> from utils.upstage_client import UpstageClient
@@ -50,21 +63,68 @@ class DocumentAgent:
         >>> print(result.text)
     """
     
-    def __init__(self, client):
+    # Document Parse 호출 파라미터 (캐시 키 구성에도 사용, 사전 분석 비활성 시 OCR 모드)
+    OCR_MODE = "force"
+    PARSE_MODEL = "document-parse"
+    
+    # 호출 계측 태그 (에이전트/파이프라인 단계)
+    CALL_TAGS = {"agent": "document", "stage": "step1_parse"}
+    
+    def __init__(
+        self,
+        client,
+        cache: Optional[ParseCache] = None,
+        use_cache: bool = True,
+        pages_per_chunk: Optional[int] = None,
+        preflight: Optional[bool] = None,
+        allow_local_text: Optional[bool] = None,
+        async_job_pages: Optional[int] = None,
+        jobs: Optional[ParseJobRunner] = None
+    ):
         """
         에이전트 초기화
         
         Args:
-            client: UpstageClient 인스턴스
+            client: UpstageClient 인스턴스 (비동기 메서드는 AsyncUpstageClient)
+            cache: Document Parse 결과 캐시 (미제공 시 프로세스 기본 캐시)
+            use_cache: False면 캐시를 사용하지 않음
+            pages_per_chunk: 구간당 페이지 수 - 지정 시 대용량 PDF를 구간별로 병렬 파싱
+                (미지정 시 환경변수 IMF_PARSE_PAGES_PER_CHUNK, 0이면 분할하지 않음)
+            preflight: 텍스트 레이어 사전 분석 사용 여부 (미지정 시 IMF_PARSE_PREFLIGHT, 기본 사용)
+            allow_local_text: 로컬 텍스트 추출 허용 여부 (미지정 시 IMF_PARSE_LOCAL_TEXT, 기본 미사용)
+            async_job_pages: 비동기 작업 모드 기준 페이지 수 (미지정 시 IMF_PARSE_ASYNC_PAGES, 0이면 미사용)
+            jobs: 비동기 작업 실행기 (미제공 시 기본 레지스트리를 쓰는 실행기를 필요할 때 생성)
         """
         self.client = client
+        self.cache = (cache or get_parse_cache()) if use_cache else None
+        if pages_per_chunk is None:
+            pages_per_chunk = int(os.getenv("IMF_PARSE_PAGES_PER_CHUNK", "0"))
+        self.pages_per_chunk = pages_per_chunk
+        if preflight is None:
+            preflight = os.getenv("IMF_PARSE_PREFLIGHT", "1").lower() not in ("0", "false", "no")
+        if allow_local_text is None:
+            allow_local_text = os.getenv("IMF_PARSE_LOCAL_TEXT", "0").lower() in ("1", "true", "yes")
+        self.preflight = preflight
+        self.allow_local_text = allow_local_text
+        if async_job_pages is None:
+            async_job_pages = int(os.getenv("IMF_PARSE_ASYNC_PAGES", "0"))
+        self.async_job_pages = async_job_pages
+        self._jobs = jobs
+    
+    @property
+    def jobs(self) -> ParseJobRunner:
+        """비동기 Document Parse 작업 실행기 (지연 생성)"""
+        if self._jobs is None:
+            self._jobs = ParseJobRunner(self.client, tags=self.CALL_TAGS)
+        return self._jobs
     
-    def parse(self, file_path: str) -> ParsedDocument:
+    def parse(self, file_path: str, deadline: Optional[Deadline] = None) -> ParsedDocument:
         """
         PDF 파일을 파싱하여 텍스트 추출
         
         Args:
             file_path: PDF 파일 경로
+            deadline: 호출 마감 시간 (남은 예산만큼 타임아웃, 취소 시 CallCancelled)
         
         Returns:
             ParsedDocument: 파싱된 문서 결과
@@ -77,25 +137,239 @@ class DocumentAgent:
             raise FileNotFoundError(f"파일을 찾을 수 없습니다: {file_path}")
         
         # Document Parse API 호출
-        response = self.client.parse_document(file_path)
+        response = self.client.parse_document(file_path, tags=self.CALL_TAGS, deadline=deadline)
         
         return self._process_response(response)
     
-    def parse_bytes(self, file_bytes: bytes, filename: str = "document.pdf") -> ParsedDocument:
+    def parse_bytes(
+        self,
+        file_bytes: bytes,
+        filename: str = "document.pdf",
+        deadline: Optional[Deadline] = None
+    ) -> ParsedDocument:
         """
         바이트 데이터에서 문서 파싱 (Streamlit 업로드용)
         
         Args:
             file_bytes: PDF 파일 바이트 데이터
             filename: 파일명
+            deadline: 호출 마감 시간 (남은 예산만큼 타임아웃, 취소 시 CallCancelled)
         
         Returns:
             ParsedDocument: 파싱된 문서 결과
         """
-        # Document Parse API 호출 (바이트 버전)
-        response = self.client.parse_document_bytes(file_bytes, filename)
+        cache_key = self._cache_key(file_bytes)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
         
-        return self._process_response(response)
+        # 텍스트 레이어 사전 분석 → OCR 모드 결정 (디지털 PDF는 OCR 생략)
+        preflight = analyze_pdf(file_bytes, self.allow_local_text) if self.preflight else None
+        started = time.perf_counter()
+        
+        if preflight is not None and preflight.strategy == "local":
+            response = build_local_parse_response(preflight)
+        elif self._use_async_job(file_bytes, preflight):
+            # 비동기 작업 등록 후 구간별 결과 수집 (120초 동기 타임아웃 없음)
+            job = self.jobs.submit(
+                file_bytes, filename, ocr_mode=self._ocr_mode(preflight), model=self.PARSE_MODEL,
+                deadline=deadline, result_key=cache_key
+            )
+            response = self.jobs.wait(job, deadline)
+        elif self.pages_per_chunk > 0:
+            # Document Parse API 호출 (페이지 구간 병렬 파싱)
+            response = self.client.parse_document_bytes_chunked(
+                file_bytes, filename, ocr_mode=self._ocr_mode(preflight), model=self.PARSE_MODEL,
+                pages_per_chunk=self.pages_per_chunk, tags=self.CALL_TAGS, deadline=deadline
+            )
+        else:
+            # Document Parse API 호출 (바이트 버전)
+            response = self.client.parse_document_bytes(
+                file_bytes, filename, ocr_mode=self._ocr_mode(preflight), model=self.PARSE_MODEL,
+                tags=self.CALL_TAGS, deadline=deadline
+            )
+        
+        parsed = self._process_response(response)
+        self._record_preflight(parsed, preflight, time.perf_counter() - started)
+        return self._cache_put(cache_key, parsed)
+    
+    async def parse_bytes_async(
+        self,
+        file_bytes: bytes,
+        filename: str = "document.pdf",
+        deadline: Optional[Deadline] = None
+    ) -> ParsedDocument:
+        """
+        바이트 데이터에서 문서 파싱 (비동기)
+        
+        client가 AsyncUpstageClient일 때 사용
+        
+        Args:
+            file_bytes: PDF 파일 바이트 데이터
+            filename: 파일명
+            deadline: 호출 마감 시간 (남은 예산만큼 타임아웃, 취소 시 CallCancelled)
+        
+        Returns:
+            ParsedDocument: 파싱된 문서 결과
+        """
+        cache_key = self._cache_key(file_bytes)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # PDF 분석은 CPU 작업이므로 이벤트 루프 밖에서 실행
+        preflight = (
+            await asyncio.to_thread(analyze_pdf, file_bytes, self.allow_local_text)
+            if self.preflight else None
+        )
+        started = time.perf_counter()
+        
+        if preflight is not None and preflight.strategy == "local":
+            response = build_local_parse_response(preflight)
+        elif self.pages_per_chunk > 0:
+            response = await self.client.parse_document_bytes_chunked(
+                file_bytes, filename, ocr_mode=self._ocr_mode(preflight), model=self.PARSE_MODEL,
+                pages_per_chunk=self.pages_per_chunk, tags=self.CALL_TAGS, deadline=deadline
+            )
+        else:
+            response = await self.client.parse_document_bytes(
+                file_bytes, filename, ocr_mode=self._ocr_mode(preflight), model=self.PARSE_MODEL,
+                tags=self.CALL_TAGS, deadline=deadline
+            )
+        
+        parsed = self._process_response(response)
+        self._record_preflight(parsed, preflight, time.perf_counter() - started)
+        return self._cache_put(cache_key, parsed)
+    
+    def parse_many(
+        self,
+        documents: List[Tuple[bytes, str]],
+        deadline: Optional[Deadline] = None
+    ) -> List[Any]:
+        """
+        여러 문서를 비동기 Document Parse 작업으로 한 번에 등록하고 함께 기다림
+        
+        캐시에 있는 문서와 로컬 추출이 가능한 문서는 작업을 등록하지 않음
+        
+        Args:
+            documents: (PDF 바이트, 파일명) 목록
+            deadline: 전체 마감 시간
+        
+        Returns:
+            list: 입력 순서대로 ParsedDocument (실패한 문서는 그 예외 객체)
+        """
+        results: List[Any] = [None] * len(documents)
+        submits = []
+        for index, (file_bytes, filename) in enumerate(documents):
+            cache_key = self._cache_key(file_bytes)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                results[index] = cached
+                continue
+            preflight = analyze_pdf(file_bytes, self.allow_local_text) if self.preflight else None
+            if preflight is not None and preflight.strategy == "local":
+                parsed = self._process_response(build_local_parse_response(preflight))
+                self._record_preflight(parsed, preflight, 0.0)
+                results[index] = self._cache_put(cache_key, parsed)
+                continue
+            submits.append((index, cache_key, preflight, file_bytes, filename))
+        
+        jobs = []
+        for index, cache_key, preflight, file_bytes, filename in submits:
+            try:
+                job = self.jobs.submit(
+                    file_bytes, filename, ocr_mode=self._ocr_mode(preflight), model=self.PARSE_MODEL,
+                    deadline=deadline, result_key=cache_key
+                )
+            except Exception as e:
+                results[index] = e
+                continue
+            jobs.append((index, cache_key, preflight, job))
+        
+        responses = self.jobs.wait_many([job for _, _, _, job in jobs], deadline)
+        for (index, cache_key, preflight, _), response in zip(jobs, responses):
+            if isinstance(response, Exception):
+                results[index] = response
+                continue
+            parsed = self._process_response(response)
+            self._record_preflight(parsed, preflight, 0.0)
+            results[index] = self._cache_put(cache_key, parsed)
+        return results
+    
+    def resume_jobs(self, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """
+        프로세스 재시작 전에 등록된 비동기 작업을 이어서 수집
+        
+        등록할 때 기록한 캐시 키로 결과를 캐시에 넣으므로, 같은 문서를 다시 올리면 캐시 히트
+        
+        Returns:
+            dict: {job_id: ParsedDocument 또는 예외}
+        """
+        results = {}
+        for job_id, response in self.jobs.resume(deadline).items():
+            if isinstance(response, Exception):
+                results[job_id] = response
+                continue
+            cache_key = response.get("result_key") if self.cache is not None else None
+            results[job_id] = self._cache_put(cache_key, self._process_response(response))
+        return results
+    
+    def _use_async_job(self, file_bytes: bytes, preflight: Optional[PreflightResult]) -> bool:
+        """비동기 작업 모드 사용 여부 (기준 페이지 수 이상인 문서)"""
+        if self.async_job_pages <= 0:
+            return False
+        pages = len(preflight.pages) if preflight is not None and preflight.pages else count_pdf_pages(file_bytes)
+        return pages >= self.async_job_pages
+    
+    def _ocr_mode(self, preflight: Optional[PreflightResult]) -> str:
+        """사전 분석 결과에 따른 OCR 모드 (사전 분석 비활성 시 OCR_MODE)"""
+        return preflight.ocr_mode if preflight is not None else self.OCR_MODE
+    
+    def _record_preflight(
+        self,
+        parsed: ParsedDocument,
+        preflight: Optional[PreflightResult],
+        parse_seconds: float
+    ) -> None:
+        """사전 분석 결정과 절약 시간 추정을 메타데이터에 기록"""
+        if preflight is None:
+            return
+        parsed.metadata["preflight"] = preflight.to_metadata()
+        parsed.metadata["preflight"]["parse_seconds"] = round(parse_seconds, 3)
+    
+    def _cache_key(self, file_bytes: bytes) -> Optional[str]:
+        """파일 바이트 + 파싱 파라미터로 캐시 키 생성 (캐시 미사용 시 None)"""
+        if self.cache is None:
+            return None
+        # 사전 분석 사용 시 OCR 모드는 파일 내용으로 결정되므로 분석 설정을 키로 사용
+        if self.preflight:
+            ocr = "preflight+local" if self.allow_local_text else "preflight"
+        else:
+            ocr = self.OCR_MODE
+        return self.cache.make_key(
+            file_bytes,
+            ocr=ocr,
+            model=self.PARSE_MODEL,
+            output_formats=getattr(self.client, "PARSE_OUTPUT_FORMATS", "")
+        )
+    
+    def _cache_get(self, cache_key: Optional[str]) -> Optional[ParsedDocument]:
+        """캐시 히트 시 ParsedDocument 복원"""
+        if cache_key is None:
+            return None
+        payload = self.cache.get(cache_key)
+        if payload is None:
+            return None
+        parsed = ParsedDocument(**payload)
+        parsed.metadata["cache"] = "hit"
+        return parsed
+    
+    def _cache_put(self, cache_key: Optional[str], parsed: ParsedDocument) -> ParsedDocument:
+        """파싱 결과를 캐시에 저장하고 그대로 반환"""
+        if cache_key is not None:
+            self.cache.put(cache_key, asdict(parsed))
+            parsed.metadata["cache"] = "miss"
+        return parsed
     
     def _process_response(self, response: Dict[str, Any]) -> ParsedDocument:
         """
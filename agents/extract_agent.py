@@ -15,10 +15,15 @@ Classes:
     ExtractAgent: 정보 추출 에이전트
 """
 
+import os
 import json
-from typing import Dict, Any, List, Generator
+from typing import Dict, Any, List, Generator, AsyncGenerator, Optional
 from dataclasses import dataclass, field
 
+from utils.deadline import Deadline
+from utils.json_stream import JsonStreamCutoff, AsyncJsonStreamCutoff, json_early_stop_enabled
+from utils.token_budget import PromptBudget, BudgetedPrompt, compact_text
+
 
 # =============================================================================
 # 추출 결과 데이터 클래스
@@ -78,6 +83,18 @@ class ExtractAgent:
         ...     print(chunk, end="")  # 실시간 추출 과정 출력
     """
     
+    # 호출 계측 태그 (에이전트/파이프라인 단계)
+    CALL_TAGS = {"agent": "extract", "stage": "step1_extract"}
+    
+    # 라우팅 목표 (짧은 JSON 추출 - 지연 우선, utils.model_router)
+    ROUTE_TARGET = "fast"
+    
+    # 스트림 조기 종료 시 완성으로 인정할 응답 JSON의 필수 키 (설명 속 예시 객체에서 멈추지 않도록)
+    JSON_REQUIRED_KEYS = ("student_name",)
+    
+    # 생활기록부 본문 토큰 예산 (기존 6000자 자르기에 해당, 초과 시 반복 줄 제거 후 자름)
+    DOCUMENT_TOKEN_BUDGET = 4500
+    
     EXTRACTION_PROMPT = """당신은 한국 학교 생활기록부 분석 전문가입니다.
 주어진 텍스트에서 다음 정보를 JSON 형식으로 추출하세요:
 
@@ -99,26 +116,97 @@ class ExtractAgent:
 - school_name은 생활기록부 상단에 표시된 학교명을 정확히 추출하세요
 - "OO고등학교", "OO중학교" 형태로 추출하세요"""
     
-    def __init__(self, client):
-        """에이전트 초기화"""
+    def __init__(
+        self,
+        client,
+        use_response_cache: Optional[bool] = None,
+        stop_after_json: Optional[bool] = None
+    ):
+        """
+        에이전트 초기화
+
+        Args:
+            client: Upstage API 클라이언트
+            use_response_cache: LLM 응답 캐시 사용 여부
+                (미지정 시 IMF_LLM_CACHE_EXTRACT, 기본 사용 - 클라이언트 캐시가 활성일 때만 적용)
+            stop_after_json: 응답 JSON이 완성되면 스트림을 바로 닫을지 여부
+                (미지정 시 IMF_JSON_EARLY_STOP, 기본 미사용 - utils.json_stream)
+        """
         self.client = client
+        if use_response_cache is None:
+            use_response_cache = os.getenv("IMF_LLM_CACHE_EXTRACT", "1").lower() not in ("0", "false", "no")
+        self.use_response_cache = use_response_cache
+        self.last_prompt: Optional[BudgetedPrompt] = None
+        self.stop_after_json = json_early_stop_enabled() if stop_after_json is None else stop_after_json
+        self.last_stream = None
+        self.last_result: Optional[ExtractedInfo] = None
     
-    def extract_from_text(self, text: str) -> Generator[str, None, ExtractedInfo]:
+    def extract_from_text(
+        self,
+        text: str,
+        deadline: Optional[Deadline] = None
+    ) -> Generator[str, None, ExtractedInfo]:
         """텍스트에서 생활기록부 정보 추출 (스트리밍)"""
-        user_message = f"다음 생활기록부에서 정보를 추출하세요:\n\n{text[:6000]}"
+        prompt = self._compose_prompt(text)
         
-        full_response = ""
-        for chunk in self.client.chat_stream(
-            message=user_message,
+        stream = self.client.chat_stream(
+            message=prompt.text,
             system_prompt=self.EXTRACTION_PROMPT,
-            reasoning_effort="low",
-            temperature=0.1
-        ):
+            target=self.ROUTE_TARGET,
+            temperature=0.1,
+            use_cache=self.use_response_cache,
+            tags={**self.CALL_TAGS, "prompt_tokens": prompt.total_tokens},
+            deadline=deadline,
+            hedge=True
+        )
+        if self.stop_after_json:
+            stream = self.last_stream = JsonStreamCutoff(stream, self.JSON_REQUIRED_KEYS)
+        
+        full_response = ""
+        for chunk in stream:
             full_response += chunk
             yield chunk
         
         return self._parse_response(full_response)
     
+    async def extract_from_text_async(
+        self,
+        text: str,
+        deadline: Optional[Deadline] = None
+    ) -> AsyncGenerator[str, None]:
+        """텍스트에서 생활기록부 정보 추출 (비동기 스트리밍, client는 AsyncUpstageClient - 스트림이 끝나면 last_result에 결과)"""
+        self.last_result = None
+        prompt = self._compose_prompt(text)
+        
+        stream = self.client.chat_stream(
+            message=prompt.text,
+            system_prompt=self.EXTRACTION_PROMPT,
+            target=self.ROUTE_TARGET,
+            temperature=0.1,
+            use_cache=self.use_response_cache,
+            tags={**self.CALL_TAGS, "prompt_tokens": prompt.total_tokens},
+            deadline=deadline,
+            hedge=True
+        )
+        if self.stop_after_json:
+            stream = self.last_stream = AsyncJsonStreamCutoff(stream, self.JSON_REQUIRED_KEYS)
+        
+        full_response = ""
+        async for chunk in stream:
+            full_response += chunk
+            yield chunk
+        
+        self.last_result = self._parse_response(full_response)
+    
+    def _compose_prompt(self, text: str) -> BudgetedPrompt:
+        """추출 요청 프롬프트 구성 (시스템 프롬프트 포함 토큰 수를 last_prompt에 기록)"""
+        budget = PromptBudget()
+        budget.reserve("system", self.EXTRACTION_PROMPT)
+        budget.add("instruction", "다음 생활기록부에서 정보를 추출하세요:\n")
+        budget.add("document", text, budget=self.DOCUMENT_TOKEN_BUDGET, compact=compact_text)
+        self.last_prompt = budget.build("\n")
+        return self.last_prompt
+    
     def _parse_response(self, response: str) -> ExtractedInfo:
         """LLM 응답을 ExtractedInfo로 변환"""
         try:
@@ -15,10 +15,15 @@ Classes:
     RecommendAgent: 추천 생성 에이전트
 """
 
+import os
 import json
-from typing import Dict, Any, List, Generator
+from typing import Dict, Any, List, Generator, AsyncGenerator, Optional
 from dataclasses import dataclass, field
 
+from utils.deadline import Deadline
+from utils.json_stream import JsonStreamCutoff, AsyncJsonStreamCutoff, json_early_stop_enabled
+from utils.token_budget import PromptBudget, BudgetedPrompt, compact_text, join_items, truncate_tokens
+
 
 # =============================================================================
 # 추천 결과 데이터 클래스
@@ -67,6 +72,22 @@ class RecommendAgent:
         ...     print(chunk, end="")  # 실시간 추론 과정 출력
     """
 
+    # 호출 계측 태그 (에이전트/파이프라인 단계)
+    CALL_TAGS = {"agent": "recommend", "stage": "step4_recommend"}
+    
+    # 라우팅 목표 (긴 추천 보고서 - 품질과 지연 균형, utils.model_router)
+    ROUTE_TARGET = "balanced"
+    
+    # 스트림 조기 종료 시 완성으로 인정할 응답 JSON의 필수 키 (설명 속 예시 객체에서 멈추지 않도록)
+    JSON_REQUIRED_KEYS = ("year1",)
+    
+    # 프롬프트 토큰 예산 (전체 예산을 넘으면 RAG → 개설 과목 순으로 줄임)
+    PROMPT_TOKEN_BUDGET = 4000
+    COURSE_LIST_TOKEN_BUDGET = 500      # 선택 구분(일반/진로/융합)별 과목 목록
+    COURSE_TOKEN_BUDGET = 1500
+    RAG_TOKEN_BUDGET = 700
+    NOTE_TOKEN_BUDGET = 150             # 동아리/참고사항 같은 자유 서술
+    
     # 시스템 프롬프트 - RAG 정보 활용 강조
     SYSTEM_PROMPT = """당신은 한국 고교학점제 전문 상담사입니다.
 학생의 프로필, 학교 개설 과목, 희망 진로를 바탕으로 3년간 최적의 과목 조합을 추천합니다.
@@ -102,33 +123,52 @@ class RecommendAgent:
 }
 """
 
-    def __init__(self, client):
+    def __init__(
+        self,
+        client,
+        use_response_cache: Optional[bool] = None,
+        stop_after_json: Optional[bool] = None
+    ):
+        """
+        에이전트 초기화
+
+        Args:
+            client: Upstage API 클라이언트
+            use_response_cache: LLM 응답 캐시 사용 여부
+                (미지정 시 IMF_LLM_CACHE_RECOMMEND, 기본 사용 - 클라이언트 캐시가 활성일 때만 적용)
+            stop_after_json: 응답 JSON이 완성되면 스트림을 바로 닫을지 여부
+                (미지정 시 IMF_JSON_EARLY_STOP, 기본 미사용 - utils.json_stream)
+        """
         self.client = client
+        if use_response_cache is None:
+            use_response_cache = os.getenv("IMF_LLM_CACHE_RECOMMEND", "1").lower() not in ("0", "false", "no")
+        self.use_response_cache = use_response_cache
+        self.last_prompt: Optional[BudgetedPrompt] = None
+        self.stop_after_json = json_early_stop_enabled() if stop_after_json is None else stop_after_json
+        self.last_stream = None
+        self.last_result: Optional[CourseRecommendation] = None
         self._load_data()
         self._init_rag()
 
     def _load_data(self):
-        """과목 및 대학 데이터 로드"""
-        import os
-        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        """과목 및 대학 데이터 로드 (프로세스 공유 캐시 - utils.university_rag.load_data_json)"""
+        from utils.university_rag import load_data_json
 
         try:
-            with open(f"{base_path}/data/subjects_2022.json", "r", encoding="utf-8") as f:
-                self.subjects_data = json.load(f)
-        except:
+            self.subjects_data = load_data_json("subjects_2022.json", default={})
+        except Exception:
             self.subjects_data = {}
 
         try:
-            with open(f"{base_path}/data/university_requirements.json", "r", encoding="utf-8") as f:
-                self.univ_data = json.load(f)
-        except:
+            self.univ_data = load_data_json("university_requirements.json", default={})
+        except Exception:
             self.univ_data = {}
 
     def _init_rag(self):
-        """RAG 시스템 초기화"""
+        """RAG 시스템 초기화 (프로세스 공유 인스턴스)"""
         try:
-            from utils.university_rag import UniversityRAG
-            self.rag = UniversityRAG()
+            from utils.university_rag import get_university_rag
+            self.rag = get_university_rag()
         except Exception as e:
             print(f"RAG 시스템 초기화 실패: {e}")
             self.rag = None
@@ -138,26 +178,66 @@ class RecommendAgent:
         student_profile: Dict[str, Any],
         school_courses: Dict[str, List[str]],
         target_university: str = "",
-        target_major: str = ""
+        target_major: str = "",
+        deadline: Optional[Deadline] = None
     ) -> Generator[str, None, CourseRecommendation]:
         """맞춤형 과목 조합 추천 (스트리밍)"""
         
         # 프롬프트 구성
-        prompt = self._build_prompt(student_profile, school_courses, target_university, target_major)
+        prompt = self._compose_prompt(student_profile, school_courses, target_university, target_major)
         
         # Solar LLM 호출 (스트리밍)
-        full_response = ""
-        for chunk in self.client.chat_stream(
-            message=prompt,
+        stream = self.client.chat_stream(
+            message=prompt.text,
             system_prompt=self.SYSTEM_PROMPT,
-            reasoning_effort="low",
-            temperature=0.3
-        ):
+            target=self.ROUTE_TARGET,
+            temperature=0.3,
+            use_cache=self.use_response_cache,
+            tags={**self.CALL_TAGS, "prompt_tokens": prompt.total_tokens},
+            deadline=deadline
+        )
+        if self.stop_after_json:
+            stream = self.last_stream = JsonStreamCutoff(stream, self.JSON_REQUIRED_KEYS)
+        
+        full_response = ""
+        for chunk in stream:
             full_response += chunk
             yield chunk
         
         return self._parse_recommendation(full_response)
     
+    async def recommend_async(
+        self,
+        student_profile: Dict[str, Any],
+        school_courses: Dict[str, List[str]],
+        target_university: str = "",
+        target_major: str = "",
+        deadline: Optional[Deadline] = None
+    ) -> AsyncGenerator[str, None]:
+        """맞춤형 과목 조합 추천 (비동기 스트리밍, client는 AsyncUpstageClient - 스트림이 끝나면 last_result에 결과)"""
+        self.last_result = None
+        
+        prompt = self._compose_prompt(student_profile, school_courses, target_university, target_major)
+        
+        stream = self.client.chat_stream(
+            message=prompt.text,
+            system_prompt=self.SYSTEM_PROMPT,
+            target=self.ROUTE_TARGET,
+            temperature=0.3,
+            use_cache=self.use_response_cache,
+            tags={**self.CALL_TAGS, "prompt_tokens": prompt.total_tokens},
+            deadline=deadline
+        )
+        if self.stop_after_json:
+            stream = self.last_stream = AsyncJsonStreamCutoff(stream, self.JSON_REQUIRED_KEYS)
+        
+        full_response = ""
+        async for chunk in stream:
+            full_response += chunk
+            yield chunk
+        
+        self.last_result = self._parse_recommendation(full_response)
+    
     def _build_prompt(
         self,
         profile: Dict[str, Any],
@@ -166,91 +246,112 @@ class RecommendAgent:
         major: str
     ) -> str:
         """추천 요청 프롬프트 구성"""
+        return self._compose_prompt(profile, courses, univ, major).text
 
-        # 과목 리스트 전체 포함 (Truncation 제거)
-        general_courses = courses.get('일반선택', [])
-        career_courses = courses.get('진로선택', [])
-        fusion_courses = courses.get('융합선택', [])
-
-        prompt = f"""[학생 프로필]
-- 강점 과목: {', '.join(profile.get('strong_subjects', []))}
-- 보완 필요: {', '.join(profile.get('weak_subjects', []))}
-- 동아리: {profile.get('club_activities', '정보 없음')}
-- 수상: {', '.join(profile.get('awards', [])[:3])}
+    def _compose_prompt(
+        self,
+        profile: Dict[str, Any],
+        courses: Dict[str, List[str]],
+        univ: str,
+        major: str
+    ) -> BudgetedPrompt:
+        """추천 요청 프롬프트 구성 (섹션별 토큰 예산 적용, 사용량은 last_prompt에 기록)"""
+        note_budget = self.NOTE_TOKEN_BUDGET
+        list_budget = self.COURSE_LIST_TOKEN_BUDGET
+
+        profile_text = f"""[학생 프로필]
+- 강점 과목: {join_items(profile.get('strong_subjects', []))}
+- 보완 필요: {join_items(profile.get('weak_subjects', []))}
+- 동아리: {truncate_tokens(profile.get('club_activities') or '정보 없음', note_budget)}
+- 수상: {join_items(profile.get('awards', [])[:3])}
 - 희망 진로: {profile.get('desired_career', major or '미정')}
+"""
 
-[목표]
+        goal_text = f"""[목표]
 - 대학: {univ or '미정'}
 - 계열/전공: {major or '미정'}
+"""
 
-[학교 개설 과목]
-- 일반선택: {', '.join(general_courses) if general_courses else '정보 없음'}
-- 진로선택: {', '.join(career_courses) if career_courses else '정보 없음'}
-- 융합선택: {', '.join(fusion_courses) if fusion_courses else '정보 없음'}
+        # 과목 목록은 중복 제거 후 구분별 예산 안에서 나열 (넘치면 "외 N개")
+        courses_text = f"""[학교 개설 과목]
+- 일반선택: {join_items(courses.get('일반선택', []), list_budget, empty='정보 없음')}
+- 진로선택: {join_items(courses.get('진로선택', []), list_budget, empty='정보 없음')}
+- 융합선택: {join_items(courses.get('융합선택', []), list_budget, empty='정보 없음')}
 """
 
-        # RAG에서 대학별 권장과목 조회
-        if self.rag and univ and univ != "선택 안함" and major and major != "선택 안함":
-            try:
-                # 전공별 권장과목 검색
-                rec = self.rag.search_major_requirements(univ, major)
+        instruction = """
+위 조건으로 3년간 192학점 과목 조합을 추천해주세요.
+대학 권장과목을 최대한 반영하되, 학교 개설 과목 내에서 선택하세요.
+반드시 [추론 과정]을 먼저 서술하고, JSON 데이터를 제공하세요."""
+
+        budget = PromptBudget(total=self.PROMPT_TOKEN_BUDGET)
+        budget.reserve("system", self.SYSTEM_PROMPT)
+        budget.add("profile", profile_text)
+        budget.add("goal", goal_text)
+        budget.add("courses", courses_text, budget=self.COURSE_TOKEN_BUDGET, priority=1)
+        budget.add("rag", self._rag_section(univ, major), budget=self.RAG_TOKEN_BUDGET, compact=compact_text)
+        budget.add("instruction", instruction)
+        self.last_prompt = budget.build("\n")
+        return self.last_prompt
+
+    def _rag_section(self, univ: str, major: str) -> str:
+        """RAG에서 대학별 권장과목 조회 (결과가 없으면 빈 문자열)"""
+        if not (self.rag and univ and univ != "선택 안함" and major and major != "선택 안함"):
+            return ""
+
+        section = ""
+        try:
+            # 전공별 권장과목 검색
+            rec = self.rag.search_major_requirements(univ, major)
 
-                if rec:
-                    prompt += f"""
-[{rec.university} {rec.major} 입학전형 권장과목]
+            if rec:
+                section += f"""[{rec.university} {rec.major} 입학전형 권장과목]
 ※ 대학 입학전형에서 참고하는 권장과목입니다. 반드시 이수를 고려하세요.
 
 """
-                    if rec.essential:
-                        prompt += f"**핵심 권장과목 (필수적으로 이수):**\n"
-                        prompt += f"  {', '.join(rec.essential)}\n\n"
-
-                    if rec.recommended:
-                        prompt += f"**권장과목 (가급적 이수):**\n"
-                        prompt += f"  {', '.join(rec.recommended)}\n\n"
-
-                    if rec.notes:
-                        prompt += f"**참고사항:** {rec.notes}\n\n"
-
-                # 학문 분야별 권장과목도 추가 (폴백)
-                if not rec:
-                    # 계열명으로 검색
-                    field_mapping = {
-                        "공학": "공학계열",
-                        "자연과학": "자연계열",
-                        "의예": "의약학계열",
-                        "약학": "의약학계열"
-                    }
-
-                    if major in field_mapping:
-                        field_info = self.rag.search_by_field(field_mapping[major])
-                        if field_info:
-                            prompt += f"""
-[{major} 계열 일반 권장과목]
+                if rec.essential:
+                    section += f"**핵심 권장과목 (필수적으로 이수):**\n"
+                    section += f"  {join_items(rec.essential)}\n\n"
+
+                if rec.recommended:
+                    section += f"**권장과목 (가급적 이수):**\n"
+                    section += f"  {join_items(rec.recommended)}\n\n"
+
+                if rec.notes:
+                    section += f"**참고사항:** {truncate_tokens(rec.notes, self.NOTE_TOKEN_BUDGET)}\n\n"
+
+            # 학문 분야별 권장과목도 추가 (폴백)
+            if not rec:
+                # 계열명으로 검색
+                field_mapping = {
+                    "공학": "공학계열",
+                    "자연과학": "자연계열",
+                    "의예": "의약학계열",
+                    "약학": "의약학계열"
+                }
+
+                if major in field_mapping:
+                    field_info = self.rag.search_by_field(field_mapping[major])
+                    if field_info:
+                        section += f"""[{major} 계열 일반 권장과목]
 ※ 주요 대학들의 공통 권장사항입니다.
 
 """
-                            # 첫 번째 전공 분야의 정보 사용
-                            first_major = next(iter(field_info.values())) if field_info else None
-                            if first_major:
-                                if "핵심수학" in first_major:
-                                    prompt += f"**수학 핵심:** {', '.join(first_major['핵심수학'])}\n"
-                                if "핵심과학" in first_major:
-                                    prompt += f"**과학 핵심:** {', '.join(first_major['핵심과학'])}\n"
-                                if "권장" in first_major:
-                                    prompt += f"**추가 권장:** {', '.join(first_major['권장'])}\n"
-                                prompt += "\n"
-
-            except Exception as e:
-                print(f"RAG 검색 오류: {e}")
-
-        prompt += """
-위 조건으로 3년간 192학점 과목 조합을 추천해주세요.
-대학 권장과목을 최대한 반영하되, 학교 개설 과목 내에서 선택하세요.
-반드시 [추론 과정]을 먼저 서술하고, JSON 데이터를 제공하세요."""
+                        # 첫 번째 전공 분야의 정보 사용
+                        first_major = next(iter(field_info.values())) if field_info else None
+                        if first_major:
+                            if "핵심수학" in first_major:
+                                section += f"**수학 핵심:** {join_items(first_major['핵심수학'])}\n"
+                            if "핵심과학" in first_major:
+                                section += f"**과학 핵심:** {join_items(first_major['핵심과학'])}\n"
+                            if "권장" in first_major:
+                                section += f"**추가 권장:** {join_items(first_major['권장'])}\n"
+
+        except Exception as e:
+            print(f"RAG 검색 오류: {e}")
+
+        return section.rstrip("\n") + "\n" if section else ""
 
-        return prompt
-    
     def _parse_recommendation(self, response: str) -> CourseRecommendation:
         """LLM 응답 파싱"""
         try:
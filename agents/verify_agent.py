@@ -15,10 +15,15 @@ Classes:
     VerifyAgent: 검증 에이전트
 """
 
+import os
 import json
-from typing import Dict, Any, List, Generator
+from typing import Dict, Any, List, Generator, AsyncGenerator, Optional
 from dataclasses import dataclass, field
 
+from utils.deadline import Deadline
+from utils.json_stream import JsonStreamCutoff, AsyncJsonStreamCutoff, json_early_stop_enabled
+from utils.token_budget import PromptBudget, BudgetedPrompt, join_items, truncate_tokens
+
 
 # =============================================================================
 # 검증 결과 데이터 클래스
@@ -34,12 +39,14 @@ class VerificationResult:
         explanation: 검증 결과 상세 설명
         evidence: 발견된 근거 목록
         suggestions: 개선 제안 목록
+        outcome: "ok" 또는 "parse_failed" (판정을 해석하지 못함 - 점수 없음, 다시 요청 가능)
     """
     is_grounded: bool = True
     score: float = 0.0
     explanation: str = ""
     evidence: List[str] = field(default_factory=list)
     suggestions: List[str] = field(default_factory=list)
+    outcome: str = "ok"
 
 
 # =============================================================================
@@ -61,6 +68,24 @@ class VerifyAgent:
         >>> print(f"근거도: {result.score:.1%}")
     """
     
+    # 호출 계측 태그 (에이전트/파이프라인 단계)
+    CALL_TAGS = {"agent": "verify", "stage": "step5_verify"}
+    GROUNDEDNESS_TAGS = {"agent": "verify", "stage": "step5_groundedness"}
+    
+    # 라우팅 목표 (검증 스트림은 지연 우선, 근거 검증은 품질 우선 - utils.model_router)
+    ROUTE_TARGET = "fast"
+    GROUNDEDNESS_TARGET = "quality"
+    
+    # 스트림 조기 종료 시 완성으로 인정할 응답 JSON의 필수 키 (설명 속 예시 객체에서 멈추지 않도록)
+    JSON_REQUIRED_KEYS = ("is_grounded",)
+    
+    # 스트리밍 근거 검증의 판정 해석 실패 시 최대 시도 횟수
+    GROUNDEDNESS_PARSE_ATTEMPTS = 2
+    
+    # 프롬프트 토큰 예산 (기존 추천 2000자 / 담임 의견 200자 자르기에 해당)
+    ANSWER_TOKEN_BUDGET = 1600
+    NOTE_TOKEN_BUDGET = 150
+    
     VERIFY_PROMPT = """당신은 교육 추천 검증 전문가입니다.
 학생의 생활기록부 정보(Context)와 과목 추천 결과(Answer)를 비교하여
 추천이 학생 정보에 얼마나 근거하는지 평가합니다.
@@ -84,46 +109,100 @@ class VerifyAgent:
 }
 """
 
-    def __init__(self, client):
+    def __init__(
+        self,
+        client,
+        use_response_cache: Optional[bool] = None,
+        stop_after_json: Optional[bool] = None
+    ):
+        """
+        에이전트 초기화
+
+        Args:
+            client: Upstage API 클라이언트
+            use_response_cache: LLM 응답 캐시 사용 여부
+                (미지정 시 IMF_LLM_CACHE_VERIFY, 기본 사용 - 클라이언트 캐시가 활성일 때만 적용)
+            stop_after_json: 응답 JSON이 완성되면 스트림을 바로 닫을지 여부
+                (미지정 시 IMF_JSON_EARLY_STOP, 기본 미사용 - utils.json_stream)
+        """
         self.client = client
+        if use_response_cache is None:
+            use_response_cache = os.getenv("IMF_LLM_CACHE_VERIFY", "1").lower() not in ("0", "false", "no")
+        self.use_response_cache = use_response_cache
+        self.last_prompt: Optional[BudgetedPrompt] = None
+        self.stop_after_json = json_early_stop_enabled() if stop_after_json is None else stop_after_json
+        self.last_stream = None
+        self.last_result: Optional[VerificationResult] = None
     
     def verify(
         self,
         student_profile: Dict[str, Any],
-        recommendation: str
+        recommendation: str,
+        deadline: Optional[Deadline] = None
     ) -> Generator[str, None, VerificationResult]:
         """추천 결과 검증 (스트리밍)"""
         
-        # 프로필을 컨텍스트로 변환
-        context = self._profile_to_context(student_profile)
+        prompt = self._compose_verify_prompt(student_profile, recommendation)
         
-        prompt = f"""[학생 정보 (Context)]
-{context}
-
-[추천 결과 (Answer)]
-{recommendation[:2000]}
-
-위 추천이 학생 정보에 근거하는지 검증해주세요."""
+        stream = self.client.chat_stream(
+            message=prompt.text,
+            system_prompt=self.VERIFY_PROMPT,
+            target=self.ROUTE_TARGET,
+            temperature=0.1,
+            use_cache=self.use_response_cache,
+            tags={**self.CALL_TAGS, "prompt_tokens": prompt.total_tokens},
+            deadline=deadline
+        )
+        if self.stop_after_json:
+            stream = self.last_stream = JsonStreamCutoff(stream, self.JSON_REQUIRED_KEYS)
         
         full_response = ""
-        for chunk in self.client.chat_stream(
-            message=prompt,
-            system_prompt=self.VERIFY_PROMPT,
-            reasoning_effort="low",
-            temperature=0.1
-        ):
+        for chunk in stream:
             full_response += chunk
             yield chunk
         
         return self._parse_result(full_response)
     
+    async def verify_async(
+        self,
+        student_profile: Dict[str, Any],
+        recommendation: str,
+        deadline: Optional[Deadline] = None
+    ) -> AsyncGenerator[str, None]:
+        """추천 결과 검증 (비동기 스트리밍, client는 AsyncUpstageClient - 스트림이 끝나면 last_result에 결과)"""
+        self.last_result = None
+        
+        prompt = self._compose_verify_prompt(student_profile, recommendation)
+        
+        stream = self.client.chat_stream(
+            message=prompt.text,
+            system_prompt=self.VERIFY_PROMPT,
+            target=self.ROUTE_TARGET,
+            temperature=0.1,
+            use_cache=self.use_response_cache,
+            tags={**self.CALL_TAGS, "prompt_tokens": prompt.total_tokens},
+            deadline=deadline
+        )
+        if self.stop_after_json:
+            stream = self.last_stream = AsyncJsonStreamCutoff(stream, self.JSON_REQUIRED_KEYS)
+        
+        full_response = ""
+        async for chunk in stream:
+            full_response += chunk
+            yield chunk
+        
+        self.last_result = self._parse_result(full_response)
+    
     def verify_with_groundedness_api(
         self,
         context: str,
-        answer: str
+        answer: str,
+        deadline: Optional[Deadline] = None
     ) -> VerificationResult:
         """Groundedness Check API 사용 검증"""
-        result = self.client.check_groundedness(context, answer)
+        result = self.client.check_groundedness(
+            context, answer, tags=self.GROUNDEDNESS_TAGS, deadline=deadline, target=self.GROUNDEDNESS_TARGET
+        )
         
         return VerificationResult(
             is_grounded=result.get("grounded", True),
@@ -132,16 +211,113 @@ class VerifyAgent:
             evidence=result.get("evidence", [])
         )
     
+    async def verify_with_groundedness_api_async(
+        self,
+        context: str,
+        answer: str,
+        deadline: Optional[Deadline] = None
+    ) -> VerificationResult:
+        """Groundedness Check API 사용 검증 (비동기)"""
+        result = await self.client.check_groundedness(
+            context, answer, tags=self.GROUNDEDNESS_TAGS, deadline=deadline, target=self.GROUNDEDNESS_TARGET
+        )
+        
+        return VerificationResult(
+            is_grounded=result.get("grounded", True),
+            score=result.get("score", 0.8),
+            explanation=result.get("explanation", ""),
+            evidence=result.get("evidence", [])
+        )
+    
+    def verify_with_groundedness_stream(
+        self,
+        context: str,
+        answer: str,
+        deadline: Optional[Deadline] = None
+    ) -> Generator[str, None, VerificationResult]:
+        """
+        Groundedness Check 스트리밍 검증 (판정 객체가 완성되면 바로 종료)
+        
+        판정을 해석하지 못하면 GROUNDEDNESS_PARSE_ATTEMPTS까지 다시 요청하고
+        그래도 실패하면 outcome="parse_failed" 결과 반환 (다시 요청한 응답 조각도 이어서 전달됨)
+        """
+        for _ in range(self.GROUNDEDNESS_PARSE_ATTEMPTS):
+            result = yield from self.client.check_groundedness_stream(
+                context, answer, tags=self.GROUNDEDNESS_TAGS, deadline=deadline, target=self.GROUNDEDNESS_TARGET
+            )
+            if not result["retryable"]:
+                break
+        
+        return self._groundedness_result(result)
+    
+    async def verify_with_groundedness_stream_async(
+        self,
+        context: str,
+        answer: str,
+        deadline: Optional[Deadline] = None
+    ) -> AsyncGenerator[str, None]:
+        """
+        Groundedness Check 스트리밍 검증 (비동기, client는 AsyncUpstageClient - 스트림이 끝나면 last_result에 결과)
+        
+        verify_with_groundedness_stream과 같은 재요청 규칙 (다시 요청한 응답 조각도 이어서 전달됨)
+        """
+        self.last_result = None
+        for _ in range(self.GROUNDEDNESS_PARSE_ATTEMPTS):
+            stream = self.client.check_groundedness_stream(
+                context, answer, tags=self.GROUNDEDNESS_TAGS, deadline=deadline, target=self.GROUNDEDNESS_TARGET
+            )
+            async for chunk in stream:
+                yield chunk
+            result = stream.result
+            if not result["retryable"]:
+                break
+        
+        self.last_result = self._groundedness_result(result)
+    
+    def _groundedness_result(self, result: Dict[str, Any]) -> VerificationResult:
+        """스트리밍 근거 검증 결과 변환 (해석 실패는 임의 점수 없이 parse_failed)"""
+        if result["outcome"] != "ok":
+            return VerificationResult(
+                is_grounded=False,
+                score=0.0,
+                explanation=result.get("explanation", "")[:300],
+                outcome=result["outcome"]
+            )
+        
+        return VerificationResult(
+            is_grounded=bool(result.get("grounded", True)),
+            score=result["score"],
+            explanation=result.get("explanation", ""),
+            evidence=result.get("evidence", [])
+        )
+    
+    def _build_verify_prompt(self, student_profile: Dict[str, Any], recommendation: str) -> str:
+        """검증 요청 프롬프트 구성"""
+        return self._compose_verify_prompt(student_profile, recommendation).text
+    
+    def _compose_verify_prompt(self, student_profile: Dict[str, Any], recommendation: str) -> BudgetedPrompt:
+        """검증 요청 프롬프트 구성 (섹션별 토큰 예산 적용, 사용량은 last_prompt에 기록)"""
+        # 프로필을 컨텍스트로 변환
+        context = self._profile_to_context(student_profile)
+        
+        budget = PromptBudget()
+        budget.reserve("system", self.VERIFY_PROMPT)
+        budget.add("context", f"[학생 정보 (Context)]\n{context}\n")
+        budget.add("answer", f"[추천 결과 (Answer)]\n{recommendation}\n", budget=self.ANSWER_TOKEN_BUDGET)
+        budget.add("instruction", "위 추천이 학생 정보에 근거하는지 검증해주세요.")
+        self.last_prompt = budget.build("\n")
+        return self.last_prompt
+    
     def _profile_to_context(self, profile: Dict[str, Any]) -> str:
         """프로필을 검증용 컨텍스트로 변환"""
         lines = []
         
         if profile.get("strong_subjects"):
-            lines.append(f"강점 과목: {', '.join(profile['strong_subjects'])}")
+            lines.append(f"강점 과목: {join_items(profile['strong_subjects'])}")
         if profile.get("weak_subjects"):
-            lines.append(f"보완 필요: {', '.join(profile['weak_subjects'])}")
+            lines.append(f"보완 필요: {join_items(profile['weak_subjects'])}")
         if profile.get("awards"):
-            lines.append(f"수상 경력: {', '.join(profile['awards'][:5])}")
+            lines.append(f"수상 경력: {join_items(profile['awards'][:5])}")
         if profile.get("club_activities"):
             lines.append(f"동아리: {profile['club_activities']}")
         if profile.get("career_activities"):
@@ -149,7 +325,7 @@ class VerifyAgent:
         if profile.get("desired_career"):
             lines.append(f"희망 진로: {profile['desired_career']}")
         if profile.get("teacher_comments"):
-            lines.append(f"담임 의견: {profile['teacher_comments'][:200]}")
+            lines.append(f"담임 의견: {truncate_tokens(profile['teacher_comments'], self.NOTE_TOKEN_BUDGET)}")
         
         return "\n".join(lines) if lines else "학생 정보 없음"
     
@@ -182,6 +358,9 @@ class VerifyAgent:
     
     def get_verification_summary(self, result: VerificationResult) -> str:
         """검증 결과 요약"""
+        if result.outcome == "parse_failed":
+            return f"⚠️ 검증 결과를 해석하지 못했습니다 (다시 시도해주세요)\n\n📝 {result.explanation[:150]}"
+        
         status = "✅ 검증 통과" if result.is_grounded else "⚠️ 검증 필요"
         score_bar = "🟢" * int(result.score * 5) + "⚪" * (5 - int(result.score * 5))
         
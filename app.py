@@ -12,7 +12,7 @@ Upstage Solar Pro 3 기반 생활기록부 분석 및 최적 과목 추천 시
 """
 
 import streamlit as st
-import json
+import copy
 import os
 from pathlib import Path
 from typing import Dict, Any, Optional
@@ -105,8 +105,8 @@ class SessionManager:
         "target_major": "",             # 관심 계열/전공
         "recommendation": None,         # Solar Pro 3 추천 결과
         "verification": None,           # Groundedness Check 결과
-        "client": None,                 # Upstage API 클라이언트
-        "neis_api": None                # NEIS API 클라이언트
+        "neis_api": None,               # NEIS API 클라이언트
+        "deadline": None                # 진행 중인 API 호출의 마감 시간/취소 토큰
     }
 
     @classmethod
@@ -118,26 +118,58 @@ class SessionManager:
 
     @classmethod
     def reset(cls) -> None:
-        """세션 상태 전체 초기화 - 처음부터 다시 시작"""
+        """세션 상태 전체 초기화 - 처음부터 다시 시작 (진행 중인 스트림은 취소)"""
+        cls.cancel_run("초기화")
         for key in list(st.session_state.keys()):
             del st.session_state[key]
 
+    @staticmethod
+    def start_run():
+        """
+        새 호출 예산 시작 - 이전 실행에서 남은 스트림은 취소
+
+        Returns:
+            Deadline: IMF_PIPELINE_BUDGET_SECONDS 예산의 Deadline
+        """
+        from utils.deadline import pipeline_deadline
+
+        SessionManager.cancel_run("새 요청")
+        st.session_state.deadline = pipeline_deadline()
+        return st.session_state.deadline
+
+    @staticmethod
+    def cancel_run(reason: str) -> None:
+        """진행 중인 호출 취소 (스트림 연결 즉시 반환)"""
+        deadline = st.session_state.get("deadline")
+        if deadline is not None:
+            deadline.cancel(reason)
+            st.session_state.deadline = None
+
     @staticmethod
     def get_client():
         """
-        Upstage 클라이언트 지연 로딩
+        프로세스 공유 Upstage 클라이언트 (세션마다 만들지 않고 utils.client_pool에서 재사용)
 
         Returns:
             UpstageClient: API 클라이언트 인스턴스 또는 None
         """
-        if st.session_state.client is None:
-            try:
-                from utils.upstage_client import UpstageClient
-                st.session_state.client = UpstageClient()
-            except Exception as e:
-                st.error(f"API 클라이언트 초기화 실패: {e}")
-                return None
-        return st.session_state.client
+        try:
+            from utils.client_pool import get_shared_client
+            return get_shared_client()
+        except Exception as e:
+            st.error(f"API 클라이언트 초기화 실패: {e}")
+            return None
+
+
+def _describe_error(action: str, error: Exception) -> str:
+    """호출 실패 메시지 - 예산 초과/취소는 원인을 안내"""
+    from utils.deadline import DeadlineExceeded, CallCancelled
+
+    if isinstance(error, DeadlineExceeded):
+        return f"⏱️ {action} 시간이 초과되었습니다. 잠시 후 다시 시도해주세요. ({error})"
+    if isinstance(error, CallCancelled):
+        return f"{action}이(가) 취소되었습니다. ({error})"
+    return f"{action} 중 오류 발생: {error}"
 
 
 # =============================================================================
@@ -148,6 +180,7 @@ class DataLoader:
     JSON 데이터 파일 로드 클래스
 
     2022 개정 교육과정 과목 데이터, 대학별 권장과목 데이터 등 로드
+    (프로세스 공유 캐시 - 세션마다 파일을 다시 읽지 않음, utils.warmup이 시작 시 미리 로드)
     """
 
     BASE_PATH = Path(__file__).parent / "data"
@@ -155,29 +188,20 @@ class DataLoader:
     @classmethod
     def load_subjects(cls) -> Dict[str, Any]:
         """2022 개정 교육과정 과목 데이터 로드"""
-        path = cls.BASE_PATH / "subjects_2022.json"
-        if path.exists():
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        return {"categories": {}}
+        from utils.university_rag import load_data_json
+        return load_data_json("subjects_2022.json", cls.BASE_PATH, default={"categories": {}})
 
     @classmethod
     def load_school_courses(cls) -> Dict[str, Any]:
         """샘플 학교 개설 과목 데이터 로드 (폴백용)"""
-        path = cls.BASE_PATH / "sample_school_courses.json"
-        if path.exists():
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        return {"schools": {}}
+        from utils.university_rag import load_data_json
+        return load_data_json("sample_school_courses.json", cls.BASE_PATH, default={"schools": {}})
 
     @classmethod
     def load_university_requirements(cls) -> Dict[str, Any]:
         """대학별 권장 이수과목 데이터 로드"""
-        path = cls.BASE_PATH / "university_requirements.json"
-        if path.exists():
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        return {"universities": {}}
+        from utils.university_rag import load_data_json
+        return load_data_json("university_requirements.json", cls.BASE_PATH, default={"universities": {}})
 
 
 # =============================================================================
@@ -435,39 +459,42 @@ class Step1Upload:
                 from agents.document_agent import DocumentAgent
                 from agents.extract_agent import ExtractAgent
 
-                # Phase 1: Document Parse
-                st.markdown('<div class="thinking-header">📄 Document Parse</div>', unsafe_allow_html=True)
-
-                doc_agent = DocumentAgent(client)
-                file_bytes = uploaded_file.read()
-                parsed = doc_agent.parse_bytes(file_bytes, uploaded_file.name)
-                st.session_state.parsed_text = parsed.text
-
-                # Phase 2: Information Extract
-                st.markdown('<div class="thinking-header">🔍 Information Extract</div>', unsafe_allow_html=True)
-
-                extract_agent = ExtractAgent(client)
-                thinking_placeholder = st.empty()
-                thinking_content = ""
-
-                gen = extract_agent.extract_from_text(parsed.text)
-
-                while True:
-                    try:
-                        chunk = next(gen)
-                        thinking_content += chunk
-                        thinking_placeholder.markdown(f"""
-                        <div class="thinking-box">{thinking_content}</div>
-                        """, unsafe_allow_html=True)
-                    except StopIteration as e:
-                        st.session_state.extracted_info = e.value
-                        st.session_state.auto_searched_school = False  # 새 추출시 자동검색 플래그 초기화
-                        st.session_state.step = 2
-                        st.rerun()
-                        break
+                # 업로드 시점부터 Parse → Extract 전체에 하나의 예산 적용
+                # (중단/재실행으로 빠져나가면 with 블록이 진행 중인 스트림을 취소)
+                with SessionManager.start_run() as deadline:
+                    # Phase 1: Document Parse
+                    st.markdown('<div class="thinking-header">📄 Document Parse</div>', unsafe_allow_html=True)
+
+                    doc_agent = DocumentAgent(client)
+                    file_bytes = uploaded_file.read()
+                    parsed = doc_agent.parse_bytes(file_bytes, uploaded_file.name, deadline=deadline)
+                    st.session_state.parsed_text = parsed.text
+
+                    # Phase 2: Information Extract
+                    st.markdown('<div class="thinking-header">🔍 Information Extract</div>', unsafe_allow_html=True)
+
+                    extract_agent = ExtractAgent(client)
+                    thinking_placeholder = st.empty()
+                    thinking_content = ""
+
+                    gen = extract_agent.extract_from_text(parsed.text, deadline=deadline)
+
+                    while True:
+                        try:
+                            chunk = next(gen)
+                            thinking_content += chunk
+                            thinking_placeholder.markdown(f"""
+                            <div class="thinking-box">{thinking_content}</div>
+                            """, unsafe_allow_html=True)
+                        except StopIteration as e:
+                            st.session_state.extracted_info = e.value
+                            st.session_state.auto_searched_school = False  # 새 추출시 자동검색 플래그 초기화
+                            st.session_state.step = 2
+                            st.rerun()
+                            break
 
             except Exception as e:
-                st.error(f"분석 중 오류 발생: {e}")
+                st.error(_describe_error("분석", e))
 
     @staticmethod
     def _render_demo_mode() -> None:
@@ -819,7 +846,7 @@ class Step3Settings:
                 sample_schools = sample_data.get("schools", {})
                 if sample_schools:
                     first_school = list(sample_schools.values())[0]
-                    st.session_state.selected_courses = first_school.get("available_subjects", {})
+                    st.session_state.selected_courses = copy.deepcopy(first_school.get("available_subjects", {}))
 
         st.rerun()
 
@@ -854,8 +881,8 @@ class Step3Settings:
 
         # RAG에서 대학 목록 가져오기
         try:
-            from utils.university_rag import UniversityRAG
-            rag = UniversityRAG()
+            from utils.university_rag import get_university_rag
+            rag = get_university_rag()
             univ_list = rag.get_universities_list()
 
             # 티어별로 정렬
@@ -988,28 +1015,30 @@ class Step4Recommend:
             }
 
             # 추천 생성 (스트리밍)
-            gen = agent.recommend(
-                student_profile=profile,
-                school_courses=st.session_state.selected_courses,
-                target_university=st.session_state.target_university,
-                target_major=st.session_state.target_major
-            )
-
-            # 스트리밍 루프
-            while True:
-                try:
-                    chunk = next(gen)
-                    thinking_content += chunk
-                    thinking_placeholder.markdown(f"""
-                    <div class="thinking-box">{thinking_content}</div>
-                    """, unsafe_allow_html=True)
-                except StopIteration as e:
-                    st.session_state.recommendation = e.value
-                    st.rerun()
-                    break
+            with SessionManager.start_run() as deadline:
+                gen = agent.recommend(
+                    student_profile=profile,
+                    school_courses=st.session_state.selected_courses,
+                    target_university=st.session_state.target_university,
+                    target_major=st.session_state.target_major,
+                    deadline=deadline
+                )
+
+                # 스트리밍 루프
+                while True:
+                    try:
+                        chunk = next(gen)
+                        thinking_content += chunk
+                        thinking_placeholder.markdown(f"""
+                        <div class="thinking-box">{thinking_content}</div>
+                        """, unsafe_allow_html=True)
+                    except StopIteration as e:
+                        st.session_state.recommendation = e.value
+                        st.rerun()
+                        break
 
         except Exception as e:
-            st.error(f"추천 생성 중 오류: {e}")
+            st.error(_describe_error("추천 생성", e))
 
     @staticmethod
     def _display_recommendation() -> None:
@@ -1129,22 +1158,23 @@ class Step5Verify:
             rec_text = rec.reasoning if rec else ""
 
             # 검증 실행 (스트리밍)
-            gen = agent.verify(profile, rec_text)
-
-            while True:
-                try:
-                    chunk = next(gen)
-                    thinking_content += chunk
-                    thinking_placeholder.markdown(f"""
-                    <div class="thinking-box">{thinking_content}</div>
-                    """, unsafe_allow_html=True)
-                except StopIteration as e:
-                    st.session_state.verification = e.value
-                    st.rerun()
-                    break
+            with SessionManager.start_run() as deadline:
+                gen = agent.verify(profile, rec_text, deadline=deadline)
+
+                while True:
+                    try:
+                        chunk = next(gen)
+                        thinking_content += chunk
+                        thinking_placeholder.markdown(f"""
+                        <div class="thinking-box">{thinking_content}</div>
+                        """, unsafe_allow_html=True)
+                    except StopIteration as e:
+                        st.session_state.verification = e.value
+                        st.rerun()
+                        break
 
         except Exception as e:
-            st.error(f"검증 중 오류: {e}")
+            st.error(_describe_error("검증", e))
 
     @staticmethod
     def _display_verification() -> None:
@@ -1277,6 +1307,10 @@ class IMFApp:
 # if __name__ == "__main__" 블록 밖에서도 실행됨
 # 하지만 명시적으로 실행 흐름을 제어하기 위해 여기에 배치
 try:
+    # 프로세스 시작 준비 (연결/데이터/캐시 - 이미 시작됐거나 끝났으면 무시, utils.warmup)
+    from utils.warmup import get_warmup
+    get_warmup().start()
+
     app = IMFApp()
     app.run()
 except Exception as e:
@@ -0,0 +1,837 @@
+"""
+Upstage 대역 서버 테스트
+
+실제 API 키 없이 로컬 대역 서버(utils.standin_server)로
+클라이언트와 에이전트 파이프라인이 끝까지 동작하는지, 지연/오류 주입이 적용되는지 테스트합니다.
+"""
+
+import io
+import sys
+import asyncio
+import threading
+import os
+import time
+import tempfile
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PyPDF2 import PdfWriter
+
+from utils.standin_server import StandinServer, StandinConfig, DEFAULT_CHAT_RULES
+from utils.upstage_client import UpstageClient, AsyncUpstageClient
+from utils.instrumentation import Instrumentation, RingBufferSink
+from utils.resilience import RetryPolicy, UpstageAPIError, StreamResumeError
+from utils.deadline import Deadline, DeadlineExceeded, CallCancelled
+from utils.hedging import Hedger, HedgePolicy
+from utils.model_router import ModelRouter, RoutingPolicy
+from utils.client_pool import ClientPool
+from utils.parse_jobs import ParseJobRunner, ParseJobRegistry, PollPolicy, ParseJob, _localize_pages
+from utils.pdf_split import PdfChunk, merge_parse_results
+from utils.json_stream import JsonStreamCutoff, AsyncJsonStreamCutoff, JsonStreamStats, get_json_stream_stats
+from utils.llm_cache import LLMResponseCache, MemoryCacheBackend
+from utils.recorder import InteractionRecorder, load_log
+from utils.replay import ReplayDriver
+from utils.key_pool import KeyPool
+from utils.rate_limiter import UpstageGovernor, EndpointBudget
+from utils.singleflight import SingleFlight
+from utils.fast_json import LazyPayload
+from utils.parse_cache import ParseCache
+from utils.warmup import Warmup, ReadinessServer, open_connections
+from utils.http_pool import get_http_session, get_pool_stats
+
+
+def _client(server: StandinServer, **kwargs) -> UpstageClient:
+    return UpstageClient(api_key="local", base_url=server.base_url, **kwargs)
+
+
+def test_pipeline_offline():
+    """대역 서버로 Document → Extract → Recommend → Verify 파이프라인 실행"""
+    print("=" * 60)
+    print("1. 대역 서버 파이프라인 테스트")
+    print("=" * 60)
+
+    from agents import DocumentAgent, ExtractAgent, RecommendAgent, VerifyAgent
+
+    with StandinServer(StandinConfig(seed=1)) as server:
+        client = _client(server)
+
+        parsed = DocumentAgent(client, use_cache=False, preflight=False).parse_bytes(b"%PDF-1.4 standin")
+        assert "서울과학고등학교" in parsed.text
+        print(f"✅ Document Parse: {len(parsed.text)}자")
+
+        stream = ExtractAgent(client, use_response_cache=False).extract_from_text(parsed.text)
+        info = _drain(stream)
+        assert info.school_name == "서울과학고등학교"
+        print(f"✅ 정보 추출: {info.student_name} / {info.desired_career}")
+
+        stream = RecommendAgent(client, use_response_cache=False).recommend(
+            {"strong_subjects": info.strong_subjects, "desired_career": info.desired_career},
+            {"1학년": ["공통수학1"]}
+        )
+        recommendation = _drain(stream)
+        assert recommendation.total_credits == 192
+        print(f"✅ 과목 추천: {recommendation.total_credits}학점")
+
+        verifier = VerifyAgent(client, use_response_cache=False)
+        result = verifier.verify_with_groundedness_api(parsed.text, recommendation.reasoning)
+        assert result.is_grounded and result.score > 0.8
+        print(f"✅ 근거 검증: {result.score:.0%}")
+
+        stats = server.stats()
+        print(f"✅ 서버 집계: {stats}")
+        assert stats["parse"]["200"] == 1 and stats["groundedness"]["200"] == 1
+
+
+def test_fault_injection():
+    """429 주입 시 재시도 후 UpstageAPIError, TTFT/토큰 속도 지연 적용"""
+    print("\n" + "=" * 60)
+    print("2. 지연/오류 주입 테스트")
+    print("=" * 60)
+
+    config = StandinConfig.from_dict({
+        "seed": 7,
+        "profiles": {
+            "groundedness": {"rate_429": 1.0, "retry_after": 0},
+            "chat": {"ttft": 0.2, "tokens_per_second": 200},
+        },
+    })
+    sink = RingBufferSink()
+
+    with StandinServer(config) as server:
+        client = _client(
+            server,
+            retry_policy=RetryPolicy(max_attempts=3, base_delay=0.0, max_delay=0.0),
+            instrumentation=Instrumentation([sink])
+        )
+
+        try:
+            client.check_groundedness("context", "answer")
+            raise AssertionError("429가 주입되지 않았습니다")
+        except UpstageAPIError as e:
+            assert e.status_code == 429
+        assert server.stats()["groundedness"]["429"] == 3
+        print("✅ 429 주입: 3회 시도 후 UpstageAPIError")
+
+        text = "".join(client.chat_stream("안녕하세요"))
+        assert text
+        record = [r for r in sink.records() if r.operation == "chat_stream"][-1]
+        assert record.ttft_seconds >= 0.2
+        print(f"✅ TTFT 주입: {record.ttft_seconds:.2f}s, 조각 {record.chunk_count}개")
+
+
+def test_deadline_cancellation():
+    """남은 예산보다 느린 응답은 DeadlineExceeded, cancel() 시 진행 중인 스트림 즉시 종료"""
+    print("\n" + "=" * 60)
+    print("3. 마감 시간/취소 테스트")
+    print("=" * 60)
+
+    import threading
+
+    config = StandinConfig.from_dict({
+        "seed": 3,
+        "profiles": {"chat": {"ttft": 1.0, "tokens_per_second": 3}},
+    })
+
+    with StandinServer(config) as server:
+        client = _client(server)
+        client.singleflight = None  # 병합 없이 호출자 스트림을 직접 취소
+
+        started = time.monotonic()
+        try:
+            "".join(client.chat_stream("안녕하세요", deadline=Deadline(0.3)))
+            raise AssertionError("예산 초과가 발생하지 않았습니다")
+        except DeadlineExceeded:
+            pass
+        assert time.monotonic() - started < 0.9
+        print(f"✅ 예산 초과: {time.monotonic() - started:.2f}s 만에 DeadlineExceeded")
+
+        deadline = Deadline(30)
+        threading.Timer(1.5, deadline.cancel, args=("테스트",)).start()
+        started = time.monotonic()
+        try:
+            "".join(client.chat_stream("안녕하세요", deadline=deadline))
+            raise AssertionError("취소가 전달되지 않았습니다")
+        except CallCancelled:
+            pass
+        assert time.monotonic() - started < 3.0
+        print(f"✅ 취소: {time.monotonic() - started:.2f}s 만에 CallCancelled")
+
+
+def test_chat_many():
+    """chat_many: 입력 순서 유지, 동시 실행 제한, 항목별 오류 보존"""
+    print("\n" + "=" * 60)
+    print("4. 일괄 채팅 테스트")
+    print("=" * 60)
+
+    config = StandinConfig.from_dict({"seed": 5, "profiles": {"chat": {"latency": 0.2}}})
+
+    with StandinServer(config) as server:
+        client = _client(server)
+        prompts = [f"질문 {i}" for i in range(4)]
+
+        results = client.chat_many(prompts, max_concurrency=2)
+        assert [r.index for r in results] == [0, 1, 2, 3]
+        assert all(r.ok and r.text for r in results)
+        # 동시 2개 제한 → 뒤의 두 항목은 앞 항목이 끝날 때까지 대기
+        assert min(r.wait_seconds for r in results[2:]) >= 0.15
+        print(f"✅ 순서/동시성: 대기 {[round(r.wait_seconds, 2) for r in results]}")
+
+        results = client.chat_many(prompts[:2], deadline=Deadline(0.05))
+        assert all(isinstance(r.error, DeadlineExceeded) for r in results)
+        print("✅ 항목별 오류: DeadlineExceeded가 결과에 담김")
+
+
+def test_hedging():
+    """p95보다 늦은 첫 시도는 헤지, 먼저 응답한 쪽 사용, 진 스트림은 닫히고 슬롯 반환"""
+    print("\n" + "=" * 60)
+    print("5. 헤지 요청 테스트")
+    print("=" * 60)
+
+    hedger = Hedger(HedgePolicy(min_samples=5, ratio=1.0))
+    for _ in range(5):
+        hedger.observe("fake", 0.05)
+    calls = []
+
+    def attempt(token):
+        calls.append(token)
+        # 첫 시도만 꼬리 지연 (취소되면 바로 깨어남)
+        if len(calls) == 1 and not token._cancelled.wait(2.0):
+            return "primary"
+        return "hedge"
+
+    started = time.monotonic()
+    assert hedger.run("fake", "chat", attempt) == "hedge"
+    assert time.monotonic() - started < 1.0
+    assert calls[0].cancelled, "진 시도에 취소가 전달되지 않음"
+    stats = hedger.stats()
+    assert stats["hedged"] == 1 and stats["hedge_wins"] == 1
+    print(f"✅ 꼬리 지연 회피: {time.monotonic() - started:.2f}s, 통계 {stats['hedged']}/{stats['primaries']}")
+
+    config = StandinConfig.from_dict({"seed": 3, "profiles": {"chat": {"latency": 0.3, "ttft": 0.3}}})
+    with StandinServer(config) as server:
+        hedger = Hedger(HedgePolicy(min_samples=5, ratio=1.0))
+        client = _client(server, hedger=hedger)
+        for key in (("chat", "solar-pro3", "low", "stream"), ("chat", "solar-pro3", "low", "complete")):
+            for _ in range(5):
+                hedger.observe(key, 0.05)
+
+        text = "".join(client.chat_stream("헤지 스트림", reasoning_effort="low", hedge=True))
+        assert text, "헤지 스트림 응답 없음"
+        assert client.chat("헤지 호출", reasoning_effort="low", hedge=True)
+        assert client.hedge_stats()["hedged"] == 2
+        time.sleep(0.5)
+        assert client.governor.stats()["chat"]["in_flight"] == 0, "진 시도의 거버너 슬롯이 반환되지 않음"
+        print(f"✅ 대역 서버 헤지: {client.hedge_stats()['hedged']}건, 진 시도 정리 완료")
+
+
+def test_model_router():
+    """목표별 후보 선택: 입력이 크거나 관측 지연이 SLO를 넘으면 다음 후보로"""
+    print("\n" + "=" * 60)
+    print("6. 모델/추론 수준 라우팅 테스트")
+    print("=" * 60)
+
+    policy = RoutingPolicy.from_dict({
+        "targets": {"quality": [
+            {"model": "solar-pro3", "reasoning_effort": "high", "slo_seconds": 0.1, "max_input_tokens": 50},
+            {"model": "solar-pro3", "reasoning_effort": "low"},
+        ]},
+        "min_samples": 2,
+    })
+    config = StandinConfig.from_dict({"seed": 4, "profiles": {"chat": {"latency": 0.2}}})
+
+    with StandinServer(config) as server:
+        router = ModelRouter(policy)
+        client = _client(server, router=router)
+
+        assert router.select("quality", prompt_tokens=500).reasoning_effort == "low"
+        assert router.select("quality", prompt_tokens=10).reasoning_effort == "high"
+        print("✅ 입력 크기: 한도를 넘는 프롬프트는 다음 후보")
+
+        for i in range(2):
+            client.chat_with_context([{"role": "user", "content": f"질문 {i}"}])
+        assert router.select("quality", prompt_tokens=10).reasoning_effort == "low"
+        assert client.chat("명시", model="solar-pro3", reasoning_effort="high")
+        stats = client.routing_stats()
+        assert stats["skips"]["slo"] >= 1
+        print(f"✅ 지연 SLO: 관측 {stats['latency']['solar-pro3/high']:.2f}s > 0.1s → {stats['picks']['quality']}")
+
+
+def test_client_pool():
+    """같은 (API 키, base_url)은 한 클라이언트를 공유, 닫힌 뒤에는 다시 생성"""
+    print("\n" + "=" * 60)
+    print("7. 공유 클라이언트 풀 테스트")
+    print("=" * 60)
+
+    with StandinServer(StandinConfig()) as server:
+        pool = ClientPool()
+        client = pool.get("standin-key", server.base_url)
+        assert pool.get("standin-key", server.base_url) is client
+        assert pool.get("other-key", server.base_url) is not client
+        assert client.chat("공유 클라이언트")
+        stats = pool.stats()
+        assert stats["clients"] == 2 and stats["connections"]["llm"]["open"] >= 1
+        assert pool.health()["healthy"]
+        print(f"✅ 공유: 클라이언트 {stats['clients']}개, LLM 연결 {stats['connections']['llm']}")
+
+        pool.close()
+        assert client.closed and len(pool) == 0
+        rebuilt = pool.get("standin-key", server.base_url)
+        assert rebuilt is not client and rebuilt.chat("재생성")
+        print(f"✅ 종료 후 재생성: 생성 {pool.created}회")
+
+
+def test_parse_jobs():
+    """비동기 Document Parse 작업: 구간별 수집, 재시작 후 레지스트리에서 재개"""
+    print("\n" + "=" * 60)
+    print("8. 비동기 Document Parse 작업 테스트")
+    print("=" * 60)
+
+    writer = PdfWriter()
+    for _ in range(10):
+        writer.add_blank_page(200, 200)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    document = buffer.getvalue()
+
+    config = StandinConfig.from_dict({
+        "async_batch_pages": 4,
+        "profiles": {"parse": {"latency": 0.05, "per_page_seconds": 0.02}},
+    })
+    poll = PollPolicy(initial=0.05, max_interval=0.2)
+
+    with StandinServer(config) as server, tempfile.TemporaryDirectory() as registry_dir:
+        client = _client(server)
+        runner = ParseJobRunner(client, ParseJobRegistry(registry_dir), poll)
+        job = runner.submit(document, "생기부.pdf")
+        for batch, result in runner.iter_batches(job):
+            # 첫 구간만 받고 프로세스가 종료된 상황
+            assert (batch.start_page, batch.end_page) == (1, 4)
+            break
+
+        restarted = ParseJobRunner(client, ParseJobRegistry(registry_dir), poll)
+        assert restarted.submit(document, "생기부.pdf").job_id == job.job_id, "진행 중 작업을 다시 등록함"
+        merged = restarted.resume()[job.job_id]
+        assert len(merged["content"]["pages"]) == 10
+        assert merged["content"]["pages"][4] == "[5쪽]"
+        assert not restarted.registry.jobs()
+        assert server.stats()["parse_submit"] == {"200": 1}
+        assert server.stats()["parse_download"] == {"200": 3}
+        print(f"✅ 재시작 후 재개: 구간 {merged['chunks']}")
+
+        # 같은 문서 동시 등록은 한 번만, 수집이 끝난 작업은 재사용하지 않음
+        same = restarted.submit_many([(document, "생기부.pdf")] * 3)
+        assert len({job.job_id for job in same}) == 1, "같은 문서를 중복 등록함"
+        assert server.stats()["parse_submit"] == {"200": 2}
+        restarted.wait(same[0], keep=True)
+        again = restarted.submit(document, "생기부.pdf")
+        assert again.job_id != same[0].job_id, "수집이 끝난 작업을 반환함"
+        assert server.stats()["parse_submit"] == {"200": 3}
+        print("✅ 동시 등록 1회, 끝난 작업 재등록")
+
+    # 구간마다 페이지 번호가 구간 기준인 응답 (1-2p, 3-12p): 작업 단위로 구간 기준으로 판단
+    def batch_result(start: int, end: int) -> dict:
+        return {"elements": [
+            {"id": page, "category": "paragraph", "page": page, "content": {"text": f"[{start + page - 1}쪽]"}}
+            for page in range(1, end - start + 2)
+        ]}
+
+    job = ParseJob("job-local", "생기부.pdf", "key", "force", "document-parse")
+    results = []
+    for index, (start, end) in enumerate(((1, 2), (3, 12))):
+        chunk = PdfChunk(index=index, start_page=start, end_page=end, data=b"")
+        results.append((chunk, _localize_pages(job, chunk, batch_result(start, end))))
+    local = merge_parse_results(results)
+    assert job.page_numbering == "local"
+    assert [element["page"] for element in local["elements"]] == list(range(1, 13)), local["elements"]
+    assert local["content"]["pages"][2] == "[3쪽]"
+    print(f"✅ 구간 기준 페이지 번호: {job.page_numbering}, 1-{len(local['content']['pages'])}p")
+
+
+def _settled_stats(server: StandinServer, endpoint: str, previous: int = -1) -> dict:
+    """서버 응답 집계가 previous와 달라지고 0.1초 동안 변하지 않을 때의 값 (최대 2초 대기)"""
+    stats = server.stats().get(endpoint, {})
+    deadline = time.monotonic() + 2.0
+    while time.monotonic() < deadline:
+        time.sleep(0.1)
+        current = server.stats().get(endpoint, {})
+        if current == stats and sum(current.values()) != previous:
+            break
+        stats = current
+    return stats
+
+
+def test_json_early_stop():
+    """응답 JSON이 완성되면 뒤따르는 설명을 기다리지 않고 스트림을 닫음"""
+    print("\n" + "=" * 60)
+    print("9. JSON 완성 시 스트림 조기 종료 테스트")
+    print("=" * 60)
+
+    from agents import RecommendAgent
+
+    recommend_rule = next(rule for rule in DEFAULT_CHAT_RULES if rule["match"] == "고교학점제 전문 상담사")
+    tail = "\n추가 설명: 이 추천은 학생의 강점 과목과 희망 진로를 바탕으로 구성했습니다." * 20
+    config = StandinConfig.from_dict({
+        "chat_rules": [dict(recommend_rule, text=recommend_rule["text"] + tail)],
+        "profiles": {"chat": {"tokens_per_second": 400}},
+    })
+    with StandinServer(config) as server:
+        client = _client(server)
+        agent = RecommendAgent(client, use_response_cache=False, stop_after_json=True)
+        recommendation = _drain(agent.recommend({"desired_career": "기계공학자"}, {"1학년": ["공통수학1"]}))
+        assert recommendation.total_credits == 192 and agent.last_stream.value is not None
+
+        stats = JsonStreamStats(sample_rate=0.0)
+        prompt = "고교학점제 전문 상담사"
+        sampled = JsonStreamCutoff(client.chat_stream(prompt), ("year1",), stats, sample=True)
+        full_text = "".join(sampled)
+        stopped = JsonStreamCutoff(client.chat_stream(prompt), ("year1",), stats, sample=False)
+        cut_text = "".join(stopped)
+
+        assert stopped.stopped and not sampled.stopped
+        assert full_text.startswith(cut_text) and len(cut_text) < len(full_text) - len(tail) // 2
+        assert stopped.total_seconds < sampled.total_seconds
+        snapshot = stats.snapshot()
+        assert snapshot["stopped"] == 1 and snapshot["sampled"] == 1 and snapshot["tokens_saved_est"] > 0
+        # 병합 펌프 스레드가 원본 스트림을 닫고 슬롯을 반환할 때까지 잠시 대기
+        for _ in range(40):
+            if client.governor.stats()["chat"]["in_flight"] == 0:
+                break
+            time.sleep(0.05)
+        assert client.governor.stats()["chat"]["in_flight"] == 0, "조기 종료한 스트림의 슬롯이 반환되지 않음"
+        assert server.stats()["chat"].get("client_closed", 0) >= 1
+        print(f"✅ 조기 종료: {stopped.total_seconds:.2f}s (끝까지 {sampled.total_seconds:.2f}s), "
+              f"절약 추정 {snapshot['tokens_saved_est']:.0f}토큰 / {snapshot['ms_saved_est']:.0f}ms")
+
+        # 조기 종료한 응답도 JSON이 완성되었으므로 응답 캐시에 저장되어 다음 호출은 재생
+        cache = LLMResponseCache(MemoryCacheBackend())
+        cached_client = _client(server, response_cache=cache)
+        agent = RecommendAgent(cached_client, use_response_cache=True, stop_after_json=True)
+        # 에이전트는 공유 통계의 표본 비율로 끝까지 받을 스트림을 고르므로 표본 없이 실행
+        shared_stats = get_json_stream_stats()
+        sample_rate, shared_stats.sample_rate = shared_stats.sample_rate, 0.0
+        try:
+            first = _drain(agent.recommend({"desired_career": "기계공학자"}, {"1학년": ["공통수학1"]}))
+            assert agent.last_stream.stopped
+            requests_before = server.stats()["chat"]
+            second = _drain(agent.recommend({"desired_career": "기계공학자"}, {"1학년": ["공통수학1"]}))
+        finally:
+            shared_stats.sample_rate = sample_rate
+        assert second.total_credits == first.total_credits
+        assert server.stats()["chat"] == requests_before, "조기 종료한 응답이 캐시되지 않음"
+        assert cache.backend.stats()["hits"] == 1
+
+        async def cached_async():
+            async with AsyncUpstageClient(
+                api_key="local", base_url=server.base_url, response_cache=cache
+            ) as aclient:
+                texts = []
+                for _ in range(2):
+                    stream = AsyncJsonStreamCutoff(
+                        aclient.chat_stream(prompt, use_cache=True), ("year1",), stats, sample=False
+                    )
+                    texts.append("".join([piece async for piece in stream]))
+                    assert stream.stopped and stream.value is not None
+                return texts
+
+        # 조기 종료한 스트림은 서버가 끊김을 감지한 뒤에 client_closed로 기록되므로 기록이 멈춘 뒤 비교
+        requests_before = sum(_settled_stats(server, "chat").values())
+        texts = asyncio.run(cached_async())
+        assert texts[0] == texts[1]
+        assert sum(_settled_stats(server, "chat", requests_before).values()) == requests_before + 1
+        print(f"✅ 조기 종료 응답 캐시: 캐시 적중 {cache.backend.stats()['hits']}회")
+
+        # 비동기 에이전트: async for로 조각을 받고 스트림이 끝나면 last_result에 결과
+        async def recommend_async():
+            async with AsyncUpstageClient(api_key="local", base_url=server.base_url) as aclient:
+                agent = RecommendAgent(aclient, use_response_cache=False, stop_after_json=True)
+                pieces = [
+                    piece async for piece in
+                    agent.recommend_async({"desired_career": "기계공학자"}, {"1학년": ["공통수학1"]})
+                ]
+                return pieces, agent
+
+        pieces, agent = asyncio.run(recommend_async())
+        assert pieces and "".join(pieces) == agent.last_stream.text
+        assert agent.last_result.total_credits == 192
+        print(f"✅ 비동기 에이전트 스트림: 조각 {len(pieces)}개, last_result 설정")
+
+
+def test_record_replay():
+    """호출 기록(가림 포함) 후 기록만으로 같은 응답/재시도 순서를 재생"""
+    print("\n" + "=" * 60)
+    print("10. 호출 기록 / 재생 테스트")
+    print("=" * 60)
+
+    from agents import ExtractAgent, RecommendAgent
+
+    config = StandinConfig.from_dict({
+        "seed": 3,
+        "profiles": {"chat": {"rate_429": 0.5, "retry_after": 0, "tokens_per_second": 500}},
+    })
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "upstage.jsonl.gz")
+        recorder = InteractionRecorder(path)
+        with StandinServer(config) as server:
+            client = _client(server, recorder=recorder,
+                             retry_policy=RetryPolicy(max_attempts=6, base_delay=0.0, max_delay=0.0))
+            info = _drain(ExtractAgent(client, use_response_cache=False).extract_from_text("연락처 010-1234-5678"))
+            _drain(RecommendAgent(client, use_response_cache=False).recommend({"desired_career": "기계공학자"}, {}))
+            client.extract_information_bytes(b"%PDF-1.4 record", {"type": "json_schema"}, tags={"stage": "step1_extract"})
+            assert info.student_name == "홍길동"
+        recorder.close()
+
+        entries = load_log(path)
+        extracted = "".join(text for entry in entries if entry["kind"] == "stream"
+                            and entry["tags"]["stage"] == "step1_extract" for _, text in entry.get("chunks") or [])
+        assert "010-1234-5678" not in str(entries), "전화번호가 기록에 남음"
+        assert '"student_name": "[REDACTED]"' in extracted and "홍길동" not in extracted, "이름 키가 가려지지 않음"
+        assert any(entry.get("status") == 429 for entry in entries), "재시도된 시도가 기록되지 않음"
+        assert any(entry.get("chunks") for entry in entries)
+
+        report = ReplayDriver(entries, speed=0).run()
+        stages = report.by_stage()
+        assert report.misses == 0 and all(call.error is None for call in report.calls)
+        assert stages["step1_extract"]["parsed"] == 2 and stages["step4_recommend"]["parse_failures"] == 0
+        print(f"✅ 기록 {len(entries)}건 → 재생 {len(report.calls)}건 (기록 없음 {report.misses}건), "
+              f"단계 {sorted(stages)}")
+
+
+def test_key_pool():
+    """키 풀: 가중 최소 부하 분산, 인증 오류 키 격리 후 다른 키로 재시도, 키별 사용량"""
+    print("\n" + "=" * 60)
+    print("11. API 키 풀 테스트")
+    print("=" * 60)
+
+    config = StandinConfig.from_dict({
+        "seed": 11,
+        "revoked_keys": ["key-revoked"],
+        "profiles": {"chat": {"latency": 0.05}},
+    })
+    with StandinServer(config) as server:
+        pool = KeyPool(["key-revoked", "key-a", ("key-b", 2)])
+        client = _client(server, governor=pool, retry_policy=RetryPolicy(max_attempts=3, base_delay=0.0))
+
+        results = client.chat_many([f"질문 {i}" for i in range(12)], max_concurrency=6)
+        assert all(r.ok for r in results), [r.error for r in results if not r.ok]
+        assert client.parse_document_bytes(b"%PDF-1.4 pool", "pool.pdf")["content"]["text"]
+
+        revoked, first, second = client.key_stats()
+        assert revoked["quarantined"] and revoked["reason"] == "auth" and revoked["auth_errors"] >= 1
+        # 첫 401 전에 동시에 나간 요청만 거절되고 격리 뒤에는 보내지 않음
+        assert server.key_usage()["key-revoked"] == revoked["auth_errors"] <= 6, "격리된 키로 다시 보냄"
+        assert second["requests"] > first["requests"] > 0, "가중치가 반영되지 않음"
+        assert client.breaker_stats()["chat"]["state"] == "closed"
+        print(f"✅ 키별 요청: {[(k['api_key'], k['requests']) for k in client.key_stats()]}, "
+              f"서버 집계 {server.key_usage()}")
+
+
+def test_groundedness_stream():
+    """스트리밍 근거 검증: 판정 객체 완성 시 종료, 해석 실패는 임의 점수 대신 parse_failed"""
+    print("\n" + "=" * 60)
+    print("12. 스트리밍 근거 검증 테스트")
+    print("=" * 60)
+
+    from agents import VerifyAgent
+
+    verdict_rule = next(rule for rule in DEFAULT_CHAT_RULES if rule["match"] == "답변 검증 전문가")
+    tail = "\n판단 근거를 덧붙이면, 추천 과목은 학생의 강점 과목과 진로 활동에 잘 연결되어 있습니다." * 20
+    config = StandinConfig.from_dict({
+        "chat_rules": [
+            {"match": "해석 불가", "endpoint": "groundedness", "text": "근거가 충분한지 판단하기 어렵습니다."},
+            dict(verdict_rule, text=verdict_rule["text"] + tail),
+        ],
+        "profiles": {"groundedness": {"tokens_per_second": 400}},
+    })
+    with StandinServer(config) as server:
+        client = _client(server)
+        stream = client.check_groundedness_stream("강점 과목: 수학", "미적분II 추천")
+        text = ""
+        try:
+            while True:
+                text += next(stream)
+        except StopIteration as stop:
+            result = stop.value
+        assert result["outcome"] == "ok" and result["score"] == 0.86 and text.rstrip().endswith("}")
+        assert "판단 근거" not in text
+        print(f"✅ 판정 완성 시 종료: {len(text)}자만 수신 (꼬리 {len(tail)}자 생략)")
+
+        server.reset_stats()
+        verified = _drain(VerifyAgent(client).verify_with_groundedness_stream("강점 과목: 수학", "해석 불가"))
+        assert verified.outcome == "parse_failed" and verified.score == 0.0 and not verified.is_grounded
+        assert server.stats()["groundedness"]["200"] == VerifyAgent.GROUNDEDNESS_PARSE_ATTEMPTS
+        print(f"✅ 해석 실패: {VerifyAgent.GROUNDEDNESS_PARSE_ATTEMPTS}회 시도 후 outcome={verified.outcome}")
+
+        # 비동기: async for로 조각을 받은 뒤 result / last_result로 결과 확인
+        async def verify_async():
+            async with AsyncUpstageClient(api_key="local", base_url=server.base_url) as aclient:
+                stream = aclient.check_groundedness_stream("강점 과목: 수학", "미적분II 추천")
+                assert stream.result is None
+                text = "".join([piece async for piece in stream])
+                agent = VerifyAgent(aclient)
+                pieces = [
+                    piece async for piece in
+                    agent.verify_with_groundedness_stream_async("강점 과목: 수학", "해석 불가")
+                ]
+                return text, stream.result, pieces, agent.last_result
+
+        server.reset_stats()
+        async_text, async_result, pieces, verified = asyncio.run(verify_async())
+        assert async_text == text and async_result["outcome"] == "ok" and async_result["score"] == 0.86
+        assert pieces and verified.outcome == "parse_failed" and verified.score == 0.0
+        # 판정 객체에서 닫은 스트림은 client_closed로 기록됨
+        assert sum(_settled_stats(server, "groundedness").values()) == 1 + VerifyAgent.GROUNDEDNESS_PARSE_ATTEMPTS
+        print("✅ 비동기 스트리밍 근거 검증: async for 후 result / last_result")
+
+
+def test_lazy_parse_payloads():
+    """Document Parse 응답의 base64 표 이미지는 요청할 때만 구체화, 캐시에는 원래 값으로 저장"""
+    print("\n" + "=" * 60)
+    print("13. 표 이미지 지연 디코딩 테스트")
+    print("=" * 60)
+
+    from agents import DocumentAgent
+
+    writer = PdfWriter()
+    for _ in range(3):
+        writer.add_blank_page(200, 200)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+
+    with StandinServer(StandinConfig(table_image_bytes=3000)) as server, tempfile.TemporaryDirectory() as cache_dir:
+        client = _client(server)
+        agent = DocumentAgent(client, cache=ParseCache(cache_dir), preflight=False)
+        parsed = agent.parse_bytes(buffer.getvalue())
+        tables = [e for e in parsed.raw_response["elements"] if e["category"] == "table"]
+        assert len(tables) == 3 and all(isinstance(e["base64_encoding"], LazyPayload) for e in tables)
+        assert tables[1]["base64_encoding"].decode() == bytes([2]) * 3000
+
+        cached = agent.parse_bytes(buffer.getvalue())
+        assert server.stats()["parse"]["200"] == 1, "캐시 적중 실패"
+        cached_tables = [e for e in cached.raw_response["elements"] if e["category"] == "table"]
+        assert [e["base64_encoding"] for e in cached_tables] == [e["base64_encoding"] for e in tables]
+        print(f"✅ 지연 디코딩: 표 이미지 {len(tables)}개 ({len(tables[0]['base64_encoding'])}바이트씩), 캐시 왕복 일치")
+
+
+def test_warmup_readiness():
+    """준비 단계가 끝나기 전까지 /ready는 503, 필수 단계 실패는 재시도, 연결은 풀에 미리 열림"""
+    print("\n" + "=" * 60)
+    print("14. 시작 준비/준비 상태 테스트")
+    print("=" * 60)
+
+    import threading
+    import urllib.request
+    import urllib.error
+
+    def status_of(url):
+        try:
+            with urllib.request.urlopen(url, timeout=5) as response:
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    gate = threading.Event()
+    attempts = []
+
+    def load_data():
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            raise OSError("데이터 볼륨 마운트 전")
+        gate.wait(5)
+        return "ok"
+
+    with StandinServer(StandinConfig()) as server:
+        warmup = Warmup(retry_interval=0.05)
+        warmup.add_step("data", load_data)
+        warmup.add_step("upstage_connections", lambda: str(open_connections(
+            lambda u: get_http_session().get(u, timeout=5, stream=True), f"{server.base_url}/models", 3
+        )), required=False)
+
+        with ReadinessServer(warmup, host="127.0.0.1", port=0) as readiness:
+            assert status_of(f"{readiness.url}/ready") == 503
+            assert status_of(f"{readiness.url}/live") == 200
+            warmup.start()
+            while len(attempts) < 2:
+                time.sleep(0.01)
+            assert status_of(f"{readiness.url}/ready") == 503, "필수 단계 진행 중인데 준비 완료"
+            gate.set()
+            assert warmup.wait(5)
+            assert status_of(f"{readiness.url}/ready") == 200
+
+        steps = {step["name"]: step for step in warmup.status()["steps"]}
+        assert steps["data"]["attempts"] == 2 and steps["upstage_connections"]["detail"] == "3"
+        host = get_pool_stats()["hosts"][f"http://127.0.0.1:{server.port}"]
+        assert host["idle_connections"] >= 3, host
+        print(f"✅ 준비 완료까지 503 (데이터 {len(attempts)}회 시도), 연결 {host['idle_connections']}개 미리 열림")
+
+
+def test_parse_job_key_pinning():
+    """키 풀 사용 시 비동기 작업 조회는 작업을 등록한 키로 고정 (재시작 후에도)"""
+    print("\n" + "=" * 60)
+    print("15. 비동기 작업 키 고정 테스트")
+    print("=" * 60)
+
+    documents = []
+    for pages in (2, 3, 4, 5):
+        writer = PdfWriter()
+        for _ in range(pages):
+            writer.add_blank_page(200, 200)
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        documents.append((buffer.getvalue(), f"doc-{pages}.pdf"))
+
+    keys = ["up_key_alpha_0001", "up_key_bravo_0002"]
+    config = StandinConfig.from_dict({
+        "async_batch_pages": 2,
+        "profiles": {"parse": {"latency": 0.05, "per_page_seconds": 0.02}},
+    })
+    poll = PollPolicy(initial=0.05, max_interval=0.2)
+
+    with StandinServer(config) as server, tempfile.TemporaryDirectory() as registry_dir:
+        pool = KeyPool(keys)
+        client = _client(server, governor=pool)
+        runner = ParseJobRunner(client, ParseJobRegistry(registry_dir), poll)
+        jobs = runner.submit_many(documents)
+        assert {job.api_key for job in jobs} == set(keys), "등록이 한 키에 몰림"
+        with open(os.path.join(registry_dir, f"{jobs[0].job_id}.json"), encoding="utf-8") as f:
+            assert jobs[0].api_key not in f.read(), "레지스트리에 원래 키가 기록됨"
+
+        # 첫 두 작업은 지금 수집, 나머지는 새 키 풀로 재시작한 뒤 재개
+        merged = runner.wait_many(jobs[:2])
+        assert all(isinstance(result, dict) for result in merged), merged
+        restarted = ParseJobRunner(_client(server, governor=KeyPool(keys)), ParseJobRegistry(registry_dir), poll)
+        resumed = restarted.resume()
+        assert sorted(resumed) == sorted(job.job_id for job in jobs[2:])
+        assert all(isinstance(result, dict) for result in resumed.values()), resumed
+
+        assert "404" not in server.stats()["parse_status"], "다른 키로 작업을 조회함"
+        assert not any(k["quarantined"] for k in client.key_stats())
+        print(f"✅ 작업 {len(jobs)}개 등록 키 {sorted(j.key_hint for j in jobs)}, 조회 {server.stats()['parse_status']}")
+
+
+def test_stream_resume():
+    """스트림이 끊기면 재요청한 응답이 이미 전달한 앞부분과 같을 때만 이어서 전달"""
+    print("\n" + "=" * 60)
+    print("16. 끊긴 스트림 재개 테스트")
+    print("=" * 60)
+
+    same = "하나 둘 셋 넷 다섯 여섯 일곱 여덟"
+    config = StandinConfig.from_dict({
+        "chat_rules": [
+            {"match": "같은 답변", "text": same},
+            # 두 번째 생성은 전달된 앞부분(셋)부터 달라짐
+            {"match": "다른 답변", "texts": [same, "하나 둘 삼 넷 다섯 여섯 일곱 여덟"]},
+        ],
+        "profiles": {"chat": {"rate_disconnect": 1.0, "max_disconnects": 1}},
+    })
+    policy = RetryPolicy(max_attempts=3, base_delay=0.0, max_delay=0.0)
+
+    with StandinServer(config) as server:
+        client = _client(server, retry_policy=policy)
+        text = "".join(client.chat_stream("같은 답변"))
+        assert text == same, text
+        assert server.stats()["chat"] == {"disconnect": 1, "200": 1}
+        print(f"✅ 같은 응답 재개: {text!r}")
+
+        server.reset_stats()
+        config.profiles["chat"].max_disconnects = 2
+        delivered = []
+        try:
+            for piece in client.chat_stream("다른 답변"):
+                delivered.append(piece)
+            raise AssertionError("다른 응답을 이어 붙임")
+        except StreamResumeError as e:
+            assert not e.is_server_fault
+        assert "".join(delivered) == "하나 둘 셋 넷", delivered
+        print(f"✅ 다른 응답 재개 거부: 전달 {''.join(delivered)!r} 후 StreamResumeError")
+
+        async def resume_async():
+            async with AsyncUpstageClient(api_key="local", base_url=server.base_url, retry_policy=policy) as aclient:
+                return "".join([piece async for piece in aclient.chat_stream("같은 답변")])
+
+        config.profiles["chat"].max_disconnects = 3
+        assert asyncio.run(resume_async()) == same
+        assert server.stats()["chat"]["disconnect"] == 3
+        print("✅ 비동기 클라이언트 재개")
+
+
+def test_singleflight_queue_wait():
+    """병합 스트림(펌프 스레드)에서도 호출자 스레드의 last_queue_wait에 거버너 대기 시간이 남음"""
+    print("\n" + "=" * 60)
+    print("17. 병합 스트림 대기 시간 테스트")
+    print("=" * 60)
+
+    config = StandinConfig.from_dict({"profiles": {"chat": {"ttft": 0.2}}})
+    governor = UpstageGovernor({"chat": EndpointBudget(rps=1.0, burst=1, max_in_flight=4)})
+
+    with StandinServer(config) as server:
+        client = _client(server, governor=governor, singleflight=SingleFlight())
+        "".join(client.chat_stream("첫 질문"))
+        assert client.last_queue_wait("chat") < 0.1
+
+        # 같은 질문 두 호출: 앞 호출이 원본 스트림, 뒤 호출은 합류 - 둘 다 원본의 대기 시간을 봄
+        waits = {}
+
+        def leader():
+            "".join(client.chat_stream("둘째 질문"))
+            waits["leader"] = client.last_queue_wait("chat")
+
+        thread = threading.Thread(target=leader)
+        thread.start()
+        time.sleep(0.1)
+        "".join(client.chat_stream("둘째 질문"))
+        waits["follower"] = client.last_queue_wait("chat")
+        thread.join()
+
+        assert client.singleflight_stats()["coalesced"] == 1
+        assert waits["leader"] >= 0.3 and waits["follower"] == waits["leader"], waits
+        print(f"✅ 대기 시간 전달: {waits}")
+
+
+def _drain(stream):
+    """스트리밍 제너레이터를 끝까지 소비하고 반환값을 돌려줌"""
+    try:
+        while True:
+            next(stream)
+    except StopIteration as stop:
+        return stop.value
+
+
+def main():
+    """전체 테스트 실행"""
+    results = []
+    for name, test in (
+        ("파이프라인", test_pipeline_offline),
+        ("지연/오류 주입", test_fault_injection),
+        ("마감 시간/취소", test_deadline_cancellation),
+        ("일괄 채팅", test_chat_many),
+        ("헤지 요청", test_hedging),
+        ("모델 라우팅", test_model_router),
+        ("공유 클라이언트 풀", test_client_pool),
+        ("비동기 Document Parse 작업", test_parse_jobs),
+        ("JSON 완성 시 조기 종료", test_json_early_stop),
+        ("호출 기록/재생", test_record_replay),
+        ("API 키 풀", test_key_pool),
+        ("스트리밍 근거 검증", test_groundedness_stream),
+        ("표 이미지 지연 디코딩", test_lazy_parse_payloads),
+        ("시작 준비/준비 상태", test_warmup_readiness),
+        ("비동기 작업 키 고정", test_parse_job_key_pinning),
+        ("끊긴 스트림 재개", test_stream_resume),
+        ("병합 스트림 대기 시간", test_singleflight_queue_wait),
+    ):
+        try:
+            test()
+            results.append((name, True))
+        except Exception as e:
+            print(f"❌ {name} 실패: {e}")
+            results.append((name, False))
+
+    passed = sum(1 for _, ok in results if ok)
+    print("\n" + "=" * 60)
+    print(f"총 {len(results)}개 테스트 중 {passed}개 성공")
+    print("=" * 60)
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,708 @@
+"""
+Upstage 클라이언트 계층 테스트
+
+로컬 대역 서버(utils.standin_server)로 UpstageClient의 각 계층
+(연결 풀, 비동기 클라이언트, 캐시, 거버너, 재시도/차단, 분할 파싱, 요청 병합, 계측)을 개별로 테스트합니다.
+"""
+
+import io
+import sys
+import os
+import json
+import base64
+import time
+import asyncio
+import tempfile
+import threading
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PyPDF2 import PdfWriter, PageObject
+from PyPDF2.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from utils.standin_server import StandinServer, StandinConfig
+from utils.upstage_client import UpstageClient, AsyncUpstageClient
+from utils.rate_limiter import UpstageGovernor, EndpointBudget
+from utils.deadline import Deadline, DeadlineExceeded, CallCancelled
+from utils.singleflight import SingleFlight, AsyncSingleFlight
+from utils import resilience
+from utils.resilience import RetryPolicy, CircuitBreaker, CircuitOpenError, UpstageAPIError
+from utils.http_pool import configure_http_pool, get_pool_stats
+from utils.parse_cache import ParseCache
+from utils.pdf_split import split_pdf, count_pdf_pages
+from utils.stream_body import Base64JsonBody
+from utils.pdf_preflight import analyze_pdf
+from utils.llm_cache import LLMResponseCache, MemoryCacheBackend
+from utils.instrumentation import Instrumentation, RingBufferSink
+
+
+def _client(server: StandinServer, **kwargs) -> UpstageClient:
+    return UpstageClient(api_key="local", base_url=server.base_url, **kwargs)
+
+
+def _blank_pdf(pages: int) -> bytes:
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(200, 200)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def _text_pdf(texts) -> bytes:
+    """페이지마다 Helvetica 텍스트 레이어가 있는 PDF (None인 페이지는 텍스트 없음 - 스캔 페이지 대용)"""
+    writer = PdfWriter()
+    for text in texts:
+        page = PageObject.create_blank_page(None, 612, 792)
+        if text is not None:
+            font = DictionaryObject({
+                NameObject("/Type"): NameObject("/Font"),
+                NameObject("/Subtype"): NameObject("/Type1"),
+                NameObject("/BaseFont"): NameObject("/Helvetica"),
+            })
+            page[NameObject("/Resources")] = DictionaryObject({
+                NameObject("/Font"): DictionaryObject({NameObject("/F1"): font}),
+            })
+            stream = DecodedStreamObject()
+            stream.set_data(f"BT /F1 12 Tf 72 700 Td ({text}) Tj ET".encode("latin-1"))
+            page[NameObject("/Contents")] = stream
+        writer.add_page(page)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def test_http_pool_reuse():
+    """원시 엔드포인트(Document Parse / Information Extract) 호출이 keep-alive 연결을 재사용"""
+    print("=" * 60)
+    print("1. keep-alive 연결 재사용 테스트")
+    print("=" * 60)
+
+    with StandinServer(StandinConfig()) as server:
+        # 새 세션으로 교체해 이 테스트의 요청만 집계
+        configure_http_pool()
+        client = _client(server)
+        for index in range(4):
+            assert client.parse_document_bytes(f"%PDF-1.4 pool {index}".encode(), "pool.pdf")
+            assert client.extract_information_bytes(f"%PDF-1.4 pool {index}".encode(), {"type": "object"})
+
+        stats = get_pool_stats()
+        assert stats["total_requests"] == 8, stats
+        assert stats["new_connections"] == 1, "요청마다 새 연결을 엶"
+        assert stats["reuse_ratio"] >= 0.8
+        print(f"✅ 요청 {stats['total_requests']}회, 새 연결 {stats['new_connections']}개, "
+              f"재사용 비율 {stats['reuse_ratio']:.0%}")
+
+
+def test_async_client():
+    """비동기 클라이언트: 한 이벤트 루프에서 네 API를 동시에 실행 (스트림이 서로를 기다리지 않음)"""
+    print("\n" + "=" * 60)
+    print("2. 비동기 클라이언트 테스트")
+    print("=" * 60)
+
+    config = StandinConfig.from_dict({"profiles": {"chat": {"ttft": 0.3, "tokens_per_second": 100}}})
+
+    async def run(base_url: str):
+        async with AsyncUpstageClient(api_key="local", base_url=base_url, governor=UpstageGovernor()) as client:
+            async def stream(index: int) -> str:
+                return "".join([piece async for piece in client.chat_stream(f"비동기 질문 {index}")])
+
+            started = time.perf_counter()
+            results = await asyncio.gather(
+                client.parse_document_bytes(b"%PDF-1.4 async", "async.pdf"),
+                client.extract_information_bytes(b"%PDF-1.4 async", {"type": "object"}),
+                client.check_groundedness("context", "answer"),
+                *(stream(index) for index in range(8)),
+            )
+            return results, time.perf_counter() - started
+
+    with StandinServer(config) as server:
+        (parsed, extracted, grounded, *texts), elapsed = asyncio.run(run(server.base_url))
+        assert parsed["content"]["text"] and extracted and "grounded" in grounded
+        assert len(texts) == 8 and all(texts)
+        # 순차 실행이면 TTFT만 8 x 0.3초 = 2.4초 (연결 수립/부하 여유를 두고 그보다 짧은지 확인)
+        assert elapsed < 2.0, f"스트림이 순차 실행됨: {elapsed:.2f}s"
+        assert server.stats()["chat"]["200"] == 8
+        print(f"✅ Parse/Extract/Groundedness + 스트림 8개 동시 실행: {elapsed:.2f}s")
+
+
+def test_parse_cache():
+    """같은 문서/파라미터는 디스크 캐시에서 재사용 (재시작 후에도), 만료/용량 초과 항목은 제거"""
+    print("\n" + "=" * 60)
+    print("3. Document Parse 디스크 캐시 테스트")
+    print("=" * 60)
+
+    from agents import DocumentAgent
+
+    document = b"%PDF-1.4 cached document"
+    with StandinServer(StandinConfig()) as server, tempfile.TemporaryDirectory() as cache_dir:
+        client = _client(server)
+        cache = ParseCache(cache_dir)
+        agent = DocumentAgent(client, cache=cache, preflight=False)
+        first = agent.parse_bytes(document)
+        assert agent.parse_bytes(document).text == first.text
+        assert server.stats()["parse"] == {"200": 1}
+
+        # 재시작: 같은 디렉토리의 새 캐시도 적중
+        restarted = DocumentAgent(client, cache=ParseCache(cache_dir), preflight=False)
+        assert restarted.parse_bytes(document).text == first.text
+        assert server.stats()["parse"] == {"200": 1}
+        assert cache.stats()["hits"] == 1 and restarted.cache.stats()["hits"] == 1
+        print(f"✅ 적중: 서버 호출 1회, 캐시 {cache.stats()['total_bytes']}바이트")
+
+        # 파라미터가 다르면 다른 키
+        assert ParseCache.make_key(document, "force", "document-parse") != ParseCache.make_key(document, "auto", "document-parse")
+
+        expired = ParseCache(cache_dir, ttl_seconds=0)
+        time.sleep(0.01)
+        assert expired.get(agent._cache_key(document)) is None
+        assert expired.stats()["expired"] == 1
+        print("✅ 만료 항목 제거")
+
+        small = ParseCache(cache_dir, max_bytes=1)
+        small.put("a" * 64, {"text": "첫 항목"})
+        small.put("b" * 64, {"text": "둘째 항목"})
+        assert small.get("a" * 64) is None and small.stats()["evictions"] >= 1
+        print(f"✅ 용량 초과 제거: {small.stats()['evictions']}개")
+
+
+def test_governor():
+    """거버너: 동시 실행 상한과 초당 요청 수를 지키고, 남은 예산보다 오래 기다려야 하면 DeadlineExceeded"""
+    print("\n" + "=" * 60)
+    print("4. 속도/동시성 거버너 테스트")
+    print("=" * 60)
+
+    config = StandinConfig.from_dict({"profiles": {"chat": {"latency": 0.2}}})
+    governor = UpstageGovernor({
+        "chat": EndpointBudget(rps=100.0, burst=100, max_in_flight=2),
+        "parse": EndpointBudget(rps=4.0, burst=1, max_in_flight=4),
+    })
+
+    with StandinServer(config) as server:
+        client = _client(server, governor=governor)
+        client.singleflight = None
+
+        peak = []
+        stop = threading.Event()
+
+        def watch():
+            while not stop.is_set():
+                peak.append(governor.stats()["chat"]["in_flight"])
+                time.sleep(0.01)
+
+        watcher = threading.Thread(target=watch)
+        watcher.start()
+        started = time.perf_counter()
+        threads = [threading.Thread(target=client.chat, args=(f"동시 질문 {i}",)) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        stop.set()
+        watcher.join()
+        assert max(peak) == 2 and elapsed >= 0.55, (max(peak), elapsed)
+        print(f"✅ 동시 실행 상한 2: 요청 6개 {elapsed:.2f}s")
+
+        started = time.perf_counter()
+        for index in range(5):
+            client.parse_document_bytes(f"%PDF-1.4 rate {index}".encode(), "rate.pdf")
+        elapsed = time.perf_counter() - started
+        # burst 1 이후 초당 4회: 나머지 4회는 0.25초 간격
+        assert elapsed >= 0.9, elapsed
+        assert governor.stats()["parse"]["max_wait"] > 0.1
+        print(f"✅ 초당 4회: 5회 {elapsed:.2f}s, 최대 대기 {governor.stats()['parse']['max_wait']:.2f}s")
+
+        try:
+            client.parse_document_bytes(b"%PDF-1.4 rate over", "rate.pdf", deadline=Deadline(0.05))
+            raise AssertionError("예산 초과가 발생하지 않았습니다")
+        except DeadlineExceeded:
+            pass
+        assert governor.stats()["parse"]["timeouts"] == 1
+        print("✅ 대기 중 예산 초과: DeadlineExceeded")
+
+
+def test_retry_and_breaker():
+    """일시 오류는 Retry-After를 지켜 재시도, 연속 실패 시 서킷 브레이커가 열려 호출 없이 즉시 실패 후 회복"""
+    print("\n" + "=" * 60)
+    print("5. 재시도 / 서킷 브레이커 테스트")
+    print("=" * 60)
+
+    config = StandinConfig.from_dict({
+        "seed": 11,
+        "profiles": {
+            "parse": {"rate_5xx": 0.5, "retry_after": 0},
+            "groundedness": {"rate_429": 1.0, "retry_after": 0.2},
+            "extract": {"rate_5xx": 1.0, "retry_after": 0},
+        },
+    })
+    policy = RetryPolicy(max_attempts=6, base_delay=0.0, max_delay=1.0)
+    # 프로세스 공유 브레이커 대신 짧은 임계값/개방 시간의 브레이커로 교체
+    saved = dict(resilience._breakers)
+    for endpoint in ("parse", "groundedness", "extract"):
+        resilience._breakers[endpoint] = CircuitBreaker(endpoint, failure_threshold=10, reset_timeout=0.3)
+    resilience._breakers["extract"].failure_threshold = 2
+
+    try:
+        with StandinServer(config) as server:
+            client = _client(server, retry_policy=policy, governor=UpstageGovernor())
+            client.singleflight = None
+
+            for index in range(4):
+                assert client.parse_document_bytes(f"%PDF-1.4 retry {index}".encode(), "retry.pdf")
+            parse = server.stats()["parse"]
+            assert parse["200"] == 4 and parse.get("503", 0) >= 1, parse
+            print(f"✅ 503 재시도 후 성공: {parse}")
+
+            client.retry_policy = RetryPolicy(max_attempts=2, base_delay=0.0)
+            started = time.perf_counter()
+            try:
+                client.check_groundedness("context", "answer")
+                raise AssertionError("429가 주입되지 않았습니다")
+            except UpstageAPIError as e:
+                assert e.status_code == 429
+            assert time.perf_counter() - started >= 0.2, "Retry-After를 기다리지 않음"
+            assert server.stats()["groundedness"] == {"429": 2}
+            print("✅ Retry-After 대기 후 재시도")
+
+            try:
+                client.extract_information_bytes(b"%PDF-1.4 breaker", {"type": "object"})
+                raise AssertionError("503이 주입되지 않았습니다")
+            except UpstageAPIError as e:
+                assert e.status_code == 503 and not isinstance(e, CircuitOpenError)
+            assert resilience._breakers["extract"].state == CircuitBreaker.OPEN
+            sent = server.stats()["extract"]["503"]
+            try:
+                client.extract_information_bytes(b"%PDF-1.4 breaker", {"type": "object"})
+                raise AssertionError("브레이커가 열리지 않았습니다")
+            except CircuitOpenError:
+                pass
+            assert server.stats()["extract"]["503"] == sent, "열린 브레이커가 요청을 보냄"
+            print(f"✅ 연속 실패 {sent}회 후 차단: 서버 호출 없이 CircuitOpenError")
+
+            config.profiles["extract"].rate_5xx = 0.0
+            time.sleep(0.35)
+            assert client.extract_information_bytes(b"%PDF-1.4 breaker", {"type": "object"})
+            assert resilience._breakers["extract"].state == CircuitBreaker.CLOSED
+            print("✅ 개방 시간 후 시험 호출 성공 → 회복")
+    finally:
+        resilience._breakers.clear()
+        resilience._breakers.update(saved)
+
+    # 비멱등 호출은 서버가 받은 뒤의 오류를 재시도하지 않음 (429 제외)
+    sent_error = UpstageAPIError("503", status_code=503, endpoint="chat", sent=True)
+    assert policy.should_retry(sent_error, 1, idempotent=True)
+    assert not policy.should_retry(sent_error, 1, idempotent=False)
+    assert policy.compute_delay(1, retry_after=0.7) == 0.7
+    print("✅ 비멱등 호출 재시도 규칙")
+
+
+def test_chunked_parse():
+    """페이지 수가 고르지 않은 구간(4+4+2)이 늦게 끝난 순서와 무관하게 원본 페이지 순서로 병합"""
+    print("\n" + "=" * 60)
+    print("6. 대용량 PDF 구간 분할 파싱 테스트")
+    print("=" * 60)
+
+    document = _blank_pdf(10)
+    chunks = split_pdf(document, 4)
+    assert [(c.start_page, c.end_page) for c in chunks] == [(1, 4), (5, 8), (9, 10)]
+    assert [count_pdf_pages(c.data) for c in chunks] == [4, 4, 2]
+
+    # 구간 응답 시간은 페이지 수에 비례 - 마지막(2쪽) 구간이 먼저 끝남, 표 요소는 구간 기준 페이지 번호
+    config = StandinConfig.from_dict({
+        "table_image_bytes": 4,
+        "profiles": {"parse": {"per_page_seconds": 0.05}},
+    })
+    with StandinServer(config) as server:
+        client = _client(server, governor=UpstageGovernor())
+        client.singleflight = None
+        merged = client.parse_document_bytes_chunked(document, "large.pdf", pages_per_chunk=4, max_workers=3)
+
+    assert merged["chunks"] == [
+        {"start_page": 1, "end_page": 4}, {"start_page": 5, "end_page": 8}, {"start_page": 9, "end_page": 10},
+    ]
+    assert merged["usage"]["pages"] == 10 and len(merged["content"]["pages"]) == 10
+    tables = [element for element in merged["elements"] if element["category"] == "table"]
+    assert [element["page"] for element in tables] == list(range(1, 11)), [e["page"] for e in tables]
+    assert [element["id"] for element in merged["elements"]] == list(range(len(merged["elements"])))
+    # 구간마다 1쪽에 있던 본문은 각 구간의 시작 페이지로
+    paragraphs = [element["page"] for element in merged["elements"] if element["category"] == "paragraph"]
+    assert paragraphs == [1, 5, 9]
+    assert server.stats()["parse"] == {"200": 3}
+    print(f"✅ 구간 {merged['chunks']} → 페이지 {len(merged['content']['pages'])}쪽, 표 {len(tables)}개 순서대로")
+
+
+def test_streaming_extract_body():
+    """base64 JSON 본문을 조각 단위로 만들어도 한 번에 직렬화한 본문과 바이트 단위로 같고, 재시도 시 처음부터 다시 보냄"""
+    print("\n" + "=" * 60)
+    print("7. Information Extract 스트리밍 본문 테스트")
+    print("=" * 60)
+
+    prefix = "data:application/octet-stream;base64,"
+    schema = {"type": "json_schema", "json_schema": {"name": "학생부", "schema": {"type": "object"}}}
+    for size in (0, 1, 2, 3, 4, 17, 100):
+        data = bytes(range(256)) * (size // 256 + 1)
+        data = data[:size]
+        expected = json.dumps(
+            {"url": prefix + base64.b64encode(data).decode("ascii"), "schema": schema}, ensure_ascii=False
+        ).encode("utf-8")
+        body = Base64JsonBody({"url": Base64JsonBody.BASE64_SLOT, "schema": schema}, memoryview(data), prefix, chunk_size=6)
+        assert len(body) == len(expected)
+        assert b"".join(body) == expected, size
+        # http.client처럼 고르지 않은 블록 단위로 읽고, 재시도처럼 처음으로 돌아가 다시 읽기
+        blocks = []
+        while True:
+            block = body.read(7)
+            if not block:
+                break
+            blocks.append(block)
+        assert b"".join(blocks) == expected
+        body.seek(0)
+        assert body.read() == expected
+
+        async def collect() -> bytes:
+            return b"".join([segment async for segment in body.async_stream()])
+
+        assert asyncio.run(collect()) == expected
+    print("✅ 조각 인코딩 = 한 번에 직렬화 (0~100바이트, 조각 6바이트)")
+
+    try:
+        Base64JsonBody({"a": "no slot"}, b"")
+        raise AssertionError("자리 표시가 없는 페이로드를 허용함")
+    except ValueError:
+        pass
+
+    # 파일 경로 호출은 mmap에서 바로 인코딩, 503 후 재시도에도 같은 본문을 처음부터 전송
+    config = StandinConfig.from_dict({"seed": 2, "profiles": {"extract": {"rate_5xx": 0.5, "retry_after": 0}}})
+    with StandinServer(config) as server, tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scan.pdf")
+        with open(path, "wb") as f:
+            f.write(os.urandom(200_000))
+        client = _client(server, governor=UpstageGovernor(), retry_policy=RetryPolicy(max_attempts=6, base_delay=0.0))
+        client.singleflight = None
+        for _ in range(3):
+            assert client.extract_information(path, {"type": "object"})
+        extract = server.stats()["extract"]
+        assert extract["200"] == 3, extract
+        print(f"✅ mmap 파일 추출 (재시도 포함): {extract}")
+
+
+def test_preflight():
+    """텍스트 레이어 사전 분석: 디지털 문서는 auto(허용 시 로컬 추출), 스캔 문서는 force"""
+    print("\n" + "=" * 60)
+    print("8. 텍스트 레이어 사전 분석 테스트")
+    print("=" * 60)
+
+    from agents import DocumentAgent
+
+    line = "School record {} with enough characters for a real text layer"
+    digital = _text_pdf([line.format(1), line.format(2)])
+    mixed = _text_pdf([line.format(1), None])
+    scanned = _blank_pdf(2)
+
+    assert analyze_pdf(digital).strategy == "auto"
+    assert analyze_pdf(digital, allow_local=True).strategy == "local"
+    result = analyze_pdf(mixed, allow_local=True)
+    assert result.strategy == "auto" and result.to_metadata()["ocr_pages"] == [2]
+    assert analyze_pdf(scanned).strategy == "force" and analyze_pdf(scanned).ocr_mode == "force"
+    assert analyze_pdf(b"not a pdf").strategy == "force"
+    print("✅ 전략: 디지털 auto/local, 일부 스캔 auto, 스캔 force, 손상 force")
+
+    with StandinServer(StandinConfig()) as server:
+        client = _client(server)
+        agent = DocumentAgent(client, use_cache=False, preflight=True, allow_local_text=True)
+        local = agent.parse_bytes(digital)
+        assert "School record 2" in local.text
+        assert local.metadata["preflight"]["strategy"] == "local"
+        assert "parse" not in server.stats(), "로컬 추출 문서로 API를 호출함"
+
+        partial = agent.parse_bytes(mixed)
+        assert partial.metadata["preflight"]["ocr_mode"] == "auto"
+        assert server.stats()["parse"] == {"200": 1}
+        print(f"✅ 로컬 추출은 API 호출 없음, 일부 스캔 문서는 auto "
+              f"(절약 추정 {partial.metadata['preflight']['estimated_seconds_saved']}s)")
+
+
+def test_response_cache():
+    """응답 캐시: 같은 요청은 저장된 응답을 조각 단위로 재생, 스트림/일반 호출이 같은 키, 중간에 버린 스트림은 저장하지 않음"""
+    print("\n" + "=" * 60)
+    print("9. LLM 응답 캐시 테스트")
+    print("=" * 60)
+
+    cache = LLMResponseCache(MemoryCacheBackend(), replay_chunk_chars=5)
+    sink = RingBufferSink()
+    with StandinServer(StandinConfig()) as server:
+        client = _client(server, response_cache=cache, instrumentation=Instrumentation([sink]))
+        client.singleflight = None
+
+        first = "".join(client.chat_stream("캐시 질문", use_cache=True))
+        pieces = list(client.chat_stream("캐시 질문", use_cache=True))
+        assert "".join(pieces) == first and all(len(piece) <= 5 for piece in pieces)
+        assert server.stats()["chat"] == {"200": 1}
+        # 스트림 여부는 키에 포함되지 않음
+        assert client.chat("캐시 질문", temperature=0.2, use_cache=True) == first
+        assert server.stats()["chat"] == {"200": 1}
+        assert [r.outcome for r in sink.records() if r.operation == "chat_stream"][-1] == "cached"
+        print(f"✅ 재생: 서버 호출 1회, 조각 {len(pieces)}개 (최대 5자)")
+
+        # 파라미터가 다르면 미스, use_cache=False는 저장/조회하지 않음
+        "".join(client.chat_stream("캐시 질문", temperature=0.7, use_cache=True))
+        "".join(client.chat_stream("캐시 안 함"))
+        "".join(client.chat_stream("캐시 안 함", use_cache=True))
+        assert server.stats()["chat"] == {"200": 4}
+
+        # 첫 조각만 받고 버린 스트림은 저장하지 않음
+        stream = client.chat_stream("중간에 닫음", use_cache=True)
+        next(stream)
+        stream.close()
+        "".join(client.chat_stream("중간에 닫음", use_cache=True))
+        assert server.stats()["chat"]["200"] + server.stats()["chat"].get("client_closed", 0) == 6
+        print(f"✅ 미스/저장 규칙: {cache.backend.stats()}")
+
+
+def test_singleflight_cancellation():
+    """병합: 첫 호출자가 취소되거나 예산을 소진해도 합류한 호출자는 결과를 받고, 모두 떠나면 원본 스트림을 닫음"""
+    print("\n" + "=" * 60)
+    print("10. 요청 병합 취소 테스트")
+    print("=" * 60)
+
+    config = StandinConfig.from_dict({"profiles": {"chat": {"ttft": 0.1, "tokens_per_second": 8}}})
+    with StandinServer(config) as server:
+        flight = SingleFlight()
+        client = _client(server, singleflight=flight, governor=UpstageGovernor())
+        expected = "".join(_client(server, governor=UpstageGovernor()).chat_stream("단독 질문"))
+        server.reset_stats()
+
+        results = {}
+        leader_deadline = Deadline()
+
+        def consume(name: str, message: str, deadline=None):
+            pieces = []
+            try:
+                for piece in client.chat_stream(message, deadline=deadline):
+                    pieces.append(piece)
+                results[name] = "".join(pieces)
+            except CallCancelled:
+                results[name] = CallCancelled
+
+        leader = threading.Thread(target=consume, args=("leader", "단독 질문", leader_deadline))
+        leader.start()
+        while flight.stats()["in_flight"] == 0:
+            time.sleep(0.01)
+        follower = threading.Thread(target=consume, args=("follower", "단독 질문"))
+        follower.start()
+        time.sleep(0.3)
+        leader_deadline.cancel("탭 닫힘")
+        leader.join()
+        follower.join()
+
+        assert results["leader"] is CallCancelled
+        assert results["follower"] == expected, "첫 호출자 취소로 합류한 스트림이 끊김"
+        assert server.stats()["chat"] == {"200": 1}
+        assert flight.stats()["coalesced"] == 1
+        print(f"✅ 첫 호출자 취소 후 합류자 완료: 원본 요청 1회, {len(expected)}자")
+
+        # 두 호출자가 모두 떠나면 원본 스트림도 닫혀 슬롯 반환
+        first = client.chat_stream("모두 떠남")
+        second = client.chat_stream("모두 떠남")
+        next(first)
+        next(second)
+        first.close()
+        second.close()
+        for _ in range(40):
+            if client.governor.stats()["chat"]["in_flight"] == 0 and "client_closed" in server.stats()["chat"]:
+                break
+            time.sleep(0.05)
+        assert client.governor.stats()["chat"]["in_flight"] == 0, "버려진 원본 스트림의 슬롯이 반환되지 않음"
+        assert server.stats()["chat"].get("client_closed") == 1
+        assert flight.stats()["in_flight"] == 0
+        print("✅ 구독자가 모두 떠나면 원본 스트림 종료")
+
+        # 일반 호출: 첫 호출자가 취소되면 기다리던 호출자가 직접 다시 실행
+        started = threading.Event()
+
+        def slow_call():
+            started.set()
+            time.sleep(0.2)
+            raise CallCancelled("첫 호출자 취소")
+
+        errors = []
+        leader = threading.Thread(target=lambda: errors.append(_catch(lambda: flight.do("chat", "k", slow_call))))
+        leader.start()
+        started.wait()
+        assert flight.do("chat", "k", lambda: "직접 실행") == "직접 실행"
+        leader.join()
+        assert isinstance(errors[0], CallCancelled)
+        print("✅ 일반 호출: 첫 호출자 취소 시 대기 호출자가 다시 실행")
+
+    # 첫 호출자가 자기 예산을 소진해도 예산이 남은(또는 없는) 호출자는 다시 실행해 결과를 받음
+    config = StandinConfig.from_dict({"profiles": {"chat": {"latency": 0.6}}})
+    with StandinServer(config) as server:
+        flight = SingleFlight()
+        client = _client(server, singleflight=flight, governor=UpstageGovernor())
+        for follower_deadline in (None, Deadline(5.0)):
+            errors = []
+            leader = threading.Thread(target=lambda: errors.append(
+                _catch(lambda: client.chat("예산 질문", deadline=Deadline(0.3)))
+            ))
+            leader.start()
+            while flight.stats()["in_flight"] == 0:
+                time.sleep(0.01)
+            assert client.chat("예산 질문", deadline=follower_deadline)
+            leader.join()
+            assert isinstance(errors[0], DeadlineExceeded), errors
+        print("✅ 일반 호출: 첫 호출자 예산 소진 시 대기 호출자가 다시 실행")
+
+        async def run_async(base_url: str):
+            async with AsyncUpstageClient(
+                api_key="local", base_url=base_url, singleflight=AsyncSingleFlight(), governor=UpstageGovernor()
+            ) as client:
+                async def leader_then_follower(leader_deadline: Deadline, follower_deadline):
+                    leader = asyncio.ensure_future(client.chat("비동기 예산 질문", deadline=leader_deadline))
+                    await asyncio.sleep(0.05)
+                    answer = await client.chat("비동기 예산 질문", deadline=follower_deadline)
+                    return answer, await asyncio.gather(leader, return_exceptions=True)
+
+                expired = await leader_then_follower(Deadline(0.3), None)
+                longer = await leader_then_follower(Deadline(0.3), Deadline(5.0))
+                return expired, longer, client.singleflight.stats()
+
+        async def run_cancelled():
+            flight = AsyncSingleFlight()
+
+            async def slow_call():
+                await asyncio.sleep(0.2)
+                raise CallCancelled("첫 호출자 취소")
+
+            async def direct_call():
+                return "직접 실행"
+
+            leader = asyncio.ensure_future(flight.do("chat", "k", slow_call))
+            await asyncio.sleep(0.05)
+            answer = await flight.do("chat", "k", direct_call)
+            return answer, await asyncio.gather(leader, return_exceptions=True)
+
+        (answer, (expired,)), (answer_longer, (expired_longer,)), stats = asyncio.run(run_async(server.base_url))
+        assert answer and isinstance(expired, DeadlineExceeded), expired
+        assert answer_longer and isinstance(expired_longer, DeadlineExceeded), expired_longer
+        assert stats["coalesced"] == 2, stats
+        answer, (cancelled,) = asyncio.run(run_cancelled())
+        assert answer == "직접 실행" and isinstance(cancelled, CallCancelled), cancelled
+        print("✅ 비동기 일반 호출: 첫 호출자 예산 소진/취소 시 대기 호출자가 다시 실행")
+
+
+def test_instrumentation():
+    """호출 계측: 스트림 TTFT/조각 수, 결과 라벨(ok, error, cancelled, cached), 거버너 대기와 시도 횟수 기록"""
+    print("\n" + "=" * 60)
+    print("11. 호출 계측 테스트")
+    print("=" * 60)
+
+    config = StandinConfig.from_dict({
+        "profiles": {
+            "chat": {"ttft": 0.3, "tokens_per_second": 100},
+            "groundedness": {"rate_429": 1.0, "retry_after": 0},
+        },
+    })
+    sink = RingBufferSink()
+    saved = dict(resilience._breakers)
+    resilience._breakers["groundedness"] = CircuitBreaker("groundedness", failure_threshold=10, reset_timeout=0.3)
+
+    try:
+        with StandinServer(config) as server:
+            client = _client(
+                server,
+                governor=UpstageGovernor(),
+                response_cache=LLMResponseCache(MemoryCacheBackend()),
+                retry_policy=RetryPolicy(max_attempts=3, base_delay=0.0),
+                instrumentation=Instrumentation([sink]),
+            )
+            client.singleflight = None
+
+            pieces = list(client.chat_stream("계측 질문", use_cache=True))
+            record = sink.records()[-1]
+            assert record.operation == "chat_stream" and record.outcome == "ok"
+            assert record.ttft_seconds >= 0.3, record.ttft_seconds
+            assert record.chunk_count == len(pieces) and record.char_count == len("".join(pieces))
+            assert record.attempts == 1 and record.status == 200 and record.connect_seconds is not None
+            print(f"✅ 스트림: ttft={record.ttft_seconds:.3f}s, 조각 {record.chunk_count}개")
+
+            list(client.chat_stream("계측 질문", use_cache=True))
+            record = sink.records()[-1]
+            assert record.outcome == "cached" and record.attempts == 0
+            print("✅ 캐시 재생: outcome=cached, 전송 없음")
+
+            stream = client.chat_stream("중간에 닫음")
+            next(stream)
+            stream.close()
+            record = sink.records()[-1]
+            assert record.outcome == "cancelled" and record.chunk_count == 1
+            print("✅ 중간에 닫은 스트림: outcome=cancelled")
+
+            try:
+                client.check_groundedness("context", "answer")
+                raise AssertionError("429가 주입되지 않았습니다")
+            except UpstageAPIError:
+                pass
+            record = sink.records()[-1]
+            assert record.outcome == "error" and record.status == 429 and record.attempts == 3
+            assert record.error
+            print(f"✅ 재시도 후 실패: outcome=error, 시도 {record.attempts}회")
+    finally:
+        resilience._breakers.clear()
+        resilience._breakers.update(saved)
+
+    # 거버너 대기 시간은 대기한 호출의 기록에 남음
+    sink.clear()
+    governor = UpstageGovernor({"chat": EndpointBudget(rps=4.0, burst=1, max_in_flight=4)})
+    with StandinServer(StandinConfig()) as server:
+        client = _client(server, governor=governor, instrumentation=Instrumentation([sink]))
+        client.singleflight = None
+        client.chat("첫 호출")
+        client.chat("두 번째 호출")
+    first, second = sink.records()
+    assert first.queue_wait < 0.05 and second.queue_wait >= 0.1, (first.queue_wait, second.queue_wait)
+    (summary,) = sink.summary().values()
+    assert summary["count"] == 2 and summary["avg_queue_wait"] >= 0.05
+    print(f"✅ 거버너 대기 기록: {second.queue_wait:.3f}s")
+
+
+def _catch(fn):
+    try:
+        return fn()
+    except Exception as e:
+        return e
+
+
+def main():
+    """전체 테스트 실행"""
+    results = []
+    for name, test in (
+        ("keep-alive 연결 재사용", test_http_pool_reuse),
+        ("비동기 클라이언트", test_async_client),
+        ("Document Parse 디스크 캐시", test_parse_cache),
+        ("속도/동시성 거버너", test_governor),
+        ("재시도/서킷 브레이커", test_retry_and_breaker),
+        ("구간 분할 파싱", test_chunked_parse),
+        ("Information Extract 스트리밍 본문", test_streaming_extract_body),
+        ("텍스트 레이어 사전 분석", test_preflight),
+        ("LLM 응답 캐시", test_response_cache),
+        ("요청 병합 취소", test_singleflight_cancellation),
+        ("호출 계측", test_instrumentation),
+    ):
+        try:
+            test()
+            results.append((name, True))
+        except Exception as e:
+            print(f"❌ {name} 실패: {e}")
+            results.append((name, False))
+
+    passed = sum(1 for _, ok in results if ok)
+    print("\n" + "=" * 60)
+    print(f"총 {len(results)}개 테스트 중 {passed}개 성공")
+    print("=" * 60)
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
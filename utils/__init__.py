@@ -9,11 +9,12 @@ Modules:
     - neis_api: 나이스 교육정보 API 연동
 """
 
-from .upstage_client import UpstageClient
+from .upstage_client import UpstageClient, AsyncUpstageClient
 from .schema import StudentRecord, AcademicRecord, Activities, CareerAspiration
 
 __all__ = [
     "UpstageClient",
+    "AsyncUpstageClient",
     "StudentRecord",
     "AcademicRecord", 
     "Activities",
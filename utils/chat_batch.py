@@ -0,0 +1,176 @@
+"""
+📦 Solar 채팅 일괄 실행 (chat_many)
+
+구간별 정보 추출, 주장별 검증, 전공 가정(what-if) 비교처럼
+서로 독립적인 프롬프트 N개를 한 번에 보내는 기능을 위한 실행기
+- 동시 실행 수를 제한 (UPSTAGE_BATCH_CONCURRENCY, 기본 4)
+- 각 호출은 UpstageClient.chat을 그대로 거치므로 거버너(RPM/동시성), 재시도, 캐시, 병합이 모두 적용
+- 항목별 오류는 예외로 터뜨리지 않고 결과에 담음 (한 항목 실패가 나머지를 막지 않음)
+- 입력 순서대로 모으거나(chat_many), 끝나는 순서대로 받을 수 있음(chat_many_iter)
+
+Classes:
+    ChatRequest: 일괄 실행 요청 1건
+    ChatResult: 일괄 실행 결과 1건 (응답 또는 오류 + 소요 시간)
+
+Functions:
+    iter_batch: 스레드 풀에서 실행하고 끝나는 순서대로 결과 반환
+    iter_batch_async: asyncio에서 실행하고 끝나는 순서대로 결과 반환
+    batch_concurrency: 기본 동시 실행 수
+"""
+
+import os
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Callable, Iterable, Generator, AsyncGenerator, Awaitable, Union
+
+
+@dataclass
+class ChatRequest:
+    """
+    일괄 실행 요청 1건 (UpstageClient.chat 인자와 같음)
+
+    Attributes:
+        message: 사용자 메시지
+        system_prompt: 시스템 프롬프트
+        reasoning_effort: 추론 노력 수준 (미지정 시 라우터가 target에 맞게 선택)
+        model: 사용할 모델 (미지정 시 라우터가 선택)
+        temperature: 응답 다양성
+        use_cache: 응답 캐시 사용 여부
+        tags: 계측 태그 (chat_many의 tags 위에 덮어씀)
+        target: 라우팅 목표 ("fast", "balanced", "quality")
+    """
+    message: str
+    system_prompt: Optional[str] = None
+    reasoning_effort: Optional[str] = None
+    model: Optional[str] = None
+    temperature: float = 0.7
+    use_cache: bool = False
+    tags: Optional[Dict[str, Any]] = None
+    target: str = "fast"
+
+    @classmethod
+    def coerce(cls, value: Union["ChatRequest", str, Dict[str, Any]]) -> "ChatRequest":
+        """문자열(메시지만) 또는 chat 인자 dict도 요청으로 변환"""
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, str):
+            return cls(message=value)
+        return cls(**value)
+
+
+@dataclass
+class ChatResult:
+    """
+    일괄 실행 결과 1건
+
+    Attributes:
+        index: 입력 순서
+        request: 요청
+        text: 응답 텍스트 (실패 시 None)
+        error: 실패 원인 (성공 시 None)
+        wait_seconds: 일괄 실행 시작부터 이 항목이 시작될 때까지 (동시 실행 제한 대기)
+        duration_seconds: 이 항목의 호출 소요 시간 (거버너 대기, 재시도 포함)
+    """
+    index: int
+    request: ChatRequest
+    text: Optional[str] = None
+    error: Optional[Exception] = None
+    wait_seconds: float = 0.0
+    duration_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def batch_concurrency() -> int:
+    """기본 동시 실행 수 (UPSTAGE_BATCH_CONCURRENCY, 기본 4)"""
+    return max(int(os.getenv("UPSTAGE_BATCH_CONCURRENCY", "4")), 1)
+
+
+def iter_batch(
+    call: Callable[[ChatRequest], str],
+    requests: Iterable[Union[ChatRequest, str, Dict[str, Any]]],
+    max_concurrency: Optional[int] = None
+) -> Generator[ChatResult, None, None]:
+    """
+    요청들을 스레드 풀에서 실행하고 끝나는 순서대로 결과 반환
+
+    소비를 중간에 멈추면 아직 시작하지 않은 요청은 취소됨
+
+    Args:
+        call: 요청 1건을 실행하는 함수
+        requests: 요청 목록
+        max_concurrency: 동시 실행 수 (미지정 시 batch_concurrency())
+
+    Yields:
+        ChatResult: 완료된 결과 (index로 입력 순서 확인)
+    """
+    items = [ChatRequest.coerce(request) for request in requests]
+    if not items:
+        return
+    workers = min(max_concurrency or batch_concurrency(), len(items))
+    started = time.perf_counter()
+
+    def run(index: int, request: ChatRequest) -> ChatResult:
+        begin = time.perf_counter()
+        result = ChatResult(index=index, request=request, wait_seconds=begin - started)
+        try:
+            result.text = call(request)
+        except Exception as e:
+            result.error = e
+        result.duration_seconds = time.perf_counter() - begin
+        return result
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chat-batch")
+    try:
+        futures = [pool.submit(run, index, request) for index, request in enumerate(items)]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def iter_batch_async(
+    call: Callable[[ChatRequest], Awaitable[str]],
+    requests: Iterable[Union[ChatRequest, str, Dict[str, Any]]],
+    max_concurrency: Optional[int] = None
+) -> AsyncGenerator[ChatResult, None]:
+    """
+    요청들을 asyncio에서 실행하고 끝나는 순서대로 결과 반환 (소비를 멈추면 남은 작업 취소)
+
+    Args:
+        call: 요청 1건을 실행하는 코루틴 함수
+        requests: 요청 목록
+        max_concurrency: 동시 실행 수 (미지정 시 batch_concurrency())
+
+    Yields:
+        ChatResult: 완료된 결과
+    """
+    items = [ChatRequest.coerce(request) for request in requests]
+    if not items:
+        return
+    semaphore = asyncio.Semaphore(max_concurrency or batch_concurrency())
+    started = time.perf_counter()
+
+    async def run(index: int, request: ChatRequest) -> ChatResult:
+        async with semaphore:
+            begin = time.perf_counter()
+            result = ChatResult(index=index, request=request, wait_seconds=begin - started)
+            try:
+                result.text = await call(request)
+            except Exception as e:
+                result.error = e
+            result.duration_seconds = time.perf_counter() - begin
+            return result
+
+    tasks = [asyncio.ensure_future(run(index, request)) for index, request in enumerate(items)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,174 @@
+"""
+♻️ 프로세스 공유 UpstageClient 풀
+
+SessionManager.get_client가 Streamlit 세션마다 UpstageClient를 새로 만들고
+각 클라이언트가 자기 OpenAI SDK 커넥션 풀을 가지고 있어
+레플리카당 세션 수만큼 유휴 풀과 소켓이 쌓였음
+
+(API 키, base_url)별로 클라이언트 하나를 만들어 모든 세션과 에이전트가 재사용
+- 지연 생성, 스레드 안전 (같은 키는 한 번만 생성)
+- 클라이언트는 상태가 없으므로 공유해도 안전 (거버너/캐시/병합/계측은 원래 프로세스 공유)
+- 꺼낼 때 HTTP 클라이언트가 닫혀 있으면 새로 만듦
+- health(): 서킷 브레이커 상태와 연결 수 보고 (probe=True면 실제 호출로 확인)
+- close(): 등록된 클라이언트와 공유 HTTP 연결을 모두 닫음 (프로세스 종료 시 자동)
+
+AsyncUpstageClient는 이벤트 루프에 묶인 연결을 가지므로 풀에 넣지 않음
+
+Classes:
+    ClientPool: (API 키, base_url)별 UpstageClient 레지스트리
+
+Functions:
+    get_client_pool: 프로세스 공유 ClientPool 반환
+    get_shared_client: 공유 UpstageClient 반환
+    close_client_pool: 공유 풀 종료
+"""
+
+import os
+import atexit
+import threading
+from typing import Dict, Any, Optional, Callable, Tuple
+
+from .upstage_client import UpstageClient
+from .http_pool import get_connection_stats, close_http_pool
+from .resilience import CircuitBreaker
+from .key_pool import mask_key, default_api_key
+
+
+class ClientPool:
+    """
+    (API 키, base_url)별 UpstageClient 레지스트리
+
+    Attributes:
+        factory: 클라이언트 생성 함수 (api_key, base_url) → UpstageClient
+
+    Example:
+        >>> pool = ClientPool()
+        >>> client = pool.get()                 # UPSTAGE_API_KEY 클라이언트
+        >>> pool.get() is client
+        True
+        >>> pool.stats()["connections"]["llm"]["open"]
+    """
+
+    def __init__(self, factory: Optional[Callable[[str, Optional[str]], UpstageClient]] = None):
+        self.factory = factory or (lambda api_key, base_url: UpstageClient(api_key=api_key, base_url=base_url))
+        self._clients: Dict[Tuple[str, str], UpstageClient] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+
+    @staticmethod
+    def _key(api_key: Optional[str], base_url: Optional[str]) -> Tuple[str, str]:
+        api_key = api_key or default_api_key()
+        if not api_key:
+            raise ValueError("UPSTAGE_API_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
+        base_url = (base_url or os.getenv("UPSTAGE_BASE_URL") or UpstageClient.SOLAR_BASE_URL).rstrip("/")
+        return api_key, base_url
+
+    def get(self, api_key: Optional[str] = None, base_url: Optional[str] = None) -> UpstageClient:
+        """
+        공유 클라이언트 반환 (없거나 닫혀 있으면 생성)
+
+        Args:
+            api_key: Upstage API 키 (미제공 시 환경변수)
+            base_url: API 기본 URL (미제공 시 UPSTAGE_BASE_URL)
+
+        Returns:
+            UpstageClient: 같은 키/URL이면 모든 세션이 같은 인스턴스
+        """
+        key = self._key(api_key, base_url)
+        client = self._clients.get(key)
+        if client is not None and not client.closed:
+            return client
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None or client.closed:
+                client = self.factory(*key)
+                self._clients[key] = client
+                self.created += 1
+            return client
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def health(self, probe: bool = False) -> Dict[str, Any]:
+        """
+        등록된 클라이언트 상태 확인
+
+        Args:
+            probe: True면 클라이언트마다 test_connection()으로 실제 호출 (LLM 호출 1회씩)
+
+        Returns:
+            dict: healthy(전체 정상 여부), clients([{api_key, base_url, closed, open_breakers, reachable}]), connections
+        """
+        with self._lock:
+            items = list(self._clients.items())
+        clients = []
+        for (api_key, base_url), client in items:
+            open_breakers = [
+                endpoint for endpoint, stats in client.breaker_stats().items() if stats.get("state") != CircuitBreaker.CLOSED
+            ]
+            entry = {
+                "api_key": mask_key(api_key),
+                "base_url": base_url,
+                "closed": client.closed,
+                "open_breakers": open_breakers,
+            }
+            if probe and not client.closed:
+                entry["reachable"] = client.test_connection()
+            entry["healthy"] = not entry["closed"] and not open_breakers and entry.get("reachable", True)
+            clients.append(entry)
+        return {
+            "healthy": all(entry["healthy"] for entry in clients),
+            "clients": clients,
+            "connections": get_connection_stats(),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        풀 통계
+
+        Returns:
+            dict: clients(등록 수), created(생성 횟수), connections({"raw", "llm"} 각각 {open, idle})
+        """
+        return {"clients": len(self._clients), "created": self.created, "connections": get_connection_stats()}
+
+    def close(self) -> None:
+        """등록된 클라이언트를 비우고 공유 HTTP 연결 종료 (다음 get()에서 다시 생성)"""
+        with self._lock:
+            self._clients.clear()
+        close_http_pool()
+
+
+_pool: Optional[ClientPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_client_pool() -> ClientPool:
+    """프로세스 공유 ClientPool 반환 (지연 생성, 프로세스 종료 시 연결 정리)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ClientPool()
+                atexit.register(close_client_pool)
+    return _pool
+
+
+def get_shared_client(api_key: Optional[str] = None, base_url: Optional[str] = None) -> UpstageClient:
+    """
+    공유 UpstageClient 반환
+
+    Args:
+        api_key: Upstage API 키 (미제공 시 환경변수)
+        base_url: API 기본 URL (미제공 시 UPSTAGE_BASE_URL)
+
+    Returns:
+        UpstageClient: 프로세스 공유 클라이언트
+    """
+    return get_client_pool().get(api_key, base_url)
+
+
+def close_client_pool() -> None:
+    """공유 풀의 클라이언트와 연결 종료"""
+    pool = _pool
+    if pool is not None:
+        pool.close()
@@ -0,0 +1,219 @@
+"""
+⏱️ 호출 마감 시간(Deadline)과 협조적 취소
+
+chat_stream / chat 에는 시간 제한이 없고 parse_document_bytes는 120초 고정이라
+추론 스트림이 멈추면 Streamlit 스레드와 업스트림 연결이 무기한 붙잡혀 있었음
+
+업로드 시점에 시작한 예산(Deadline)을 DocumentAgent → ExtractAgent → RecommendAgent → VerifyAgent로 전달
+- 각 단계의 호출은 남은 예산만큼의 타임아웃을 받음 (거버너 대기, HTTP 타임아웃, 재시도 대기 포함)
+- 예산이 끝나면 DeadlineExceeded, 사용자가 초기화/이동하면 CallCancelled
+- 진행 중인 스트림은 Deadline에 등록되어 cancel() 시 즉시 닫힘 (소켓 반환)
+
+Classes:
+    DeadlineExceeded: 예산 초과 예외
+    CallCancelled: 취소 예외
+    Deadline: 호출 마감 시간 + 취소 토큰
+
+Functions:
+    request_timeout: 남은 예산으로 timeout 인자 구성
+    pipeline_deadline: 파이프라인 기본 예산으로 Deadline 시작 (IMF_PIPELINE_BUDGET_SECONDS)
+"""
+
+import os
+import time
+import asyncio
+import threading
+from typing import Dict, Any, Optional, List
+
+from .resilience import UpstageAPIError, ENDPOINT_LABELS
+
+
+class DeadlineExceeded(UpstageAPIError):
+    """예산 안에 호출을 마치지 못함 (재시도하지 않음)"""
+
+
+class CallCancelled(UpstageAPIError):
+    """사용자 초기화/이동으로 호출이 취소됨 (재시도하지 않음)"""
+
+
+class Deadline:
+    """
+    호출 마감 시간 + 협조적 취소 토큰
+
+    Attributes:
+        budget: 전체 예산 (초, None이면 무제한 - 취소만 사용)
+        started_at: 시작 시각 (time.monotonic)
+
+    Example:
+        >>> deadline = Deadline(180)
+        >>> parsed = DocumentAgent(client).parse_bytes(file_bytes, deadline=deadline)
+        >>> gen = ExtractAgent(client).extract_from_text(parsed.text, deadline=deadline)
+        >>> deadline.cancel("초기화")   # 다른 스레드에서 호출 시 진행 중인 스트림이 즉시 닫힘
+    """
+
+    def __init__(self, budget: Optional[float] = None):
+        self.budget = budget
+        self.started_at = time.monotonic()
+
+        self._lock = threading.Lock()
+        self._cancel_reason: Optional[str] = None
+        self._cancelled = threading.Event()
+        self._resources: List[Any] = []
+
+    def remaining(self) -> Optional[float]:
+        """남은 시간 (초, 무제한이면 None, 초과 시 0)"""
+        if self.budget is None:
+            return None
+        return max(self.budget - (time.monotonic() - self.started_at), 0.0)
+
+    def timeout(self, default: Optional[float] = None) -> Optional[float]:
+        """
+        이번 호출에 줄 타임아웃 (기본 타임아웃과 남은 예산 중 작은 값)
+
+        Args:
+            default: 호출의 기본 타임아웃 (None이면 제한 없음)
+
+        Returns:
+            float | None: 타임아웃 (초)
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        remaining = max(remaining, 0.001)
+        return remaining if default is None else min(default, remaining)
+
+    @property
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_reason is not None
+
+    @property
+    def done(self) -> bool:
+        """취소되었거나 예산이 끝났는지"""
+        return self.cancelled or self.expired
+
+    def error(self, endpoint: str = "") -> UpstageAPIError:
+        """현재 상태에 맞는 예외 (취소 우선)"""
+        label = ENDPOINT_LABELS.get(endpoint, endpoint) or "호출"
+        if self.cancelled:
+            return CallCancelled(f"{label} 취소됨: {self._cancel_reason}", endpoint=endpoint)
+        return DeadlineExceeded(f"{label} 시간 초과: 예산 {self.budget:g}s 소진", endpoint=endpoint)
+
+    def check(self, endpoint: str = "") -> None:
+        """취소되었거나 예산이 끝났으면 예외 발생"""
+        if self.done:
+            raise self.error(endpoint)
+
+    def _check_wait(self, seconds: float, endpoint: str) -> None:
+        """대기가 남은 예산보다 길면 기다리지 않고 바로 DeadlineExceeded"""
+        remaining = self.remaining()
+        if remaining is not None and seconds >= remaining:
+            label = ENDPOINT_LABELS.get(endpoint, endpoint) or "호출"
+            raise DeadlineExceeded(
+                f"{label} 시간 초과: 재시도 대기 {seconds:.1f}s가 남은 예산 {remaining:.1f}s보다 김",
+                endpoint=endpoint
+            )
+
+    def sleep(self, seconds: float, endpoint: str = "") -> None:
+        """재시도 대기 (취소 시 즉시 깨어남)"""
+        self._check_wait(seconds, endpoint)
+        if self._cancelled.wait(seconds):
+            raise self.error(endpoint)
+
+    async def sleep_async(self, seconds: float, endpoint: str = "") -> None:
+        """재시도 대기 (비동기)"""
+        self._check_wait(seconds, endpoint)
+        await asyncio.sleep(seconds)
+        self.check(endpoint)
+
+    def cancel(self, reason: str = "사용자 요청") -> None:
+        """
+        취소 (다른 스레드에서 호출 가능)
+
+        등록된 스트림을 모두 닫아, 응답을 기다리던 호출자는 즉시 CallCancelled를 받음
+        """
+        with self._lock:
+            if self._cancel_reason is None:
+                self._cancel_reason = reason
+            self._cancelled.set()
+            resources, self._resources = self._resources, []
+        for resource in resources:
+            _close_quietly(resource)
+
+    def register(self, resource: Any) -> None:
+        """진행 중인 스트림/응답 등록 (close()를 가진 객체, 이미 취소된 경우 바로 닫음)"""
+        with self._lock:
+            if self._cancel_reason is None:
+                self._resources.append(resource)
+                return
+        _close_quietly(resource)
+
+    def unregister(self, resource: Any) -> None:
+        with self._lock:
+            if resource in self._resources:
+                self._resources.remove(resource)
+
+    def child(self) -> "Deadline":
+        """
+        같은 남은 예산을 가진 하위 Deadline (상위가 취소되면 함께 취소, 하위 취소는 상위에 영향 없음)
+
+        헤지 요청처럼 시도 하나만 따로 취소해야 할 때 사용, 끝나면 release_child()로 등록 해제
+        """
+        child = Deadline(self.remaining())
+        self.register(child)
+        return child
+
+    def release_child(self, child: "Deadline") -> None:
+        self.unregister(child)
+
+    def close(self) -> None:
+        """상위 Deadline의 cancel()에서 호출 (등록 자원 프로토콜)"""
+        self.cancel("상위 호출 취소")
+
+    def __enter__(self) -> "Deadline":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        # 예외(Streamlit 재실행 중단 포함)로 빠져나가면 남은 스트림 정리
+        if exc_type is not None:
+            self.cancel("중단됨")
+        return False
+
+
+def request_timeout(deadline: Optional[Deadline], default: Optional[float] = None) -> Dict[str, Any]:
+    """
+    SDK/HTTP 호출에 넘길 timeout 인자 (예산이 없으면 빈 dict - 라이브러리 기본값 유지)
+
+    Args:
+        deadline: 호출 마감 시간
+        default: 호출의 기본 타임아웃
+    """
+    if deadline is None or deadline.budget is None:
+        return {} if default is None else {"timeout": default}
+    return {"timeout": deadline.timeout(default)}
+
+
+def _close_quietly(resource: Any) -> None:
+    try:
+        resource.close()
+    except Exception:
+        pass
+
+
+def pipeline_deadline(budget: Optional[float] = None) -> Deadline:
+    """
+    파이프라인 예산으로 Deadline 시작
+
+    Args:
+        budget: 예산 (초, 미제공 시 IMF_PIPELINE_BUDGET_SECONDS, 기본 300 / 0 이하면 무제한)
+
+    Returns:
+        Deadline: 시작된 Deadline
+    """
+    if budget is None:
+        budget = float(os.getenv("IMF_PIPELINE_BUDGET_SECONDS", "300"))
+    return Deadline(budget if budget > 0 else None)
@@ -0,0 +1,352 @@
+"""
+⚡ 대용량 API 응답 JSON 디코딩 (Fast JSON)
+
+Document Parse 응답은 페이지마다 HTML/텍스트와 base64 표 이미지를 담고 있어
+30쪽 이상 생활기록부에서는 response.json()(표준 라이브러리)의 디코딩 시간과 메모리가 프로파일 상위에 나타남
+
+- 디코딩 백엔드 교체 가능: orjson(설치 시 자동 사용) / stdlib, register_json_backend()로 추가
+  (IMF_JSON_BACKEND=auto|orjson|stdlib|<등록한 이름>, 기본 auto)
+- 선택적 구체화: 지정한 키(기본 base64_encoding)의 문자열 값은 디코딩 전에 원본 본문에서 잘라내고
+  LazyPayload(잘라낸 원본 bytes)로 대체 → 디코더가 수십 KB짜리 base64를 훑지도, 문자열로 만들지도 않음
+  (원본 본문 전체를 붙잡지 않도록 값 구간만 복사)
+  호출자가 .text / .decode()로 요청할 때만 구체화 (IMF_JSON_LAZY_BASE64=0이면 기존처럼 모두 디코딩)
+- LazyPayload는 json_default로 JSON 직렬화 가능 (파싱 캐시/작업 레지스트리 저장 시 원래 문자열로 기록)
+
+벤치마크:
+    $ python -m utils.fast_json --pages 30 --repeat 5
+
+Classes:
+    LazyPayload: 디코딩을 미룬 JSON 문자열 값
+
+Functions:
+    register_json_backend: 디코딩 백엔드 등록
+    get_json_backend: 사용할 백엔드 이름 (IMF_JSON_BACKEND)
+    lazy_parse_keys: Document Parse 응답에서 구체화를 미룰 키
+    decode_json: 백엔드 디코딩 + 선택적 구체화
+    json_default: json.dumps의 default (LazyPayload → 문자열)
+    main: 디코딩 벤치마크
+"""
+
+import os
+import json
+import time
+import base64
+import argparse
+import threading
+import tracemalloc
+from statistics import median
+from typing import Dict, Any, Optional, List, Callable, Sequence, Tuple, Union
+
+
+# Document Parse 응답에서 기본으로 구체화를 미루는 키 (요소별 base64 표 이미지)
+LAZY_PARSE_KEYS = ("base64_encoding",)
+
+# 잘라낸 값 자리에 넣는 표식 (JSON 문자열 "\u0000lazy:<번호>" - 실제 응답 값과 겹치지 않음)
+_PLACEHOLDER = "\x00lazy:"
+_PLACEHOLDER_JSON = b'"\\u0000lazy:'
+_WHITESPACE = b" \t\r\n"
+
+
+class LazyPayload:
+    """
+    디코딩을 미룬 JSON 문자열 값 (응답 본문에서 잘라낸 원본 bytes)
+
+    Example:
+        >>> result = decode_json(response.content, LAZY_PARSE_KEYS)
+        >>> payload = result["elements"][0]["base64_encoding"]
+        >>> len(payload)            # 구체화 없이 크기 확인
+        >>> image = payload.decode()  # 필요할 때만 base64 → bytes
+    """
+
+    __slots__ = ("raw", "_text")
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        self._text: Optional[str] = None
+
+    def __len__(self) -> int:
+        """원본 JSON 안의 길이 (바이트, 이스케이프 포함)"""
+        return len(self.raw)
+
+    @property
+    def text(self) -> str:
+        """문자열로 구체화 (처음 한 번만 변환)"""
+        if self._text is None:
+            # base64에는 이스케이프가 거의 없으므로 있을 때만 JSON 문자열로 해석
+            self._text = json.loads(b'"' + self.raw + b'"') if b"\\" in self.raw else self.raw.decode("utf-8")
+        return self._text
+
+    def decode(self) -> bytes:
+        """base64 값 → bytes"""
+        return base64.b64decode(self.text)
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return f"LazyPayload({len(self)} bytes)"
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyPayload):
+            other = other.text
+        return self.text == other
+
+    def __hash__(self) -> int:
+        return hash(self.text)
+
+
+# =============================================================================
+# 디코딩 백엔드
+# =============================================================================
+def _orjson_loads() -> Optional[Callable[[bytes], Any]]:
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson.loads
+
+
+_backends: Dict[str, Callable[[bytes], Any]] = {"stdlib": json.loads}
+_backend_name: Optional[str] = None
+_backend_lock = threading.Lock()
+
+_orjson = _orjson_loads()
+if _orjson is not None:
+    _backends["orjson"] = _orjson
+
+
+def register_json_backend(name: str, loads: Callable[[bytes], Any]) -> None:
+    """
+    디코딩 백엔드 등록
+
+    Args:
+        name: 백엔드 이름 (IMF_JSON_BACKEND / decode_json(backend=...)에 사용)
+        loads: UTF-8 JSON bytes → 파이썬 객체
+    """
+    global _backend_name
+    with _backend_lock:
+        _backends[name] = loads
+        _backend_name = None
+
+
+def get_json_backend() -> str:
+    """사용할 백엔드 이름 (IMF_JSON_BACKEND, auto면 orjson 설치 시 orjson, 없으면 stdlib)"""
+    global _backend_name
+    if _backend_name is None:
+        with _backend_lock:
+            if _backend_name is None:
+                name = os.getenv("IMF_JSON_BACKEND", "auto").lower()
+                if name not in _backends:
+                    if name != "auto":
+                        print(f"⚠️ JSON 백엔드 '{name}'를 사용할 수 없어 기본 백엔드를 사용합니다.")
+                    name = "orjson" if "orjson" in _backends else "stdlib"
+                _backend_name = name
+    return _backend_name
+
+
+def lazy_parse_keys() -> Tuple[str, ...]:
+    """Document Parse 응답에서 구체화를 미룰 키 (IMF_JSON_LAZY_BASE64=0이면 없음)"""
+    if os.getenv("IMF_JSON_LAZY_BASE64", "1").lower() in ("0", "false", "no"):
+        return ()
+    return LAZY_PARSE_KEYS
+
+
+# =============================================================================
+# 선택적 구체화
+# =============================================================================
+def _string_end(data: bytes, start: int) -> int:
+    """start부터 시작하는 JSON 문자열 내용의 닫는 따옴표 위치 (없으면 -1)"""
+    position = data.find(b'"', start)
+    while position >= 0:
+        backslashes = 0
+        while data[position - 1 - backslashes] == 0x5C:
+            backslashes += 1
+        if backslashes % 2 == 0:
+            return position
+        position = data.find(b'"', position + 1)
+    return -1
+
+
+def _lazy_spans(data: bytes, keys: Sequence[str]) -> List[Tuple[int, int]]:
+    """지정한 키의 문자열 값 구간 [(내용 시작, 닫는 따옴표)] (문서 순서)"""
+    spans = []
+    for key in keys:
+        marker = b'"' + key.encode("utf-8") + b'"'
+        position = data.find(marker)
+        while position >= 0:
+            cursor = position + len(marker)
+            # 문자열 안의 \"key\"는 앞이 백슬래시이므로 제외
+            if position == 0 or data[position - 1] != 0x5C:
+                while cursor < len(data) and data[cursor] in _WHITESPACE:
+                    cursor += 1
+                if data[cursor:cursor + 1] == b":":
+                    cursor += 1
+                    while cursor < len(data) and data[cursor] in _WHITESPACE:
+                        cursor += 1
+                    if data[cursor:cursor + 1] == b'"':
+                        end = _string_end(data, cursor + 1)
+                        if end < 0:
+                            break
+                        spans.append((cursor + 1, end))
+                        cursor = end + 1
+            position = data.find(marker, cursor)
+    spans.sort()
+    return spans
+
+
+def _attach(value: Any, keys: Sequence[str], payloads: List[LazyPayload]) -> None:
+    """디코딩된 값에서 표식을 LazyPayload로 교체"""
+    stack = [value]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key, item in node.items():
+                if isinstance(item, str):
+                    if key in keys and item.startswith(_PLACEHOLDER):
+                        node[key] = payloads[int(item[len(_PLACEHOLDER):])]
+                elif isinstance(item, (dict, list)):
+                    stack.append(item)
+        elif isinstance(node, list):
+            stack.extend(item for item in node if isinstance(item, (dict, list)))
+
+
+def decode_json(
+    data: Union[bytes, str],
+    lazy_keys: Sequence[str] = (),
+    backend: Optional[str] = None
+) -> Any:
+    """
+    JSON 디코딩 (선택한 백엔드 + 지정한 키의 문자열 값 구체화 지연)
+
+    Args:
+        data: 응답 본문 (response.content)
+        lazy_keys: 구체화를 미룰 키 (값이 문자열일 때만, 예: LAZY_PARSE_KEYS)
+        backend: 백엔드 이름 (미지정 시 get_json_backend())
+
+    Returns:
+        디코딩된 값 (lazy_keys의 문자열 값은 LazyPayload)
+
+    Raises:
+        ValueError: 잘못된 JSON (json.JSONDecodeError / orjson.JSONDecodeError 모두 ValueError)
+    """
+    loads = _backends[backend or get_json_backend()]
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+
+    spans = _lazy_spans(data, lazy_keys) if lazy_keys else []
+    if not spans:
+        return loads(data)
+
+    buffer = memoryview(data)
+    parts = []
+    last = 0
+    for index, (start, end) in enumerate(spans):
+        parts.append(buffer[last:start - 1])
+        parts.append(_PLACEHOLDER_JSON + str(index).encode("ascii") + b'"')
+        last = end + 1
+    parts.append(buffer[last:])
+
+    value = loads(b"".join(parts))
+    _attach(value, tuple(lazy_keys), [LazyPayload(data[start:end]) for start, end in spans])
+    return value
+
+
+def json_default(value: Any) -> Any:
+    """json.dumps(default=json_default) - LazyPayload를 원래 문자열로 직렬화"""
+    if isinstance(value, LazyPayload):
+        return value.text
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# =============================================================================
+# 벤치마크
+# =============================================================================
+def sample_parse_response(pages: int = 30, tables_per_page: int = 2, image_bytes: int = 48_000) -> bytes:
+    """벤치마크용 Document Parse 응답 (페이지마다 HTML/텍스트 + base64 표 이미지)"""
+    elements = []
+    seed = bytes(range(256)) * (image_bytes // 256 + 1)
+    for page in range(1, pages + 1):
+        paragraph = f"{page}쪽 교과학습발달상황: 수학 탐구 활동에서 미적분 개념을 활용한 보고서를 작성함. " * 12
+        elements.append({
+            "id": len(elements), "category": "paragraph", "page": page,
+            "content": {"text": paragraph, "html": f"<p>{paragraph}</p>", "markdown": paragraph},
+        })
+        for table in range(tables_per_page):
+            cells = "".join(f"<tr><td>{page}-{table}-{row}</td><td>수학</td><td>A</td></tr>" for row in range(20))
+            elements.append({
+                "id": len(elements), "category": "table", "page": page,
+                "content": {"text": "", "html": f"<table>{cells}</table>", "markdown": ""},
+                "base64_encoding": base64.b64encode(seed[page + table:page + table + image_bytes]).decode("ascii"),
+            })
+    response = {
+        "api": "2.0",
+        "model": "document-parse",
+        "content": {"text": "\n".join(e["content"]["text"] for e in elements), "html": "", "markdown": ""},
+        "elements": elements,
+        "usage": {"pages": pages},
+    }
+    return json.dumps(response, ensure_ascii=False).encode("utf-8")
+
+
+def benchmark(data: bytes, repeat: int = 5) -> List[Dict[str, Any]]:
+    """
+    백엔드 x (전체 디코딩 / base64 지연) 조합별 디코딩 시간과 메모리
+
+    Returns:
+        list: [{backend, mode, median_ms, peak_mb, retained_mb}]
+            (peak: 디코딩 중 본문 외 최대 추가 할당, retained: 본문을 버린 뒤 결과가 붙잡은 메모리)
+    """
+    rows = []
+    for backend in sorted(_backends):
+        for mode, keys in (("eager", ()), ("lazy", LAZY_PARSE_KEYS)):
+            times = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                decode_json(data, keys, backend)
+                times.append(time.perf_counter() - started)
+
+            tracemalloc.start()
+            base = tracemalloc.get_traced_memory()[0]
+            body = bytes(memoryview(data))
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            value = decode_json(body, keys, backend)
+            peak = tracemalloc.get_traced_memory()[1] - before
+            del body
+            retained = tracemalloc.get_traced_memory()[0] - base
+            tracemalloc.stop()
+            del value
+
+            rows.append({
+                "backend": backend,
+                "mode": mode,
+                "median_ms": median(times) * 1000,
+                "peak_mb": peak / 1e6,
+                "retained_mb": retained / 1e6,
+            })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """명령줄 실행: python -m utils.fast_json [--pages] [--tables] [--image-bytes] [--repeat]"""
+    parser = argparse.ArgumentParser(description="Document Parse 응답 JSON 디코딩 벤치마크")
+    parser.add_argument("--pages", type=int, default=30)
+    parser.add_argument("--tables", type=int, default=2, help="페이지당 표 이미지 수")
+    parser.add_argument("--image-bytes", type=int, default=48_000, help="표 이미지 하나의 크기 (base64 전)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    data = sample_parse_response(args.pages, args.tables, args.image_bytes)
+    print(f"⚡ 응답 {len(data) / 1e6:.1f}MB ({args.pages}쪽, 표 이미지 {args.pages * args.tables}개)")
+    rows = benchmark(data, args.repeat)
+    baseline = next(row for row in rows if row["backend"] == "stdlib" and row["mode"] == "eager")
+    print(f"{'backend':<10}{'mode':<7}{'decode':>10}{'peak':>10}{'retained':>10}{'speedup':>9}")
+    for row in rows:
+        print(
+            f"{row['backend']:<10}{row['mode']:<7}{row['median_ms']:>8.1f}ms{row['peak_mb']:>8.1f}MB"
+            f"{row['retained_mb']:>8.1f}MB{baseline['median_ms'] / row['median_ms']:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
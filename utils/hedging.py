@@ -0,0 +1,407 @@
+"""
+🪁 헤지 요청 (Hedged Requests) - 짧은 호출의 꼬리 지연 줄이기
+
+check_groundedness, test_connection, 정보 추출 스트림 같은 짧은 호출은
+가끔 우리 쪽 원인 없이 중앙값의 5~10배가 걸림
+
+첫 시도(primary)가 최근 지연 분포의 p95 안에 첫 응답(스트림은 첫 조각)을 주지 않으면
+같은 요청을 한 번 더 보내(hedge) 먼저 응답한 쪽을 쓰고 나머지는 취소
+- 임계값은 호출 종류별 최근 지연(슬라이딩 윈도우)의 백분위로 자동 조정 (표본이 모이기 전에는 헤지하지 않음)
+- 헤지 비율은 토큰 버킷으로 제한 (기본: 첫 시도 10건당 1건, 최대 3건 연속)
+- 서킷 브레이커가 닫혀 있지 않으면(장애 중) 헤지하지 않아 부하를 키우지 않음
+- 헤지 요청도 거버너 슬롯을 받아야 하므로 공유 속도 제한을 그대로 따름
+
+UPSTAGE_HEDGE=1 일 때 프로세스 공유 Hedger 사용 (기본 비활성)
+
+Classes:
+    HedgePolicy: 헤지 정책 (백분위, 최소 표본, 비율 제한)
+    LatencyTracker: 최근 지연 분포
+    Hedger: 헤지 실행기
+
+Functions:
+    hedging_enabled: UPSTAGE_HEDGE 확인
+    get_hedger: 프로세스 공유 Hedger 반환 (비활성 시 None)
+"""
+
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Callable, Awaitable, Hashable
+
+from .deadline import Deadline
+from .resilience import CircuitBreaker, get_breaker
+
+
+# 동기 실행 시 상위 Deadline 취소를 확인하는 간격 (초)
+_POLL_SECONDS = 0.05
+
+
+@dataclass
+class HedgePolicy:
+    """
+    헤지 정책
+
+    Attributes:
+        percentile: 헤지 임계값으로 쓸 지연 백분위
+        min_samples: 헤지를 시작하기 전 필요한 표본 수
+        window: 호출 종류별로 보관할 최근 표본 수
+        min_delay: 임계값 하한 (초)
+        max_delay: 임계값 상한 (초)
+        ratio: 첫 시도 1건당 적립되는 헤지 토큰 (0.1이면 최대 약 10%)
+        burst: 헤지 토큰 최대 적립량
+        max_workers: 동기 클라이언트의 시도 실행 스레드 수
+    """
+    percentile: float = 0.95
+    min_samples: int = 20
+    window: int = 200
+    min_delay: float = 0.05
+    max_delay: float = 10.0
+    ratio: float = 0.1
+    burst: float = 3.0
+    max_workers: int = 32
+
+    @classmethod
+    def from_env(cls) -> "HedgePolicy":
+        """
+        환경변수로 정책 구성
+
+        환경변수:
+            UPSTAGE_HEDGE_PERCENTILE: 임계 백분위 (기본 0.95)
+            UPSTAGE_HEDGE_MIN_SAMPLES: 최소 표본 수 (기본 20)
+            UPSTAGE_HEDGE_RATIO: 헤지 비율 상한 (기본 0.1)
+            UPSTAGE_HEDGE_BURST: 연속 헤지 허용 수 (기본 3)
+        """
+        return cls(
+            percentile=float(os.getenv("UPSTAGE_HEDGE_PERCENTILE", cls.percentile)),
+            min_samples=int(os.getenv("UPSTAGE_HEDGE_MIN_SAMPLES", cls.min_samples)),
+            ratio=float(os.getenv("UPSTAGE_HEDGE_RATIO", cls.ratio)),
+            burst=float(os.getenv("UPSTAGE_HEDGE_BURST", cls.burst)),
+        )
+
+
+class LatencyTracker:
+    """
+    최근 지연 분포 (슬라이딩 윈도우)
+
+    Attributes:
+        window: 보관할 최근 표본 수
+        max_age: 표본 보관 시간 (초, None이면 개수로만 제한)
+    """
+
+    def __init__(self, window: int = 200, max_age: Optional[float] = None):
+        self.window = window
+        self.max_age = max_age
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append((time.monotonic(), seconds))
+
+    def _expire(self) -> None:
+        if self.max_age is None:
+            return
+        cutoff = time.monotonic() - self.max_age
+        while self._samples and self._samples[0][0] < cutoff:
+            self._samples.popleft()
+
+    def quantile(self, q: float) -> Optional[float]:
+        """q 분위 지연 (표본이 없으면 None)"""
+        with self._lock:
+            self._expire()
+            samples = sorted(seconds for _, seconds in self._samples)
+        if not samples:
+            return None
+        return samples[min(int(q * len(samples)), len(samples) - 1)]
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire()
+            return len(self._samples)
+
+
+class Hedger:
+    """
+    헤지 실행기
+
+    시도 함수 attempt(token)는 한 번의 전송을 수행하고 첫 응답까지 돌려줌
+    (스트림은 첫 조각을 미리 읽은 열린 스트림 - 패자 쪽은 close()로 정리)
+
+    Attributes:
+        policy: 헤지 정책
+
+    Example:
+        >>> hedger = Hedger()
+        >>> text = hedger.run(("groundedness", "solar-pro3"), "groundedness", lambda token: send(token))
+        >>> hedger.stats()
+    """
+
+    def __init__(self, policy: Optional[HedgePolicy] = None):
+        self.policy = policy or HedgePolicy()
+        self._trackers: Dict[Hashable, LatencyTracker] = {}
+        self._lock = threading.Lock()
+        self._tokens = self.policy.burst
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._counters = {
+            "primaries": 0, "hedged": 0, "hedge_wins": 0,
+            "suppressed_budget": 0, "suppressed_outage": 0,
+        }
+
+    # ==================== 임계값 / 예산 ====================
+
+    def threshold(self, key: Hashable) -> Optional[float]:
+        """
+        헤지 임계값 (초, 표본이 min_samples 미만이면 None - 헤지하지 않음)
+
+        Args:
+            key: 호출 종류 (엔드포인트, 모델, 스트림 여부 등)
+        """
+        tracker = self._trackers.get(key)
+        if tracker is None or len(tracker) < self.policy.min_samples:
+            return None
+        value = tracker.quantile(self.policy.percentile)
+        return min(max(value, self.policy.min_delay), self.policy.max_delay)
+
+    def observe(self, key: Hashable, seconds: float) -> None:
+        """첫 응답까지 걸린 시간 기록"""
+        tracker = self._trackers.get(key)
+        if tracker is None:
+            with self._lock:
+                tracker = self._trackers.setdefault(key, LatencyTracker(self.policy.window))
+        tracker.observe(seconds)
+
+    def _note_primary(self) -> None:
+        with self._lock:
+            self._counters["primaries"] += 1
+            self._tokens = min(self._tokens + self.policy.ratio, self.policy.burst)
+
+    def _admit(self, endpoint: str) -> bool:
+        """헤지 허용 여부 (장애 중이거나 비율 예산이 없으면 거부)"""
+        if get_breaker(endpoint).state != CircuitBreaker.CLOSED:
+            with self._lock:
+                self._counters["suppressed_outage"] += 1
+            return False
+        with self._lock:
+            if self._tokens < 1:
+                self._counters["suppressed_budget"] += 1
+                return False
+            self._tokens -= 1
+            self._counters["hedged"] += 1
+            return True
+
+    def _record_win(self, hedge_won: bool) -> None:
+        if hedge_won:
+            with self._lock:
+                self._counters["hedge_wins"] += 1
+
+    # ==================== 동기 실행 ====================
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.policy.max_workers, thread_name_prefix="hedge"
+                    )
+        return self._pool
+
+    @staticmethod
+    def _wait(futures, timeout: Optional[float], deadline: Optional[Deadline], endpoint: str):
+        """
+        시도 중 하나가 끝나거나 timeout까지 대기
+
+        시도는 취소 시 스트림을 닫지 않으므로(헤지 중 스트림은 각자 스레드에서 정리)
+        상위 Deadline의 취소/예산 초과는 여기서 주기적으로 확인해 바로 예외로 알림
+        """
+        if deadline is None:
+            return wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+        end = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if end is None else max(end - time.monotonic(), 0.0)
+            step = _POLL_SECONDS if remaining is None else min(_POLL_SECONDS, remaining)
+            done, pending = wait(futures, timeout=step, return_when=FIRST_COMPLETED)
+            if done or (remaining is not None and remaining <= step):
+                return done, pending
+            deadline.check(endpoint)
+
+    def _timed(self, key: Hashable, attempt: Callable[[Deadline], Any], token: Deadline) -> Any:
+        started = time.perf_counter()
+        result = attempt(token)
+        self.observe(key, time.perf_counter() - started)
+        return result
+
+    def run(
+        self,
+        key: Hashable,
+        endpoint: str,
+        attempt: Callable[[Deadline], Any],
+        deadline: Optional[Deadline] = None,
+        on_hedge: Optional[Callable[[], None]] = None
+    ) -> Any:
+        """
+        헤지를 적용해 시도 1회 실행 (재시도는 호출자의 재시도 정책이 담당)
+
+        Args:
+            key: 호출 종류 (지연 분포 구분)
+            endpoint: 엔드포인트 분류 (서킷 브레이커 확인)
+            attempt: 한 번의 전송을 수행하는 함수 (시도별 취소 토큰을 받음)
+            deadline: 상위 마감 시간 (취소 시 두 시도 모두 취소)
+            on_hedge: 헤지 요청을 보낼 때 호출 (계측용)
+
+        Returns:
+            먼저 성공한 시도의 결과 (둘 다 실패하면 첫 오류를 발생)
+        """
+        self._note_primary()
+        delay = self.threshold(key)
+        if delay is None:
+            return self._timed(key, attempt, deadline if deadline is not None else Deadline())
+
+        pool = self._get_pool()
+        tokens = {}
+        primary_token = deadline.child() if deadline is not None else Deadline()
+        primary = pool.submit(self._timed, key, attempt, primary_token)
+        tokens[primary] = primary_token
+        winner = None
+        try:
+            done, _ = self._wait([primary], delay, deadline, endpoint)
+            if not done and self._admit(endpoint):
+                hedge_token = deadline.child() if deadline is not None else Deadline()
+                tokens[pool.submit(self._timed, key, attempt, hedge_token)] = hedge_token
+                if on_hedge is not None:
+                    on_hedge()
+
+            errors = []
+            pending = set(tokens)
+            while pending and winner is None:
+                done, pending = self._wait(pending, None, deadline, endpoint)
+                for future in done:
+                    if future.exception() is None:
+                        winner = future
+                        break
+                    errors.append(future.exception())
+            if winner is None:
+                raise errors[0]
+            self._record_win(winner is not primary)
+            return winner.result()
+        finally:
+            for future, token in tokens.items():
+                if future is winner:
+                    if deadline is not None:
+                        deadline.release_child(token)
+                    continue
+                token.cancel("헤지 패자")
+                # 진행 중인 시도는 끝난 스레드에서 정리 (이미 끝났으면 여기서 바로)
+                future.add_done_callback(lambda f, token=token: self._discard(f, deadline, token))
+
+    @staticmethod
+    def _discard(future, deadline: Optional[Deadline], token: Deadline) -> None:
+        """진 시도 정리 (늦게 성공한 스트림은 닫고 상위 등록 해제)"""
+        if deadline is not None:
+            deadline.release_child(token)
+        if future.cancelled() or future.exception() is not None:
+            return
+        close = getattr(future.result(), "close", None)
+        if close is not None:
+            close()
+
+    # ==================== 비동기 실행 ====================
+
+    async def _timed_async(self, key: Hashable, attempt: Callable[[], Awaitable[Any]]) -> Any:
+        started = time.perf_counter()
+        result = await attempt()
+        self.observe(key, time.perf_counter() - started)
+        return result
+
+    async def run_async(
+        self,
+        key: Hashable,
+        endpoint: str,
+        attempt: Callable[[], Awaitable[Any]],
+        on_hedge: Optional[Callable[[], None]] = None
+    ) -> Any:
+        """헤지를 적용해 시도 1회 실행 (비동기, 진 쪽은 작업 취소로 정리)"""
+        self._note_primary()
+        delay = self.threshold(key)
+        if delay is None:
+            return await self._timed_async(key, attempt)
+
+        primary = asyncio.ensure_future(self._timed_async(key, attempt))
+        tasks = [primary]
+        winner = None
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and self._admit(endpoint):
+                tasks.append(asyncio.ensure_future(self._timed_async(key, attempt)))
+                if on_hedge is not None:
+                    on_hedge()
+
+            errors = []
+            pending = set(tasks)
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        winner = task
+                        break
+                    errors.append(task.exception())
+            if winner is None:
+                raise errors[0]
+            self._record_win(winner is not primary)
+            return winner.result()
+        finally:
+            for task in tasks:
+                if task is winner:
+                    continue
+                if not task.done():
+                    task.cancel()
+                task.add_done_callback(self._discard_async)
+
+    @staticmethod
+    def _discard_async(task: "asyncio.Task") -> None:
+        if task.cancelled() or task.exception() is not None:
+            return
+        aclose = getattr(task.result(), "aclose", None)
+        if aclose is not None:
+            asyncio.ensure_future(aclose())
+
+    # ==================== 통계 ====================
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        헤지 통계
+
+        Returns:
+            dict: primaries, hedged, hedge_wins, hedge_rate, suppressed_budget, suppressed_outage,
+                thresholds({호출 종류: 임계값 초})
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            keys = list(self._trackers)
+        counters["hedge_rate"] = counters["hedged"] / counters["primaries"] if counters["primaries"] else 0.0
+        counters["thresholds"] = {"/".join(map(str, key)): self.threshold(key) for key in keys}
+        return counters
+
+
+def hedging_enabled() -> bool:
+    """UPSTAGE_HEDGE 환경변수 확인 (기본 비활성)"""
+    return os.getenv("UPSTAGE_HEDGE", "0").lower() in ("1", "true", "yes")
+
+
+_hedger: Optional[Hedger] = None
+_hedger_lock = threading.Lock()
+
+
+def get_hedger() -> Optional[Hedger]:
+    """프로세스 공유 Hedger 반환 (지연 생성, 비활성 시 None)"""
+    global _hedger
+    if not hedging_enabled():
+        return None
+    if _hedger is None:
+        with _hedger_lock:
+            if _hedger is None:
+                _hedger = Hedger(HedgePolicy.from_env())
+    return _hedger
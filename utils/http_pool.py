@@ -0,0 +1,266 @@
+"""
+🔗 공유 HTTP 커넥션 풀
+
+프로세스 전체에서 하나의 keep-alive 세션을 공유하여
+Document Parse / Information Extract 호출마다 발생하던
+DNS + TCP + TLS 핸드셰이크 비용을 제거
+
+- 모든 UpstageClient 인스턴스와 Streamlit 세션이 같은 풀을 사용
+- Solar LLM(OpenAI SDK) 호출도 프로세스 공유 httpx 클라이언트 하나를 사용 (API 키는 요청마다 헤더로 전달)
+- 풀 크기 및 호스트별 최대 연결 수 설정 가능 (환경변수 또는 configure_http_pool)
+- 연결 재사용 통계 제공 (새 연결 수 vs 전체 요청 수), 현재 열린 연결 수 제공
+
+Functions:
+    get_http_session: 공유 requests.Session 반환
+    get_llm_http_client: OpenAI SDK용 공유 httpx.Client 반환
+    configure_http_pool: 풀 설정 변경 (기존 세션 교체)
+    get_pool_stats: 연결 재사용 통계 조회
+    get_connection_stats: 현재 열린 연결 수 조회
+    close_http_pool: 공유 세션 종료
+"""
+
+import os
+import threading
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional
+
+import httpx
+import requests
+from openai import DefaultHttpxClient
+from requests.adapters import HTTPAdapter
+
+
+@dataclass
+class PoolConfig:
+    """
+    커넥션 풀 설정
+
+    Attributes:
+        pool_connections: 캐시할 호스트별 커넥션 풀 개수
+        pool_maxsize: 호스트당 유지할 최대 연결 수
+        pool_block: 최대 연결 수 초과 시 대기 여부 (False면 임시 연결 생성)
+    """
+    pool_connections: int = 10
+    pool_maxsize: int = 32
+    pool_block: bool = False
+
+    @classmethod
+    def from_env(cls) -> "PoolConfig":
+        """환경변수(UPSTAGE_POOL_CONNECTIONS, UPSTAGE_POOL_MAXSIZE, UPSTAGE_POOL_BLOCK)에서 설정 로드"""
+        return cls(
+            pool_connections=int(os.getenv("UPSTAGE_POOL_CONNECTIONS", cls.pool_connections)),
+            pool_maxsize=int(os.getenv("UPSTAGE_POOL_MAXSIZE", cls.pool_maxsize)),
+            pool_block=os.getenv("UPSTAGE_POOL_BLOCK", "").lower() in ("1", "true", "yes"),
+        )
+
+
+class _PooledTransport:
+    """
+    keep-alive 세션 + 요청 카운터 (내부 전용)
+
+    urllib3 커넥션 풀의 num_connections / num_requests 값과
+    세션 응답 훅에서 센 요청 수를 합쳐 재사용 통계를 계산
+    """
+
+    def __init__(self, config: PoolConfig):
+        self.config = config
+        self.session = requests.Session()
+        self.adapter = HTTPAdapter(
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize,
+            pool_block=config.pool_block,
+        )
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+        self._lock = threading.Lock()
+        self.total_requests = 0
+        self.session.hooks["response"].append(self._count_response)
+
+    def _count_response(self, response, *args, **kwargs):
+        """응답 훅 - 전체 요청 수 집계"""
+        with self._lock:
+            self.total_requests += 1
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        """호스트별 연결 수 및 재사용 비율 계산"""
+        hosts = {}
+        new_connections = 0
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{pool.scheme}://{pool.host}:{pool.port}"
+            # LifoQueue는 빈 슬롯을 None으로 채워두므로 실제 연결만 집계
+            idle = sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool is not None else 0
+            hosts[host] = {
+                "new_connections": pool.num_connections,
+                "requests": pool.num_requests,
+                "idle_connections": idle,
+            }
+            new_connections += pool.num_connections
+
+        with self._lock:
+            total = self.total_requests
+
+        reused = max(total - new_connections, 0)
+        return {
+            "config": asdict(self.config),
+            "total_requests": total,
+            "new_connections": new_connections,
+            "reused_connections": reused,
+            "reuse_ratio": (reused / total) if total else 0.0,
+            "hosts": hosts,
+        }
+
+    def connections(self) -> Dict[str, int]:
+        """현재 열린 연결 수 (open: 유휴 + 사용 중, idle: 유휴)"""
+        open_count = idle_count = 0
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None or pool.pool is None:
+                continue
+            slots = list(pool.pool.queue)
+            idle = sum(1 for conn in slots if conn is not None)
+            # 큐에서 빠져 있는 자리는 대여 중인 연결
+            open_count += idle + max(pool.pool.maxsize - len(slots), 0)
+            idle_count += idle
+        return {"open": open_count, "idle": idle_count}
+
+    def close(self) -> None:
+        """세션 및 모든 풀 연결 종료"""
+        self.session.close()
+
+
+_transport: Optional[_PooledTransport] = None
+_transport_lock = threading.Lock()
+
+_llm_client: Optional[httpx.Client] = None
+
+
+def get_http_session() -> requests.Session:
+    """
+    프로세스 공유 keep-alive 세션 반환 (지연 생성, 스레드 안전)
+
+    Returns:
+        requests.Session: 모든 Upstage 원시 엔드포인트 호출에 사용하는 세션
+    """
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = _PooledTransport(PoolConfig.from_env())
+    return _transport.session
+
+
+def get_llm_http_client() -> httpx.Client:
+    """
+    OpenAI SDK용 프로세스 공유 httpx 클라이언트 (지연 생성, 스레드 안전)
+
+    API 키가 달라도 같은 호스트로의 keep-alive 연결을 함께 사용
+    (키는 요청마다 Authorization 헤더로 전달되므로 연결에 묶이지 않음)
+
+    Returns:
+        httpx.Client: OpenAI(http_client=...)에 넘길 클라이언트 (닫혀 있으면 새로 생성)
+    """
+    global _llm_client
+    client = _llm_client
+    if client is None or client.is_closed:
+        with _transport_lock:
+            if _llm_client is None or _llm_client.is_closed:
+                config = _transport.config if _transport else PoolConfig.from_env()
+                _llm_client = DefaultHttpxClient(limits=httpx.Limits(
+                    max_connections=config.pool_maxsize,
+                    max_keepalive_connections=config.pool_maxsize,
+                ))
+            client = _llm_client
+    return client
+
+
+def configure_http_pool(
+    pool_connections: Optional[int] = None,
+    pool_maxsize: Optional[int] = None,
+    pool_block: Optional[bool] = None
+) -> PoolConfig:
+    """
+    공유 풀 설정 변경
+
+    새 설정으로 세션을 교체하고 기존 세션의 연결은 닫음.
+    진행 중인 요청은 기존 세션 객체로 끝까지 처리됨.
+
+    Args:
+        pool_connections: 호스트별 풀 개수
+        pool_maxsize: 호스트당 최대 연결 수
+        pool_block: 최대 연결 수 초과 시 대기 여부
+
+    Returns:
+        PoolConfig: 적용된 설정
+    """
+    global _transport
+    with _transport_lock:
+        base = _transport.config if _transport else PoolConfig.from_env()
+        config = PoolConfig(
+            pool_connections=pool_connections if pool_connections is not None else base.pool_connections,
+            pool_maxsize=pool_maxsize if pool_maxsize is not None else base.pool_maxsize,
+            pool_block=pool_block if pool_block is not None else base.pool_block,
+        )
+        old = _transport
+        _transport = _PooledTransport(config)
+    if old is not None:
+        old.close()
+    return config
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    연결 재사용 통계 조회
+
+    Returns:
+        dict: total_requests, new_connections, reused_connections, reuse_ratio, hosts
+    """
+    if _transport is None:
+        return {
+            "config": asdict(PoolConfig.from_env()),
+            "total_requests": 0,
+            "new_connections": 0,
+            "reused_connections": 0,
+            "reuse_ratio": 0.0,
+            "hosts": {},
+        }
+    return _transport.stats()
+
+
+def get_connection_stats() -> Dict[str, Dict[str, int]]:
+    """
+    현재 열린 연결 수
+
+    Returns:
+        dict: {"raw": 원시 엔드포인트 세션, "llm": OpenAI SDK 클라이언트} 각각 {open, idle}
+    """
+    raw = _transport.connections() if _transport is not None else {"open": 0, "idle": 0}
+    llm = {"open": 0, "idle": 0}
+    client = _llm_client
+    if client is not None and not client.is_closed:
+        # httpx 전송 계층의 httpcore 풀 (SDK 버전에 따라 없으면 0으로 보고)
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        for connection in list(getattr(pool, "connections", [])):
+            if connection.is_closed():
+                continue
+            llm["open"] += 1
+            llm["idle"] += 1 if connection.is_idle() else 0
+    return {"raw": raw, "llm": llm}
+
+
+def close_http_pool() -> None:
+    """공유 세션과 LLM 클라이언트 종료 (다음 호출 시 재생성)"""
+    global _transport, _llm_client
+    with _transport_lock:
+        old, _transport = _transport, None
+        llm, _llm_client = _llm_client, None
+    if old is not None:
+        old.close()
+    if llm is not None:
+        llm.close()
@@ -0,0 +1,463 @@
+"""
+⏱️ Upstage 호출 계측 (Instrumentation)
+
+Step 4가 느린 세션이 대기열(거버너), 네트워크, 모델 추론 중 어디서 시간을 쓰는지 구분하기 위해
+호출 단위로 다음을 기록
+- 요청 시작 시각, 거버너 대기 시간, 연결(응답 헤더 수신)까지 시간, 첫 토큰까지 시간(TTFT)
+- 조각 간 간격(평균/최대/p95), 전체 소요 시간, 조각/토큰 수
+- 요청/응답 크기, HTTP 상태, 결과(ok, error, cancelled, cached, coalesced)
+- 호출한 에이전트와 단계(stage) 태그, 에이전트가 계산한 프롬프트 토큰 수(prompt_tokens 태그)
+
+싱크(sink)는 교체 가능 (로그, 메모리 링 버퍼, JSONL 파일)
+싱크가 없으면 아무 일도 하지 않는 NOOP_SPAN을 돌려주어 오버헤드가 거의 없음
+
+Classes:
+    CallRecord: 호출 1건의 계측 기록
+    CallSpan: 진행 중인 호출 계측기
+    Instrumentation: 싱크 관리 및 Span 발급
+    LogSink: logging 출력 싱크
+    RingBufferSink: 최근 기록 보관 싱크 (요약 통계 제공)
+    FileSink: JSONL 파일 싱크
+
+Functions:
+    get_instrumentation: 프로세스 공유 Instrumentation 반환
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Callable
+
+
+@dataclass
+class CallRecord:
+    """
+    호출 1건의 계측 기록
+
+    Attributes:
+        call_id: 호출 식별자
+        endpoint: 엔드포인트 분류 (parse, extract, chat, groundedness)
+        operation: 호출 종류 (chat, chat_stream, parse, extract 등)
+        agent: 호출한 에이전트
+        stage: 호출 단계
+        model: 모델명
+        started_at: 시작 시각 (epoch 초)
+        queue_wait: 거버너 대기 시간 합계 (초)
+        connect_seconds: 마지막 시도의 요청 전송 ~ 응답 헤더 수신 시간 (초)
+        ttft_seconds: 첫 조각까지 시간 (초, 스트림만)
+        duration_seconds: 전체 소요 시간 (초)
+        attempts: 실제 전송 시도 횟수 (재시도, 헤지 포함)
+        hedged: 헤지 요청을 보냈는지 (utils.hedging)
+        chunk_count: 전달한 조각 수
+        char_count: 전달한 글자 수
+        tokens: 서버가 보고한 출력 토큰 수 (없으면 None)
+        prompt_tokens: 에이전트가 계산한 프롬프트 토큰 수 (utils.token_budget, 없으면 None)
+        avg_gap_seconds: 조각 간 평균 간격
+        max_gap_seconds: 조각 간 최대 간격
+        p95_gap_seconds: 조각 간 간격 95 백분위
+        request_bytes: 요청 본문 크기
+        response_bytes: 응답 크기
+        status: HTTP 상태 코드
+        outcome: ok, error, cancelled, cached, coalesced
+        error: 오류 메시지
+    """
+    call_id: str
+    endpoint: str
+    operation: str
+    agent: Optional[str] = None
+    stage: Optional[str] = None
+    model: Optional[str] = None
+    started_at: float = 0.0
+    queue_wait: float = 0.0
+    connect_seconds: Optional[float] = None
+    ttft_seconds: Optional[float] = None
+    duration_seconds: float = 0.0
+    attempts: int = 0
+    hedged: bool = False
+    chunk_count: int = 0
+    char_count: int = 0
+    tokens: Optional[int] = None
+    prompt_tokens: Optional[int] = None
+    avg_gap_seconds: float = 0.0
+    max_gap_seconds: float = 0.0
+    p95_gap_seconds: float = 0.0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    status: Optional[int] = None
+    outcome: str = "ok"
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class _NoopSpan:
+    """계측 비활성 시 사용하는 빈 Span (모든 메서드가 아무 일도 하지 않음)"""
+
+    __slots__ = ()
+
+    def queued(self, seconds: float) -> None:
+        pass
+
+    def attempt(self) -> None:
+        pass
+
+    def hedged(self) -> None:
+        pass
+
+    def connected(
+        self,
+        status: Optional[int] = 200,
+        elapsed: Optional[float] = None,
+        response_bytes: Optional[int] = None,
+        tokens: Optional[int] = None
+    ) -> None:
+        pass
+
+    def chunk(self, text: str) -> None:
+        pass
+
+    def finish(self, outcome: Optional[str] = None, **kwargs) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+# 간격 분포 계산용으로 보관하는 최대 간격 수
+_MAX_GAPS = 4096
+
+
+class CallSpan:
+    """
+    진행 중인 호출 계측기
+
+    클라이언트 각 계층에서 queued → attempt → connected → chunk* → finish 순으로 호출
+    """
+
+    def __init__(self, instrumentation: "Instrumentation", record: CallRecord):
+        self._instrumentation = instrumentation
+        self.record = record
+        self._started = time.perf_counter()
+        self._attempt_started = self._started
+        self._last_chunk: Optional[float] = None
+        self._gaps: List[float] = []
+        self._gap_total = 0.0
+        self._finished = False
+
+    def queued(self, seconds: float) -> None:
+        """거버너 대기 시간 누적"""
+        self.record.queue_wait += seconds
+
+    def attempt(self) -> None:
+        """전송 시도 시작 (거버너 슬롯 획득 후)"""
+        self.record.attempts += 1
+        self._attempt_started = time.perf_counter()
+
+    def hedged(self) -> None:
+        """첫 시도가 늦어 헤지 요청을 보냄"""
+        self.record.hedged = True
+
+    def connected(
+        self,
+        status: Optional[int] = 200,
+        elapsed: Optional[float] = None,
+        response_bytes: Optional[int] = None,
+        tokens: Optional[int] = None
+    ) -> None:
+        """
+        응답 헤더(비스트리밍은 응답 전체) 수신
+
+        Args:
+            status: HTTP 상태 코드
+            elapsed: 연결 시간 (미지정 시 시도 시작부터 측정)
+            response_bytes: 응답 본문 크기
+            tokens: 서버가 보고한 출력 토큰 수
+        """
+        record = self.record
+        record.connect_seconds = (
+            elapsed if elapsed is not None else time.perf_counter() - self._attempt_started
+        )
+        record.status = status
+        if response_bytes is not None:
+            record.response_bytes = response_bytes
+        if tokens is not None:
+            record.tokens = tokens
+
+    def chunk(self, text: str) -> None:
+        """조각 전달"""
+        now = time.perf_counter()
+        record = self.record
+        if self._last_chunk is None:
+            record.ttft_seconds = now - self._started
+        else:
+            gap = now - self._last_chunk
+            self._gap_total += gap
+            if gap > record.max_gap_seconds:
+                record.max_gap_seconds = gap
+            if len(self._gaps) < _MAX_GAPS:
+                self._gaps.append(gap)
+        self._last_chunk = now
+        record.chunk_count += 1
+        record.char_count += len(text)
+        record.response_bytes += len(text.encode("utf-8"))
+
+    def finish(
+        self,
+        outcome: Optional[str] = None,
+        error: Optional[BaseException] = None,
+        response_bytes: Optional[int] = None,
+        tokens: Optional[int] = None
+    ) -> None:
+        """
+        호출 종료 및 싱크로 기록 전달 (여러 번 호출해도 한 번만 기록)
+
+        Args:
+            outcome: 결과 (미지정 시 오류/시도 여부로 결정)
+            error: 발생한 예외
+            response_bytes: 응답 크기 (미지정 시 connected/chunk에서 누적한 값)
+            tokens: 서버가 보고한 출력 토큰 수
+        """
+        if self._finished:
+            return
+        self._finished = True
+
+        record = self.record
+        record.duration_seconds = time.perf_counter() - self._started
+        if self._gaps:
+            ordered = sorted(self._gaps)
+            record.avg_gap_seconds = self._gap_total / (record.chunk_count - 1)
+            record.p95_gap_seconds = ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+        if tokens is not None:
+            record.tokens = tokens
+        if response_bytes is not None:
+            record.response_bytes = response_bytes
+
+        if error is not None:
+            record.error = str(error)
+            record.status = getattr(error, "status_code", record.status)
+            record.outcome = outcome or "error"
+        elif outcome is not None:
+            record.outcome = outcome
+        elif record.attempts == 0:
+            # 네트워크 전송 없이 끝남 - 진행 중인 동일 요청에 합류
+            record.outcome = "coalesced"
+
+        self._instrumentation.emit(record)
+
+
+class Instrumentation:
+    """
+    싱크 관리 및 Span 발급
+
+    Example:
+        >>> instrumentation = Instrumentation([RingBufferSink()])
+        >>> client = UpstageClient(instrumentation=instrumentation)
+        >>> for chunk in client.chat_stream("...", tags={"agent": "recommend", "stage": "step4"}):
+        ...     pass
+        >>> instrumentation.sinks[0].summary()
+    """
+
+    def __init__(self, sinks: Optional[List[Callable[[CallRecord], None]]] = None):
+        self.sinks: List[Callable[[CallRecord], None]] = list(sinks or [])
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.sinks)
+
+    def add_sink(self, sink: Callable[[CallRecord], None]) -> None:
+        self.sinks.append(sink)
+
+    def remove_sink(self, sink: Callable[[CallRecord], None]) -> None:
+        if sink in self.sinks:
+            self.sinks.remove(sink)
+
+    def span(
+        self,
+        endpoint: str,
+        operation: str,
+        tags: Optional[Dict[str, Any]] = None,
+        model: Optional[str] = None,
+        payload: Any = None
+    ):
+        """
+        호출 계측 시작
+
+        Args:
+            endpoint: 엔드포인트 분류
+            operation: 호출 종류
+            tags: {"agent": ..., "stage": ..., "prompt_tokens": ...}
+            model: 모델명
+            payload: 요청 본문 크기 계산용 (bytes 또는 JSON 직렬화 가능한 값)
+
+        Returns:
+            CallSpan | NOOP_SPAN: 싱크가 없으면 NOOP_SPAN
+        """
+        if not self.sinks:
+            return NOOP_SPAN
+
+        tags = tags or {}
+        record = CallRecord(
+            call_id=uuid.uuid4().hex[:12],
+            endpoint=endpoint,
+            operation=operation,
+            agent=tags.get("agent"),
+            stage=tags.get("stage"),
+            prompt_tokens=tags.get("prompt_tokens"),
+            model=model,
+            started_at=time.time(),
+            request_bytes=_payload_size(payload),
+        )
+        return CallSpan(self, record)
+
+    def emit(self, record: CallRecord) -> None:
+        """모든 싱크로 기록 전달 (싱크 오류는 호출 결과에 영향을 주지 않음)"""
+        for sink in list(self.sinks):
+            try:
+                sink(record)
+            except Exception as e:
+                print(f"계측 기록 실패 ({type(sink).__name__}): {e}")
+
+
+def _payload_size(payload: Any) -> int:
+    """요청 본문 크기 (바이트)"""
+    if payload is None:
+        return 0
+    if isinstance(payload, (bytes, bytearray, memoryview)):
+        return len(payload)
+    if hasattr(payload, "__len__") and hasattr(payload, "read"):
+        return len(payload)
+    try:
+        return len(json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return 0
+
+
+class LogSink:
+    """logging으로 한 줄 요약 출력"""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO):
+        self.logger = logger or logging.getLogger("imf.upstage")
+        self.level = level
+
+    def __call__(self, record: CallRecord) -> None:
+        self.logger.log(
+            self.level,
+            "%s %s/%s [%s/%s] %s status=%s prompt=%s queue=%.3fs connect=%s ttft=%s total=%.3fs chunks=%d gap_max=%.3fs",
+            record.call_id, record.endpoint, record.operation, record.agent, record.stage,
+            record.outcome, record.status,
+            record.prompt_tokens if record.prompt_tokens is not None else "-",
+            record.queue_wait,
+            f"{record.connect_seconds:.3f}s" if record.connect_seconds is not None else "-",
+            f"{record.ttft_seconds:.3f}s" if record.ttft_seconds is not None else "-",
+            record.duration_seconds, record.chunk_count, record.max_gap_seconds,
+        )
+
+
+class RingBufferSink:
+    """
+    최근 기록을 메모리에 보관 (진단 화면/테스트용)
+
+    Attributes:
+        capacity: 보관할 최대 기록 수
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self._records: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def __call__(self, record: CallRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+
+    def records(self) -> List[CallRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        (에이전트, 단계, 호출 종류)별 요약
+
+        Returns:
+            dict: {"agent/stage/operation": {count, errors, hedged, avg_prompt_tokens, avg_queue_wait, avg_connect, avg_ttft, max_ttft, avg_duration}}
+        """
+        groups: Dict[str, List[CallRecord]] = {}
+        for record in self.records():
+            groups.setdefault(f"{record.agent}/{record.stage}/{record.operation}", []).append(record)
+
+        def average(values):
+            values = [v for v in values if v is not None]
+            return (sum(values) / len(values)) if values else None
+
+        return {
+            name: {
+                "count": len(records),
+                "errors": sum(1 for r in records if r.outcome == "error"),
+                "hedged": sum(1 for r in records if r.hedged),
+                "avg_prompt_tokens": average(r.prompt_tokens for r in records),
+                "avg_queue_wait": average(r.queue_wait for r in records),
+                "avg_connect": average(r.connect_seconds for r in records),
+                "avg_ttft": average(r.ttft_seconds for r in records),
+                "max_ttft": max((r.ttft_seconds for r in records if r.ttft_seconds is not None), default=None),
+                "avg_duration": average(r.duration_seconds for r in records),
+            }
+            for name, records in groups.items()
+        }
+
+
+class FileSink:
+    """JSONL 파일에 기록 추가"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def __call__(self, record: CallRecord) -> None:
+        line = json.dumps(record.to_dict(), ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+_instrumentation: Optional[Instrumentation] = None
+_instrumentation_lock = threading.Lock()
+
+
+def get_instrumentation() -> Instrumentation:
+    """
+    프로세스 공유 Instrumentation 반환 (지연 생성)
+
+    환경변수:
+        UPSTAGE_INSTRUMENT: 사용할 싱크 목록 (쉼표 구분: log, memory, file / 미설정 시 비활성)
+        UPSTAGE_INSTRUMENT_FILE: file 싱크 경로 (기본 .cache/upstage_calls.jsonl)
+        UPSTAGE_INSTRUMENT_CAPACITY: memory 싱크 보관 수 (기본 1000)
+
+    Returns:
+        Instrumentation: 싱크가 없으면 비활성 상태 (add_sink로 실행 중 추가 가능)
+    """
+    global _instrumentation
+    if _instrumentation is None:
+        with _instrumentation_lock:
+            if _instrumentation is None:
+                sinks = []
+                names = [n.strip().lower() for n in os.getenv("UPSTAGE_INSTRUMENT", "").split(",") if n.strip()]
+                if "log" in names:
+                    sinks.append(LogSink())
+                if "memory" in names:
+                    sinks.append(RingBufferSink(int(os.getenv("UPSTAGE_INSTRUMENT_CAPACITY", "1000"))))
+                if "file" in names:
+                    default_path = Path(__file__).parent.parent / ".cache" / "upstage_calls.jsonl"
+                    sinks.append(FileSink(os.getenv("UPSTAGE_INSTRUMENT_FILE") or str(default_path)))
+                _instrumentation = Instrumentation(sinks)
+    return _instrumentation
@@ -0,0 +1,404 @@
+"""
+✂️ JSON 응답 완성 시점에 LLM 스트림 조기 종료
+
+ExtractAgent / RecommendAgent / VerifyAgent는 chat_stream을 끝까지 받은 뒤 ```json 블록을 꺼내는데,
+모델이 닫는 펜스 뒤에 설명을 덧붙이는 경우가 많아 그만큼 지연과 토큰을 낭비했음
+
+스트림 조각을 받으면서 펜스(```)와 중괄호 균형을 점진적으로 추적하고
+완성되어 파싱 가능한 JSON 객체가 도착하면 그 지점까지만 전달한 뒤 원본 스트림을 닫음
+- 문자열 안의 괄호/이스케이프는 무시
+- 괄호는 맞지만 파싱되지 않거나 필수 키가 없는 객체(설명 속 예시 등)는 건너뛰고 계속 찾음
+- JSON이 끝내 완성되지 않으면 기존처럼 끝까지 전달
+- 절약량 추정: 일부 스트림(sample_rate)은 끝까지 받아 JSON 뒤에 오는 꼬리의 토큰/시간을 측정하고,
+  조기 종료한 스트림마다 그 평균을 절약량으로 집계
+- 조기 종료 시 원본 스트림에 StreamComplete를 던져 닫으므로
+  응답 캐시(chat_stream use_cache)는 중간에 버린 스트림과 구분해 완성된 응답을 저장
+
+Classes:
+    StreamComplete: 응답이 완성되어 원본 스트림을 닫는다는 신호
+    JsonScanner: 점진적 JSON 객체 완성 감지
+    JsonStreamStats: 조기 종료/절약량 통계 (프로세스 공유)
+    JsonStreamCutoff: 동기 스트림 래퍼
+    AsyncJsonStreamCutoff: 비동기 스트림 래퍼
+
+Functions:
+    json_early_stop_enabled: 에이전트 기본 사용 여부 (IMF_JSON_EARLY_STOP)
+    get_json_stream_stats: 프로세스 공유 통계 반환
+"""
+
+import os
+import json
+import time
+import random
+import threading
+from typing import Dict, Any, Optional, Iterable, Iterator, AsyncIterator, Sequence
+
+from .token_budget import count_tokens
+
+
+class StreamComplete(Exception):
+    """
+    응답이 완성되어 원본 스트림을 닫는다는 신호
+
+    원본 제너레이터에 throw로 전달하면 받는 쪽은 중간에 버려진 스트림(close)이 아니라
+    필요한 응답을 모두 받은 것으로 구분할 수 있음 (UpstageClient._cached_stream이 응답 캐시에 저장)
+    (GeneratorExit는 yield from이 하위 제너레이터에 close()로 바꿔 전달하므로 일반 예외로 정의)
+    """
+
+
+def _complete(iterator: Any) -> None:
+    """동기 원본 스트림에 StreamComplete를 던져 닫음 (throw가 없는 반복자는 무시)"""
+    if not hasattr(iterator, "throw"):
+        return
+    try:
+        iterator.throw(StreamComplete())
+    except (StreamComplete, StopIteration):
+        pass
+
+
+async def _acomplete(iterator: Any) -> None:
+    """비동기 원본 스트림에 StreamComplete를 던져 닫음 (athrow가 없는 반복자는 무시)"""
+    if not hasattr(iterator, "athrow"):
+        return
+    try:
+        await iterator.athrow(StreamComplete())
+    except (StreamComplete, StopAsyncIteration):
+        pass
+
+
+class JsonScanner:
+    """
+    점진적 JSON 객체 완성 감지
+
+    feed()로 조각을 넣을 때마다 새로 들어온 글자만 검사하므로 전체 비용은 응답 길이에 비례
+
+    Attributes:
+        required_keys: 완성으로 인정할 객체가 가져야 하는 키
+        text: 지금까지 받은 전체 텍스트
+        value: 완성된 JSON 객체 (완성 전에는 None)
+        end: 완성된 객체의 끝 위치 (text 기준, 완성 전에는 None)
+
+    Example:
+        >>> scanner = JsonScanner(required_keys=("score",))
+        >>> scanner.feed('분석 결과:\\n```json\\n{"score": 0.9')
+        False
+        >>> scanner.feed('}\\n```\\n추가 설명...')
+        True
+        >>> scanner.value, scanner.text[:scanner.end]
+    """
+
+    def __init__(self, required_keys: Sequence[str] = ()):
+        self.required_keys = tuple(required_keys)
+        self.text = ""
+        self.value: Optional[Dict[str, Any]] = None
+        self.end: Optional[int] = None
+        self._start: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def complete(self) -> bool:
+        return self.end is not None
+
+    def feed(self, chunk: str) -> bool:
+        """
+        조각 추가
+
+        Returns:
+            bool: 이번 조각까지로 JSON 객체가 완성되었는지 여부
+        """
+        if self.complete:
+            self.text += chunk
+            return True
+
+        offset = len(self.text)
+        self.text += chunk
+        for i, char in enumerate(chunk, offset):
+            if self._depth == 0:
+                if char == "{":
+                    self._start, self._depth = i, 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0 and self._accept(self.text[self._start:i + 1]):
+                    self.end = i + 1
+                    return True
+            elif char == "`":
+                # 객체가 닫히기 전에 펜스가 나오면 설명 속 괄호였던 것 - 처음부터 다시 찾음
+                self._depth = 0
+        return False
+
+    def _accept(self, candidate: str) -> bool:
+        try:
+            value = json.loads(candidate)
+        except ValueError:
+            return False
+        if not isinstance(value, dict) or any(key not in value for key in self.required_keys):
+            return False
+        self.value = value
+        return True
+
+
+class JsonStreamStats:
+    """
+    조기 종료/절약량 통계
+
+    Attributes:
+        sample_rate: 꼬리 측정을 위해 끝까지 받는 스트림 비율 (0.0~1.0)
+    """
+
+    def __init__(self, sample_rate: float = 0.05):
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+        self._counters = {"streams": 0, "stopped": 0, "sampled": 0, "incomplete": 0}
+        self._tail_tokens = 0
+        self._tail_seconds = 0.0
+        self._discarded_tokens = 0
+
+    def should_sample(self) -> bool:
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def record(
+        self,
+        outcome: str,
+        tail_tokens: int = 0,
+        tail_seconds: float = 0.0
+    ) -> None:
+        """
+        스트림 하나의 결과 기록
+
+        Args:
+            outcome: "stopped" (조기 종료) / "sampled" (끝까지 받아 꼬리 측정) / "incomplete" (JSON 미완성)
+            tail_tokens: stopped는 버린 조각 나머지, sampled는 JSON 뒤 꼬리 전체 토큰 수
+            tail_seconds: sampled의 JSON 완성 ~ 스트림 종료 시간
+        """
+        with self._lock:
+            self._counters["streams"] += 1
+            self._counters[outcome] += 1
+            if outcome == "sampled":
+                self._tail_tokens += tail_tokens
+                self._tail_seconds += tail_seconds
+            elif outcome == "stopped":
+                self._discarded_tokens += tail_tokens
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        통계
+
+        Returns:
+            dict: streams, stopped, sampled, incomplete, tail_tokens_avg, tail_ms_avg,
+                  tokens_saved_est, ms_saved_est (표본이 없으면 추정값 None),
+                  discarded_tokens (조기 종료 시 마지막 조각에서 잘라낸 토큰 수)
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+            sampled = stats["sampled"]
+            tail_tokens = self._tail_tokens
+            tail_seconds = self._tail_seconds
+            discarded = self._discarded_tokens
+
+        if sampled:
+            stats["tail_tokens_avg"] = tail_tokens / sampled
+            stats["tail_ms_avg"] = tail_seconds * 1000 / sampled
+            stats["tokens_saved_est"] = stats["tail_tokens_avg"] * stats["stopped"]
+            stats["ms_saved_est"] = stats["tail_ms_avg"] * stats["stopped"]
+        else:
+            stats.update(tail_tokens_avg=None, tail_ms_avg=None, tokens_saved_est=None, ms_saved_est=None)
+        stats["discarded_tokens"] = discarded
+        return stats
+
+    def reset(self) -> None:
+        with self._lock:
+            for key in self._counters:
+                self._counters[key] = 0
+            self._tail_tokens = 0
+            self._tail_seconds = 0.0
+            self._discarded_tokens = 0
+
+
+class _CutoffState:
+    """동기/비동기 래퍼 공통 상태 (조각 처리 + 통계 기록)"""
+
+    def __init__(self, required_keys: Sequence[str], stats: Optional[JsonStreamStats], sample: Optional[bool]):
+        self.scanner = JsonScanner(required_keys)
+        self.stats = stats or get_json_stream_stats()
+        self.sample = self.stats.should_sample() if sample is None else sample
+        self.started_at = time.monotonic()
+        self.json_seconds: Optional[float] = None
+        self.total_seconds: Optional[float] = None
+        self.stopped = False
+        self._recorded = False
+
+    def process(self, chunk: str) -> str:
+        """
+        조각 처리
+
+        Returns:
+            str: 호출자에게 전달할 텍스트 (조기 종료하는 조각은 JSON 끝까지만, 이후 stopped=True)
+        """
+        if self.scanner.complete:
+            # 표본 스트림: 꼬리까지 전달하며 측정
+            self.scanner.feed(chunk)
+            return chunk
+        before = len(self.scanner.text)
+        if not self.scanner.feed(chunk):
+            return chunk
+        self.json_seconds = time.monotonic() - self.started_at
+        if self.sample:
+            return chunk
+        self.stopped = True
+        return self.scanner.text[before:self.scanner.end]
+
+    def finish(self) -> None:
+        if self._recorded:
+            return
+        self._recorded = True
+        self.total_seconds = time.monotonic() - self.started_at
+        tail = self.scanner.text[self.scanner.end:] if self.scanner.complete else ""
+        if self.stopped:
+            self.stats.record("stopped", count_tokens(tail))
+        elif self.scanner.complete:
+            self.stats.record("sampled", count_tokens(tail), self.total_seconds - self.json_seconds)
+        else:
+            self.stats.record("incomplete")
+
+
+class JsonStreamCutoff:
+    """
+    JSON 객체가 완성되면 원본 스트림을 닫는 동기 스트림 래퍼
+
+    Attributes:
+        value: 완성된 JSON 객체 (없으면 None)
+        text: 호출자에게 전달한 텍스트
+        stopped: 조기 종료 여부
+        json_seconds: 스트림 시작 ~ JSON 완성 시간
+        total_seconds: 스트림 시작 ~ 종료 시간
+
+    Example:
+        >>> stream = JsonStreamCutoff(client.chat_stream(prompt), required_keys=("score",))
+        >>> for chunk in stream:
+        ...     print(chunk, end="")
+        >>> stream.value, stream.stopped
+    """
+
+    def __init__(
+        self,
+        source: Iterable[str],
+        required_keys: Sequence[str] = (),
+        stats: Optional[JsonStreamStats] = None,
+        sample: Optional[bool] = None
+    ):
+        """
+        Args:
+            source: 원본 스트림 (chat_stream 제너레이터)
+            required_keys: 완성으로 인정할 객체의 필수 키
+            stats: 통계 (미제공 시 프로세스 공유 통계)
+            sample: True면 끝까지 받아 꼬리 측정 (미지정 시 stats.sample_rate 확률)
+        """
+        self.source = source
+        self._state = _CutoffState(required_keys, stats, sample)
+
+    @property
+    def value(self) -> Optional[Dict[str, Any]]:
+        return self._state.scanner.value
+
+    @property
+    def text(self) -> str:
+        scanner = self._state.scanner
+        return scanner.text[:scanner.end] if self.stopped else scanner.text
+
+    @property
+    def stopped(self) -> bool:
+        return self._state.stopped
+
+    @property
+    def json_seconds(self) -> Optional[float]:
+        return self._state.json_seconds
+
+    @property
+    def total_seconds(self) -> Optional[float]:
+        return self._state.total_seconds
+
+    def __iter__(self) -> Iterator[str]:
+        iterator = iter(self.source)
+        try:
+            for chunk in iterator:
+                emit = self._state.process(chunk)
+                if emit:
+                    yield emit
+                if self._state.stopped:
+                    break
+        finally:
+            if self._state.stopped:
+                # 조기 종료 시 완성 신호와 함께 원본 스트림을 닫아 연결과 거버너 슬롯을 바로 반환
+                _complete(iterator)
+            if hasattr(iterator, "close"):
+                iterator.close()
+            self._state.finish()
+
+
+class AsyncJsonStreamCutoff:
+    """JSON 객체가 완성되면 원본 스트림을 닫는 비동기 스트림 래퍼 (JsonStreamCutoff와 동일)"""
+
+    def __init__(
+        self,
+        source: AsyncIterator[str],
+        required_keys: Sequence[str] = (),
+        stats: Optional[JsonStreamStats] = None,
+        sample: Optional[bool] = None
+    ):
+        self.source = source
+        self._state = _CutoffState(required_keys, stats, sample)
+
+    value = JsonStreamCutoff.value
+    text = JsonStreamCutoff.text
+    stopped = JsonStreamCutoff.stopped
+    json_seconds = JsonStreamCutoff.json_seconds
+    total_seconds = JsonStreamCutoff.total_seconds
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        try:
+            async for chunk in self.source:
+                emit = self._state.process(chunk)
+                if emit:
+                    yield emit
+                if self._state.stopped:
+                    break
+        finally:
+            if self._state.stopped:
+                await _acomplete(self.source)
+            if hasattr(self.source, "aclose"):
+                await self.source.aclose()
+            self._state.finish()
+
+
+def json_early_stop_enabled() -> bool:
+    """에이전트 기본 조기 종료 사용 여부 (IMF_JSON_EARLY_STOP=1, 기본 미사용)"""
+    return os.getenv("IMF_JSON_EARLY_STOP", "0").lower() in ("1", "true", "yes")
+
+
+_stats: Optional[JsonStreamStats] = None
+_stats_lock = threading.Lock()
+
+
+def get_json_stream_stats() -> JsonStreamStats:
+    """프로세스 공유 통계 반환 (표본 비율은 IMF_JSON_EARLY_STOP_SAMPLE, 기본 0.05)"""
+    global _stats
+    if _stats is None:
+        with _stats_lock:
+            if _stats is None:
+                _stats = JsonStreamStats(float(os.getenv("IMF_JSON_EARLY_STOP_SAMPLE", "0.05")))
+    return _stats
@@ -0,0 +1,422 @@
+"""
+🔑 Upstage API 키 풀 (Multi-key)
+
+입시 시즌 처리량은 서버 자원이 아니라 키당 할당량에 막힘
+UPSTAGE_API_KEY 하나만 쓰면 레플리카를 늘려도 같은 할당량을 나눠 쓸 뿐이라
+여러 키를 풀로 묶어 키를 추가하는 것만으로 전체 처리량을 늘림
+
+- UPSTAGE_API_KEYS="key1,key2:2,key3" (콜론 뒤는 가중치, 기본 1)
+- 키마다 독립된 UpstageGovernor (엔드포인트 분류별 RPS/동시성 예산이 키마다 따로 적용)
+- 가중 최소 부하 선택: 격리되지 않은 키 중 (해당 분류 실행/대기 수) / 가중치가 가장 작은 키
+  (같으면 누적 요청 수 / 가중치가 작은 키)
+- 자동 격리
+  · 401/403 → auth_quarantine(기본 600초) 동안 제외
+  · 429 → Retry-After(없으면 quota_quarantine, 기본 30초) 동안 제외
+  · 모든 키가 격리되면 가장 먼저 풀리는 키 사용
+- 다른 키가 남아 있으면 오류에 key_quarantined 표시 → 재시도 정책이 기다리지 않고 다른 키로 재시도
+  (키 하나의 할당량 소진은 서킷 브레이커 실패로 집계하지 않음)
+- 키 고정: acquire(api_key=...)는 그 키의 슬롯을 받음 (Document Parse 작업 조회처럼 등록한 키로만 볼 수 있는 호출)
+  고정한 호출은 격리되어도 다른 키로 재시도하지 않음
+- UpstageGovernor와 같은 인터페이스 → UpstageClient의 governor 자리에 그대로 사용
+- key_stats(): 키별 사용량 (분류별 요청 수, 오류, 429, 인증 오류, 격리, 토큰)
+
+Classes:
+    PooledKey: 풀에 등록된 키 하나의 상태
+    KeyPool: 가중 최소 부하 API 키 풀
+
+Functions:
+    mask_key: 통계/로그용 API 키 표기
+    parse_api_keys: UPSTAGE_API_KEYS 형식 파싱
+    get_key_pool: 프로세스 공유 키 풀 반환 (UPSTAGE_API_KEYS 미설정 시 None)
+    default_api_key: 기본 API 키 (UPSTAGE_API_KEY, 없으면 키 풀의 첫 키)
+"""
+
+import os
+import time
+import threading
+from contextlib import contextmanager, asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Sequence, Tuple, Union
+
+from .rate_limiter import UpstageGovernor, EndpointBudget, Ticket
+from .resilience import UpstageAPIError
+
+
+def mask_key(api_key: str) -> str:
+    """통계/로그용 API 키 표기 (끝 4자리만)"""
+    return f"…{api_key[-4:]}" if len(api_key) > 4 else "…"
+
+
+def parse_api_keys(value: str) -> List[Tuple[str, float]]:
+    """
+    UPSTAGE_API_KEYS 형식 파싱
+
+    Args:
+        value: 쉼표로 구분한 키 목록 (키:가중치)
+
+    Returns:
+        list: [(키, 가중치)] (중복 키는 처음 것만)
+
+    Example:
+        >>> parse_api_keys("up_a, up_b:2")
+        [('up_a', 1.0), ('up_b', 2.0)]
+    """
+    keys: List[Tuple[str, float]] = []
+    seen = set()
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        key, _, weight = item.rpartition(":")
+        try:
+            entry = (key.strip(), float(weight)) if key else (item, 1.0)
+        except ValueError:
+            entry = (item, 1.0)
+        if entry[0] and entry[0] not in seen:
+            seen.add(entry[0])
+            keys.append(entry)
+    return keys
+
+
+@dataclass
+class PooledKey:
+    """
+    풀에 등록된 키 하나의 상태
+
+    Attributes:
+        api_key: Upstage API 키
+        weight: 선택 가중치 (클수록 더 많은 요청을 받음)
+        governor: 키 전용 거버너
+        active: 분류별 실행 + 대기 중인 호출 수
+        requests: 분류별 누적 요청 수
+        errors: 누적 오류 수 (상태 코드가 있는 오류)
+        rate_limited: 429 응답 수
+        auth_errors: 401/403 응답 수
+        quarantines: 격리 횟수
+        quarantined_until: 격리 해제 시각 (monotonic, 0이면 정상)
+        reason: 마지막 격리 사유
+        tokens: 누적 사용 토큰 (비스트리밍 Chat 응답 기준)
+    """
+    api_key: str
+    weight: float = 1.0
+    governor: UpstageGovernor = field(default_factory=UpstageGovernor)
+    active: Dict[str, int] = field(default_factory=dict)
+    requests: Dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+    rate_limited: int = 0
+    auth_errors: int = 0
+    quarantines: int = 0
+    quarantined_until: float = 0.0
+    reason: str = ""
+    tokens: int = 0
+
+    def load(self, endpoint: str) -> float:
+        return self.active.get(endpoint, 0) / self.weight
+
+    def usage(self) -> float:
+        return sum(self.requests.values()) / self.weight
+
+
+class KeyPool:
+    """
+    가중 최소 부하 API 키 풀 (UpstageGovernor 호환)
+
+    Attributes:
+        ENDPOINTS: 지원하는 엔드포인트 분류
+        auth_quarantine: 401/403 후 격리 시간 (초)
+        quota_quarantine: Retry-After 없는 429 후 격리 시간 (초)
+
+    환경변수:
+        UPSTAGE_API_KEYS: 키 목록 ("key1,key2:2")
+        UPSTAGE_KEY_AUTH_QUARANTINE, UPSTAGE_KEY_QUOTA_QUARANTINE: 격리 시간 (초)
+        키별 예산은 UpstageGovernor와 같은 UPSTAGE_RPS_<분류> 등 (키 하나 기준)
+
+    Example:
+        >>> pool = KeyPool(["up_a", ("up_b", 2)])
+        >>> client = UpstageClient(api_key=pool.primary, governor=pool)
+        >>> client.chat("안녕하세요")
+        >>> pool.key_stats()
+    """
+
+    ENDPOINTS = UpstageGovernor.ENDPOINTS
+
+    def __init__(
+        self,
+        keys: Sequence[Union[str, Tuple[str, float]]],
+        budgets: Optional[Dict[str, EndpointBudget]] = None,
+        auth_quarantine: float = 600.0,
+        quota_quarantine: float = 30.0
+    ):
+        """
+        키 풀 초기화
+
+        Args:
+            keys: API 키 목록 (키 또는 (키, 가중치))
+            budgets: 키 하나의 엔드포인트 분류별 예산 (미지정 분류는 환경변수/기본값)
+            auth_quarantine: 401/403 후 격리 시간 (초)
+            quota_quarantine: Retry-After 없는 429 후 격리 시간 (초)
+        """
+        self._keys: List[PooledKey] = []
+        for entry in keys:
+            api_key, weight = (entry, 1.0) if isinstance(entry, str) else (entry[0], float(entry[1]))
+            if api_key and all(k.api_key != api_key for k in self._keys):
+                self._keys.append(PooledKey(api_key, max(weight, 0.01), UpstageGovernor(budgets)))
+        if not self._keys:
+            raise ValueError("키 풀에 API 키가 없습니다.")
+        self._by_key = {k.api_key: k for k in self._keys}
+        self.auth_quarantine = auth_quarantine
+        self.quota_quarantine = quota_quarantine
+        self._lock = threading.Lock()
+
+    @property
+    def primary(self) -> str:
+        """첫 번째 키 (클라이언트 기본 키, 병합/캐시 키 구분용)"""
+        return self._keys[0].api_key
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, api_key: object) -> bool:
+        return api_key in self._by_key
+
+    # ---------- 키 선택 ----------
+
+    def resolve(self, masked: str) -> Optional[str]:
+        """마스킹된 키(mask_key) → 풀의 키 (하나로 정해질 때만, 재시작 후 작업 기록의 키 복원용)"""
+        matches = [k.api_key for k in self._keys if mask_key(k.api_key) == masked]
+        return matches[0] if len(matches) == 1 else None
+
+    def _select(self, endpoint: str, api_key: Optional[str] = None) -> PooledKey:
+        """격리되지 않은 키 중 가중 부하가 가장 작은 키(api_key를 주면 그 키)를 골라 실행 수 예약"""
+        if endpoint not in self.ENDPOINTS:
+            raise ValueError(f"알 수 없는 엔드포인트 분류: {endpoint} (지원: {', '.join(self.ENDPOINTS)})")
+        if api_key is not None and api_key not in self._by_key:
+            raise ValueError(f"키 풀에 없는 API 키: {mask_key(api_key)}")
+        now = time.monotonic()
+        with self._lock:
+            available = [k for k in self._keys if k.quarantined_until <= now]
+            if api_key is not None:
+                chosen = self._by_key[api_key]
+            elif available:
+                chosen = min(available, key=lambda k: (k.load(endpoint), k.usage()))
+            else:
+                chosen = min(self._keys, key=lambda k: k.quarantined_until)
+            chosen.active[endpoint] = chosen.active.get(endpoint, 0) + 1
+            chosen.requests[endpoint] = chosen.requests.get(endpoint, 0) + 1
+        return chosen
+
+    def _done(self, key: PooledKey, endpoint: str) -> None:
+        with self._lock:
+            key.active[endpoint] = max(key.active.get(endpoint, 0) - 1, 0)
+
+    def acquire(self, endpoint: str, timeout: Optional[float] = None, api_key: Optional[str] = None) -> Ticket:
+        """
+        키 선택 후 그 키의 슬롯 획득 (ticket.api_key에 선택된 키, 반드시 release 호출 필요)
+
+        Args:
+            endpoint: 엔드포인트 분류
+            timeout: 슬롯 대기 한도 (초)
+            api_key: 고정할 키 (격리 중이어도 그 키 사용, 풀에 없으면 ValueError)
+        """
+        key = self._select(endpoint, api_key)
+        try:
+            ticket = key.governor.acquire(endpoint, timeout)
+        except BaseException:
+            self._done(key, endpoint)
+            raise
+        ticket.api_key = key.api_key
+        ticket.pinned = api_key is not None
+        return ticket
+
+    async def acquire_async(
+        self,
+        endpoint: str,
+        timeout: Optional[float] = None,
+        api_key: Optional[str] = None
+    ) -> Ticket:
+        """키 선택 후 그 키의 슬롯 획득 (비동기)"""
+        key = self._select(endpoint, api_key)
+        try:
+            ticket = await key.governor.acquire_async(endpoint, timeout)
+        except BaseException:
+            self._done(key, endpoint)
+            raise
+        ticket.api_key = key.api_key
+        ticket.pinned = api_key is not None
+        return ticket
+
+    def release(self, ticket: Ticket) -> None:
+        """슬롯 반환"""
+        key = self._by_key[ticket.api_key]
+        key.governor.release(ticket)
+        self._done(key, ticket.endpoint)
+
+    @contextmanager
+    def slot(self, endpoint: str, timeout: Optional[float] = None):
+        """슬롯 획득 ~ 반환 컨텍스트 매니저"""
+        ticket = self.acquire(endpoint, timeout)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    @asynccontextmanager
+    async def slot_async(self, endpoint: str, timeout: Optional[float] = None):
+        """슬롯 획득 ~ 반환 비동기 컨텍스트 매니저"""
+        ticket = await self.acquire_async(endpoint, timeout)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    # ---------- 결과 반영 ----------
+
+    def observe(
+        self,
+        ticket: Ticket,
+        error: Optional[UpstageAPIError] = None,
+        tokens: Optional[int] = None
+    ) -> None:
+        """
+        호출 결과 반영 (오류에 따른 격리, 토큰 사용량)
+
+        격리 후 다른 키가 남아 있으면 error.key_quarantined를 표시하고
+        Retry-After를 비워 재시도가 기다리지 않고 다른 키로 가도록 함
+        (키를 고정한 호출은 다른 키로 갈 수 없으므로 표시하지 않음 - 원래 Retry-After대로 재시도)
+
+        Args:
+            ticket: 호출에 사용한 슬롯
+            error: 발생한 오류 (성공 시 None)
+            tokens: 사용 토큰 수
+        """
+        key = self._by_key.get(ticket.api_key)
+        if key is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if tokens:
+                key.tokens += tokens
+            if error is None or error.status_code is None:
+                return
+            key.errors += 1
+            if error.status_code in (401, 403):
+                key.auth_errors += 1
+                seconds = self.auth_quarantine
+                reason = "auth"
+            elif error.status_code == 429:
+                key.rate_limited += 1
+                seconds = error.retry_after if error.retry_after is not None else self.quota_quarantine
+                reason = "quota"
+            else:
+                return
+            if seconds > 0:
+                key.quarantines += 1
+                key.quarantined_until = max(key.quarantined_until, now + seconds)
+                key.reason = reason
+            others = any(k is not key and k.quarantined_until <= now for k in self._keys)
+        if others and not ticket.pinned:
+            error.key_quarantined = True
+            error.retry_after = 0.0
+
+    # ---------- 설정 / 통계 ----------
+
+    def configure(
+        self,
+        endpoint: str,
+        rps: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_in_flight: Optional[int] = None
+    ) -> EndpointBudget:
+        """
+        실행 중 키별 예산 변경 (모든 키에 같은 예산 적용)
+
+        Returns:
+            EndpointBudget: 적용된 키 하나의 예산
+        """
+        budget = None
+        for key in self._keys:
+            budget = key.governor.configure(endpoint, rps, burst, max_in_flight)
+        return budget
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        엔드포인트 분류별 통계 (모든 키 합산, UpstageGovernor.stats와 같은 형식)
+
+        Returns:
+            dict: {분류: {budget(키 하나 기준), keys, in_flight, queued, granted, timeouts, avg_wait, max_wait}}
+        """
+        per_key = [key.governor.stats() for key in self._keys]
+        merged = {}
+        for name in self.ENDPOINTS:
+            items = [stats[name] for stats in per_key]
+            granted = sum(item["granted"] for item in items)
+            merged[name] = {
+                "budget": items[0]["budget"],
+                "keys": len(items),
+                "in_flight": sum(item["in_flight"] for item in items),
+                "queued": sum(item["queued"] for item in items),
+                "granted": granted,
+                "timeouts": sum(item["timeouts"] for item in items),
+                "avg_wait": (sum(item["avg_wait"] * item["granted"] for item in items) / granted) if granted else 0.0,
+                "max_wait": max(item["max_wait"] for item in items),
+            }
+        return merged
+
+    def key_stats(self) -> List[Dict[str, Any]]:
+        """
+        키별 사용량
+
+        Returns:
+            list: [{api_key(마스킹), weight, requests, by_endpoint, in_flight, errors, rate_limited,
+                    auth_errors, quarantines, quarantined, quarantine_remaining, reason, tokens}]
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "api_key": mask_key(key.api_key),
+                    "weight": key.weight,
+                    "requests": sum(key.requests.values()),
+                    "by_endpoint": dict(key.requests),
+                    "in_flight": sum(key.active.values()),
+                    "errors": key.errors,
+                    "rate_limited": key.rate_limited,
+                    "auth_errors": key.auth_errors,
+                    "quarantines": key.quarantines,
+                    "quarantined": key.quarantined_until > now,
+                    "quarantine_remaining": max(key.quarantined_until - now, 0.0),
+                    "reason": key.reason,
+                    "tokens": key.tokens,
+                }
+                for key in self._keys
+            ]
+
+
+_key_pool: Optional[KeyPool] = None
+_key_pool_lock = threading.Lock()
+
+
+def get_key_pool() -> Optional[KeyPool]:
+    """프로세스 공유 키 풀 반환 (UPSTAGE_API_KEYS 미설정 시 None, 지연 생성)"""
+    global _key_pool
+    if _key_pool is None:
+        keys = parse_api_keys(os.getenv("UPSTAGE_API_KEYS", ""))
+        if not keys:
+            return None
+        with _key_pool_lock:
+            if _key_pool is None:
+                _key_pool = KeyPool(
+                    keys,
+                    auth_quarantine=float(os.getenv("UPSTAGE_KEY_AUTH_QUARANTINE", "600")),
+                    quota_quarantine=float(os.getenv("UPSTAGE_KEY_QUOTA_QUARANTINE", "30")),
+                )
+    return _key_pool
+
+
+def default_api_key() -> Optional[str]:
+    """기본 API 키 (UPSTAGE_API_KEY, 없으면 키 풀의 첫 키)"""
+    api_key = os.getenv("UPSTAGE_API_KEY")
+    if api_key:
+        return api_key
+    pool = get_key_pool()
+    return pool.primary if pool is not None else None
@@ -0,0 +1,250 @@
+"""
+💾 Solar LLM 응답 캐시 (결정적 재생)
+
+추출/추천/검증은 낮은 temperature(0.1~0.3)로 호출되므로 같은 입력이면 사실상 같은 응답이 나옴
+데모 프로필이나 Streamlit 재실행처럼 동일한 입력이 반복될 때 추론 호출을 다시 하지 않도록
+model + messages + temperature + reasoning_effort를 키로 응답 텍스트를 저장
+
+- 기본 비활성 (IMF_LLM_CACHE=memory 또는 disk로 사용)
+- 메모리(LRU) / 디스크 백엔드 선택, 용량 상한
+- 캐시 히트도 같은 제너레이터 인터페이스로 조각 단위 재생 (속도 조절 가능)
+  → UI 스트리밍 코드는 변경 불필요
+
+Classes:
+    MemoryCacheBackend: 프로세스 메모리 LRU 백엔드
+    LLMResponseCache: 응답 캐시 (키 생성 + 재생)
+
+Functions:
+    get_llm_cache: 프로세스 기본 응답 캐시 반환 (비활성 시 None)
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Generator, AsyncGenerator
+
+from .parse_cache import ParseCache
+
+
+class MemoryCacheBackend:
+    """
+    프로세스 메모리 LRU 백엔드 (ParseCache와 같은 get/put/clear/stats 인터페이스)
+
+    Attributes:
+        max_bytes: 전체 용량 상한 (응답 텍스트 UTF-8 기준)
+        ttl_seconds: 항목 유효 기간 (초)
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl_seconds: float = 24 * 3600):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._total_bytes = 0
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evictions": 0,
+            "bytes_read": 0,
+            "bytes_written": 0,
+        }
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+
+            created_at, size, payload = entry
+            if time.time() - created_at > self.ttl_seconds:
+                self._pop(key)
+                self._counters["expired"] += 1
+                self._counters["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            self._counters["bytes_read"] += size
+            return payload
+
+    def put(self, key: str, payload: Dict[str, Any]) -> None:
+        size = len(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (time.time(), size, payload)
+            self._total_bytes += size
+            self._counters["bytes_written"] += size
+
+            # 용량 초과 시 가장 오래 접근하지 않은 항목부터 제거
+            while self._total_bytes > self.max_bytes and self._entries:
+                self._pop(next(iter(self._entries)))
+                self._counters["evictions"] += 1
+
+    def _pop(self, key: str) -> None:
+        """항목 삭제 (잠금 보유 상태에서 호출)"""
+        _, size, _ = self._entries.pop(key)
+        self._total_bytes -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["total_bytes"] = self._total_bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = (stats["hits"] / lookups) if lookups else 0.0
+        return stats
+
+
+class LLMResponseCache:
+    """
+    Solar LLM 응답 캐시
+
+    Attributes:
+        backend: 저장소 (MemoryCacheBackend 또는 ParseCache 디스크 저장소)
+        replay_chunk_chars: 재생 시 조각당 글자 수
+        replay_delay: 재생 시 조각 사이 대기 시간 (초, 0이면 즉시)
+
+    Example:
+        >>> cache = LLMResponseCache(MemoryCacheBackend())
+        >>> key = cache.make_key(params)
+        >>> text = cache.get(key)
+        >>> for chunk in cache.replay(text):
+        ...     print(chunk, end="")
+    """
+
+    def __init__(
+        self,
+        backend: Any,
+        replay_chunk_chars: int = 8,
+        replay_delay: float = 0.0
+    ):
+        """
+        캐시 초기화
+
+        Args:
+            backend: get/put/clear/stats를 제공하는 저장소
+            replay_chunk_chars: 재생 시 조각당 글자 수
+            replay_delay: 재생 시 조각 사이 대기 시간 (초)
+        """
+        self.backend = backend
+        self.replay_chunk_chars = max(replay_chunk_chars, 1)
+        self.replay_delay = replay_delay
+
+    @staticmethod
+    def make_key(params: Dict[str, Any]) -> str:
+        """
+        캐시 키 생성 (stream 여부와 무관하게 같은 요청이면 같은 키)
+
+        Args:
+            params: chat.completions.create 파라미터
+
+        Returns:
+            str: SHA-256 16진 문자열
+        """
+        identity = {
+            "model": params.get("model"),
+            "messages": params.get("messages"),
+            "temperature": params.get("temperature"),
+            "reasoning_effort": params.get("reasoning_effort"),
+        }
+        raw = json.dumps(identity, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """저장된 응답 텍스트 (없으면 None)"""
+        payload = self.backend.get(key)
+        if payload is None:
+            return None
+        return payload.get("text")
+
+    def put(self, key: str, text: str) -> None:
+        """응답 텍스트 저장 (빈 응답은 저장하지 않음)"""
+        if text:
+            self.backend.put(key, {"text": text})
+
+    def _chunks(self, text: str):
+        size = self.replay_chunk_chars
+        return (text[i:i + size] for i in range(0, len(text), size))
+
+    def replay(self, text: str) -> Generator[str, None, None]:
+        """저장된 응답을 스트리밍처럼 조각 단위로 재생"""
+        for index, chunk in enumerate(self._chunks(text)):
+            if index and self.replay_delay > 0:
+                time.sleep(self.replay_delay)
+            yield chunk
+
+    async def areplay(self, text: str) -> AsyncGenerator[str, None]:
+        """저장된 응답 재생 (비동기)"""
+        for index, chunk in enumerate(self._chunks(text)):
+            if index and self.replay_delay > 0:
+                await asyncio.sleep(self.replay_delay)
+            yield chunk
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self.backend.stats()
+
+
+_default_cache: Optional[LLMResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    프로세스 기본 LLM 응답 캐시 반환 (지연 생성)
+
+    환경변수:
+        IMF_LLM_CACHE: "memory" / "disk" (미설정 또는 "0"/"off"면 비활성)
+        IMF_LLM_CACHE_DIR: 디스크 캐시 디렉토리 (기본 .cache/llm_responses)
+        IMF_LLM_CACHE_MAX_MB: 용량 상한 (MB, 기본 64)
+        IMF_LLM_CACHE_TTL: 유효 기간 (초, 기본 86400)
+        IMF_LLM_CACHE_REPLAY_CHARS: 재생 조각당 글자 수 (기본 8)
+        IMF_LLM_CACHE_REPLAY_DELAY: 재생 조각 사이 대기 시간 (초, 기본 0)
+
+    Returns:
+        LLMResponseCache | None: 캐시 인스턴스 (비활성화 시 None)
+    """
+    global _default_cache
+    mode = os.getenv("IMF_LLM_CACHE", "off").lower()
+    if mode not in ("memory", "disk"):
+        return None
+
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                max_bytes = int(float(os.getenv("IMF_LLM_CACHE_MAX_MB", "64")) * 1024 * 1024)
+                ttl_seconds = float(os.getenv("IMF_LLM_CACHE_TTL", str(24 * 3600)))
+                if mode == "disk":
+                    # ParseCache는 키 → JSON 페이로드 범용 디스크 저장소로 재사용
+                    backend = ParseCache(
+                        cache_dir=os.getenv("IMF_LLM_CACHE_DIR")
+                        or Path(__file__).parent.parent / ".cache" / "llm_responses",
+                        max_bytes=max_bytes,
+                        ttl_seconds=ttl_seconds
+                    )
+                else:
+                    backend = MemoryCacheBackend(max_bytes=max_bytes, ttl_seconds=ttl_seconds)
+
+                _default_cache = LLMResponseCache(
+                    backend,
+                    replay_chunk_chars=int(os.getenv("IMF_LLM_CACHE_REPLAY_CHARS", "8")),
+                    replay_delay=float(os.getenv("IMF_LLM_CACHE_REPLAY_DELAY", "0"))
+                )
+    return _default_cache
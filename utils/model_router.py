@@ -0,0 +1,254 @@
+"""
+🧭 모델/추론 수준 라우터 (Model Router)
+
+모델과 reasoning_effort가 호출 위치마다 고정되어 있었음
+(chat_with_context, check_groundedness는 "high", 나머지는 "low", 모델은 모두 solar-pro3)
+
+각 에이전트/호출은 목표(target)만 선언하고 ("fast", "balanced", "quality")
+라우터가 배포별 정책 파일의 후보 목록(cascade)에서 위에서부터 조건에 맞는 첫 후보를 고름
+- 입력 크기: 후보의 max_input_tokens를 넘는 프롬프트는 다음 후보로
+- 관측 지연: 후보의 최근 첫 응답 지연(p95)이 slo_seconds를 넘으면 다음 후보로
+- 남은 예산: 관측 지연이 호출의 남은 Deadline보다 길면 다음 후보로
+- 모든 후보가 조건을 넘으면 마지막 후보 사용
+지연 표본은 일정 시간(max_age)이 지나면 버려지므로, 밀려난 후보도 부하가 줄면 다시 선택됨
+
+정책 파일은 UPSTAGE_ROUTER_POLICY에 JSON 경로를 지정 (없으면 기존 고정값과 같은 기본 정책)
+    {
+      "targets": {
+        "quality": [
+          {"model": "solar-pro3", "reasoning_effort": "high", "slo_seconds": 30, "max_input_tokens": 12000},
+          {"model": "solar-pro3", "reasoning_effort": "medium", "slo_seconds": 20},
+          {"model": "solar-pro3", "reasoning_effort": "low"}
+        ]
+      },
+      "percentile": 0.95, "min_samples": 5, "max_age_seconds": 300
+    }
+
+Classes:
+    Route: 후보 (모델 + 추론 수준 + 지연 SLO + 입력 한도)
+    RoutingPolicy: 목표별 후보 목록
+    ModelRouter: 후보 선택 및 지연 관측
+
+Functions:
+    get_router: 프로세스 공유 ModelRouter 반환
+"""
+
+import os
+import json
+import threading
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, Optional, List
+
+from .deadline import Deadline
+from .hedging import LatencyTracker
+from .token_budget import count_tokens
+
+
+@dataclass(frozen=True)
+class Route:
+    """
+    라우팅 후보
+
+    Attributes:
+        model: 모델명
+        reasoning_effort: 추론 노력 수준 ("low", "medium", "high")
+        slo_seconds: 첫 응답 지연 목표 (초, 스트림은 첫 조각까지 / None이면 지연으로 건너뛰지 않음)
+        max_input_tokens: 허용 입력 토큰 수 (None이면 제한 없음)
+    """
+    model: str = "solar-pro3"
+    reasoning_effort: str = "low"
+    slo_seconds: Optional[float] = None
+    max_input_tokens: Optional[int] = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.model}/{self.reasoning_effort}"
+
+
+# 기존 호출 위치의 고정값과 같은 선택 + quality는 느릴 때 낮은 추론 수준으로 내려감
+DEFAULT_TARGETS: Dict[str, List[Route]] = {
+    "fast": [Route("solar-pro3", "low")],
+    "balanced": [Route("solar-pro3", "low")],
+    "quality": [
+        Route("solar-pro3", "high", slo_seconds=30.0, max_input_tokens=12000),
+        Route("solar-pro3", "medium", slo_seconds=20.0),
+        Route("solar-pro3", "low"),
+    ],
+}
+
+
+@dataclass
+class RoutingPolicy:
+    """
+    라우팅 정책
+
+    Attributes:
+        targets: 목표별 후보 목록 (위에서부터 우선)
+        percentile: SLO 비교에 쓸 지연 백분위
+        min_samples: 지연으로 후보를 건너뛰기 전 필요한 표본 수
+        max_age_seconds: 지연 표본 보관 시간 (초)
+    """
+    targets: Dict[str, List[Route]] = field(default_factory=lambda: dict(DEFAULT_TARGETS))
+    percentile: float = 0.95
+    min_samples: int = 5
+    max_age_seconds: float = 300.0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RoutingPolicy":
+        """
+        dict에서 정책 구성 (파일에 없는 목표는 기본 정책 유지)
+
+        Args:
+            data: {"targets": {목표: [후보 dict, ...]}, "percentile", "min_samples", "max_age_seconds"}
+        """
+        targets = dict(DEFAULT_TARGETS)
+        for target, routes in data.get("targets", {}).items():
+            if not routes:
+                raise ValueError(f"라우팅 정책: '{target}' 후보가 비어 있음")
+            targets[target] = [Route(**route) for route in routes]
+        return cls(
+            targets=targets,
+            percentile=float(data.get("percentile", cls.percentile)),
+            min_samples=int(data.get("min_samples", cls.min_samples)),
+            max_age_seconds=float(data.get("max_age_seconds", cls.max_age_seconds)),
+        )
+
+    @classmethod
+    def from_file(cls, path: str) -> "RoutingPolicy":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def from_env(cls) -> "RoutingPolicy":
+        """UPSTAGE_ROUTER_POLICY 경로의 정책 파일 (미설정 시 기본 정책)"""
+        path = os.getenv("UPSTAGE_ROUTER_POLICY")
+        return cls.from_file(path) if path else cls()
+
+
+class ModelRouter:
+    """
+    목표별 모델/추론 수준 선택기
+
+    클라이언트가 select()로 후보를 고르고, 첫 응답까지 걸린 시간을 observe()로 알려줌
+    지연은 후보(모델/추론 수준) 단위로 모으므로 목표가 달라도 같은 후보는 관측을 공유
+
+    Attributes:
+        policy: 라우팅 정책
+
+    Example:
+        >>> router = ModelRouter(RoutingPolicy.from_file("router_policy.json"))
+        >>> route = router.select("quality", prompt_tokens=3500, deadline=deadline)
+        >>> route.model, route.reasoning_effort
+        ('solar-pro3', 'high')
+    """
+
+    def __init__(self, policy: Optional[RoutingPolicy] = None):
+        self.policy = policy or RoutingPolicy()
+        self._trackers: Dict[str, LatencyTracker] = {}
+        self._lock = threading.Lock()
+        self._picks: Dict[str, Dict[str, int]] = {}
+        self._skips = {"input": 0, "slo": 0, "deadline": 0}
+
+    def latency(self, route: Route) -> Optional[float]:
+        """후보의 최근 첫 응답 지연 (백분위, 표본이 min_samples 미만이면 None)"""
+        tracker = self._trackers.get(route.name)
+        if tracker is None or len(tracker) < self.policy.min_samples:
+            return None
+        return tracker.quantile(self.policy.percentile)
+
+    def observe(self, route: Route, seconds: float) -> None:
+        """후보의 첫 응답까지 걸린 시간 기록 (거버너 대기 제외)"""
+        tracker = self._trackers.get(route.name)
+        if tracker is None:
+            with self._lock:
+                tracker = self._trackers.setdefault(
+                    route.name, LatencyTracker(max_age=self.policy.max_age_seconds)
+                )
+        tracker.observe(seconds)
+
+    def select(
+        self,
+        target: str,
+        messages: Optional[List[Dict[str, Any]]] = None,
+        prompt_tokens: Optional[int] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Route:
+        """
+        목표에 맞는 후보 선택
+
+        Args:
+            target: 목표 ("fast", "balanced", "quality" 또는 정책 파일의 목표)
+            messages: 요청 메시지 (prompt_tokens가 없을 때 입력 토큰 추정에 사용)
+            prompt_tokens: 에이전트가 이미 계산한 프롬프트 토큰 수
+            deadline: 호출 마감 시간 (관측 지연이 남은 예산보다 긴 후보는 건너뜀)
+
+        Returns:
+            Route: 선택된 후보
+        """
+        routes = self.policy.targets.get(target)
+        if not routes:
+            raise ValueError(f"알 수 없는 라우팅 목표: {target} (정책: {', '.join(self.policy.targets)})")
+
+        if prompt_tokens is None and any(route.max_input_tokens for route in routes):
+            prompt_tokens = sum(count_tokens(str(message.get("content") or "")) for message in messages or [])
+        remaining = deadline.remaining() if deadline is not None else None
+
+        chosen = routes[-1]
+        for route in routes[:-1]:
+            reason = self._skip_reason(route, prompt_tokens, remaining)
+            if reason is None:
+                chosen = route
+                break
+            with self._lock:
+                self._skips[reason] += 1
+
+        with self._lock:
+            picks = self._picks.setdefault(target, {})
+            picks[chosen.name] = picks.get(chosen.name, 0) + 1
+        return chosen
+
+    def _skip_reason(self, route: Route, prompt_tokens: Optional[int], remaining: Optional[float]) -> Optional[str]:
+        if route.max_input_tokens is not None and prompt_tokens is not None and prompt_tokens > route.max_input_tokens:
+            return "input"
+        observed = self.latency(route)
+        if observed is None:
+            return None
+        if route.slo_seconds is not None and observed > route.slo_seconds:
+            return "slo"
+        if remaining is not None and observed > remaining:
+            return "deadline"
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        라우팅 통계
+
+        Returns:
+            dict: picks({목표: {후보: 선택 횟수}}), skips(건너뛴 이유별 횟수), latency({후보: 관측 지연})
+        """
+        with self._lock:
+            picks = {target: dict(counts) for target, counts in self._picks.items()}
+            skips = dict(self._skips)
+        latency = {}
+        for routes in self.policy.targets.values():
+            for route in routes:
+                latency.setdefault(route.name, self.latency(route))
+        return {"picks": picks, "skips": skips, "latency": latency}
+
+    def describe(self) -> Dict[str, List[Dict[str, Any]]]:
+        """현재 정책 (목표별 후보 목록)"""
+        return {target: [asdict(route) for route in routes] for target, routes in self.policy.targets.items()}
+
+
+_router: Optional[ModelRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> ModelRouter:
+    """프로세스 공유 ModelRouter 반환 (지연 생성, UPSTAGE_ROUTER_POLICY 정책 파일 사용)"""
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = ModelRouter(RoutingPolicy.from_env())
+    return _router
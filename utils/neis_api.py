@@ -5,6 +5,7 @@ NEIS Open API를 활용한 학교 정보 및 시간표 조회
 - 학교 기본정보 조회 (schoolInfo)
 - 고등학교 시간표 조회 (hisTimetable)
 - 학교별 개설 과목 자동 추출
+- 프로세스 공유 keep-alive 세션 사용 (utils.http_pool - 시작 시 utils.warmup이 연결을 미리 열어 둠)
 
 API 문서: https://open.neis.go.kr
 """
@@ -15,6 +16,9 @@ from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from .fast_json import decode_json
+from .http_pool import get_http_session
+
 
 @dataclass
 class SchoolInfo:
@@ -168,9 +172,9 @@ class NeisAPI:
             if school_type:
                 params["SCHUL_KND_SC_NM"] = school_type
 
-            response = requests.get(url, params=params, timeout=10)
+            response = get_http_session().get(url, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()
+            data = decode_json(response.content)
 
             # API 응답 파싱
             parsed = self._parse_api_response(data, "schoolInfo")
@@ -242,9 +246,9 @@ class NeisAPI:
                 # 학기 미지정시 현재 학기 사용
                 params["SEM"] = self.current_semester
 
-            response = requests.get(url, params=params, timeout=15)
+            response = get_http_session().get(url, params=params, timeout=15)
             response.raise_for_status()
-            data = response.json()
+            data = decode_json(response.content)
 
             # API 응답 파싱
             parsed = self._parse_api_response(data, "hisTimetable")
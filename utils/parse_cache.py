@@ -0,0 +1,258 @@
+"""
+🗄️ Document Parse 결과 디스크 캐시
+
+같은 생활기록부 PDF를 다시 업로드할 때(리셋, 새로고침, 목표 전공 수정 등)
+10~120초 걸리는 OCR 호출을 건너뛰기 위한 내용 주소 기반(content-addressed) 캐시
+
+- 키: SHA-256(파일 바이트) + ocr + model + output_formats
+- 값: 정규화된 ParsedDocument 페이로드 (JSON)
+- 용량 상한 LRU 제거 + TTL 만료
+- 히트/미스/바이트 카운터 제공
+
+Classes:
+    ParseCache: Document Parse 디스크 캐시
+
+Functions:
+    get_parse_cache: 프로세스 기본 캐시 반환 (IMF_PARSE_CACHE=0 이면 None)
+"""
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from .fast_json import decode_json, json_default, lazy_parse_keys
+
+
+class ParseCache:
+    """
+    Document Parse 결과 디스크 캐시
+
+    파일 하나에 항목 하나를 저장하며, 파일 mtime을 마지막 접근 시각으로 사용해
+    용량 초과 시 가장 오래 접근하지 않은 항목부터 제거
+
+    Attributes:
+        cache_dir: 캐시 디렉토리
+        max_bytes: 전체 캐시 용량 상한 (바이트)
+        ttl_seconds: 항목 유효 기간 (초)
+
+    Example:
+        >>> cache = ParseCache("./.cache/document_parse")
+        >>> key = cache.make_key(pdf_bytes, ocr="force", model="document-parse")
+        >>> payload = cache.get(key)
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: int = 512 * 1024 * 1024,
+        ttl_seconds: float = 24 * 3600
+    ):
+        """
+        캐시 초기화
+
+        Args:
+            cache_dir: 캐시 디렉토리 (기본값: 프로젝트 루트의 .cache/document_parse)
+            max_bytes: 전체 캐시 용량 상한
+            ttl_seconds: 항목 유효 기간
+        """
+        if cache_dir is None:
+            cache_dir = Path(__file__).parent.parent / ".cache" / "document_parse"
+
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evictions": 0,
+            "bytes_read": 0,
+            "bytes_written": 0,
+        }
+        self._total_bytes = sum(p.stat().st_size for p in self._entry_paths())
+
+    @staticmethod
+    def make_key(
+        file_bytes: bytes,
+        ocr: str,
+        model: str,
+        output_formats: str = ""
+    ) -> str:
+        """
+        캐시 키 생성
+
+        Args:
+            file_bytes: 원본 파일 바이트
+            ocr: OCR 모드
+            model: Document Parse 모델
+            output_formats: 출력 형식
+
+        Returns:
+            str: SHA-256 16진 문자열
+        """
+        digest = hashlib.sha256(file_bytes).hexdigest()
+        params = f"{digest}|ocr={ocr}|model={model}|output_formats={output_formats}"
+        return hashlib.sha256(params.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        """키 → 항목 파일 경로 (앞 2글자로 하위 디렉토리 분산)"""
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _entry_paths(self):
+        """저장된 모든 항목 파일"""
+        return self.cache_dir.glob("*/*.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        캐시 조회
+
+        Args:
+            key: make_key로 만든 캐시 키
+
+        Returns:
+            dict | None: 저장된 페이로드 (없거나 만료 시 None)
+        """
+        path = self._path(key)
+        with self._lock:
+            try:
+                raw = path.read_bytes()
+                entry = decode_json(raw, lazy_parse_keys())
+            except (OSError, json.JSONDecodeError):
+                self._counters["misses"] += 1
+                return None
+
+            if time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+                self._remove(path)
+                self._counters["expired"] += 1
+                self._counters["misses"] += 1
+                return None
+
+            # 마지막 접근 시각 갱신 (LRU)
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+
+            self._counters["hits"] += 1
+            self._counters["bytes_read"] += len(raw)
+            return entry.get("payload")
+
+    def put(self, key: str, payload: Dict[str, Any]) -> None:
+        """
+        캐시 저장 (임시 파일 + rename으로 원자적 기록)
+
+        Args:
+            key: 캐시 키
+            payload: JSON 직렬화 가능한 페이로드
+        """
+        raw = json.dumps(
+            {"created_at": time.time(), "payload": payload},
+            ensure_ascii=False,
+            default=json_default
+        ).encode("utf-8")
+
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._lock:
+            previous = path.stat().st_size if path.exists() else 0
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(raw)
+                os.replace(tmp_path, path)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return
+
+            self._total_bytes += len(raw) - previous
+            self._counters["bytes_written"] += len(raw)
+            self._evict()
+
+    def _remove(self, path: Path) -> None:
+        """항목 삭제 (잠금 보유 상태에서 호출)"""
+        try:
+            size = path.stat().st_size
+            path.unlink()
+            self._total_bytes -= size
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """용량 상한 초과 시 오래 접근하지 않은 항목부터 제거 (잠금 보유 상태에서 호출)"""
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        entries = []
+        for path in self._entry_paths():
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+
+        for _, path in sorted(entries):
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._remove(path)
+            self._counters["evictions"] += 1
+
+    def clear(self) -> None:
+        """전체 항목 삭제"""
+        with self._lock:
+            for path in list(self._entry_paths()):
+                self._remove(path)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계
+
+        Returns:
+            dict: hits, misses, expired, evictions, bytes_read, bytes_written, total_bytes, hit_ratio
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["total_bytes"] = self._total_bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = (stats["hits"] / lookups) if lookups else 0.0
+        return stats
+
+
+_default_cache: Optional[ParseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_parse_cache() -> Optional[ParseCache]:
+    """
+    프로세스 기본 Document Parse 캐시 반환 (지연 생성)
+
+    환경변수:
+        IMF_PARSE_CACHE: "0"/"false"면 캐시 비활성화
+        IMF_PARSE_CACHE_DIR: 캐시 디렉토리
+        IMF_PARSE_CACHE_MAX_MB: 용량 상한 (MB, 기본 512)
+        IMF_PARSE_CACHE_TTL: 유효 기간 (초, 기본 86400)
+
+    Returns:
+        ParseCache | None: 캐시 인스턴스 (비활성화 시 None)
+    """
+    global _default_cache
+    if os.getenv("IMF_PARSE_CACHE", "1").lower() in ("0", "false", "no"):
+        return None
+
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = ParseCache(
+                    cache_dir=os.getenv("IMF_PARSE_CACHE_DIR") or None,
+                    max_bytes=int(float(os.getenv("IMF_PARSE_CACHE_MAX_MB", "512")) * 1024 * 1024),
+                    ttl_seconds=float(os.getenv("IMF_PARSE_CACHE_TTL", str(24 * 3600)))
+                )
+    return _default_cache
@@ -0,0 +1,561 @@
+"""
+⏳ Document Parse 비동기 작업 (등록 → 폴링 → 구간별 결과 수집)
+
+동기 Document Parse는 OCR이 끝날 때까지 연결을 붙잡고 120초 타임아웃에 묶여
+처리할 수 있는 문서 크기에 한계가 있었음
+
+비동기 작업 모드
+- 문서를 등록하면 작업 ID를 바로 받음 (OCR은 서버에서 진행)
+- 상태를 지수 백오프로 폴링하며, 완료된 구간(batch)부터 결과를 내려받아 바로 전달
+- 여러 문서를 한 번에 등록하고 함께 기다릴 수 있음
+- 작업 목록과 내려받은 구간 결과를 디스크 레지스트리에 기록하므로
+  프로세스가 재시작되어도 진행 중인 OCR 작업을 이어서 수집 (같은 문서를 다시 올려도 재등록하지 않음)
+- 작업 ID는 등록한 키의 계정에만 보이므로 상태 조회는 등록한 키로 고정
+  (기록에는 마스킹된 키만 남기고, 재시작 후에는 현재 키 풀/클라이언트 키에서 복원)
+
+Classes:
+    ParseJob: 작업 기록
+    ParseJobRegistry: 작업 기록 디스크 레지스트리
+    PollPolicy: 상태 폴링 간격
+    ParseJobRunner: 작업 등록/폴링/수집 실행기
+
+Functions:
+    get_parse_job_registry: 프로세스 기본 레지스트리 반환
+"""
+
+import os
+import json
+import time
+import hashlib
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, Optional, List, Iterable, Tuple, Generator
+
+from .deadline import Deadline
+from .pdf_split import PdfChunk, merge_parse_results
+from .resilience import UpstageAPIError
+from .key_pool import KeyPool, mask_key
+from .fast_json import decode_json, json_default, lazy_parse_keys
+
+
+@dataclass
+class ParseJob:
+    """
+    Document Parse 비동기 작업 기록
+
+    Attributes:
+        job_id: 작업 ID (서버 request_id)
+        filename: 파일명
+        document_key: 문서 내용 + 파싱 파라미터 해시 (재시작 후 같은 문서 재등록 방지)
+        ocr_mode: OCR 모드
+        model: Document Parse 모델
+        status: "submitted" / "started" / "completed" / "failed"
+        total_pages: 전체 페이지 수 (서버가 알려주기 전에는 0)
+        completed_pages: 처리 완료 페이지 수
+        batches: 구간 목록 [{id, status, start_page, end_page}]
+        fetched: 결과를 내려받아 레지스트리에 저장한 구간 ID
+        failure_message: 실패 사유
+        result_key: 호출자가 결과를 저장할 키 (재시작 후 재개한 결과를 캐시에 넣을 때 사용)
+        submitted_at: 등록 시각 (epoch)
+        updated_at: 마지막 상태 갱신 시각 (epoch)
+        key_hint: 등록한 키의 마스킹 표기 (mask_key, 디스크 기록용)
+        api_key: 등록한 키 (메모리에만 보관, 디스크에 기록하지 않음)
+        page_numbering: 구간 결과의 페이지 번호 기준 ("global" / "local", 판단 전에는 "")
+    """
+    job_id: str
+    filename: str
+    document_key: str
+    ocr_mode: str
+    model: str
+    status: str = "submitted"
+    total_pages: int = 0
+    completed_pages: int = 0
+    batches: List[Dict[str, Any]] = field(default_factory=list)
+    fetched: List[int] = field(default_factory=list)
+    failure_message: str = ""
+    result_key: Optional[str] = None
+    submitted_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    key_hint: str = ""
+    api_key: Optional[str] = field(default=None, repr=False)
+    page_numbering: str = ""
+
+    @property
+    def failed(self) -> bool:
+        return self.status == "failed"
+
+    @property
+    def finished(self) -> bool:
+        """모든 구간 결과를 내려받았는지 여부"""
+        return self.status == "completed" and len(self.fetched) >= len(self.batches)
+
+    def update(self, status: Dict[str, Any]) -> None:
+        """서버 상태 응답 반영 (download_url은 만료되므로 기록하지 않음)"""
+        self.status = status.get("status", self.status)
+        self.total_pages = int(status.get("total_pages") or self.total_pages)
+        self.completed_pages = int(status.get("completed_pages") or 0)
+        self.failure_message = status.get("failure_message") or ""
+        self.batches = [
+            {key: batch.get(key) for key in ("id", "status", "start_page", "end_page", "failure_message")}
+            for batch in status.get("batches", [])
+        ]
+        self.updated_at = time.time()
+
+
+class ParseJobRegistry:
+    """
+    Document Parse 작업 기록 디스크 레지스트리
+
+    작업마다 <job_id>.json 기록과 <job_id>/ 아래 구간별 결과 파일을 저장
+    (임시 파일 + rename으로 원자적 기록)
+
+    Attributes:
+        registry_dir: 레지스트리 디렉토리
+
+    Example:
+        >>> registry = ParseJobRegistry("./.cache/parse_jobs")
+        >>> for job in registry.pending():
+        ...     print(job.job_id, job.completed_pages, job.total_pages)
+    """
+
+    def __init__(self, registry_dir: Optional[str] = None):
+        """
+        레지스트리 초기화
+
+        Args:
+            registry_dir: 레지스트리 디렉토리 (기본값: 프로젝트 루트의 .cache/parse_jobs)
+        """
+        if registry_dir is None:
+            registry_dir = Path(__file__).parent.parent / ".cache" / "parse_jobs"
+        self.registry_dir = Path(registry_dir)
+        self.registry_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._claims: Dict[str, threading.Lock] = {}
+
+    def _job_path(self, job_id: str) -> Path:
+        return self.registry_dir / f"{job_id}.json"
+
+    def _batch_path(self, job_id: str, batch_id: int) -> Path:
+        return self.registry_dir / job_id / f"batch-{batch_id}.json"
+
+    @staticmethod
+    def _write(path: Path, payload: Any) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, default=json_default)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def save(self, job: ParseJob) -> None:
+        record = asdict(job)
+        record.pop("api_key")
+        with self._lock:
+            self._write(self._job_path(job.job_id), record)
+
+    def load(self, job_id: str) -> Optional[ParseJob]:
+        try:
+            with open(self._job_path(job_id), "r", encoding="utf-8") as f:
+                return ParseJob(**json.load(f))
+        except (OSError, json.JSONDecodeError, TypeError):
+            return None
+
+    def jobs(self) -> List[ParseJob]:
+        """기록된 모든 작업 (등록 순)"""
+        jobs = [self.load(path.stem) for path in self.registry_dir.glob("*.json")]
+        return sorted((job for job in jobs if job is not None), key=lambda job: job.submitted_at)
+
+    def pending(self) -> List[ParseJob]:
+        """실패하지 않았고 결과 수집이 끝나지 않은 작업"""
+        return [job for job in self.jobs() if not job.failed and not job.finished]
+
+    def find(self, document_key: str) -> Optional[ParseJob]:
+        """같은 문서/파라미터로 등록된 진행 중 작업 (실패했거나 수집이 끝난 작업 제외)"""
+        for job in self.jobs():
+            if job.failed or job.finished:
+                continue
+            if job.document_key == document_key:
+                return job
+        return None
+
+    def claim(self, document_key: str) -> threading.Lock:
+        """
+        문서별 등록 잠금 (find → 등록 → save를 묶어 같은 문서의 동시 등록을 하나로)
+
+        다른 문서의 등록은 서로 기다리지 않도록 레지스트리 전체 잠금 대신 문서 키마다 잠금
+        """
+        with self._lock:
+            return self._claims.setdefault(document_key, threading.Lock())
+
+    def put_batch(self, job_id: str, batch_id: int, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._write(self._batch_path(job_id, batch_id), result)
+
+    def get_batch(self, job_id: str, batch_id: int) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._batch_path(job_id, batch_id), "rb") as f:
+                return decode_json(f.read(), lazy_parse_keys())
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def remove(self, job_id: str) -> None:
+        """작업 기록과 구간 결과 삭제"""
+        with self._lock:
+            shutil.rmtree(self.registry_dir / job_id, ignore_errors=True)
+            self._job_path(job_id).unlink(missing_ok=True)
+
+
+@dataclass
+class PollPolicy:
+    """
+    상태 폴링 간격 (진행이 없을 때마다 multiplier배로 늘리고, 새 구간이 완료되면 처음 간격으로)
+
+    Attributes:
+        initial: 첫 폴링 간격 (초)
+        multiplier: 간격 증가 배수
+        max_interval: 최대 간격 (초)
+    """
+    initial: float = 1.0
+    multiplier: float = 1.5
+    max_interval: float = 10.0
+
+    def next_interval(self, current: Optional[float]) -> float:
+        if current is None:
+            return self.initial
+        return min(current * self.multiplier, self.max_interval)
+
+
+def _batch_chunk(batch: Dict[str, Any]) -> PdfChunk:
+    """구간 정보 → merge_parse_results용 PdfChunk (데이터 없음)"""
+    start = int(batch.get("start_page") or 1)
+    return PdfChunk(index=int(batch["id"]), start_page=start, end_page=int(batch.get("end_page") or start), data=b"")
+
+
+def _localize_pages(job: ParseJob, chunk: PdfChunk, result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    원본 기준 페이지 번호를 구간 기준으로 변환 (merge_parse_results가 구간 시작 페이지를 더함)
+
+    번호 기준은 작업마다 한 번만 판단해 job.page_numbering에 기록
+    (첫 구간이 아닌 구간에서 구간 페이지 수보다 큰 번호가 있으면 원본 기준, 없으면 구간 기준)
+    """
+    raw = result.get("raw", result)
+    elements = raw.get("elements", []) if isinstance(raw, dict) else []
+    if not job.page_numbering and chunk.start_page > 1 and elements:
+        size = chunk.end_page - chunk.start_page + 1
+        beyond = any((element.get("page") or 1) > size for element in elements)
+        job.page_numbering = "global" if beyond else "local"
+    if job.page_numbering != "global" or chunk.start_page <= 1:
+        return result
+    localized = [
+        dict(element, page=(element.get("page") or chunk.start_page) - chunk.start_page + 1)
+        for element in elements
+    ]
+    return dict(result, raw=dict(raw, elements=localized))
+
+
+class ParseJobRunner:
+    """
+    Document Parse 비동기 작업 실행기
+
+    UpstageClient의 submit_parse_job / get_parse_job / download_parse_batch를 사용해
+    작업을 등록하고, 폴링으로 완료된 구간을 내려받아 레지스트리에 저장
+
+    Attributes:
+        client: UpstageClient 인스턴스
+        registry: 작업 기록 레지스트리
+        poll: 폴링 간격 정책
+
+    Example:
+        >>> runner = ParseJobRunner(client)
+        >>> job = runner.submit(pdf_bytes, "생기부.pdf")
+        >>> for batch, result in runner.iter_batches(job):
+        ...     print(batch.start_page, batch.end_page, len(result["content"]["text"]))
+        >>> merged = runner.wait(job)
+    """
+
+    def __init__(
+        self,
+        client,
+        registry: Optional[ParseJobRegistry] = None,
+        poll: Optional[PollPolicy] = None,
+        tags: Optional[Dict[str, Any]] = None
+    ):
+        """
+        실행기 초기화
+
+        Args:
+            client: UpstageClient 인스턴스
+            registry: 작업 기록 레지스트리 (미제공 시 프로세스 기본 레지스트리)
+            poll: 폴링 간격 정책
+            tags: 계측 태그 (등록/조회/다운로드 호출에 전달)
+        """
+        self.client = client
+        self.registry = registry or get_parse_job_registry()
+        self.poll = poll or PollPolicy()
+        self.tags = tags
+
+    @staticmethod
+    def document_key(file_bytes: bytes, ocr_mode: str, model: str) -> str:
+        digest = hashlib.sha256(file_bytes).hexdigest()
+        return hashlib.sha256(f"{digest}|ocr={ocr_mode}|model={model}".encode("utf-8")).hexdigest()
+
+    def submit(
+        self,
+        file_bytes: bytes,
+        filename: str = "document.pdf",
+        ocr_mode: str = "force",
+        model: str = "document-parse",
+        deadline: Optional[Deadline] = None,
+        result_key: Optional[str] = None
+    ) -> ParseJob:
+        """
+        작업 등록 (같은 문서의 진행 중 작업이 레지스트리에 있으면 그 작업을 반환, 동시 호출도 한 번만 등록)
+
+        Args:
+            file_bytes: PDF 바이트 데이터
+            filename: 파일명
+            ocr_mode: OCR 모드
+            model: 사용할 모델
+            deadline: 호출 마감 시간
+            result_key: 작업 기록에 남길 결과 저장 키 (예: Document Parse 캐시 키)
+
+        Returns:
+            ParseJob: 등록된 (또는 재개할) 작업
+        """
+        key = self.document_key(file_bytes, ocr_mode, model)
+        with self.registry.claim(key):
+            existing = self.registry.find(key)
+            if existing is not None:
+                return existing
+
+            job_id, api_key = self.client.submit_parse_job(
+                file_bytes, filename, ocr_mode=ocr_mode, model=model, tags=self.tags, deadline=deadline
+            )
+            job = ParseJob(
+                job_id=job_id, filename=filename, document_key=key, ocr_mode=ocr_mode, model=model,
+                result_key=result_key, key_hint=mask_key(api_key), api_key=api_key
+            )
+            self.registry.save(job)
+            return job
+
+    def submit_many(
+        self,
+        documents: Iterable[Tuple[bytes, str]],
+        ocr_mode: str = "force",
+        model: str = "document-parse",
+        max_workers: int = 4,
+        deadline: Optional[Deadline] = None
+    ) -> List[ParseJob]:
+        """
+        여러 문서 동시 등록 (등록 호출은 거버너 parse 예산 적용)
+
+        Args:
+            documents: (PDF 바이트, 파일명) 목록
+            ocr_mode: OCR 모드
+            model: 사용할 모델
+            max_workers: 동시 등록 수
+            deadline: 호출 마감 시간
+
+        Returns:
+            list[ParseJob]: 입력 순서대로의 작업
+        """
+        documents = list(documents)
+        if len(documents) <= 1:
+            return [self.submit(data, name, ocr_mode, model, deadline) for data, name in documents]
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="parse-submit") as pool:
+            futures = [pool.submit(self.submit, data, name, ocr_mode, model, deadline) for data, name in documents]
+            return [future.result() for future in futures]
+
+    def _job_key(self, job: ParseJob) -> Optional[str]:
+        """
+        작업을 등록한 키 (재시작 후에는 마스킹 표기로 키 풀/클라이언트 키에서 복원)
+
+        Raises:
+            UpstageAPIError: 등록한 키가 현재 설정에 없는 경우 (다른 키로 조회하지 않음)
+        """
+        if job.api_key is None and job.key_hint:
+            governor = getattr(self.client, "governor", None)
+            resolved = governor.resolve(job.key_hint) if isinstance(governor, KeyPool) else None
+            if resolved is None and mask_key(self.client.api_key) == job.key_hint:
+                resolved = self.client.api_key
+            if resolved is None:
+                raise UpstageAPIError(
+                    f"Document Parse 작업 {job.job_id}을 등록한 키({job.key_hint})가 현재 설정에 없습니다.",
+                    endpoint="parse",
+                )
+            job.api_key = resolved
+        return job.api_key
+
+    def refresh(self, job: ParseJob, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """
+        서버 상태를 조회해 작업 기록 갱신
+
+        Returns:
+            dict: 상태 원본 응답 (구간별 download_url 포함)
+        """
+        status = self.client.get_parse_job(job.job_id, tags=self.tags, deadline=deadline, api_key=self._job_key(job))
+        job.update(status)
+        self.registry.save(job)
+        return status
+
+    def iter_batches(
+        self,
+        job: ParseJob,
+        deadline: Optional[Deadline] = None
+    ) -> Generator[Tuple[PdfChunk, Dict[str, Any]], None, None]:
+        """
+        완료되는 구간부터 (구간, 정규화된 결과) 전달
+
+        이미 레지스트리에 저장된 구간은 다시 내려받지 않고 먼저 전달 (재시작 후 재개)
+
+        Args:
+            job: 작업
+            deadline: 전체 대기 마감 시간 (폴링 대기 중에도 취소/예산 초과 확인)
+
+        Yields:
+            tuple[PdfChunk, dict]: 구간 정보 (data 없음)와 결과
+
+        Raises:
+            UpstageAPIError: 서버에서 작업 또는 구간이 실패한 경우
+            DeadlineExceeded / CallCancelled: 예산 초과 또는 취소
+        """
+        delivered = set()
+        for batch in job.batches:
+            if batch["id"] in job.fetched:
+                result = self.registry.get_batch(job.job_id, batch["id"])
+                if result is None:
+                    # 레지스트리에서 사라진 결과는 다시 내려받음
+                    job.fetched.remove(batch["id"])
+                    continue
+                delivered.add(batch["id"])
+                chunk = _batch_chunk(batch)
+                yield chunk, _localize_pages(job, chunk, result)
+
+        interval = None
+        while True:
+            status = self.refresh(job, deadline)
+            progressed = False
+            for batch in status.get("batches", []):
+                if batch.get("status") == "failed":
+                    raise UpstageAPIError(
+                        f"Document Parse 작업 {job.job_id} 구간 {batch.get('start_page')}-{batch.get('end_page')}p 실패: "
+                        f"{batch.get('failure_message') or '사유 없음'}",
+                        endpoint="parse",
+                    )
+                if batch.get("status") != "completed" or batch["id"] in delivered:
+                    continue
+                result = self.client.download_parse_batch(batch["download_url"], tags=self.tags, deadline=deadline)
+                self.registry.put_batch(job.job_id, batch["id"], result)
+                if batch["id"] not in job.fetched:
+                    job.fetched.append(batch["id"])
+                chunk = _batch_chunk(batch)
+                localized = _localize_pages(job, chunk, result)
+                self.registry.save(job)
+                delivered.add(batch["id"])
+                progressed = True
+                yield chunk, localized
+
+            if job.failed:
+                raise UpstageAPIError(
+                    f"Document Parse 작업 {job.job_id} 실패: {job.failure_message or '사유 없음'}",
+                    endpoint="parse",
+                )
+            if job.finished:
+                return
+
+            interval = self.poll.initial if progressed else self.poll.next_interval(interval)
+            if deadline is not None:
+                deadline.sleep(interval, "parse")
+            else:
+                time.sleep(interval)
+
+    def wait(self, job: ParseJob, deadline: Optional[Deadline] = None, keep: bool = False) -> Dict[str, Any]:
+        """
+        모든 구간을 수집해 단일 호출과 같은 구조로 병합
+
+        Args:
+            job: 작업
+            deadline: 전체 대기 마감 시간
+            keep: True면 수집이 끝난 작업 기록을 레지스트리에 남김
+
+        Returns:
+            dict: merge_parse_results 병합 결과 (job_id, result_key 포함)
+        """
+        results = list(self.iter_batches(job, deadline))
+        merged = merge_parse_results(results)
+        merged["job_id"] = job.job_id
+        merged["result_key"] = job.result_key
+        if not keep:
+            self.registry.remove(job.job_id)
+        return merged
+
+    def wait_many(
+        self,
+        jobs: List[ParseJob],
+        deadline: Optional[Deadline] = None,
+        max_workers: int = 4
+    ) -> List[Any]:
+        """
+        여러 작업을 함께 기다림
+
+        Returns:
+            list: 작업 순서대로 병합 결과 (실패한 작업은 그 예외 객체)
+        """
+        def collect(job: ParseJob) -> Any:
+            try:
+                return self.wait(job, deadline)
+            except Exception as e:
+                return e
+
+        if len(jobs) <= 1:
+            return [collect(job) for job in jobs]
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="parse-poll") as pool:
+            return list(pool.map(collect, jobs))
+
+    def parse(
+        self,
+        file_bytes: bytes,
+        filename: str = "document.pdf",
+        ocr_mode: str = "force",
+        model: str = "document-parse",
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
+        """등록 후 완료까지 기다려 병합 결과 반환 (parse_document_bytes 대체)"""
+        return self.wait(self.submit(file_bytes, filename, ocr_mode, model, deadline), deadline)
+
+    def resume(self, deadline: Optional[Deadline] = None, max_workers: int = 4) -> Dict[str, Any]:
+        """
+        레지스트리에 남은 진행 중 작업을 이어서 수집 (프로세스 재시작 후)
+
+        Returns:
+            dict: {job_id: 병합 결과 또는 예외}
+        """
+        jobs = self.registry.pending()
+        return {job.job_id: result for job, result in zip(jobs, self.wait_many(jobs, deadline, max_workers))}
+
+
+_default_registry: Optional[ParseJobRegistry] = None
+_default_registry_lock = threading.Lock()
+
+
+def get_parse_job_registry() -> ParseJobRegistry:
+    """
+    프로세스 기본 작업 레지스트리 반환 (지연 생성)
+
+    환경변수:
+        IMF_PARSE_JOBS_DIR: 레지스트리 디렉토리 (기본 .cache/parse_jobs)
+    """
+    global _default_registry
+    if _default_registry is None:
+        with _default_registry_lock:
+            if _default_registry is None:
+                _default_registry = ParseJobRegistry(os.getenv("IMF_PARSE_JOBS_DIR") or None)
+    return _default_registry
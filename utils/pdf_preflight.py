@@ -0,0 +1,224 @@
+"""
+🔎 PDF 텍스트 레이어 사전 분석 (Preflight)
+
+NEIS에서 내려받은 생활기록부 PDF는 대부분 텍스트 레이어가 온전한 디지털 문서인데도
+항상 OCR 강제 모드(force)로 파싱하여 페이지마다 OCR 지연을 부담하고 있음
+
+업로드 직후 로컬에서 페이지별 텍스트 레이어를 검사하여 파싱 전략을 결정
+- local: 모든 페이지의 텍스트 레이어가 온전함 → API 호출 없이 로컬 추출 (허용 시)
+- auto: 텍스트 레이어가 온전한 페이지가 있음 → Upstage가 필요한 페이지만 OCR
+- force: 텍스트 레이어가 없거나 깨진 스캔 문서 → OCR 강제
+
+Classes:
+    PageTextLayer: 페이지별 텍스트 레이어 분석 결과
+    PreflightResult: 문서 단위 분석 결과 및 파싱 전략
+
+Functions:
+    analyze_pdf: PDF 텍스트 레이어 분석 및 전략 결정
+    build_local_parse_response: 로컬 추출 텍스트로 Document Parse 응답 구성
+"""
+
+import io
+import os
+import re
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, List
+
+from PyPDF2 import PdfReader
+
+
+# 페이지를 텍스트 페이지로 인정하는 최소 글자 수 (공백 제외)
+MIN_CHARS_PER_PAGE = 40
+
+# 정상 문자(한글, 영문/숫자, 문장부호) 비율 하한 - 미만이면 글꼴 매핑이 깨진 것으로 판단
+MIN_VALID_RATIO = 0.85
+
+# OCR 페이지당 예상 처리 시간 (초) - 절약 시간 추정용
+OCR_SECONDS_PER_PAGE = float(os.getenv("IMF_OCR_SECONDS_PER_PAGE", "2.5"))
+
+_VALID_CHAR = re.compile(r"[가-힣ㄱ-ㆎ0-9A-Za-z\s.,:;!?()\[\]{}<>'\"`~@#$%^&*_+=|/\\·ㆍ○●□■△▲※-]")
+_CID_GLYPH = re.compile(r"\(cid:\d+\)")
+
+
+@dataclass
+class PageTextLayer:
+    """
+    페이지별 텍스트 레이어 분석 결과
+
+    Attributes:
+        page: 페이지 번호 (1부터)
+        char_count: 공백 제외 글자 수
+        valid_ratio: 정상 문자 비율
+        has_images: 이미지 객체 포함 여부
+        has_text_layer: 텍스트 레이어가 온전한지 여부
+    """
+    page: int
+    char_count: int
+    valid_ratio: float
+    has_images: bool
+    has_text_layer: bool
+
+
+@dataclass
+class PreflightResult:
+    """
+    문서 단위 텍스트 레이어 분석 결과
+
+    Attributes:
+        strategy: 파싱 전략 ("local", "auto", "force")
+        pages: 페이지별 분석 결과
+        page_texts: 로컬 추출 텍스트 (페이지 순서)
+        analysis_seconds: 분석에 걸린 시간 (초)
+        reason: 전략 결정 사유
+    """
+    strategy: str
+    pages: List[PageTextLayer] = field(default_factory=list)
+    page_texts: List[str] = field(default_factory=list)
+    analysis_seconds: float = 0.0
+    reason: str = ""
+
+    @property
+    def ocr_mode(self) -> str:
+        """Document Parse에 전달할 OCR 모드 (local 전략은 API를 호출하지 않음)"""
+        return "force" if self.strategy == "force" else "auto"
+
+    @property
+    def text_page_count(self) -> int:
+        return sum(1 for page in self.pages if page.has_text_layer)
+
+    def estimated_seconds_saved(self) -> float:
+        """
+        OCR 강제 모드 대비 절약 시간 추정
+
+        local은 전체 페이지, auto는 텍스트 레이어가 온전한 페이지의 OCR 시간을 절약
+        (분석 시간은 차감)
+        """
+        if self.strategy == "local":
+            skipped = len(self.pages)
+        elif self.strategy == "auto":
+            skipped = self.text_page_count
+        else:
+            skipped = 0
+        return max(skipped * OCR_SECONDS_PER_PAGE - self.analysis_seconds, 0.0)
+
+    def to_metadata(self) -> Dict[str, Any]:
+        """ParsedDocument.metadata에 기록할 요약"""
+        return {
+            "strategy": self.strategy,
+            "ocr_mode": None if self.strategy == "local" else self.ocr_mode,
+            "reason": self.reason,
+            "text_pages": [page.page for page in self.pages if page.has_text_layer],
+            "ocr_pages": [page.page for page in self.pages if not page.has_text_layer],
+            "analysis_seconds": round(self.analysis_seconds, 3),
+            "estimated_seconds_saved": round(self.estimated_seconds_saved(), 1),
+            "page_details": [asdict(page) for page in self.pages],
+        }
+
+
+def _page_has_images(page) -> bool:
+    """페이지 리소스에 이미지 XObject가 있는지 확인"""
+    try:
+        resources = page.get("/Resources") or {}
+        xobjects = resources.get("/XObject") or {}
+        return any(
+            xobject.get_object().get("/Subtype") == "/Image"
+            for xobject in xobjects.values()
+        )
+    except Exception:
+        return False
+
+
+def _analyze_page(page_no: int, text: str, has_images: bool) -> PageTextLayer:
+    """페이지 텍스트 품질 판정"""
+    stripped = re.sub(r"\s+", "", _CID_GLYPH.sub("�", text))
+    char_count = len(stripped)
+    if char_count:
+        valid = sum(1 for ch in stripped if _VALID_CHAR.match(ch))
+        valid_ratio = valid / char_count
+    else:
+        valid_ratio = 0.0
+
+    return PageTextLayer(
+        page=page_no,
+        char_count=char_count,
+        valid_ratio=round(valid_ratio, 3),
+        has_images=has_images,
+        has_text_layer=char_count >= MIN_CHARS_PER_PAGE and valid_ratio >= MIN_VALID_RATIO,
+    )
+
+
+def analyze_pdf(file_bytes: bytes, allow_local: bool = False) -> PreflightResult:
+    """
+    PDF 텍스트 레이어 분석 및 파싱 전략 결정
+
+    Args:
+        file_bytes: PDF 바이트 데이터
+        allow_local: 모든 페이지가 텍스트 페이지일 때 로컬 추출(local) 허용 여부
+            (로컬 추출은 표 구조/HTML이 없으므로 기본적으로 비활성)
+
+    Returns:
+        PreflightResult: 분석 결과 (읽을 수 없는 PDF는 force)
+    """
+    started = time.perf_counter()
+
+    try:
+        reader = PdfReader(io.BytesIO(file_bytes))
+        raw_pages = list(reader.pages)
+    except Exception as e:
+        return PreflightResult(
+            strategy="force",
+            analysis_seconds=time.perf_counter() - started,
+            reason=f"PDF를 읽을 수 없음: {e}",
+        )
+
+    pages: List[PageTextLayer] = []
+    page_texts: List[str] = []
+    for page_no, page in enumerate(raw_pages, start=1):
+        try:
+            text = page.extract_text() or ""
+        except Exception:
+            text = ""
+        page_texts.append(text)
+        pages.append(_analyze_page(page_no, text, _page_has_images(page)))
+
+    text_pages = sum(1 for page in pages if page.has_text_layer)
+
+    if not pages or text_pages == 0:
+        strategy, reason = "force", "텍스트 레이어 없음 (스캔 문서)"
+    elif text_pages == len(pages):
+        if allow_local:
+            strategy, reason = "local", "모든 페이지 텍스트 레이어 온전 - 로컬 추출"
+        else:
+            strategy, reason = "auto", "모든 페이지 텍스트 레이어 온전"
+    else:
+        strategy, reason = "auto", f"{len(pages) - text_pages}/{len(pages)} 페이지만 OCR 필요"
+
+    return PreflightResult(
+        strategy=strategy,
+        pages=pages,
+        page_texts=page_texts if strategy == "local" else [],
+        analysis_seconds=time.perf_counter() - started,
+        reason=reason,
+    )
+
+
+def build_local_parse_response(preflight: PreflightResult) -> Dict[str, Any]:
+    """
+    로컬 추출 텍스트로 Document Parse 정규화 응답과 같은 구조 구성
+
+    Args:
+        preflight: strategy가 local인 분석 결과
+
+    Returns:
+        dict: {"content": {"text", "pages", "tables"}, "usage": {"pages"}}
+    """
+    pages = [text.strip() for text in preflight.page_texts]
+    return {
+        "content": {
+            "text": "\n".join(text for text in pages if text),
+            "pages": pages,
+            "tables": [],
+        },
+        "usage": {"pages": len(pages)},
+    }
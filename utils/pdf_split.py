@@ -0,0 +1,155 @@
+"""
+✂️ PDF 페이지 구간 분할 및 파싱 결과 병합
+
+30~40페이지 3개년 생활기록부를 한 번에 OCR하면 120초 타임아웃에 근접하므로
+페이지 구간(chunk)으로 나누어 병렬 파싱한 뒤 페이지 순서대로 다시 합침
+
+Classes:
+    PdfChunk: 분할된 PDF 구간
+
+Functions:
+    count_pdf_pages: PDF 페이지 수
+    split_pdf: PDF를 페이지 구간으로 분할
+    merge_parse_results: 구간별 Document Parse 결과를 페이지 순서대로 병합
+"""
+
+import io
+from dataclasses import dataclass
+from typing import Dict, Any, List, Tuple
+
+from PyPDF2 import PdfReader, PdfWriter
+
+
+@dataclass
+class PdfChunk:
+    """
+    분할된 PDF 구간
+
+    Attributes:
+        index: 구간 순번 (0부터)
+        start_page: 시작 페이지 (1부터, 원본 기준)
+        end_page: 끝 페이지 (포함)
+        data: 구간 PDF 바이트
+    """
+    index: int
+    start_page: int
+    end_page: int
+    data: bytes
+
+
+def count_pdf_pages(file_bytes: bytes) -> int:
+    """PDF 페이지 수 (읽을 수 없는 파일은 0)"""
+    try:
+        return len(PdfReader(io.BytesIO(file_bytes)).pages)
+    except Exception:
+        return 0
+
+
+def split_pdf(file_bytes: bytes, pages_per_chunk: int) -> List[PdfChunk]:
+    """
+    PDF를 페이지 구간으로 분할
+
+    Args:
+        file_bytes: 원본 PDF 바이트
+        pages_per_chunk: 구간당 페이지 수
+
+    Returns:
+        list[PdfChunk]: 페이지 순서대로 정렬된 구간 목록
+    """
+    reader = PdfReader(io.BytesIO(file_bytes))
+    total = len(reader.pages)
+    if total <= pages_per_chunk:
+        # 분할할 필요 없음 - 원본 그대로
+        return [PdfChunk(index=0, start_page=1, end_page=total, data=file_bytes)]
+
+    chunks = []
+
+    for index, start in enumerate(range(0, total, max(pages_per_chunk, 1))):
+        end = min(start + pages_per_chunk, total)
+        writer = PdfWriter()
+        for page_no in range(start, end):
+            writer.add_page(reader.pages[page_no])
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        chunks.append(PdfChunk(index=index, start_page=start + 1, end_page=end, data=buffer.getvalue()))
+
+    return chunks
+
+
+def _element_text(element: Dict[str, Any]) -> str:
+    """element에서 텍스트 추출"""
+    content = element.get("content")
+    if isinstance(content, dict):
+        return content.get("text") or ""
+    if isinstance(content, str):
+        return content
+    return element.get("text") or ""
+
+
+def merge_parse_results(results: List[Tuple[PdfChunk, Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    구간별 Document Parse 결과를 원본 페이지 순서대로 병합
+
+    elements의 page 번호를 원본 기준으로 보정하고,
+    페이지별 텍스트(pages)와 테이블(tables)을 content 아래에 채움
+
+    Args:
+        results: (구간, 정규화된 파싱 결과) 목록
+
+    Returns:
+        dict: 단일 요청 응답과 같은 구조의 병합 결과
+    """
+    text_parts: List[str] = []
+    html_parts: List[str] = []
+    pages: List[str] = []
+    tables: List[Any] = []
+    elements: List[Dict[str, Any]] = []
+    chunk_info = []
+
+    for chunk, result in sorted(results, key=lambda item: item[0].start_page):
+        content = result.get("content", {})
+        if isinstance(content, dict):
+            text_parts.append(content.get("text", ""))
+            if content.get("html"):
+                html_parts.append(content["html"])
+        elif isinstance(content, str):
+            text_parts.append(content)
+
+        raw = result.get("raw", result)
+        chunk_elements = raw.get("elements", []) if isinstance(raw, dict) else []
+
+        page_texts: Dict[int, List[str]] = {}
+        for element in chunk_elements:
+            element = dict(element)
+            local_page = element.get("page", 1) or 1
+            element["page"] = chunk.start_page + local_page - 1
+            element["id"] = len(elements)
+            elements.append(element)
+
+            page_texts.setdefault(element["page"], []).append(_element_text(element))
+            if element.get("category") == "table":
+                tables.append(element.get("content", {}))
+
+        if page_texts:
+            for page_no in range(chunk.start_page, chunk.end_page + 1):
+                pages.append("\n".join(t for t in page_texts.get(page_no, []) if t))
+        else:
+            # 페이지 정보가 없는 응답은 구간 전체를 한 덩어리로 유지
+            pages.append(text_parts[-1] if text_parts else "")
+
+        chunk_info.append({"start_page": chunk.start_page, "end_page": chunk.end_page})
+
+    merged_content: Dict[str, Any] = {
+        "text": "\n".join(t for t in text_parts if t),
+        "pages": pages,
+        "tables": tables,
+    }
+    if html_parts:
+        merged_content["html"] = "\n".join(html_parts)
+
+    return {
+        "content": merged_content,
+        "elements": elements,
+        "usage": {"pages": chunk_info[-1]["end_page"] if chunk_info else 0},
+        "chunks": chunk_info,
+    }
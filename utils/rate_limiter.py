@@ -0,0 +1,363 @@
+"""
+🚦 Upstage 호출 속도/동시성 제어 (Governor)
+
+상담 주간 피크에 여러 세션이 동시에 Document Parse, 추출 스트림, 추천, 근거 검증을
+호출하면서 발생하는 429 및 재시도 폭주를 막기 위한 프로세스 공유 거버너
+
+- 엔드포인트 분류(parse, extract, chat, groundedness)별로 독립된 예산
+  · 초당 요청 수(token bucket) + 최대 동시 실행 수(in-flight)
+  · chat 분류는 chat / chat_stream / chat_with_context를 모두 포함
+- 대기열은 FIFO로 공정하게 처리 (먼저 온 호출이 먼저 슬롯을 받음)
+- 호출자는 발급받은 Ticket에서 대기 시간(queue_wait)을 확인
+- 실행 중에도 configure()로 예산 변경 가능
+
+Classes:
+    EndpointBudget: 엔드포인트 분류별 예산
+    Ticket: 슬롯 발급 정보
+    UpstageGovernor: 프로세스 공유 거버너
+
+Functions:
+    get_governor: 프로세스 기본 거버너 반환
+"""
+
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+from contextlib import contextmanager, asynccontextmanager
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, Optional
+
+
+class GovernorTimeout(Exception):
+    """대기 시간 안에 슬롯을 받지 못함"""
+
+
+@dataclass
+class EndpointBudget:
+    """
+    엔드포인트 분류별 예산
+
+    Attributes:
+        rps: 초당 허용 요청 수 (0 이하면 무제한)
+        burst: 순간 허용 요청 수 (token bucket 용량)
+        max_in_flight: 최대 동시 실행 수 (0 이하면 무제한)
+    """
+    rps: float = 0.0
+    burst: int = 1
+    max_in_flight: int = 0
+
+
+@dataclass
+class Ticket:
+    """
+    슬롯 발급 정보
+
+    Attributes:
+        endpoint: 엔드포인트 분류
+        enqueued_at: 대기열 진입 시각 (monotonic)
+        granted_at: 슬롯 발급 시각 (monotonic)
+        api_key: 키 풀이 고른 API 키 (단일 키 거버너는 None)
+        pinned: 호출자가 키를 지정했는지 여부 (다른 키로 재시도하면 안 되는 호출)
+    """
+    endpoint: str
+    enqueued_at: float = field(default_factory=time.monotonic)
+    granted_at: Optional[float] = None
+    api_key: Optional[str] = None
+    pinned: bool = False
+
+    @property
+    def queue_wait(self) -> float:
+        """대기열에서 기다린 시간 (초)"""
+        if self.granted_at is None:
+            return time.monotonic() - self.enqueued_at
+        return self.granted_at - self.enqueued_at
+
+
+class _EndpointLimiter:
+    """
+    단일 엔드포인트 분류의 token bucket + in-flight 제한 (내부 전용)
+
+    대기열 맨 앞의 Ticket만 슬롯을 받을 수 있어 FIFO 순서가 보장됨
+    """
+
+    def __init__(self, name: str, budget: EndpointBudget):
+        self.name = name
+        self.budget = budget
+        self._cond = threading.Condition()
+        self._queue: deque = deque()
+        self._tokens = float(max(budget.burst, 1))
+        self._last_refill = time.monotonic()
+        self.in_flight = 0
+
+        self.granted = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def configure(self, budget: EndpointBudget) -> None:
+        """예산 변경 후 대기 중인 호출 깨우기"""
+        with self._cond:
+            self._refill()
+            self.budget = budget
+            self._tokens = min(self._tokens, float(max(budget.burst, 1)))
+            self._cond.notify_all()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if self.budget.rps > 0:
+            capacity = float(max(self.budget.burst, 1))
+            self._tokens = min(capacity, self._tokens + (now - self._last_refill) * self.budget.rps)
+        self._last_refill = now
+
+    def _try_grant(self, ticket: Ticket) -> Optional[float]:
+        """
+        슬롯 발급 시도 (잠금 보유 상태에서 호출)
+
+        Returns:
+            None이면 발급 완료, 아니면 다음 확인까지 기다릴 시간(초, 0이면 알림 대기)
+        """
+        if not self._queue or self._queue[0] is not ticket:
+            return 0.0
+        if self.budget.max_in_flight > 0 and self.in_flight >= self.budget.max_in_flight:
+            return 0.0
+
+        self._refill()
+        if self.budget.rps > 0 and self._tokens < 1.0:
+            return (1.0 - self._tokens) / self.budget.rps
+
+        if self.budget.rps > 0:
+            self._tokens -= 1.0
+        self._queue.popleft()
+        self.in_flight += 1
+        ticket.granted_at = time.monotonic()
+
+        self.granted += 1
+        self.total_wait += ticket.queue_wait
+        self.max_wait = max(self.max_wait, ticket.queue_wait)
+        # 다음 순번이 바로 확인할 수 있도록 알림
+        self._cond.notify_all()
+        return None
+
+    def _abandon(self, ticket: Ticket) -> None:
+        """대기 포기 (잠금 보유 상태에서 호출)"""
+        try:
+            self._queue.remove(ticket)
+        except ValueError:
+            pass
+        self.timeouts += 1
+        self._cond.notify_all()
+
+    def acquire(self, timeout: Optional[float] = None) -> Ticket:
+        """슬롯을 받을 때까지 대기 (스레드 블로킹)"""
+        ticket = Ticket(self.name)
+        deadline = None if timeout is None else ticket.enqueued_at + timeout
+
+        with self._cond:
+            self._queue.append(ticket)
+            while True:
+                wait = self._try_grant(ticket)
+                if wait is None:
+                    return ticket
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._abandon(ticket)
+                    raise GovernorTimeout(f"{self.name} 슬롯 대기 시간 초과 ({timeout:.1f}s)")
+
+                candidates = [w for w in (wait or None, remaining) if w is not None]
+                self._cond.wait(min(candidates) if candidates else None)
+
+    async def acquire_async(self, timeout: Optional[float] = None) -> Ticket:
+        """슬롯을 받을 때까지 대기 (이벤트 루프 비블로킹, 같은 FIFO 대기열 공유)"""
+        ticket = Ticket(self.name)
+        deadline = None if timeout is None else ticket.enqueued_at + timeout
+
+        with self._cond:
+            self._queue.append(ticket)
+
+        try:
+            while True:
+                with self._cond:
+                    wait = self._try_grant(ticket)
+                    if wait is None:
+                        return ticket
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        self._abandon(ticket)
+                        raise GovernorTimeout(f"{self.name} 슬롯 대기 시간 초과 ({timeout:.1f}s)")
+
+                # 알림을 받을 수 없으므로 짧은 간격으로 다시 확인
+                await asyncio.sleep(min(wait or 0.01, 0.05))
+        except asyncio.CancelledError:
+            with self._cond:
+                if ticket.granted_at is None:
+                    self._abandon(ticket)
+                else:
+                    self.release()
+            raise
+
+    def release(self) -> None:
+        """슬롯 반환"""
+        with self._cond:
+            self.in_flight = max(self.in_flight - 1, 0)
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "budget": asdict(self.budget),
+                "in_flight": self.in_flight,
+                "queued": len(self._queue),
+                "granted": self.granted,
+                "timeouts": self.timeouts,
+                "avg_wait": (self.total_wait / self.granted) if self.granted else 0.0,
+                "max_wait": self.max_wait,
+            }
+
+
+class UpstageGovernor:
+    """
+    Upstage 엔드포인트 분류별 속도/동시성 거버너
+
+    Attributes:
+        ENDPOINTS: 지원하는 엔드포인트 분류
+        DEFAULT_BUDGETS: 기본 예산 (환경변수로 덮어쓰기 가능)
+
+    환경변수:
+        UPSTAGE_RPS_<분류>, UPSTAGE_BURST_<분류>, UPSTAGE_MAX_IN_FLIGHT_<분류>
+        (예: UPSTAGE_RPS_PARSE=1, UPSTAGE_MAX_IN_FLIGHT_CHAT=32)
+
+    Example:
+        >>> governor = get_governor()
+        >>> with governor.slot("parse") as ticket:
+        ...     response = session.post(...)
+        >>> print(f"대기 {ticket.queue_wait:.2f}s")
+    """
+
+    ENDPOINTS = ("parse", "extract", "chat", "groundedness")
+
+    DEFAULT_BUDGETS = {
+        "parse": EndpointBudget(rps=2.0, burst=4, max_in_flight=4),
+        "extract": EndpointBudget(rps=2.0, burst=4, max_in_flight=4),
+        "chat": EndpointBudget(rps=5.0, burst=10, max_in_flight=16),
+        "groundedness": EndpointBudget(rps=5.0, burst=10, max_in_flight=8),
+    }
+
+    def __init__(self, budgets: Optional[Dict[str, EndpointBudget]] = None):
+        """
+        거버너 초기화
+
+        Args:
+            budgets: 엔드포인트 분류별 예산 (미지정 분류는 환경변수/기본값)
+        """
+        budgets = budgets or {}
+        self._limiters = {
+            name: _EndpointLimiter(name, budgets.get(name) or self._budget_from_env(name))
+            for name in self.ENDPOINTS
+        }
+
+    def _budget_from_env(self, name: str) -> EndpointBudget:
+        default = self.DEFAULT_BUDGETS[name]
+        suffix = name.upper()
+        return EndpointBudget(
+            rps=float(os.getenv(f"UPSTAGE_RPS_{suffix}", default.rps)),
+            burst=int(os.getenv(f"UPSTAGE_BURST_{suffix}", default.burst)),
+            max_in_flight=int(os.getenv(f"UPSTAGE_MAX_IN_FLIGHT_{suffix}", default.max_in_flight)),
+        )
+
+    def _limiter(self, endpoint: str) -> _EndpointLimiter:
+        if endpoint not in self._limiters:
+            raise ValueError(f"알 수 없는 엔드포인트 분류: {endpoint} (지원: {', '.join(self.ENDPOINTS)})")
+        return self._limiters[endpoint]
+
+    def configure(
+        self,
+        endpoint: str,
+        rps: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_in_flight: Optional[int] = None
+    ) -> EndpointBudget:
+        """
+        실행 중 예산 변경
+
+        Args:
+            endpoint: 엔드포인트 분류
+            rps: 초당 허용 요청 수
+            burst: 순간 허용 요청 수
+            max_in_flight: 최대 동시 실행 수
+
+        Returns:
+            EndpointBudget: 적용된 예산
+        """
+        limiter = self._limiter(endpoint)
+        current = limiter.budget
+        budget = EndpointBudget(
+            rps=rps if rps is not None else current.rps,
+            burst=burst if burst is not None else current.burst,
+            max_in_flight=max_in_flight if max_in_flight is not None else current.max_in_flight,
+        )
+        limiter.configure(budget)
+        return budget
+
+    def acquire(self, endpoint: str, timeout: Optional[float] = None, api_key: Optional[str] = None) -> Ticket:
+        """슬롯 획득 (반드시 release 호출 필요, api_key는 KeyPool 호환용 - 단일 키 거버너는 무시)"""
+        return self._limiter(endpoint).acquire(timeout)
+
+    async def acquire_async(
+        self,
+        endpoint: str,
+        timeout: Optional[float] = None,
+        api_key: Optional[str] = None
+    ) -> Ticket:
+        """슬롯 획득 (비동기)"""
+        return await self._limiter(endpoint).acquire_async(timeout)
+
+    def release(self, ticket: Ticket) -> None:
+        """슬롯 반환"""
+        self._limiter(ticket.endpoint).release()
+
+    def observe(self, ticket: Ticket, error: Any = None, tokens: Optional[int] = None) -> None:
+        """호출 결과 반영 (단일 키 거버너는 기록하지 않음, KeyPool 호환용)"""
+
+    @contextmanager
+    def slot(self, endpoint: str, timeout: Optional[float] = None):
+        """슬롯 획득 ~ 반환 컨텍스트 매니저"""
+        ticket = self.acquire(endpoint, timeout)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    @asynccontextmanager
+    async def slot_async(self, endpoint: str, timeout: Optional[float] = None):
+        """슬롯 획득 ~ 반환 비동기 컨텍스트 매니저"""
+        ticket = await self.acquire_async(endpoint, timeout)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        엔드포인트 분류별 통계
+
+        Returns:
+            dict: {분류: {budget, in_flight, queued, granted, timeouts, avg_wait, max_wait}}
+        """
+        return {name: limiter.stats() for name, limiter in self._limiters.items()}
+
+
+_governor: Optional[UpstageGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_governor() -> UpstageGovernor:
+    """프로세스 공유 거버너 반환 (지연 생성)"""
+    global _governor
+    if _governor is None:
+        with _governor_lock:
+            if _governor is None:
+                _governor = UpstageGovernor()
+    return _governor
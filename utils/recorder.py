@@ -0,0 +1,682 @@
+"""
+🎙️ Upstage 호출 기록 (Record mode)
+
+운영에서 생긴 지연/파싱 문제를 오프라인에서 재현할 수 없었음
+(Upstage에 무엇을 보내고 무엇을 받았는지 남는 곳이 없었음)
+
+UpstageClient/AsyncUpstageClient의 모든 전송 시도를 한 줄짜리 JSON으로 덧붙여 기록
+- 원시 엔드포인트(Document Parse, Information Extract, 비동기 작업): 요청 필드 + 상태 코드 + 응답 본문 + 지연
+- Chat Completions: 요청 파라미터 + 응답 전체 (스트림은 조각 순서와 요청 시작 기준 도착 시각 [ms, 텍스트])
+- 재시도/헤지로 나간 시도도 각각 한 줄 (429/5xx/끊김도 그대로 남아 재생 시 같은 순서로 재현)
+- 문서 바이트는 남기지 않고 SHA-256만 기록 (재생 시 REPLAY_MARKER 문서로 대체)
+- 민감 정보 가림: 정규식(주민등록번호/전화번호/이메일 기본) + 지정한 JSON 키의 값
+  스트림은 조각을 이어 붙인 전체 텍스트에서 가려 조각 경계에 걸친 값도 가림
+- 재생 키(replay_key)는 가린 뒤의 요청으로 계산 → 재생 서버가 같은 요청을 받으면 같은 응답을 찾음
+
+사용법:
+    $ UPSTAGE_RECORD=logs/upstage.jsonl.gz streamlit run app.py
+    $ python -m utils.replay logs/upstage.jsonl.gz
+
+Classes:
+    RedactionPolicy: 민감 정보 가림 규칙
+    StreamRecording: 스트림 한 번의 조각 기록
+    InteractionRecorder: 덧붙이기 전용 호출 기록기
+
+Functions:
+    document_digest: 문서 SHA-256 (재생용 대체 문서면 원래 해시)
+    replay_document: 해시를 담은 재생용 대체 문서
+    canonical_chat: Chat Completions 요청 정규화 (data URL → 문서 해시)
+    canonical_multipart: multipart 요청 정규화 (문서 → 문서 해시)
+    replay_key: 재생 키 계산
+    load_log: 기록 파일 읽기
+    get_recorder: UPSTAGE_RECORD 설정의 프로세스 공유 기록기 반환
+"""
+
+import os
+import re
+import gzip
+import json
+import time
+import base64
+import hashlib
+import threading
+from pathlib import Path
+from urllib.parse import urlsplit
+from typing import Dict, Any, Optional, List, Sequence, Tuple, Callable, Iterator, AsyncIterator
+
+LOG_VERSION = 1
+
+# 재생 시 원본 문서 대신 보내는 문서 (접두사 + 원본 SHA-256)
+REPLAY_MARKER = b"%IMF-REPLAY "
+
+DEFAULT_REDACT_PATTERNS = (
+    r"\d{6}-[1-4]\d{6}",                         # 주민등록번호
+    r"01[016789]-?\d{3,4}-?\d{4}",               # 휴대전화
+    r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+",             # 이메일
+)
+DEFAULT_REDACT_KEYS = ("student_name", "name")
+
+_DATA_URL = re.compile(r"^data:[^;,]*;base64,")
+
+
+# =============================================================================
+# 요청 정규화 / 재생 키
+# =============================================================================
+def document_digest(data: Any) -> str:
+    """
+    문서 SHA-256
+
+    Args:
+        data: 문서 바이트 (bytes, memoryview, mmap)
+
+    Returns:
+        str: 16진수 해시 (재생용 대체 문서면 담겨 있는 원래 해시)
+    """
+    view = memoryview(data).cast("B")
+    if view[:len(REPLAY_MARKER)] == REPLAY_MARKER:
+        return bytes(view[len(REPLAY_MARKER):]).decode("ascii").strip()
+    return hashlib.sha256(view).hexdigest()
+
+
+def replay_document(digest: str) -> bytes:
+    """재생 서버가 원래 문서로 인식하는 대체 문서"""
+    return REPLAY_MARKER + digest.encode("ascii")
+
+
+def _route(url: str) -> str:
+    """호스트와 /v1 접두사를 뗀 경로 (기록/재생 서버 주소가 달라도 같은 값)"""
+    path = urlsplit(url).path.rstrip("/")
+    index = path.find("/v1/")
+    return path[index + 3:] if index >= 0 else path
+
+
+def _replace_documents(value: Any) -> Any:
+    """data URL 문자열을 {"document_sha256": ...}로 교체 (재귀)"""
+    if isinstance(value, dict):
+        return {key: _replace_documents(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_replace_documents(item) for item in value]
+    if isinstance(value, str) and _DATA_URL.match(value):
+        encoded = value[_DATA_URL.match(value).end():]
+        return {"document_sha256": document_digest(base64.b64decode(encoded))}
+    return value
+
+
+def canonical_chat(body: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Chat Completions 요청 정규화
+
+    SDK가 보내지 않는 None 값을 빼고, 첨부 문서(data URL)는 해시로 바꿈
+
+    Args:
+        body: chat.completions.create 파라미터 또는 서버가 받은 JSON 본문
+
+    Returns:
+        dict: 정규화된 요청 (stream은 항상 bool)
+    """
+    request = {key: _replace_documents(value) for key, value in body.items() if value is not None}
+    request["stream"] = bool(request.get("stream"))
+    return request
+
+
+def canonical_multipart(fields: Dict[str, str], document: Optional[Any]) -> Dict[str, Any]:
+    """
+    multipart 요청(Document Parse) 정규화
+
+    Args:
+        fields: 문서를 제외한 폼 필드
+        document: 문서 바이트 (없으면 None)
+
+    Returns:
+        dict: 폼 필드 + {"document": {"document_sha256": ...}}
+    """
+    request = {key: str(value) for key, value in fields.items()}
+    if document is not None:
+        request["document"] = {"document_sha256": document_digest(document)}
+    return request
+
+
+def replay_key(method: str, route: str, request: Optional[Dict[str, Any]]) -> str:
+    """
+    재생 키 (메서드 + 경로 + 정규화/가림 처리한 요청)
+
+    Args:
+        method: HTTP 메서드
+        route: _route() 경로 (예: "/chat/completions")
+        request: 정규화된 요청 (GET은 None)
+
+    Returns:
+        str: 40자 16진수 키
+    """
+    canonical = json.dumps([method.lower(), route, request], ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def _document_bytes(value: Any) -> Optional[bytes]:
+    """requests files= 값에서 문서 바이트 (파일 객체는 읽은 뒤 처음으로 되감음)"""
+    if isinstance(value, tuple):
+        value = value[1]
+    if hasattr(value, "read"):
+        data = value.read()
+        value.seek(0)
+        return data
+    return value
+
+
+def describe_http(url: str, kwargs: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    원시 엔드포인트 요청 인자를 정규화된 요청으로 변환
+
+    Args:
+        url: 요청 URL
+        kwargs: requests/httpx 요청 인자 (files/data/content/json)
+
+    Returns:
+        tuple: (경로, 정규화된 요청 - 본문이 없으면 None)
+    """
+    route = _route(url)
+    body = kwargs.get("data")
+    content = kwargs.get("content")
+    if content is not None and hasattr(content, "body"):
+        body = content.body
+    if hasattr(body, "payload") and hasattr(body, "source"):
+        # Information Extract 스트리밍 본문: base64 자리를 문서 해시로
+        slot = body.BASE64_SLOT
+        digest = {"document_sha256": document_digest(body.source)}
+
+        def fill(value):
+            if isinstance(value, dict):
+                return {key: fill(item) for key, item in value.items()}
+            if isinstance(value, list):
+                return [fill(item) for item in value]
+            return digest if value == slot else value
+
+        return route, canonical_chat(fill(body.payload))
+    if kwargs.get("json") is not None:
+        return route, canonical_chat(kwargs["json"])
+    files = kwargs.get("files")
+    if files or isinstance(body, dict):
+        document = _document_bytes(files["document"]) if files and "document" in files else None
+        return route, canonical_multipart(body or {}, document)
+    return route, None
+
+
+# =============================================================================
+# 민감 정보 가림
+# =============================================================================
+class RedactionPolicy:
+    """
+    민감 정보 가림 규칙
+
+    같은 정책을 두 번 적용해도 결과가 같음 (가린 요청으로 다시 재생 키를 계산해도 일치)
+
+    Attributes:
+        patterns: 텍스트에서 가릴 정규식 목록
+        keys: 값을 가릴 JSON 키 (dict 키 + 텍스트 속 "키": "값" 형태)
+        placeholder: 가린 자리에 넣는 문자열
+
+    Example:
+        >>> policy = RedactionPolicy()
+        >>> policy.redact_text("연락처 010-1234-5678")
+        '연락처 [REDACTED]'
+        >>> policy.redact({"student_name": "홍길동", "grade": 2})
+        {'student_name': '[REDACTED]', 'grade': 2}
+    """
+
+    def __init__(
+        self,
+        patterns: Sequence[str] = DEFAULT_REDACT_PATTERNS,
+        keys: Sequence[str] = DEFAULT_REDACT_KEYS,
+        placeholder: str = "[REDACTED]"
+    ):
+        self.patterns = tuple(patterns)
+        self.keys = frozenset(keys)
+        self.placeholder = placeholder
+        self._pattern = re.compile("|".join(f"(?:{p})" for p in self.patterns)) if self.patterns else None
+        self._key_pattern = (
+            re.compile(r'"(?:%s)"\s*:\s*"((?:[^"\\]|\\.)*)"' % "|".join(re.escape(k) for k in sorted(self.keys)))
+            if self.keys else None
+        )
+
+    @classmethod
+    def from_env(cls) -> "RedactionPolicy":
+        """
+        환경변수로 정책 구성
+
+        UPSTAGE_RECORD_REDACT_KEYS: 쉼표로 구분한 키 (미설정 시 기본 키, 빈 값이면 키 가림 없음)
+        UPSTAGE_RECORD_REDACT_PATTERNS: 기본 정규식에 더할 정규식 (|| 로 구분)
+        """
+        keys = os.getenv("UPSTAGE_RECORD_REDACT_KEYS")
+        extra = [p for p in os.getenv("UPSTAGE_RECORD_REDACT_PATTERNS", "").split("||") if p]
+        return cls(
+            patterns=DEFAULT_REDACT_PATTERNS + tuple(extra),
+            keys=DEFAULT_REDACT_KEYS if keys is None else [k.strip() for k in keys.split(",") if k.strip()]
+        )
+
+    def _spans(self, text: str) -> List[Tuple[int, int]]:
+        """가릴 구간 목록 (겹치면 합침)"""
+        spans = []
+        if self._pattern is not None:
+            spans.extend(m.span() for m in self._pattern.finditer(text) if m.end() > m.start())
+        if self._key_pattern is not None:
+            spans.extend(m.span(1) for m in self._key_pattern.finditer(text) if m.group(1) != self.placeholder)
+        merged: List[Tuple[int, int]] = []
+        for start, end in sorted(spans):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def redact_text(self, text: str) -> str:
+        """텍스트에서 가릴 구간을 placeholder로 교체"""
+        return self.redact_pieces([text])[0] if text else text
+
+    def redact_pieces(self, pieces: List[str]) -> List[str]:
+        """
+        스트림 조각 목록 가림 (이어 붙인 전체 텍스트 기준)
+
+        조각 경계에 걸친 값도 가리며, 가린 값은 시작한 조각에 placeholder로 남고
+        나머지 조각에서는 지워짐 (조각 수와 순서는 유지)
+
+        Args:
+            pieces: 텍스트 조각 목록
+
+        Returns:
+            list: 가린 조각 목록
+        """
+        text = "".join(pieces)
+        spans = self._spans(text)
+        if not spans:
+            return list(pieces)
+
+        result = []
+        offset = 0
+        for piece in pieces:
+            start, end = offset, offset + len(piece)
+            offset = end
+            out = []
+            cursor = start
+            for span_start, span_end in spans:
+                if span_end <= cursor or span_start >= end:
+                    continue
+                out.append(text[cursor:max(span_start, cursor)])
+                if span_start >= start:
+                    out.append(self.placeholder)
+                cursor = min(span_end, end)
+            out.append(text[cursor:end])
+            result.append("".join(out))
+        return result
+
+    def redact(self, value: Any) -> Any:
+        """JSON 값 가림 (지정 키의 값은 통째로, 나머지 문자열은 정규식/텍스트 속 키 기준, 문서 해시는 그대로)"""
+        if isinstance(value, dict):
+            return {
+                key: (
+                    item if key == "document_sha256"
+                    else self.placeholder if key in self.keys and item not in (None, "")
+                    else self.redact(item)
+                )
+                for key, item in value.items()
+            }
+        if isinstance(value, list):
+            return [self.redact(item) for item in value]
+        if isinstance(value, str):
+            return self.redact_text(value)
+        return value
+
+
+# =============================================================================
+# 기록기
+# =============================================================================
+def _error_text(error: BaseException) -> str:
+    return f"{type(error).__name__}: {error}"[:500]
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+class StreamRecording:
+    """
+    스트림 한 번의 조각 기록 (finish()에서 가림 처리 후 한 줄로 기록)
+
+    Attributes:
+        entry: 기록할 항목 (chunks는 [요청 시작 기준 ms, 텍스트])
+    """
+
+    def __init__(self, recorder: "InteractionRecorder", entry: Dict[str, Any], started: float):
+        self.recorder = recorder
+        self.entry = entry
+        self._started = started
+        self._chunks: List[List[Any]] = []
+        self._finished = False
+        self._lock = threading.Lock()
+
+    def chunk(self, chunk: Any) -> None:
+        """SDK 스트림 조각 기록 (내용 없는 조각은 finish_reason/usage만 반영)"""
+        choices = getattr(chunk, "choices", None) or []
+        if choices:
+            content = choices[0].delta.content
+            if content:
+                self._chunks.append([_elapsed_ms(self._started), content])
+            if choices[0].finish_reason:
+                self.entry["finish_reason"] = choices[0].finish_reason
+        usage = getattr(chunk, "usage", None)
+        if usage is not None:
+            self.entry["usage"] = usage.model_dump() if hasattr(usage, "model_dump") else dict(usage)
+
+    def finish(self, outcome: str, error: Optional[BaseException] = None) -> None:
+        """
+        기록 종료 (처음 한 번만 기록)
+
+        Args:
+            outcome: "stop"(끝까지 받음), "closed"(소비자가 중간에 닫음), "error"(전송 중 오류)
+            error: outcome이 "error"일 때의 예외
+        """
+        with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+        pieces = self.recorder.redaction.redact_pieces([text for _, text in self._chunks])
+        self.entry.update(
+            outcome=outcome,
+            latency_ms=_elapsed_ms(self._started),
+            ttft_ms=self._chunks[0][0] if self._chunks else None,
+            chunks=[[ms, piece] for (ms, _), piece in zip(self._chunks, pieces)],
+        )
+        if error is not None:
+            self.entry["error"] = _error_text(error)
+        self.recorder.write(self.entry)
+
+
+class _RecordedStream:
+    """SDK 스트림을 감싸 받은 조각을 기록 (close()는 원본 스트림에 전달)"""
+
+    def __init__(self, stream, recording: StreamRecording):
+        self._stream = stream
+        self._recording = recording
+
+    def __iter__(self) -> Iterator[Any]:
+        try:
+            for chunk in self._stream:
+                self._recording.chunk(chunk)
+                yield chunk
+        except Exception as e:
+            self._recording.finish("error", e)
+            raise
+        self._recording.finish("stop")
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._recording.finish("closed")
+
+
+class _AsyncRecordedStream:
+    """비동기 SDK 스트림 기록 래퍼"""
+
+    def __init__(self, stream, recording: StreamRecording):
+        self._stream = stream
+        self._recording = recording
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        try:
+            async for chunk in self._stream:
+                self._recording.chunk(chunk)
+                yield chunk
+        except Exception as e:
+            self._recording.finish("error", e)
+            raise
+        self._recording.finish("stop")
+
+    async def close(self) -> None:
+        try:
+            await self._stream.close()
+        finally:
+            self._recording.finish("closed")
+
+
+class InteractionRecorder:
+    """
+    덧붙이기 전용 Upstage 호출 기록기
+
+    한 줄에 한 시도씩 압축된 JSON으로 기록하며, 경로가 .gz로 끝나면 gzip으로 덧붙임
+    (gzip 멤버를 이어 붙이는 방식이라 프로세스가 중간에 죽어도 앞부분은 그대로 읽힘)
+
+    Attributes:
+        path: 기록 파일 경로
+        redaction: 민감 정보 가림 규칙
+        count: 이 기록기가 쓴 항목 수
+
+    Example:
+        >>> recorder = InteractionRecorder("logs/upstage.jsonl.gz")
+        >>> client = UpstageClient(recorder=recorder)
+        >>> client.chat("안녕하세요")
+        >>> load_log("logs/upstage.jsonl.gz")[0]["response"]["choices"][0]
+    """
+
+    def __init__(self, path: str, redaction: Optional[RedactionPolicy] = None):
+        self.path = Path(path)
+        self.redaction = redaction or RedactionPolicy.from_env()
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = None
+
+    def write(self, entry: Dict[str, Any]) -> None:
+        """항목 한 줄 덧붙이기 (스레드 안전, 한 줄마다 flush)"""
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                if self.path.suffix == ".gz":
+                    self._file = gzip.open(self.path, "at", encoding="utf-8")
+                else:
+                    self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+            self.count += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _entry(
+        self,
+        kind: str,
+        endpoint: str,
+        method: str,
+        route: str,
+        request: Optional[Dict[str, Any]],
+        tags: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        request = self.redaction.redact(request) if request is not None else None
+        return {
+            "v": LOG_VERSION,
+            "ts": round(time.time(), 3),
+            "kind": kind,
+            "endpoint": endpoint,
+            "tags": dict(tags or {}),
+            "method": method.lower(),
+            "route": route,
+            "key": replay_key(method, route, request),
+            "request": request,
+        }
+
+    def http(
+        self,
+        endpoint: str,
+        method: str,
+        url: str,
+        kwargs: Dict[str, Any],
+        send: Callable[[], Any],
+        tags: Optional[Dict[str, Any]] = None,
+        started: Optional[float] = None
+    ) -> Any:
+        """
+        원시 엔드포인트 요청 한 번을 실행하고 기록
+
+        Args:
+            endpoint: 엔드포인트 분류
+            method: HTTP 메서드
+            url: 요청 URL
+            kwargs: 요청 인자 (files/data/content/json - 정규화해 기록)
+            send: 요청을 보내고 응답(requests/httpx Response)을 반환하는 함수
+            tags: 계측 태그
+            started: 지연 측정 기준 (미지정 시 지금)
+
+        Returns:
+            send()의 응답 (예외는 기록 후 그대로 전파)
+        """
+        entry = self._entry("http", endpoint, method, *describe_http(url, kwargs), tags)
+        started = started if started is not None else time.perf_counter()
+        try:
+            response = send()
+        except Exception as e:
+            entry.update(latency_ms=_elapsed_ms(started), status=None, error=_error_text(e))
+            self.write(entry)
+            raise
+        entry.update(latency_ms=_elapsed_ms(started), status=response.status_code)
+        try:
+            entry["response"] = self.redaction.redact(response.json())
+        except ValueError:
+            entry["response"] = self.redaction.redact_text(response.text)
+        self.write(entry)
+        return response
+
+    def completion(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        create: Callable[[], Any],
+        tags: Optional[Dict[str, Any]] = None,
+        started: Optional[float] = None
+    ) -> Any:
+        """
+        Chat Completions 요청 한 번을 실행하고 기록 (스트림이면 조각을 기록하는 래퍼 반환)
+
+        Args:
+            endpoint: 엔드포인트 분류
+            params: chat.completions.create 파라미터
+            create: 요청을 보내는 함수
+            tags: 계측 태그
+            started: 조각 시각의 기준 (미지정 시 지금)
+
+        Returns:
+            응답 객체 또는 기록 래퍼로 감싼 스트림
+        """
+        entry = self._entry("stream" if params.get("stream") else "completion", endpoint, "post",
+                            "/chat/completions", canonical_chat(params), tags)
+        started = started if started is not None else time.perf_counter()
+        try:
+            response = create()
+        except Exception as e:
+            status = getattr(e, "status_code", None)
+            entry.update(latency_ms=_elapsed_ms(started), status=status, error=_error_text(e))
+            body = getattr(e, "body", None)
+            if status is not None and body is not None:
+                entry["response"] = self.redaction.redact({"error": body} if "error" not in body else body) \
+                    if isinstance(body, dict) else self.redaction.redact_text(str(body))
+            self.write(entry)
+            raise
+        entry["status"] = 200
+        if params.get("stream"):
+            recording = StreamRecording(self, entry, started)
+            if hasattr(response, "__aiter__"):
+                return _AsyncRecordedStream(response, recording)
+            return _RecordedStream(response, recording)
+        entry.update(latency_ms=_elapsed_ms(started), response=self.redaction.redact(response.model_dump(mode="json")))
+        self.write(entry)
+        return response
+
+    async def completion_async(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        create: Callable[[], Any],
+        tags: Optional[Dict[str, Any]] = None,
+        started: Optional[float] = None
+    ) -> Any:
+        """completion()의 비동기 버전 (create는 코루틴 함수)"""
+        started = started if started is not None else time.perf_counter()
+        outcome = await _settle(create)
+        return self.completion(endpoint, params, outcome, tags, started)
+
+    async def http_async(
+        self,
+        endpoint: str,
+        method: str,
+        url: str,
+        kwargs: Dict[str, Any],
+        send: Callable[[], Any],
+        tags: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """http()의 비동기 버전 (send는 코루틴 함수)"""
+        started = time.perf_counter()
+        outcome = await _settle(send)
+        return self.http(endpoint, method, url, kwargs, outcome, tags, started)
+
+
+async def _settle(fn: Callable[[], Any]) -> Callable[[], Any]:
+    """코루틴 결과/예외를 받아 두고 그대로 돌려주는 함수로 변환 (동기 기록 경로 재사용)"""
+    try:
+        value = await fn()
+    except Exception as e:
+        error = e
+
+        def outcome():
+            raise error
+    else:
+        def outcome():
+            return value
+    return outcome
+
+
+def load_log(path: str) -> List[Dict[str, Any]]:
+    """
+    기록 파일 읽기 (.gz 자동 인식, 마지막 줄이 잘려 있으면 무시)
+
+    Args:
+        path: 기록 파일 경로
+
+    Returns:
+        list: 기록 순서대로의 항목
+    """
+    opener = gzip.open if str(path).endswith(".gz") else open
+    entries = []
+    try:
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+    except EOFError:
+        # 기록 중 종료되어 gzip 멤버가 잘린 경우 읽은 데까지 사용
+        pass
+    return entries
+
+
+_recorder: Optional[InteractionRecorder] = None
+_recorder_lock = threading.Lock()
+
+
+def get_recorder() -> Optional[InteractionRecorder]:
+    """
+    프로세스 공유 기록기 반환 (UPSTAGE_RECORD에 기록 파일 경로가 있을 때만, 기본 None)
+    """
+    global _recorder
+    path = os.getenv("UPSTAGE_RECORD", "").strip()
+    if not path or path.lower() in ("0", "false", "no", "off"):
+        return None
+    if _recorder is None:
+        with _recorder_lock:
+            if _recorder is None:
+                _recorder = InteractionRecorder(path)
+    return _recorder
@@ -0,0 +1,501 @@
+"""
+🔁 기록한 Upstage 호출 재생 (Replay)
+
+utils.recorder가 남긴 기록을 결정적인 벤치마크로 다시 실행
+- ReplayServer: 재생 키가 같은 요청에 기록된 응답을 기록된 순서/시각(x speed)대로 돌려줌
+  스트림은 기록된 조각을 기록된 도착 시각에 맞춰 SSE로 전송, 오류/끊김 시도도 그대로 재현
+- ReplayDriver: 기록된 성공 호출을 UpstageClient로 다시 보내고(재시도/스트림 재개 경로 포함)
+  받은 응답을 태그의 stage에 맞는 에이전트 파서로 넘겨 단계별 지연/TTFT/파싱 성공 여부를 집계
+- 문서는 기록된 해시만 있으므로 REPLAY_MARKER 대체 문서를 보냄 (서버가 원래 해시로 인식)
+
+사용법:
+    $ python -m utils.replay logs/upstage.jsonl.gz --speed 1.0 --repeat 3
+
+Classes:
+    ReplayServer: 기록 재생 서버
+    ReplayCall: 재생한 호출 한 번의 결과
+    ReplayReport: 재생 결과 집계
+    ReplayDriver: 기록 재생 실행기
+
+Functions:
+    main: 명령줄 실행
+"""
+
+import json
+import time
+import base64
+import argparse
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, Optional, List, Callable
+
+from .standin_server import StandinServer, StandinConfig, _StandinHandler, _multipart_fields
+from .recorder import (
+    LOG_VERSION, RedactionPolicy, canonical_chat, canonical_multipart, replay_key, replay_document, load_log, _route
+)
+from .upstage_client import UpstageClient, _parse_extract_result
+
+
+# =============================================================================
+# 재생 서버
+# =============================================================================
+class _ReplayHandler(_StandinHandler):
+    """재생 키로 기록된 응답을 찾아 기록된 시각대로 전송 (없으면 404)"""
+
+    server_version = "UpstageReplay/1.0"
+
+    def do_POST(self) -> None:
+        self._replay("post", self._read_body())
+
+    def do_GET(self) -> None:
+        self._replay("get", b"")
+
+    def _request_of(self, body: bytes) -> Optional[Dict[str, Any]]:
+        """받은 본문을 기록 때와 같은 방식으로 정규화"""
+        content_type = self.headers.get("Content-Type", "")
+        if "multipart/form-data" in content_type:
+            fields = _multipart_fields(content_type, body)
+            document = fields.pop("document", None)
+            return canonical_multipart({k: v.decode("utf-8") for k, v in fields.items()}, document)
+        if body:
+            return canonical_chat(json.loads(body))
+        return None
+
+    def _replay(self, method: str, body: bytes) -> None:
+        started = time.perf_counter()
+        route = _route(self.path.split("?", 1)[0])
+        try:
+            request = self._request_of(body)
+        except ValueError:
+            self._send_error(400, "invalid_request", "본문을 해석할 수 없습니다.")
+            return
+        if request is not None:
+            request = self.standin.redaction.redact(request)
+
+        entry = self.standin.next_entry(replay_key(method, route, request))
+        if entry is None:
+            self.standin.record("miss", 404)
+            self._send_error(404, "not_recorded", f"기록에 없는 요청: {method.upper()} {route}")
+            return
+
+        self.standin.record(entry["endpoint"], entry.get("status") or "error")
+        wait = lambda ms: self._sleep(started + (ms or 0) / 1000 * self.standin.speed - time.perf_counter())
+        if entry.get("status") is None:
+            # 응답 없이 끊긴 시도 (타임아웃/연결 오류)
+            wait(entry.get("latency_ms"))
+            self.close_connection = True
+        elif entry["kind"] == "stream" and entry["status"] == 200:
+            self._replay_stream(entry, wait)
+        else:
+            wait(entry.get("latency_ms"))
+            response = entry.get("response")
+            if isinstance(response, (dict, list)):
+                self._send_json(entry["status"], response)
+            else:
+                data = str(response or "").encode("utf-8")
+                self.send_response(entry["status"])
+                self.send_header("Content-Type", "text/plain; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+    def _replay_stream(self, entry: Dict[str, Any], wait: Callable[[Optional[float]], None]) -> None:
+        """기록된 조각을 기록된 도착 시각에 SSE로 전송 (오류로 끝난 기록은 연결을 끊음)"""
+        request = entry.get("request") or {}
+        completion_id = self.standin.next_id()
+        created = int(time.time())
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def event(delta: Dict[str, Any], finish_reason: Optional[str] = None, **extra) -> None:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": request.get("model", "solar-pro3"),
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                **extra,
+            }
+            self._write_chunk(f"data: {json.dumps(payload, ensure_ascii=False)}\n\n".encode("utf-8"))
+
+        try:
+            event({"role": "assistant", "content": ""})
+            for ms, text in entry.get("chunks") or []:
+                wait(ms)
+                event({"content": text})
+            if entry.get("outcome") == "error":
+                self.close_connection = True
+                return
+            extra = {"usage": entry["usage"]} if entry.get("usage") else {}
+            event({}, entry.get("finish_reason") or "stop", **extra)
+            self._write_chunk(b"data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            self.standin.record(entry["endpoint"], "client_closed")
+            self.close_connection = True
+
+
+class ReplayServer(StandinServer):
+    """
+    기록 재생 서버
+
+    같은 재생 키의 기록은 기록된 순서대로 하나씩 돌려주고, 다 쓰면 처음부터 다시 사용
+    (429 → 200처럼 재시도 순서까지 재현하고, repeat 실행에서도 같은 순서 유지)
+
+    Attributes:
+        entries: 재생할 기록 항목
+        speed: 기록된 지연에 곱할 배율 (0이면 지연 없이 바로 응답)
+        redaction: 받은 요청에 기록 때와 같은 가림 규칙을 적용 (재생 키 일치용)
+
+    Example:
+        >>> with ReplayServer(load_log("logs/upstage.jsonl.gz")) as server:
+        ...     client = UpstageClient(api_key="replay", base_url=server.base_url)
+    """
+
+    handler_class = _ReplayHandler
+
+    def __init__(
+        self,
+        entries: List[Dict[str, Any]],
+        speed: float = 1.0,
+        redaction: Optional[RedactionPolicy] = None,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ):
+        super().__init__(StandinConfig(seed=0), host=host, port=port)
+        self.entries = [entry for entry in entries if entry.get("v") == LOG_VERSION]
+        self.speed = max(speed, 0.0)
+        self.redaction = redaction or RedactionPolicy.from_env()
+        self._recorded: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in self.entries:
+            self._recorded.setdefault(entry["key"], []).append(entry)
+        self._cursor: Dict[str, int] = {}
+
+    def next_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """재생 키의 다음 기록 (없으면 None)"""
+        recorded = self._recorded.get(key)
+        if not recorded:
+            return None
+        with self._lock:
+            index = self._cursor.get(key, 0)
+            self._cursor[key] = index + 1
+        return recorded[index % len(recorded)]
+
+    def rewind(self) -> None:
+        """모든 재생 키를 처음 기록부터 다시 재생"""
+        with self._lock:
+            self._cursor.clear()
+
+
+# =============================================================================
+# 재생 실행기
+# =============================================================================
+@dataclass
+class ReplayCall:
+    """재생한 호출 한 번의 결과 (시간은 초)"""
+    index: int
+    endpoint: str
+    stage: str
+    kind: str
+    seconds: float
+    ttft: Optional[float] = None
+    recorded_seconds: Optional[float] = None
+    recorded_ttft: Optional[float] = None
+    parsed: Optional[bool] = None
+    error: Optional[str] = None
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+def _mean(values: List[float]) -> Optional[float]:
+    return sum(values) / len(values) if values else None
+
+
+@dataclass
+class ReplayReport:
+    """
+    재생 결과 집계
+
+    Attributes:
+        calls: 재생한 호출 목록
+        misses: 재생 서버가 기록을 찾지 못한 요청 수
+        wall_seconds: 전체 재생 시간
+    """
+    calls: List[ReplayCall] = field(default_factory=list)
+    misses: int = 0
+    wall_seconds: float = 0.0
+
+    def by_stage(self) -> Dict[str, Dict[str, Any]]:
+        """
+        단계별 집계
+
+        Returns:
+            dict: {stage: {calls, errors, parsed, parse_failures, avg_seconds, p95_seconds,
+                   avg_ttft, recorded_avg_seconds, recorded_avg_ttft}}
+        """
+        stages: Dict[str, List[ReplayCall]] = {}
+        for call in self.calls:
+            stages.setdefault(call.stage, []).append(call)
+        summary = {}
+        for stage, calls in stages.items():
+            seconds = [c.seconds for c in calls if c.error is None]
+            summary[stage] = {
+                "calls": len(calls),
+                "errors": sum(1 for c in calls if c.error is not None),
+                "parsed": sum(1 for c in calls if c.parsed),
+                "parse_failures": sum(1 for c in calls if c.parsed is False),
+                "avg_seconds": _mean(seconds),
+                "p95_seconds": _percentile(seconds, 0.95),
+                "avg_ttft": _mean([c.ttft for c in calls if c.ttft is not None]),
+                "recorded_avg_seconds": _mean([c.recorded_seconds for c in calls if c.recorded_seconds is not None]),
+                "recorded_avg_ttft": _mean([c.recorded_ttft for c in calls if c.recorded_ttft is not None]),
+            }
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "misses": self.misses,
+            "wall_seconds": self.wall_seconds,
+            "stages": self.by_stage(),
+            "calls": [asdict(call) for call in self.calls],
+        }
+
+
+def _restore_documents(value: Any) -> Any:
+    """정규화된 요청의 문서 해시를 재생용 대체 문서(data URL)로 되돌림"""
+    if isinstance(value, dict):
+        if set(value) == {"document_sha256"}:
+            encoded = base64.b64encode(replay_document(value["document_sha256"])).decode("ascii")
+            return f"data:application/octet-stream;base64,{encoded}"
+        return {key: _restore_documents(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_restore_documents(item) for item in value]
+    return value
+
+
+def _http_arguments(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """기록된 원시 엔드포인트 요청을 requests 인자로 되돌림"""
+    request = entry.get("request")
+    if request is None:
+        return {}
+    if entry["route"].endswith("/chat/completions"):
+        return {"json": _restore_documents(request)}
+    fields = dict(request)
+    document = fields.pop("document", None)
+    arguments: Dict[str, Any] = {"data": fields}
+    if document is not None:
+        arguments["files"] = {
+            "document": ("document.pdf", replay_document(document["document_sha256"]), "application/pdf")
+        }
+    return arguments
+
+
+def default_parsers(client: UpstageClient) -> Dict[str, Callable[[Any], bool]]:
+    """
+    stage별 에이전트 파서 (응답 → 파싱 성공 여부)
+
+    에이전트는 해당 stage의 기록이 처음 나올 때 만듦 (RecommendAgent의 데이터/RAG 로딩 등)
+
+    Args:
+        client: 재생 서버를 가리키는 클라이언트
+
+    Returns:
+        dict: {stage: parse(response) -> bool}
+    """
+    agents: Dict[str, Any] = {}
+
+    def agent(name: str):
+        if name not in agents:
+            if name == "document":
+                from agents.document_agent import DocumentAgent
+                agents[name] = DocumentAgent(client, use_cache=False)
+            elif name == "extract":
+                from agents.extract_agent import ExtractAgent
+                agents[name] = ExtractAgent(client)
+            elif name == "recommend":
+                from agents.recommend_agent import RecommendAgent
+                agents[name] = RecommendAgent(client)
+            else:
+                from agents.verify_agent import VerifyAgent
+                agents[name] = VerifyAgent(client)
+        return agents[name]
+
+    def parse_document(response):
+        return bool(agent("document")._process_response(response).text.strip())
+
+    def parse_extract(response):
+        if isinstance(response, dict):
+            # Information Extract 원시 응답
+            return "raw_content" not in _parse_extract_result(response)
+        return "error" not in agent("extract")._parse_response(response).raw_data
+
+    def parse_recommend(response):
+        return bool(agent("recommend")._parse_recommendation(response).year1)
+
+    def parse_verify(response):
+        from .json_stream import JsonScanner
+        agent("verify")._parse_result(response)
+        return JsonScanner(agent("verify").JSON_REQUIRED_KEYS).feed(response)
+
+    def parse_groundedness(response):
+        from .json_stream import JsonScanner
+        from .upstage_client import GROUNDEDNESS_REQUIRED_KEYS, _groundedness_outcome
+        scanner = JsonScanner(GROUNDEDNESS_REQUIRED_KEYS)
+        scanner.feed(response)
+        return _groundedness_outcome(scanner.value, response)["outcome"] == "ok"
+
+    return {
+        "step1_parse": parse_document,
+        "step1_extract": parse_extract,
+        "step4_recommend": parse_recommend,
+        "step5_verify": parse_verify,
+        "step5_groundedness": parse_groundedness,
+    }
+
+
+class ReplayDriver:
+    """
+    기록 재생 실행기
+
+    기록 중 성공한 시도(상태 200, 오류로 끝나지 않은 스트림)마다 같은 요청을 클라이언트로 다시 보냄
+    실패한 시도는 재생 서버가 같은 키의 앞 순서로 돌려주므로 클라이언트의 재시도/재개 경로를 그대로 거침
+
+    Attributes:
+        entries: 기록 항목
+        speed: 기록된 지연 배율 (1.0 = 기록된 그대로, 0 = 지연 없음)
+
+    Example:
+        >>> report = ReplayDriver(load_log("logs/upstage.jsonl.gz")).run()
+        >>> report.by_stage()["step4_recommend"]["p95_seconds"]
+    """
+
+    def __init__(
+        self,
+        entries: List[Dict[str, Any]],
+        speed: float = 1.0,
+        parsers: Optional[Callable[[UpstageClient], Dict[str, Callable[[Any], bool]]]] = None
+    ):
+        self.entries = [entry for entry in entries if entry.get("v") == LOG_VERSION]
+        self.speed = speed
+        self.parsers = parsers or default_parsers
+
+    @staticmethod
+    def replayable(entry: Dict[str, Any]) -> bool:
+        return entry.get("status") == 200 and entry.get("outcome") != "error"
+
+    def run(self, repeat: int = 1) -> ReplayReport:
+        """
+        재생 실행 (기록 순서대로, 한 번에 한 호출)
+
+        Args:
+            repeat: 전체 기록 반복 횟수
+
+        Returns:
+            ReplayReport: 재생 결과
+        """
+        report = ReplayReport()
+        with ReplayServer(self.entries, self.speed) as server:
+            client = UpstageClient(api_key="replay", base_url=server.base_url)
+            # 재생 호출이 다시 기록되지 않도록 (UPSTAGE_RECORD가 설정된 환경에서도)
+            client.recorder = None
+            parsers = self.parsers(client)
+            started = time.perf_counter()
+            for _ in range(max(repeat, 1)):
+                server.rewind()
+                for index, entry in enumerate(self.entries):
+                    if self.replayable(entry):
+                        report.calls.append(self._call(client, parsers, index, entry))
+            report.wall_seconds = time.perf_counter() - started
+            report.misses = server.stats().get("miss", {}).get("404", 0)
+        return report
+
+    def _call(
+        self,
+        client: UpstageClient,
+        parsers: Dict[str, Callable[[Any], bool]],
+        index: int,
+        entry: Dict[str, Any]
+    ) -> ReplayCall:
+        tags = entry.get("tags") or {}
+        stage = tags.get("stage") or entry["endpoint"]
+        call = ReplayCall(
+            index=index,
+            endpoint=entry["endpoint"],
+            stage=stage,
+            kind=entry["kind"],
+            seconds=0.0,
+            recorded_seconds=(entry.get("latency_ms") or 0) / 1000,
+            recorded_ttft=entry["ttft_ms"] / 1000 if entry.get("ttft_ms") is not None else None,
+        )
+        # 기록된 요청을 그대로 보내야 하므로 라우팅/캐시를 거치는 공개 메서드 대신 내부 실행 경로를 사용
+        started = time.perf_counter()
+        try:
+            if entry["kind"] == "http":
+                response = client._request(
+                    entry["method"], entry["endpoint"], client.SOLAR_BASE_URL + entry["route"], tags=tags,
+                    headers={"Authorization": f"Bearer {client.api_key}"}, **_http_arguments(entry)
+                ).json()
+            elif entry["kind"] == "completion":
+                params = {k: v for k, v in entry["request"].items() if k != "stream"}
+                response = client._complete(entry["endpoint"], tags=tags, **params)
+            else:
+                pieces = []
+                for piece in client._cached_stream(entry["endpoint"], dict(entry["request"]), tags=tags):
+                    if not pieces:
+                        call.ttft = time.perf_counter() - started
+                    pieces.append(piece)
+                response = "".join(pieces)
+        except Exception as e:
+            call.seconds = time.perf_counter() - started
+            call.error = f"{type(e).__name__}: {e}"[:300]
+            return call
+        call.seconds = time.perf_counter() - started
+
+        parse = parsers.get(stage)
+        if parse is not None:
+            try:
+                call.parsed = bool(parse(response))
+            except Exception:
+                call.parsed = False
+        return call
+
+
+def _format_seconds(value: Optional[float]) -> str:
+    return f"{value:.3f}" if value is not None else "-"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """명령줄 실행: python -m utils.replay LOG [--speed] [--repeat] [--json]"""
+    parser = argparse.ArgumentParser(description="기록한 Upstage 호출 재생 벤치마크")
+    parser.add_argument("log", help="UPSTAGE_RECORD 기록 파일 (.jsonl / .jsonl.gz)")
+    parser.add_argument("--speed", type=float, default=1.0, help="기록된 지연 배율 (0 = 지연 없음)")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    report = ReplayDriver(load_log(args.log), speed=args.speed).run(args.repeat)
+    if args.json:
+        print(json.dumps(report.to_dict(), ensure_ascii=False, indent=2))
+        return
+
+    print(f"🔁 재생 {len(report.calls)}건 / {report.wall_seconds:.2f}s / 기록 없음 {report.misses}건")
+    print(f"{'stage':<22}{'calls':>6}{'err':>5}{'parse✗':>8}{'avg':>8}{'p95':>8}{'ttft':>8}{'rec avg':>9}")
+    for stage, stats in report.by_stage().items():
+        print(
+            f"{stage:<22}{stats['calls']:>6}{stats['errors']:>5}{stats['parse_failures']:>8}"
+            f"{_format_seconds(stats['avg_seconds']):>8}{_format_seconds(stats['p95_seconds']):>8}"
+            f"{_format_seconds(stats['avg_ttft']):>8}{_format_seconds(stats['recorded_avg_seconds']):>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
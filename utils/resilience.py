@@ -0,0 +1,357 @@
+"""
+🛡️ Upstage 호출 복원력(Resilience) 계층
+
+일시적인 5xx/429/네트워크 오류 하나로 60초짜리 업로드 흐름 전체가 실패하지 않도록
+정책 기반 재시도와 서킷 브레이커를 제공
+
+- 지수 백오프 + 지터, Retry-After 헤더 준수
+- 멱등성 인지 재시도 (비멱등 호출은 요청이 서버에 도달하지 않은 경우만 재시도)
+- 엔드포인트별 서킷 브레이커 (Upstage 장애 시 즉시 실패)
+- 예외 분류: requests / httpx / openai 예외 → UpstageAPIError
+
+Classes:
+    UpstageAPIError: Upstage API 호출 실패 예외
+    CircuitOpenError: 서킷 브레이커 개방 상태 예외
+    StreamResumeError: 재개한 스트림이 이미 전달한 앞부분과 다른 응답을 생성한 경우의 예외
+    RetryPolicy: 재시도 정책
+    CircuitBreaker: 엔드포인트별 서킷 브레이커
+
+Functions:
+    get_breaker: 프로세스 공유 서킷 브레이커 반환
+    classify_exception: 하위 라이브러리 예외를 UpstageAPIError로 변환
+    error_from_response: HTTP 응답을 UpstageAPIError로 변환
+"""
+
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+
+import httpx
+import requests
+import openai
+from urllib3.exceptions import NewConnectionError
+
+
+class UpstageAPIError(Exception):
+    """
+    Upstage API 호출 실패
+
+    Attributes:
+        endpoint: 엔드포인트 분류 (parse, extract, chat, groundedness)
+        status_code: HTTP 상태 코드 (네트워크 오류 시 None)
+        retry_after: 서버가 지정한 재시도 대기 시간 (초)
+        sent: 요청이 서버에 전달되었을 수 있는지 여부
+        key_quarantined: 키 풀이 이 호출의 키를 격리했고 다른 키가 남아 있는지 여부
+    """
+
+    def __init__(
+        self,
+        message: str,
+        endpoint: str = "",
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None,
+        sent: bool = True
+    ):
+        super().__init__(message)
+        self.endpoint = endpoint
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.sent = sent
+        self.key_quarantined = False
+
+    @property
+    def is_server_fault(self) -> bool:
+        """서킷 브레이커 실패로 집계할 오류인지 (5xx, 429, 네트워크 오류 - 키 하나의 격리는 제외)"""
+        if self.key_quarantined:
+            return False
+        return self.status_code is None or self.status_code == 429 or self.status_code >= 500
+
+
+class CircuitOpenError(UpstageAPIError):
+    """서킷 브레이커가 열려 있어 호출하지 않고 즉시 실패"""
+
+
+class StreamResumeError(UpstageAPIError):
+    """
+    끊긴 스트림을 다시 요청했더니 이미 전달한 앞부분과 다른 응답이 생성됨
+
+    다른 답변의 뒷부분을 이어 붙이면 JSON 블록 등이 조용히 깨지므로 재시도하지 않고 실패
+    (서버 장애가 아니므로 서킷 브레이커 실패로 집계하지 않음)
+    """
+
+    @property
+    def is_server_fault(self) -> bool:
+        return False
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After 헤더 파싱 (초 단위 숫자 또는 HTTP 날짜)
+
+    Returns:
+        float | None: 대기 시간 (초)
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+# 엔드포인트 분류 → 표시명 (기존 오류 메시지 형식 유지)
+ENDPOINT_LABELS = {
+    "parse": "Document Parse",
+    "extract": "Information Extract",
+    "chat": "Solar Chat",
+    "groundedness": "Groundedness Check",
+}
+
+
+def error_from_response(endpoint: str, status_code: int, text: str, headers: Any = None) -> UpstageAPIError:
+    """HTTP 오류 응답 → UpstageAPIError"""
+    retry_after = parse_retry_after(headers.get("Retry-After")) if headers is not None else None
+    label = ENDPOINT_LABELS.get(endpoint, endpoint)
+    return UpstageAPIError(
+        f"{label} 실패: {status_code} - {text}",
+        endpoint=endpoint,
+        status_code=status_code,
+        retry_after=retry_after,
+    )
+
+
+def classify_exception(exc: BaseException, endpoint: str) -> Optional[UpstageAPIError]:
+    """
+    requests / httpx / openai 예외를 UpstageAPIError로 변환
+
+    Args:
+        exc: 발생한 예외
+        endpoint: 엔드포인트 분류
+
+    Returns:
+        UpstageAPIError | None: 재시도 판단이 가능한 오류 (알 수 없는 예외는 None)
+    """
+    label = ENDPOINT_LABELS.get(endpoint, endpoint)
+
+    if isinstance(exc, UpstageAPIError):
+        return exc
+
+    if isinstance(exc, openai.APIStatusError):
+        return error_from_response(endpoint, exc.status_code, str(exc), exc.response.headers)
+
+    if isinstance(exc, openai.APIConnectionError):
+        # APITimeoutError 포함 - 요청이 전달되었는지 알 수 없음
+        return UpstageAPIError(f"{label} 연결 오류: {exc}", endpoint=endpoint, sent=True)
+
+    if isinstance(exc, httpx.TransportError):
+        # 스트림 도중 연결 끊김 등 (openai 스트림 반복 중에는 httpx 예외가 그대로 전달됨)
+        sent = not isinstance(exc, httpx.ConnectError)
+        return UpstageAPIError(f"{label} 연결 오류: {exc}", endpoint=endpoint, sent=sent)
+
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return UpstageAPIError(f"{label} 연결 시간 초과: {exc}", endpoint=endpoint, sent=False)
+
+    if isinstance(exc, requests.exceptions.ConnectionError):
+        # 연결 수립 단계 실패(DNS, 연결 거부)는 요청이 전달되지 않은 것으로 간주
+        reason = getattr(exc.args[0], "reason", None) if exc.args else None
+        sent = not isinstance(reason, NewConnectionError)
+        return UpstageAPIError(f"{label} 연결 오류: {exc}", endpoint=endpoint, sent=sent)
+
+    if isinstance(exc, requests.exceptions.Timeout):
+        return UpstageAPIError(f"{label} 응답 시간 초과: {exc}", endpoint=endpoint, sent=True)
+
+    return None
+
+
+@dataclass
+class RetryPolicy:
+    """
+    재시도 정책
+
+    Attributes:
+        max_attempts: 최대 시도 횟수 (첫 시도 포함)
+        base_delay: 백오프 기본 대기 시간 (초)
+        max_delay: 최대 대기 시간 (초)
+        retry_statuses: 재시도 대상 HTTP 상태 코드
+        max_stream_resumes: 끊긴 스트림 재개 최대 횟수
+    """
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 20.0
+    retry_statuses: Tuple[int, ...] = (408, 429, 500, 502, 503, 504)
+    max_stream_resumes: int = 2
+
+    def should_retry(self, error: UpstageAPIError, attempt: int, idempotent: bool = True) -> bool:
+        """
+        재시도 여부 판단
+
+        Args:
+            error: 발생한 오류
+            attempt: 지금까지 시도한 횟수 (1부터)
+            idempotent: 같은 요청을 다시 보내도 안전한지 여부
+
+        Returns:
+            bool: 재시도 여부
+        """
+        if isinstance(error, CircuitOpenError) or attempt >= self.max_attempts:
+            return False
+
+        if error.key_quarantined:
+            # 다른 키로 보내므로 같은 키에 다시 보내는 재시도가 아님 (401/403/429는 처리되지 않은 요청)
+            return True
+        if error.status_code is None:
+            retryable = True
+        else:
+            retryable = error.status_code in self.retry_statuses
+
+        if not retryable:
+            return False
+
+        if idempotent:
+            return True
+
+        # 비멱등 호출: 서버가 처리하지 않았음이 확실한 경우만 재시도
+        return not error.sent or error.status_code == 429
+
+    def compute_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        다음 시도까지 대기 시간 (full jitter 지수 백오프, Retry-After 우선)
+
+        Args:
+            attempt: 지금까지 시도한 횟수 (1부터)
+            retry_after: 서버 지정 대기 시간
+
+        Returns:
+            float: 대기 시간 (초)
+        """
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """
+    엔드포인트별 서킷 브레이커
+
+    연속 실패가 임계값을 넘으면 일정 시간 동안 호출을 즉시 실패시키고(open),
+    이후 시험 호출 하나만 허용(half-open)하여 회복 여부를 확인
+
+    Attributes:
+        endpoint: 엔드포인트 분류
+        failure_threshold: 개방까지 허용하는 연속 실패 수
+        reset_timeout: 개방 유지 시간 (초)
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, endpoint: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """현재 상태 (open 유지 시간이 지나면 half_open으로 표시)"""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> None:
+        """
+        호출 허용 여부 확인
+
+        Raises:
+            CircuitOpenError: 개방 상태이거나 시험 호출이 이미 진행 중인 경우
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+
+            if self._state == self.OPEN:
+                remaining = self.reset_timeout - (time.monotonic() - self._opened_at)
+                if remaining > 0:
+                    self.rejected += 1
+                    label = ENDPOINT_LABELS.get(self.endpoint, self.endpoint)
+                    raise CircuitOpenError(
+                        f"{label} 일시 중단: Upstage 응답 지연/장애로 {remaining:.0f}초 후 재시도 가능",
+                        endpoint=self.endpoint,
+                        retry_after=remaining,
+                        sent=False,
+                    )
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+
+            # half-open: 시험 호출 하나만 허용
+            if self._probe_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError(
+                    f"{ENDPOINT_LABELS.get(self.endpoint, self.endpoint)} 회복 확인 중",
+                    endpoint=self.endpoint,
+                    sent=False,
+                )
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        """성공 기록 → closed"""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self, error: Optional[UpstageAPIError] = None) -> None:
+        """실패 기록 (서버 측 오류만 집계) → 임계값 초과 시 open"""
+        with self._lock:
+            if error is not None and not error.is_server_fault:
+                # 클라이언트 오류는 장애 신호가 아님 - 시험 호출 슬롯만 반환
+                self._probe_in_flight = False
+                return
+
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def cancel_probe(self) -> None:
+        """판단할 수 없는 예외로 끝난 호출 - 상태 변경 없이 시험 호출 슬롯만 반환"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "rejected": self.rejected,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(endpoint: str) -> CircuitBreaker:
+    """프로세스 공유 서킷 브레이커 반환 (엔드포인트 분류별 1개)"""
+    with _breakers_lock:
+        if endpoint not in _breakers:
+            _breakers[endpoint] = CircuitBreaker(endpoint)
+        return _breakers[endpoint]
@@ -0,0 +1,489 @@
+"""
+🔗 동일 요청 병합 (Single-flight)
+
+Streamlit 재실행이 스트림 도중에 발생하거나, 같은 상담자가 두 탭에서 같은 학생을 제출하면
+바이트 단위로 동일한 chat_stream / parse_document_bytes 호출이 중복으로 나감
+
+진행 중인 동일 요청이 있으면 두 번째 호출자는 네트워크를 타지 않고
+첫 번째 요청의 결과(또는 토큰 스트림)에 합류
+- 일반 호출: 첫 호출의 반환값/예외를 그대로 공유 (반환 객체는 복사하지 않음)
+- 스트림: 백그라운드 펌프가 조각을 버퍼에 쌓고, 늦게 합류한 호출자는 처음부터 따라잡은 뒤 실시간 수신
+  모든 구독자가 떠나면 원본 스트림도 중단
+- 엔드포인트 분류별 병합 건수를 통계로 제공
+- 호출자별 Deadline: 각자 자기 예산/취소로만 빠져나가고, 첫 호출자가 취소되거나 예산을 소진해도
+  예산이 남은 나머지 호출자는 이어서 진행 (일반 호출은 남은 호출자가 다시 실행)
+- 스트림의 거버너 대기 시간은 펌프 스레드에서 읽어 구독자 스레드에 전달 (호출자도 대기 시간 확인 가능)
+
+Classes:
+    SingleFlight: 스레드 기반 동일 요청 병합 (프로세스 공유)
+    AsyncSingleFlight: asyncio 기반 동일 요청 병합 (이벤트 루프별)
+
+Functions:
+    request_key: 요청 구성 요소로 병합 키 생성
+    singleflight_enabled: 병합 사용 여부 (UPSTAGE_SINGLEFLIGHT)
+    get_singleflight: 프로세스 공유 SingleFlight 반환 (UPSTAGE_SINGLEFLIGHT=0 이면 None)
+"""
+
+import os
+import json
+import asyncio
+import hashlib
+import threading
+from typing import Dict, Any, Optional, Callable, Iterator, AsyncIterator, Awaitable
+
+from .deadline import Deadline, CallCancelled, DeadlineExceeded
+
+
+# 병합된 호출자가 Deadline을 확인하는 간격 (초)
+_WAIT_SLICE = 0.25
+
+
+def request_key(endpoint: str, *parts: Any) -> str:
+    """
+    요청 구성 요소로 병합 키 생성
+
+    Args:
+        endpoint: 엔드포인트 분류
+        *parts: 요청을 구성하는 값 (bytes는 그대로, 그 외는 JSON 직렬화하여 해시)
+
+    Returns:
+        str: SHA-256 16진 문자열
+    """
+    digest = hashlib.sha256(endpoint.encode("utf-8"))
+    for part in parts:
+        if isinstance(part, (bytes, bytearray, memoryview)):
+            digest.update(b"\x00b")
+            digest.update(part)
+        else:
+            digest.update(b"\x00j")
+            digest.update(json.dumps(part, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _inherited(error: BaseException, deadline: Optional[Deadline], endpoint: str) -> bool:
+    """
+    병합된 호출자가 받은 예외가 첫 호출자의 취소/예산 소진인지 (이 호출자의 예산이 남아 있으면 다시 실행할 대상)
+
+    이 호출자의 예산도 끝났으면 첫 호출자의 예외 대신 이 호출자 자신의 예외를 발생
+    """
+    if not isinstance(error, (CallCancelled, DeadlineExceeded)):
+        return False
+    if deadline is not None:
+        deadline.check(endpoint)
+    return True
+
+
+class _Counters:
+    """엔드포인트 분류별 leader / coalesced 집계 (잠금은 호출자가 보유)"""
+
+    def __init__(self):
+        self._by_endpoint: Dict[str, Dict[str, int]] = {}
+
+    def record(self, endpoint: str, kind: str, leader: bool) -> None:
+        counters = self._by_endpoint.setdefault(
+            endpoint, {"calls": 0, "streams": 0, "coalesced_calls": 0, "coalesced_streams": 0}
+        )
+        if leader:
+            counters[kind] += 1
+        else:
+            counters[f"coalesced_{kind}"] += 1
+
+    def snapshot(self, in_flight: int) -> Dict[str, Any]:
+        endpoints = {name: dict(values) for name, values in self._by_endpoint.items()}
+        executed = sum(v["calls"] + v["streams"] for v in endpoints.values())
+        coalesced = sum(v["coalesced_calls"] + v["coalesced_streams"] for v in endpoints.values())
+        total = executed + coalesced
+        return {
+            "executed": executed,
+            "coalesced": coalesced,
+            "coalesced_ratio": (coalesced / total) if total else 0.0,
+            "in_flight": in_flight,
+            "endpoints": endpoints,
+        }
+
+
+class _Call:
+    """진행 중인 일반 호출"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _Stream:
+    """진행 중인 스트림 (조각 버퍼 + 구독자 수 + 원본 스트림 취소 토큰 + 원본 스트림의 거버너 대기 시간)"""
+
+    def __init__(self, lock: threading.Lock):
+        self.cond = threading.Condition(lock)
+        self.chunks: list = []
+        self.done = False
+        self.cancelled = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.token = Deadline()
+        self.queue_wait: Optional[float] = None
+
+
+class _Wakeup:
+    """Deadline 취소 시 스트림 대기 중인 구독자를 깨움 (Deadline.register용)"""
+
+    def __init__(self, cond: threading.Condition):
+        self.cond = cond
+
+    def close(self) -> None:
+        with self.cond:
+            self.cond.notify_all()
+
+
+class SingleFlight:
+    """
+    스레드 기반 동일 요청 병합
+
+    Example:
+        >>> flight = get_singleflight()
+        >>> key = request_key("chat", params)
+        >>> text = flight.do("chat", key, lambda: client.chat.completions.create(**params))
+        >>> for chunk in flight.stream("chat", key, lambda token: resilient_stream(params, token)):
+        ...     print(chunk, end="")
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._streams: Dict[str, _Stream] = {}
+        self._counters = _Counters()
+
+    def do(self, endpoint: str, key: str, fn: Callable[[], Any], deadline: Optional[Deadline] = None) -> Any:
+        """
+        동일 키 호출이 진행 중이면 그 결과를 기다려 공유, 아니면 fn() 실행
+
+        Args:
+            endpoint: 엔드포인트 분류 (통계용)
+            key: 병합 키
+            fn: 실제 호출
+            deadline: 이 호출자의 마감 시간 (기다리는 동안 초과/취소되면 예외)
+
+        Returns:
+            fn()의 반환값 (병합된 호출자는 같은 객체를 받음)
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+                self._counters.record(endpoint, "calls", leader)
+
+            if leader:
+                try:
+                    call.result = fn()
+                except BaseException as e:
+                    call.error = e
+                finally:
+                    with self._lock:
+                        self._calls.pop(key, None)
+                    call.event.set()
+            elif deadline is None:
+                call.event.wait()
+            else:
+                while not call.event.wait(deadline.timeout(_WAIT_SLICE)):
+                    deadline.check(endpoint)
+
+            if call.error is not None:
+                if not leader and _inherited(call.error, deadline, endpoint):
+                    # 첫 호출자만 취소/예산 소진 - 직접 다시 실행
+                    continue
+                raise call.error
+            return call.result
+
+    def stream(
+        self,
+        endpoint: str,
+        key: str,
+        factory: Callable[[Deadline], Iterator[str]],
+        deadline: Optional[Deadline] = None,
+        queue_wait: Optional[Callable[[], Optional[float]]] = None,
+        on_queue_wait: Optional[Callable[[float], None]] = None
+    ) -> Iterator[str]:
+        """
+        동일 키 스트림이 진행 중이면 합류, 아니면 factory(token)로 새 스트림 시작
+
+        Args:
+            endpoint: 엔드포인트 분류 (통계용)
+            key: 병합 키
+            factory: 원본 스트림 제너레이터 생성 함수
+                (token: 구독자가 모두 떠나면 취소되는 Deadline - 원본 스트림을 등록해 즉시 닫히게 함)
+            deadline: 이 구독자의 마감 시간 (초과/취소 시 이 구독자만 예외로 빠져나감)
+            queue_wait: 펌프 스레드에서 원본 스트림의 거버너 대기 시간을 읽는 함수 (첫 호출자 것만 사용)
+            on_queue_wait: 구독자 스레드에서 그 대기 시간을 받는 함수 (조각을 전달하기 전에 한 번 호출)
+
+        Yields:
+            str: 스트림 조각 (합류 시 이미 받은 조각부터 순서대로)
+        """
+        with self._lock:
+            flight = self._streams.get(key)
+            leader = flight is None or flight.cancelled
+            if leader:
+                flight = self._streams[key] = _Stream(self._lock)
+            flight.subscribers += 1
+            self._counters.record(endpoint, "streams", leader)
+
+        if leader:
+            threading.Thread(
+                target=self._pump, args=(key, flight, factory, queue_wait), name="singleflight-stream", daemon=True
+            ).start()
+
+        wakeup = None
+        if deadline is not None:
+            wakeup = _Wakeup(flight.cond)
+            deadline.register(wakeup)
+
+        index = 0
+        abandoned = False
+        waited = None
+        try:
+            while True:
+                with flight.cond:
+                    while index >= len(flight.chunks) and not flight.done:
+                        if deadline is not None and deadline.done:
+                            break
+                        flight.cond.wait(deadline.timeout() if deadline is not None else None)
+                    pending = flight.chunks[index:]
+                    index += len(pending)
+                    finished = flight.done and index >= len(flight.chunks)
+                    error = flight.error
+                    report = waited is None and flight.queue_wait is not None
+                    if report:
+                        waited = flight.queue_wait
+
+                if report and on_queue_wait is not None:
+                    on_queue_wait(waited)
+                if deadline is not None:
+                    deadline.check(endpoint)
+
+                for chunk in pending:
+                    yield chunk
+
+                if finished:
+                    if error is not None:
+                        raise error
+                    return
+        finally:
+            if wakeup is not None:
+                deadline.unregister(wakeup)
+            with flight.cond:
+                flight.subscribers -= 1
+                if flight.subscribers == 0 and not flight.done:
+                    # 남은 구독자가 없으면 원본 스트림 중단 (새 호출자는 새 스트림 시작)
+                    flight.cancelled = True
+                    abandoned = True
+            if abandoned:
+                flight.token.cancel("구독자 없음")
+
+    def _pump(
+        self,
+        key: str,
+        flight: _Stream,
+        factory: Callable[[Deadline], Iterator[str]],
+        queue_wait: Optional[Callable[[], Optional[float]]] = None
+    ) -> None:
+        """원본 스트림을 읽어 버퍼에 쌓는 백그라운드 작업"""
+        source = None
+        try:
+            source = factory(flight.token)
+            for chunk in source:
+                wait = queue_wait() if queue_wait is not None else None
+                with flight.cond:
+                    if wait is not None:
+                        flight.queue_wait = wait
+                    flight.chunks.append(chunk)
+                    flight.cond.notify_all()
+                    if flight.cancelled:
+                        break
+        except BaseException as e:
+            flight.error = e
+        finally:
+            if source is not None and hasattr(source, "close"):
+                source.close()
+            wait = queue_wait() if queue_wait is not None else None
+            with flight.cond:
+                if wait is not None:
+                    flight.queue_wait = wait
+                if self._streams.get(key) is flight:
+                    del self._streams[key]
+                flight.done = True
+                flight.cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        병합 통계
+
+        Returns:
+            dict: executed(실제 실행), coalesced(병합으로 생략), coalesced_ratio, in_flight, endpoints
+        """
+        with self._lock:
+            return self._counters.snapshot(len(self._calls) + len(self._streams))
+
+
+class AsyncSingleFlight:
+    """
+    asyncio 기반 동일 요청 병합 (SingleFlight와 같은 규칙, 하나의 이벤트 루프 안에서 사용)
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, "asyncio.Task"] = {}
+        self._waiters: Dict[str, int] = {}
+        self._streams: Dict[str, Dict[str, Any]] = {}
+        self._counters = _Counters()
+
+    async def do(
+        self,
+        endpoint: str,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        deadline: Optional[Deadline] = None
+    ) -> Any:
+        """
+        동일 키 호출이 진행 중이면 그 결과를 공유, 아니면 fn() 실행 (deadline 초과 시 이 호출자만 예외)
+
+        공유 태스크가 첫 호출자의 취소/예산 소진으로 실패하면 남은 호출자가 새 태스크로 다시 실행
+        """
+        while True:
+            task = self._calls.get(key)
+            leader = task is None
+            if leader:
+                task = self._calls[key] = asyncio.ensure_future(fn())
+                task.add_done_callback(lambda _, key=key, task=task: self._forget_call(key, task))
+            self._counters.record(endpoint, "calls", leader)
+            self._waiters[key] = self._waiters.get(key, 0) + 1
+
+            try:
+                if deadline is None:
+                    return await asyncio.shield(task)
+                try:
+                    return await asyncio.wait_for(asyncio.shield(task), deadline.timeout())
+                except asyncio.TimeoutError:
+                    raise deadline.error(endpoint) from None
+            except (CallCancelled, DeadlineExceeded) as e:
+                shared = task.done() and not task.cancelled() and task.exception() is e
+                if leader or not shared or not _inherited(e, deadline, endpoint):
+                    self._abandon(key, task)
+                    raise
+                # 첫 호출자만 취소/예산 소진 - 새 태스크로 다시 실행
+            except BaseException:
+                self._abandon(key, task)
+                raise
+            finally:
+                remaining = self._waiters.get(key, 1) - 1
+                if remaining:
+                    self._waiters[key] = remaining
+                else:
+                    self._waiters.pop(key, None)
+
+    def _abandon(self, key: str, task: "asyncio.Task") -> None:
+        """기다리는 호출자가 모두 빠져나가면 원본 호출도 취소"""
+        if self._waiters.get(key) == 1 and not task.done():
+            self._forget_call(key, task)
+            task.cancel()
+
+    def _forget_call(self, key: str, task: "asyncio.Task") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    async def stream(
+        self,
+        endpoint: str,
+        key: str,
+        factory: Callable[[], AsyncIterator[str]],
+        deadline: Optional[Deadline] = None
+    ) -> AsyncIterator[str]:
+        """
+        동일 키 스트림이 진행 중이면 합류, 아니면 factory()로 새 스트림 시작
+
+        구독자가 모두 떠나면 펌프 태스크를 취소하므로 원본 스트림도 함께 닫힘 (취소 토큰 불필요)
+        """
+        flight = self._streams.get(key)
+        leader = flight is None or flight["cancelled"]
+        if leader:
+            flight = self._streams[key] = {
+                "chunks": [], "done": False, "cancelled": False, "error": None,
+                "subscribers": 0, "changed": asyncio.Event(),
+            }
+            flight["task"] = asyncio.ensure_future(self._pump(key, flight, factory))
+        flight["subscribers"] += 1
+        self._counters.record(endpoint, "streams", leader)
+
+        index = 0
+        try:
+            while True:
+                if deadline is not None:
+                    deadline.check(endpoint)
+                if index >= len(flight["chunks"]) and not flight["done"]:
+                    flight["changed"].clear()
+                    if deadline is None:
+                        await flight["changed"].wait()
+                        continue
+                    try:
+                        await asyncio.wait_for(flight["changed"].wait(), deadline.timeout(_WAIT_SLICE))
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                pending = flight["chunks"][index:]
+                index += len(pending)
+                for chunk in pending:
+                    yield chunk
+
+                if flight["done"] and index >= len(flight["chunks"]):
+                    if flight["error"] is not None:
+                        raise flight["error"]
+                    return
+        finally:
+            flight["subscribers"] -= 1
+            if flight["subscribers"] == 0 and not flight["done"]:
+                flight["cancelled"] = True
+                flight["task"].cancel()
+
+    async def _pump(self, key: str, flight: Dict[str, Any], factory: Callable[[], AsyncIterator[str]]) -> None:
+        source = factory()
+        try:
+            async for chunk in source:
+                flight["chunks"].append(chunk)
+                flight["changed"].set()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            flight["error"] = e
+        finally:
+            if hasattr(source, "aclose"):
+                await source.aclose()
+            if self._streams.get(key) is flight:
+                del self._streams[key]
+            flight["done"] = True
+            flight["changed"].set()
+
+    def stats(self) -> Dict[str, Any]:
+        """병합 통계 (SingleFlight.stats와 같은 형식)"""
+        return self._counters.snapshot(len(self._calls) + len(self._streams))
+
+
+_singleflight: Optional[SingleFlight] = None
+_singleflight_lock = threading.Lock()
+
+
+def singleflight_enabled() -> bool:
+    """UPSTAGE_SINGLEFLIGHT 환경변수 확인 (기본 사용)"""
+    return os.getenv("UPSTAGE_SINGLEFLIGHT", "1").lower() not in ("0", "false", "no")
+
+
+def get_singleflight() -> Optional[SingleFlight]:
+    """프로세스 공유 SingleFlight 반환 (지연 생성, 비활성 시 None)"""
+    global _singleflight
+    if not singleflight_enabled():
+        return None
+    if _singleflight is None:
+        with _singleflight_lock:
+            if _singleflight is None:
+                _singleflight = SingleFlight()
+    return _singleflight
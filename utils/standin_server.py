@@ -0,0 +1,774 @@
+"""
+🧪 Upstage API 로컬 대역 서버 (Stand-in)
+
+실제 UPSTAGE_API_KEY 없이 파이프라인을 벤치마크/부하 테스트하기 위한 로컬 HTTP 서버
+UpstageClient가 사용하는 엔드포인트를 같은 형식으로 응답
+
+- /v1/document-digitization: Document Parse (multipart, 페이지 수에 비례한 지연)
+- /v1/document-digitization/async, /requests/{id}: 비동기 Document Parse 작업 (구간별로 시간이 지나면 완료)
+- /v1/chat/completions: Solar 채팅 (SSE 스트리밍 포함), 그라운디드니스 검증, Information Extract
+- 엔드포인트 분류별 지연 분포 / TTFT / 토큰 속도 / 429 / 5xx / 스트림 중단 주입
+- 응답은 픽스처(JSON 파일로 교체 가능), 기본 픽스처로 전체 파이프라인이 끝까지 동작
+
+사용법:
+    $ python -m utils.standin_server --port 8787 --config standin.json
+    $ UPSTAGE_BASE_URL=http://127.0.0.1:8787/v1 UPSTAGE_API_KEY=local streamlit run app.py
+
+Classes:
+    LatencyDistribution: 지연 시간 분포
+    EndpointProfile: 엔드포인트 분류별 지연/오류 설정
+    StandinConfig: 서버 설정 (프로필 + 픽스처)
+    StandinServer: 로컬 대역 서버
+
+Functions:
+    main: 명령줄 실행
+"""
+
+import io
+import re
+import sys
+import json
+import time
+import random
+import base64
+import argparse
+import threading
+from dataclasses import dataclass, field
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Optional, List, Tuple
+
+from .pdf_split import count_pdf_pages
+
+
+# =============================================================================
+# 기본 픽스처 (에이전트 시스템 프롬프트로 응답 선택)
+# =============================================================================
+DEFAULT_PARSE_TEXT = """학교생활기록부
+학교명: 서울과학고등학교  학년: 2  성명: 홍길동
+[교과학습발달상황] 수학 1등급, 물리학 1등급, 화학 2등급, 국어 3등급
+[창의적 체험활동] 동아리: 로봇공학 연구반 / 진로활동: 공학 계열 탐색
+[수상경력] 교내 수학경시대회 금상, 과학탐구대회 은상
+[행동특성 및 종합의견] 탐구심이 강하고 문제 해결 과정을 끝까지 파고듦"""
+
+DEFAULT_EXTRACT_RESULT = {
+    "student_name": "홍길동",
+    "school_name": "서울과학고등학교",
+    "school_type": "고등학교",
+    "grade": 2,
+}
+
+DEFAULT_CHAT_RULES = [
+    {
+        "match": "답변 검증 전문가",
+        "endpoint": "groundedness",
+        "text": json.dumps(
+            {"grounded": True, "score": 0.86, "explanation": "추천 과목이 강점 과목과 진로에 근거함"},
+            ensure_ascii=False
+        ),
+    },
+    {
+        "match": "생활기록부 분석 전문가",
+        "endpoint": "chat",
+        "text": json.dumps({
+            "student_name": "홍길동",
+            "school_name": "서울과학고등학교",
+            "school_type": "고등학교",
+            "grade": 2,
+            "strong_subjects": ["수학", "물리학"],
+            "weak_subjects": ["국어"],
+            "awards": ["교내 수학경시대회 금상", "과학탐구대회 은상"],
+            "club_activities": "로봇공학 연구반",
+            "career_activities": "공학 계열 탐색",
+            "desired_career": "기계공학자",
+            "teacher_comments": "탐구심이 강함",
+        }, ensure_ascii=False, indent=2),
+    },
+    {
+        "match": "고교학점제 전문 상담사",
+        "endpoint": "chat",
+        "text": "[추론 과정]\n강점 과목인 수학/물리학을 심화 과목으로 연결합니다.\n\n```json\n" + json.dumps({
+            "year1": {"1학기": ["공통수학1", "통합과학1"], "2학기": ["공통수학2", "통합과학2"]},
+            "year2": {"1학기": ["대수", "물리학"], "2학기": ["미적분I", "화학"]},
+            "year3": {"1학기": ["미적분II", "역학과 에너지"], "2학기": ["기하", "전자기와 양자"]},
+            "total_credits": 192,
+            "reasoning": "기계공학 핵심 권장과목 반영",
+            "highlights": ["미적분II, 기하 포함", "물리 계열 심화"],
+        }, ensure_ascii=False, indent=2) + "\n```",
+    },
+    {
+        "match": "교육 추천 검증 전문가",
+        "endpoint": "chat",
+        "text": json.dumps({
+            "is_grounded": True,
+            "score": 0.88,
+            "explanation": "강점 과목과 희망 진로가 추천에 반영됨",
+            "evidence": ["수학/물리학 1등급 → 미적분II/역학과 에너지"],
+            "suggestions": ["국어 보완 과목 1개 추가 고려"],
+        }, ensure_ascii=False, indent=2),
+    },
+]
+
+DEFAULT_CHAT_TEXT = "로컬 대역 서버 응답입니다. 요청한 내용을 확인했습니다."
+
+# 토큰 분할 (공백 + 단어 단위, 스트리밍 조각 및 usage 계산용)
+_TOKEN_PATTERN = re.compile(r"\s*\S+|\s+")
+
+
+# =============================================================================
+# 지연 / 오류 설정
+# =============================================================================
+@dataclass
+class LatencyDistribution:
+    """
+    지연 시간 분포 (초)
+
+    Attributes:
+        kind: "fixed" / "uniform" (mean ± spread) / "normal" (표준편차 spread) / "lognormal" (로그 표준편차 spread)
+        mean: 평균 (lognormal은 중앙값)
+        spread: 분포 폭
+    """
+    kind: str = "fixed"
+    mean: float = 0.0
+    spread: float = 0.0
+
+    @classmethod
+    def from_value(cls, value: Any) -> "LatencyDistribution":
+        """숫자(고정 지연) 또는 {"kind", "mean", "spread"} dict에서 생성"""
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, (int, float)):
+            return cls("fixed", float(value))
+        return cls(
+            kind=value.get("kind", "fixed"),
+            mean=float(value.get("mean", 0.0)),
+            spread=float(value.get("spread", 0.0))
+        )
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            value = rng.uniform(self.mean - self.spread, self.mean + self.spread)
+        elif self.kind == "normal":
+            value = rng.gauss(self.mean, self.spread)
+        elif self.kind == "lognormal":
+            value = self.mean * rng.lognormvariate(0.0, self.spread) if self.mean > 0 else 0.0
+        else:
+            value = self.mean
+        return max(value, 0.0)
+
+
+@dataclass
+class EndpointProfile:
+    """
+    엔드포인트 분류별 지연/오류 설정
+
+    Attributes:
+        latency: 응답 헤더까지의 지연 (비스트리밍은 본문 생성 전 지연)
+        ttft: 스트리밍 첫 토큰까지의 추가 지연
+        tokens_per_second: 토큰 생성 속도 (0이면 즉시)
+        per_page_seconds: Document Parse 페이지당 추가 지연
+        rate_429: 429 응답 비율 (0.0~1.0)
+        rate_5xx: 5xx 응답 비율
+        status_5xx: 주입할 5xx 상태 코드
+        retry_after: 429/5xx 응답의 Retry-After (초, None이면 헤더 생략)
+        rate_disconnect: 스트림 도중 연결 끊김 비율
+        max_disconnects: 연결 끊김 주입 최대 횟수 (None이면 제한 없음)
+    """
+    latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    ttft: LatencyDistribution = field(default_factory=LatencyDistribution)
+    tokens_per_second: float = 0.0
+    per_page_seconds: float = 0.0
+    rate_429: float = 0.0
+    rate_5xx: float = 0.0
+    status_5xx: int = 503
+    retry_after: Optional[float] = 1.0
+    rate_disconnect: float = 0.0
+    max_disconnects: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EndpointProfile":
+        values = dict(data)
+        for key in ("latency", "ttft"):
+            if key in values:
+                values[key] = LatencyDistribution.from_value(values[key])
+        return cls(**values)
+
+
+@dataclass
+class StandinConfig:
+    """
+    대역 서버 설정
+
+    Attributes:
+        profiles: 엔드포인트 분류(parse, extract, chat, groundedness)별 설정 (없는 분류는 지연/오류 없음)
+        parse_text: Document Parse 응답 텍스트
+        extract_result: Information Extract 응답 JSON
+        chat_rules: 채팅 응답 규칙 [{"match": 메시지 포함 문자열, "endpoint": 분류, "text": 응답}]
+            ("texts": [응답, ...]이면 채팅 요청마다 차례로 돌아가며 응답 - 재생성 시 달라지는 답변 재현)
+        chat_text: 규칙에 맞지 않을 때의 채팅 응답
+        async_batch_pages: 비동기 Document Parse 작업의 구간당 페이지 수
+        revoked_keys: 401로 거절할 API 키 (키 풀 격리 확인용)
+        table_image_bytes: Document Parse 응답에 페이지마다 넣을 base64 표 이미지 크기 (0이면 없음)
+        seed: 난수 시드 (None이면 매 실행 다름)
+    """
+    profiles: Dict[str, EndpointProfile] = field(default_factory=dict)
+    parse_text: str = DEFAULT_PARSE_TEXT
+    extract_result: Dict[str, Any] = field(default_factory=lambda: dict(DEFAULT_EXTRACT_RESULT))
+    chat_rules: List[Dict[str, Any]] = field(default_factory=lambda: list(DEFAULT_CHAT_RULES))
+    chat_text: str = DEFAULT_CHAT_TEXT
+    async_batch_pages: int = 10
+    revoked_keys: List[str] = field(default_factory=list)
+    table_image_bytes: int = 0
+    seed: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StandinConfig":
+        """
+        dict에서 설정 생성 (chat_rules는 기본 규칙 앞에 추가)
+
+        Example:
+            >>> StandinConfig.from_dict({
+            ...     "seed": 7,
+            ...     "profiles": {"chat": {"ttft": {"kind": "lognormal", "mean": 0.8, "spread": 0.4},
+            ...                           "tokens_per_second": 40, "rate_429": 0.05}}
+            ... })
+        """
+        values = dict(data)
+        values["profiles"] = {
+            name: EndpointProfile.from_dict(profile)
+            for name, profile in values.get("profiles", {}).items()
+        }
+        if "chat_rules" in values:
+            values["chat_rules"] = list(values["chat_rules"]) + list(DEFAULT_CHAT_RULES)
+        return cls(**values)
+
+    @classmethod
+    def from_file(cls, path: str) -> "StandinConfig":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def profile(self, endpoint: str) -> EndpointProfile:
+        return self.profiles.get(endpoint) or _NO_FAULTS
+
+    def chat_response(self, messages: List[Dict[str, Any]], serial: int = 0) -> Tuple[str, str]:
+        """메시지에 맞는 (분류, 응답 텍스트) (serial: 서버가 받은 채팅 요청 순번, "texts" 규칙에서 응답 선택)"""
+        joined = "\n".join(str(message.get("content", "")) for message in messages)
+        for rule in self.chat_rules:
+            if rule.get("match", "") in joined:
+                texts = rule.get("texts") or [rule["text"]]
+                return rule.get("endpoint", "chat"), texts[serial % len(texts)]
+        return "chat", self.chat_text
+
+
+_NO_FAULTS = EndpointProfile()
+
+
+# =============================================================================
+# 요청 처리
+# =============================================================================
+class _StandinHandler(BaseHTTPRequestHandler):
+    """엔드포인트별 요청 처리 (self.server는 StandinServer의 HTTP 서버)"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "UpstageStandin/1.0"
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    @property
+    def standin(self) -> "StandinServer":
+        return self.server.standin
+
+    def do_POST(self) -> None:
+        body = self._read_body()
+        if not self._authorize():
+            return
+
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path.endswith("/document-digitization"):
+            self._handle_parse(body)
+        elif path.endswith("/document-digitization/async"):
+            self._handle_parse_submit(body)
+        elif path.endswith("/chat/completions"):
+            self._handle_chat(body)
+        else:
+            self._send_error(404, "not_found", f"알 수 없는 경로: {self.path}")
+
+    def do_GET(self) -> None:
+        path = self.path.split("?", 1)[0].rstrip("/")
+        match = _JOB_PATH.search(path)
+        if match is None:
+            self._send_error(404, "not_found", f"알 수 없는 경로: {self.path}")
+        elif match.group("batch") is not None:
+            # 구간 결과 다운로드 (서명된 URL 대역 - 인증 헤더 없음)
+            self._handle_parse_download(match.group("job"), int(match.group("batch")))
+        elif self._authorize():
+            self._handle_parse_status(match.group("job"))
+
+    def _api_key(self) -> Optional[str]:
+        authorization = self.headers.get("Authorization", "")
+        return authorization[len("Bearer "):] if authorization.startswith("Bearer ") else None
+
+    def _authorize(self) -> bool:
+        """Bearer 키 확인 및 키별 요청 집계 (거절했으면 False)"""
+        authorization = self.headers.get("Authorization", "")
+        if not authorization.startswith("Bearer "):
+            self._send_error(401, "invalid_api_key", "Authorization 헤더가 없습니다.")
+            return False
+        api_key = authorization[len("Bearer "):]
+        self.standin.count_key(api_key)
+        if api_key in self.standin.config.revoked_keys:
+            self._send_error(401, "invalid_api_key", "유효하지 않은 API 키입니다.")
+            return False
+        return True
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            parts = []
+            while True:
+                size = int(self.rfile.readline().split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                parts.append(self.rfile.read(size))
+                self.rfile.readline()
+            return b"".join(parts)
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    # ---------- 공통 ----------
+
+    def _inject_fault(self, endpoint: str, profile: EndpointProfile) -> bool:
+        """설정된 비율로 429/5xx 응답 (응답했으면 True)"""
+        roll = self.standin.random()
+        if roll < profile.rate_429:
+            self.standin.record(endpoint, 429)
+            self._send_error(429, "too_many_requests", "요청 한도를 초과했습니다.", profile.retry_after)
+            return True
+        if roll < profile.rate_429 + profile.rate_5xx:
+            self.standin.record(endpoint, profile.status_5xx)
+            self._send_error(profile.status_5xx, "server_error", "일시적인 서버 오류입니다.", profile.retry_after)
+            return True
+        return False
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, status: int, code: str, message: str, retry_after: Optional[float] = None) -> None:
+        headers = {"Retry-After": f"{retry_after:g}"} if retry_after is not None else None
+        self._send_json(status, {"error": {"message": message, "type": code, "code": code}}, headers)
+
+    def _sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+
+    # ---------- Document Parse ----------
+
+    def _handle_parse(self, body: bytes) -> None:
+        profile = self.standin.config.profile("parse")
+        if self._inject_fault("parse", profile):
+            return
+
+        document = _multipart_field(self.headers.get("Content-Type", ""), body, "document") or b""
+        try:
+            pages = count_pdf_pages(document)
+        except Exception:
+            pages = 1
+        self._sleep(profile.latency.sample(self.standin.rng) + pages * profile.per_page_seconds)
+
+        text = self.standin.config.parse_text
+        elements = [{"id": 0, "category": "paragraph", "page": 1, "content": {"text": text}}]
+        image_bytes = self.standin.config.table_image_bytes
+        if image_bytes > 0:
+            elements += [
+                {
+                    "id": page, "category": "table", "page": page,
+                    "content": {"text": "", "html": "<table></table>", "markdown": ""},
+                    "base64_encoding": base64.b64encode(bytes([page % 256]) * image_bytes).decode("ascii"),
+                }
+                for page in range(1, pages + 1)
+            ]
+        self.standin.record("parse", 200)
+        self._send_json(200, {
+            "api": "2.0",
+            "model": "document-parse",
+            "content": {"text": text, "html": "", "markdown": ""},
+            "elements": elements,
+            "usage": {"pages": pages},
+        })
+
+    def _parse_pages(self, body: bytes) -> int:
+        document = _multipart_field(self.headers.get("Content-Type", ""), body, "document") or b""
+        return max(count_pdf_pages(document), 1)
+
+    def _handle_parse_submit(self, body: bytes) -> None:
+        profile = self.standin.config.profile("parse")
+        if self._inject_fault("parse", profile):
+            return
+        job_id = self.standin.submit_job(self._parse_pages(body), profile, owner=self._api_key())
+        self.standin.record("parse_submit", 200)
+        self._send_json(200, {"request_id": job_id})
+
+    def _handle_parse_status(self, job_id: str) -> None:
+        # 작업은 등록한 키의 계정에만 보임 (다른 키로 조회하면 없는 작업)
+        job = self.standin.job_status(job_id, owner=self._api_key())
+        if job is None:
+            self._send_error(404, "not_found", f"작업을 찾을 수 없습니다: {job_id}")
+            return
+        for batch in job["batches"]:
+            if batch["status"] == "completed":
+                batch["download_url"] = f"{self.standin.base_url}/document-digitization/requests/{job_id}/batches/{batch['id']}"
+        self.standin.record("parse_status", 200)
+        self._send_json(200, job)
+
+    def _handle_parse_download(self, job_id: str, batch_id: int) -> None:
+        job = self.standin.job_status(job_id)
+        batch = next((b for b in job["batches"] if b["id"] == batch_id), None) if job else None
+        if batch is None or batch["status"] != "completed":
+            self._send_error(404, "not_found", f"완료된 구간이 없습니다: {job_id}/{batch_id}")
+            return
+        # 페이지 번호는 원본 문서 기준
+        text = self.standin.config.parse_text
+        elements = [
+            {"id": i, "category": "paragraph", "page": page, "content": {"text": text if page == 1 else f"[{page}쪽]"}}
+            for i, page in enumerate(range(batch["start_page"], batch["end_page"] + 1))
+        ]
+        self.standin.record("parse_download", 200)
+        self._send_json(200, {
+            "api": "2.0",
+            "model": "document-parse",
+            "content": {"text": "\n".join(e["content"]["text"] for e in elements), "html": "", "markdown": ""},
+            "elements": elements,
+            "usage": {"pages": len(elements)},
+        })
+
+    # ---------- Chat Completions ----------
+
+    def _handle_chat(self, body: bytes) -> None:
+        try:
+            request = json.loads(body)
+        except json.JSONDecodeError:
+            self._send_error(400, "invalid_request", "JSON 본문을 해석할 수 없습니다.")
+            return
+
+        config = self.standin.config
+        model = request.get("model", "solar-pro3")
+        if model == "information-extract":
+            endpoint, text = "extract", json.dumps(config.extract_result, ensure_ascii=False)
+        else:
+            endpoint, text = config.chat_response(request.get("messages") or [], self.standin.next_chat())
+
+        profile = config.profile(endpoint)
+        if self._inject_fault(endpoint, profile):
+            return
+
+        tokens = _TOKEN_PATTERN.findall(text)
+        usage = {
+            "prompt_tokens": len(body) // 4,
+            "completion_tokens": len(tokens),
+            "total_tokens": len(body) // 4 + len(tokens),
+        }
+        self._sleep(profile.latency.sample(self.standin.rng))
+
+        if request.get("stream"):
+            self._stream_chat(endpoint, profile, model, tokens, usage)
+            return
+
+        if profile.tokens_per_second > 0:
+            self._sleep(len(tokens) / profile.tokens_per_second)
+        self.standin.record(endpoint, 200)
+        self._send_json(200, {
+            "id": self.standin.next_id(),
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        })
+
+    def _stream_chat(
+        self,
+        endpoint: str,
+        profile: EndpointProfile,
+        model: str,
+        tokens: List[str],
+        usage: Dict[str, int]
+    ) -> None:
+        """SSE 스트리밍 (chunked 전송, TTFT 후 토큰 속도에 맞춰 전송)"""
+        completion_id = self.standin.next_id()
+        created = int(time.time())
+        # 끊김 주입 시 절반쯤에서 연결 종료
+        cut = self.standin.random() < profile.rate_disconnect
+        if cut and profile.max_disconnects is not None:
+            cut = self.standin.stats().get(endpoint, {}).get("disconnect", 0) < profile.max_disconnects
+        cut_at = len(tokens) // 2 if cut else None
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def event(delta: Dict[str, Any], finish_reason: Optional[str] = None, **extra) -> None:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                **extra,
+            }
+            self._write_chunk(f"data: {json.dumps(payload, ensure_ascii=False)}\n\n".encode("utf-8"))
+
+        interval = 1.0 / profile.tokens_per_second if profile.tokens_per_second > 0 else 0.0
+        try:
+            event({"role": "assistant", "content": ""})
+            self._sleep(profile.ttft.sample(self.standin.rng))
+            for index, token in enumerate(tokens):
+                if index == cut_at:
+                    self.standin.record(endpoint, "disconnect")
+                    self.close_connection = True
+                    return
+                if index:
+                    self._sleep(interval)
+                event({"content": token})
+            event({}, "stop", usage=usage)
+            self._write_chunk(b"data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+            self.standin.record(endpoint, 200)
+        except (BrokenPipeError, ConnectionResetError):
+            # 클라이언트가 스트림을 중간에 닫음
+            self.standin.record(endpoint, "client_closed")
+            self.close_connection = True
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+
+_JOB_PATH = re.compile(r"/document-digitization/requests/(?P<job>[^/]+)(?:/batches/(?P<batch>\d+))?$")
+
+
+def _multipart_fields(content_type: str, body: bytes) -> Dict[str, bytes]:
+    """multipart/form-data 본문의 모든 필드 {이름: 값}"""
+    if "multipart/form-data" not in content_type:
+        return {}
+    message = BytesParser(policy=HTTP).parse(
+        io.BytesIO(f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body)
+    )
+    return {
+        part.get_param("name", header="content-disposition"): part.get_payload(decode=True)
+        for part in message.iter_parts()
+    }
+
+
+def _multipart_field(content_type: str, body: bytes, name: str) -> Optional[bytes]:
+    """multipart/form-data 본문에서 필드 값 추출"""
+    return _multipart_fields(content_type, body).get(name)
+
+
+# =============================================================================
+# 서버
+# =============================================================================
+class _StandinHTTPServer(ThreadingHTTPServer):
+    """클라이언트가 keep-alive 연결을 끊을 때의 오류 출력 생략"""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address) -> None:
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+class StandinServer:
+    """
+    Upstage API 로컬 대역 서버
+
+    Attributes:
+        config: 서버 설정
+        host: 바인드 주소
+        port: 포트 (0이면 빈 포트 자동 선택)
+
+    Example:
+        >>> with StandinServer(StandinConfig(seed=1)) as server:
+        ...     client = UpstageClient(api_key="local", base_url=server.base_url)
+        ...     print(client.chat("안녕하세요"))
+        ...     print(server.stats())
+    """
+
+    # 요청 처리 클래스 (재생 서버 등 파생 서버가 교체)
+    handler_class = _StandinHandler
+
+    def __init__(self, config: Optional[StandinConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StandinConfig()
+        self.host = host
+        self.port = port
+        self.rng = random.Random(self.config.seed)
+
+        self._lock = threading.Lock()
+        self._counter = 0
+        self._chats = 0
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._keys: Dict[str, int] = {}
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """UpstageClient base_url / UPSTAGE_BASE_URL에 넣을 주소"""
+        return f"http://{self.host}:{self.port}/v1"
+
+    def start(self) -> str:
+        """백그라운드 스레드에서 서버 시작 후 base_url 반환"""
+        if self._httpd is None:
+            self._httpd = _StandinHTTPServer((self.host, self.port), self.handler_class)
+            self._httpd.standin = self
+            self.port = self._httpd.server_port
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever, name="upstage-standin", daemon=True
+            )
+            self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+            self._thread = None
+
+    def serve_forever(self) -> None:
+        """현재 스레드에서 서버 실행 (명령줄 실행용)"""
+        self.start()
+        try:
+            self._thread.join()
+        except KeyboardInterrupt:
+            self.stop()
+
+    def __enter__(self) -> "StandinServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def random(self) -> float:
+        with self._lock:
+            return self.rng.random()
+
+    def next_id(self) -> str:
+        with self._lock:
+            self._counter += 1
+            return f"standin-{self._counter}"
+
+    def next_chat(self) -> int:
+        """채팅 요청 순번 (0부터)"""
+        with self._lock:
+            self._chats += 1
+            return self._chats - 1
+
+    def submit_job(self, pages: int, profile: EndpointProfile, owner: Optional[str] = None) -> str:
+        """비동기 파싱 작업 생성 (구간은 순서대로 per_page_seconds x 페이지 수만큼 걸려 완료, owner: 등록한 키)"""
+        job_id = self.next_id()
+        size = max(self.config.async_batch_pages, 1)
+        with self._lock:
+            ready_at = time.monotonic() + profile.latency.sample(self.rng)
+        batches = []
+        for index, start in enumerate(range(1, pages + 1, size)):
+            end = min(start + size - 1, pages)
+            ready_at += (end - start + 1) * profile.per_page_seconds
+            batches.append({"id": index, "start_page": start, "end_page": end, "ready_at": ready_at})
+        with self._lock:
+            self._jobs[job_id] = {"pages": pages, "batches": batches, "owner": owner}
+        return job_id
+
+    def job_status(self, job_id: str, owner: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """비동기 파싱 작업 상태 (Upstage 작업 조회 응답과 같은 형식, 없거나 owner가 등록한 키가 아니면 None)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None or (owner is not None and job["owner"] not in (None, owner)):
+            return None
+        now = time.monotonic()
+        batches = [
+            {
+                "id": batch["id"],
+                "model": "document-parse",
+                "status": "completed" if now >= batch["ready_at"] else "started",
+                "failure_message": "",
+                "start_page": batch["start_page"],
+                "end_page": batch["end_page"],
+            }
+            for batch in job["batches"]
+        ]
+        completed = [batch for batch in batches if batch["status"] == "completed"]
+        return {
+            "id": job_id,
+            "model": "document-parse",
+            "status": "completed" if len(completed) == len(batches) else "started",
+            "failure_message": "",
+            "total_pages": job["pages"],
+            "completed_pages": sum(b["end_page"] - b["start_page"] + 1 for b in completed),
+            "batches": batches,
+        }
+
+    def record(self, endpoint: str, status: Any) -> None:
+        with self._lock:
+            counters = self._stats.setdefault(endpoint, {})
+            counters[str(status)] = counters.get(str(status), 0) + 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        엔드포인트 분류별 응답 집계
+
+        Returns:
+            dict: {분류: {"200": n, "429": n, "503": n, "disconnect": n, "client_closed": n}}
+        """
+        with self._lock:
+            return {name: dict(counters) for name, counters in self._stats.items()}
+
+    def count_key(self, api_key: str) -> None:
+        with self._lock:
+            self._keys[api_key] = self._keys.get(api_key, 0) + 1
+
+    def key_usage(self) -> Dict[str, int]:
+        """API 키별 요청 수 (거절된 요청 포함)"""
+        with self._lock:
+            return dict(self._keys)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._keys.clear()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """명령줄 실행: python -m utils.standin_server [--host] [--port] [--config]"""
+    parser = argparse.ArgumentParser(description="Upstage API 로컬 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--config", help="StandinConfig JSON 파일 (profiles, 픽스처, seed)")
+    args = parser.parse_args(argv)
+
+    config = StandinConfig.from_file(args.config) if args.config else StandinConfig()
+    server = StandinServer(config, host=args.host, port=args.port)
+    server.start()
+    print(f"🧪 Upstage 대역 서버 실행 중: {server.base_url}")
+    print(f"   UPSTAGE_BASE_URL={server.base_url} UPSTAGE_API_KEY=local 로 앱/벤치마크 실행")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
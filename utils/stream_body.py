@@ -0,0 +1,159 @@
+"""
+📦 Information Extract 스트리밍 요청 본문
+
+파일 전체를 base64 문자열로 만들고, data URL f-string에 넣고, 다시 JSON 직렬화하면
+20MB 스캔 파일 하나에 4~5벌의 사본이 메모리에 올라감
+
+이 모듈은 JSON 앞/뒤 부분만 미리 직렬화해 두고, 그 사이의 base64 구간은
+memoryview(또는 mmap)에서 조각 단위로 인코딩하여 바로 HTTP 본문으로 흘려보냄
+→ 요청당 추가 메모리는 파일 크기와 무관한 조각 크기 수준으로 제한
+
+Classes:
+    Base64JsonBody: base64 데이터 URL을 포함한 JSON 스트리밍 본문
+"""
+
+import json
+import base64
+from typing import Dict, Any, Iterator, AsyncIterator, Optional, Union
+
+# 인코딩 조각 크기 (3의 배수여야 조각 경계에서 패딩이 생기지 않음)
+CHUNK_SIZE = 3 * 16 * 1024
+
+# JSON 안에서 base64 자리를 표시하는 임시 토큰
+_PLACEHOLDER = "\x00__IMF_BASE64__\x00"
+
+
+class Base64JsonBody:
+    """
+    base64 데이터 URL을 포함한 JSON 스트리밍 본문
+
+    requests(data=)에는 read()/seek()/__len__을 가진 파일 객체로,
+    httpx.AsyncClient(content=)에는 async_stream()으로 전달할 수 있으며
+    Content-Length를 미리 계산하므로 chunked 전송 없이 보냄
+
+    Attributes:
+        content_length: 전체 본문 길이 (바이트)
+        payload: base64 자리가 BASE64_SLOT으로 남아 있는 원래 페이로드 (호출 기록용)
+
+    Example:
+        >>> payload = {"image_url": {"url": Base64JsonBody.BASE64_SLOT}}
+        >>> body = Base64JsonBody(payload, file_bytes, "data:application/octet-stream;base64,")
+        >>> session.post(url, data=body, headers={"Content-Type": "application/json"})
+    """
+
+    BASE64_SLOT = _PLACEHOLDER
+
+    def __init__(
+        self,
+        payload: Dict[str, Any],
+        source: Union[bytes, bytearray, memoryview, Any],
+        data_url_prefix: str = "",
+        chunk_size: int = CHUNK_SIZE
+    ):
+        """
+        본문 초기화
+
+        Args:
+            payload: base64가 들어갈 자리에 BASE64_SLOT 문자열을 넣은 JSON 페이로드
+            source: 원본 바이트 (bytes, memoryview, mmap 등 버퍼 프로토콜 객체)
+            data_url_prefix: base64 앞에 붙일 문자열 (예: "data:...;base64,")
+            chunk_size: 인코딩 조각 크기 (3의 배수로 내림)
+        """
+        serialized = json.dumps(payload, ensure_ascii=False)
+        marker = json.dumps(self.BASE64_SLOT)[1:-1]
+        if serialized.count(marker) != 1:
+            raise ValueError("payload에 BASE64_SLOT이 정확히 한 번 있어야 합니다")
+
+        self.payload = payload
+        head, tail = serialized.split(marker)
+        self._head = (head + json.dumps(data_url_prefix)[1:-1]).encode("utf-8")
+        self._tail = tail.encode("utf-8")
+        self._source = memoryview(source).cast("B")
+        self._chunk_size = max(chunk_size - chunk_size % 3, 3)
+
+        self._encoded_length = 4 * ((len(self._source) + 2) // 3)
+        self.content_length = len(self._head) + self._encoded_length + len(self._tail)
+
+        self._position = 0
+        self._pending = memoryview(b"")
+
+    def __len__(self) -> int:
+        return self.content_length
+
+    @property
+    def source(self) -> memoryview:
+        """base64로 인코딩되는 원본 바이트"""
+        return self._source
+
+    def _segment(self, offset: int) -> bytes:
+        """본문 offset 위치에서 시작하는 다음 조각"""
+        head_len = len(self._head)
+        if offset < head_len:
+            return self._head[offset:]
+
+        encoded_offset = offset - head_len
+        if encoded_offset < self._encoded_length:
+            # base64는 3바이트 → 4글자 단위이므로 조각 경계를 4의 배수로 유지
+            raw_start = (encoded_offset // 4) * 3
+            skip = encoded_offset % 4
+            raw_end = min(raw_start + self._chunk_size, len(self._source))
+            return base64.b64encode(self._source[raw_start:raw_end])[skip:]
+
+        return self._tail[offset - head_len - self._encoded_length:]
+
+    def __iter__(self) -> Iterator[bytes]:
+        offset = 0
+        while offset < self.content_length:
+            segment = self._segment(offset)
+            offset += len(segment)
+            yield segment
+
+    def async_stream(self) -> "_AsyncBodyStream":
+        """httpx.AsyncClient(content=)용 비동기 반복자 (재시도마다 처음부터 다시 생성)"""
+        return _AsyncBodyStream(self)
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        """파일 객체 인터페이스 (http.client가 블록 단위로 호출)"""
+        if size is None or size < 0:
+            size = self.content_length
+
+        parts = []
+        remaining = size
+        while remaining > 0 and self._position < self.content_length:
+            if not self._pending:
+                self._pending = memoryview(self._segment(self._position))
+            part = self._pending[:remaining]
+            self._pending = self._pending[remaining:]
+            self._position += len(part)
+            remaining -= len(part)
+            parts.append(part)
+        return b"".join(parts)
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        """재시도 시 처음부터 다시 보내기 위한 위치 이동"""
+        if whence == 1:
+            offset += self._position
+        elif whence == 2:
+            offset += self.content_length
+        self._position = min(max(offset, 0), self.content_length)
+        self._pending = memoryview(b"")
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def release(self) -> None:
+        """원본 버퍼 참조 해제 (mmap을 닫기 전에 호출)"""
+        self._pending = memoryview(b"")
+        self._source.release()
+
+
+class _AsyncBodyStream:
+    """Base64JsonBody 비동기 반복 어댑터 (내부 전용)"""
+
+    def __init__(self, body: Base64JsonBody):
+        self.body = body
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for segment in self.body:
+            yield segment
@@ -0,0 +1,408 @@
+"""
+🧮 프롬프트 토큰 예산 관리 (Token Budget)
+
+ExtractAgent는 text[:6000], VerifyAgent는 recommendation[:2000]처럼 글자 수로 자르고
+RecommendAgent는 개설 과목 전체와 RAG 블록을 크기 제한 없이 이어 붙이고 있었음
+지연 시간과 비용은 프롬프트 토큰 수에 비례하지만 이를 측정하는 곳이 없었음
+
+프롬프트를 섹션 단위로 구성하고
+- 섹션별 토큰 예산 할당 (예산이 없는 섹션은 필수 - 자르지 않음)
+- 예산 초과 섹션은 먼저 압축(공백 정리, 반복 줄/중복 과목 제거)한 뒤 줄 단위로 잘라냄
+- 전체 예산을 넘으면 우선순위가 낮은 섹션부터 추가로 줄임
+- 섹션별/전체 토큰 수를 보고 (에이전트가 계측 태그 prompt_tokens로 단계별 기록)
+
+토큰 수는 IMF_TOKENIZER에 tokenizer.json 경로가 있고 tokenizers 패키지가 설치되어 있으면 정확히 세고,
+없으면 한글 음절 1토큰 + 그 외 4글자 1토큰으로 추정 (Solar 토크나이저보다 약간 크게 잡는 보수적 추정)
+
+Classes:
+    SectionUsage: 섹션별 토큰 사용량
+    BudgetedPrompt: 예산이 적용된 프롬프트
+    PromptBudget: 섹션 단위 프롬프트 구성기
+
+Functions:
+    count_tokens: 토큰 수 계산
+    truncate_tokens: 토큰 예산에 맞춰 줄 단위로 자르기
+    compact_text: 공백 정리 및 반복 줄 제거
+    dedupe: 순서를 유지한 중복 제거
+    join_items: 예산 안에서 목록 이어 붙이기 (넘치면 "외 N개")
+"""
+
+import os
+import re
+import math
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Callable, Iterable
+
+
+_HANGUL = re.compile(r"[가-힣]")
+_SPACES = re.compile(r"[ \t　\xa0]+")
+
+# 잘린 섹션 끝에 붙이는 표시
+TRUNCATION_MARK = "…(생략)"
+
+_tokenizer = None
+_tokenizer_loaded = False
+_tokenizer_lock = threading.Lock()
+
+
+def _get_tokenizer():
+    """IMF_TOKENIZER 경로의 tokenizer.json 로드 (tokenizers 미설치/미설정 시 None)"""
+    global _tokenizer, _tokenizer_loaded
+    if not _tokenizer_loaded:
+        with _tokenizer_lock:
+            if not _tokenizer_loaded:
+                path = os.getenv("IMF_TOKENIZER", "")
+                if path:
+                    try:
+                        from tokenizers import Tokenizer
+                        _tokenizer = Tokenizer.from_file(path)
+                    except Exception as e:
+                        print(f"토크나이저 로드 실패 (추정치 사용): {e}")
+                _tokenizer_loaded = True
+    return _tokenizer
+
+
+def count_tokens(text: str) -> int:
+    """
+    토큰 수 계산 (토크나이저가 없으면 추정)
+
+    Args:
+        text: 대상 텍스트
+
+    Returns:
+        int: 토큰 수
+    """
+    if not text:
+        return 0
+    tokenizer = _get_tokenizer()
+    if tokenizer is not None:
+        return len(tokenizer.encode(text, add_special_tokens=False).ids)
+    hangul = len(_HANGUL.findall(text))
+    return hangul + math.ceil((len(text) - hangul) / 4)
+
+
+def truncate_tokens(
+    text: str,
+    max_tokens: int,
+    counter: Callable[[str], int] = count_tokens,
+    mark: str = TRUNCATION_MARK
+) -> str:
+    """
+    토큰 예산에 맞춰 앞부분만 남기기 (가능하면 줄 경계에서 자름)
+
+    Args:
+        text: 대상 텍스트
+        max_tokens: 최대 토큰 수
+        counter: 토큰 계산 함수
+        mark: 잘렸을 때 끝에 붙일 표시
+
+    Returns:
+        str: 잘린 텍스트 (예산 이내면 그대로)
+    """
+    if counter(text) <= max_tokens:
+        return text
+    budget = max_tokens - counter(mark)
+    if budget <= 0:
+        return ""
+
+    # 글자 수 기준 이분 탐색으로 예산에 맞는 최대 길이 탐색
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if counter(text[:mid]) <= budget:
+            low = mid
+        else:
+            high = mid - 1
+    cut = text[:low]
+
+    # 마지막 줄이 너무 짧게 남지 않으면 줄 경계에서 자름
+    newline = cut.rfind("\n")
+    if newline > len(cut) * 0.8:
+        cut = cut[:newline]
+    return cut.rstrip() + mark
+
+
+def compact_text(text: str, repeat_threshold: int = 3, min_repeat_length: int = 8) -> str:
+    """
+    공백 정리 및 반복 줄 제거 (PDF 페이지마다 반복되는 머리말/꼬리말 등)
+
+    Args:
+        text: 대상 텍스트
+        repeat_threshold: 이 횟수 이상 반복되는 줄은 첫 줄만 유지
+        min_repeat_length: 반복 제거 대상 최소 길이 (짧은 표 셀 값 등은 유지)
+
+    Returns:
+        str: 압축된 텍스트
+    """
+    lines = [_SPACES.sub(" ", line).strip() for line in text.splitlines()]
+
+    counts: Dict[str, int] = {}
+    for line in lines:
+        if len(line) >= min_repeat_length:
+            counts[line] = counts.get(line, 0) + 1
+
+    compacted: List[str] = []
+    seen = set()
+    for line in lines:
+        if not line:
+            # 빈 줄은 연속되지 않게 하나만
+            if compacted and compacted[-1]:
+                compacted.append("")
+            continue
+        if compacted and compacted[-1] == line:
+            continue
+        if counts.get(line, 0) >= repeat_threshold:
+            if line in seen:
+                continue
+            seen.add(line)
+        compacted.append(line)
+    return "\n".join(compacted).strip()
+
+
+def dedupe(items: Iterable[Any]) -> List[str]:
+    """순서를 유지한 중복/빈 항목 제거 (앞뒤 공백 무시)"""
+    result: List[str] = []
+    seen = set()
+    for item in items or []:
+        value = str(item).strip()
+        if value and value not in seen:
+            seen.add(value)
+            result.append(value)
+    return result
+
+
+def join_items(
+    items: Iterable[Any],
+    max_tokens: Optional[int] = None,
+    separator: str = ", ",
+    empty: str = "",
+    counter: Callable[[str], int] = count_tokens
+) -> str:
+    """
+    중복을 제거한 목록을 이어 붙이기 (예산을 넘으면 항목 단위로 자르고 "외 N개" 표시)
+
+    Args:
+        items: 항목 목록
+        max_tokens: 최대 토큰 수 (None이면 제한 없음)
+        separator: 구분자
+        empty: 항목이 없을 때 값
+        counter: 토큰 계산 함수
+
+    Returns:
+        str: 이어 붙인 문자열
+    """
+    values = dedupe(items)
+    if not values:
+        return empty
+    joined = separator.join(values)
+    if max_tokens is None or counter(joined) <= max_tokens:
+        return joined
+
+    kept: List[str] = []
+    used = 0
+    sep_tokens = counter(separator)
+    for value in values:
+        cost = counter(value) + (sep_tokens if kept else 0)
+        # "외 N개" 표시 자리를 남겨 둠
+        if used + cost + 4 > max_tokens:
+            break
+        kept.append(value)
+        used += cost
+    return separator.join(kept) + f" 외 {len(values) - len(kept)}개"
+
+
+@dataclass
+class SectionUsage:
+    """
+    섹션별 토큰 사용량
+
+    Attributes:
+        name: 섹션 이름
+        tokens: 최종 토큰 수
+        original_tokens: 압축/자르기 전 토큰 수
+        budget: 섹션 예산 (None이면 필수 섹션)
+        compacted: 압축이 적용되었는지
+        truncated: 예산 때문에 잘렸는지
+    """
+    name: str
+    tokens: int
+    original_tokens: int
+    budget: Optional[int] = None
+    compacted: bool = False
+    truncated: bool = False
+
+
+@dataclass
+class BudgetedPrompt:
+    """
+    예산이 적용된 프롬프트
+
+    Attributes:
+        text: 최종 프롬프트
+        sections: 섹션별 사용량 (구성 순서)
+        budget: 전체 예산 (None이면 섹션 예산만 적용)
+    """
+    text: str
+    sections: List[SectionUsage] = field(default_factory=list)
+    budget: Optional[int] = None
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(section.tokens for section in self.sections)
+
+    @property
+    def saved_tokens(self) -> int:
+        """압축/자르기로 줄인 토큰 수"""
+        return sum(section.original_tokens - section.tokens for section in self.sections)
+
+    def report(self) -> Dict[str, Any]:
+        """
+        토큰 사용 보고
+
+        Returns:
+            dict: {total_tokens, saved_tokens, budget, sections: {name: {tokens, original_tokens, budget, truncated}}}
+        """
+        return {
+            "total_tokens": self.total_tokens,
+            "saved_tokens": self.saved_tokens,
+            "budget": self.budget,
+            "sections": {
+                section.name: {
+                    "tokens": section.tokens,
+                    "original_tokens": section.original_tokens,
+                    "budget": section.budget,
+                    "truncated": section.truncated,
+                }
+                for section in self.sections
+            },
+        }
+
+
+class PromptBudget:
+    """
+    섹션 단위 프롬프트 구성기
+
+    Attributes:
+        total: 전체 토큰 예산 (None이면 섹션 예산만 적용)
+        counter: 토큰 계산 함수
+
+    Example:
+        >>> budget = PromptBudget(total=3000)
+        >>> budget.reserve("system", SYSTEM_PROMPT)                          # 별도 메시지 (집계만)
+        >>> budget.add("profile", profile_text)                              # 필수 섹션
+        >>> budget.add("courses", courses_text, budget=1200, priority=1)
+        >>> budget.add("rag", rag_text, budget=600, compact=compact_text)   # 낮은 우선순위부터 줄임
+        >>> prompt = budget.build("\\n")
+        >>> prompt.total_tokens, prompt.report()
+    """
+
+    def __init__(self, total: Optional[int] = None, counter: Callable[[str], int] = count_tokens):
+        self.total = total
+        self.counter = counter
+        self._sections: List[Dict[str, Any]] = []
+
+    def add(
+        self,
+        name: str,
+        text: str,
+        budget: Optional[int] = None,
+        priority: int = 0,
+        compact: Optional[Callable[[str], str]] = None
+    ) -> "PromptBudget":
+        """
+        섹션 추가
+
+        Args:
+            name: 섹션 이름 (보고용)
+            text: 섹션 내용 (빈 문자열이면 생략)
+            budget: 섹션 토큰 예산 (None이면 필수 섹션 - 자르지 않음)
+            priority: 전체 예산 초과 시 낮은 값부터 줄임
+            compact: 예산 초과 시 먼저 적용할 압축 함수
+
+        Returns:
+            PromptBudget: 체이닝용 self
+        """
+        if text:
+            self._sections.append({
+                "name": name, "text": text, "budget": budget,
+                "priority": priority, "compact": compact, "include": True,
+            })
+        return self
+
+    def reserve(self, name: str, text: str) -> "PromptBudget":
+        """
+        프롬프트 본문에는 넣지 않고 토큰만 집계할 섹션 (시스템 프롬프트 등 별도 메시지)
+
+        Args:
+            name: 섹션 이름 (보고용)
+            text: 섹션 내용
+
+        Returns:
+            PromptBudget: 체이닝용 self
+        """
+        if text:
+            self._sections.append({
+                "name": name, "text": text, "budget": None,
+                "priority": 0, "compact": None, "include": False,
+            })
+        return self
+
+    def build(self, separator: str = "\n") -> BudgetedPrompt:
+        """
+        예산을 적용해 프롬프트 구성
+
+        Args:
+            separator: 섹션 구분자
+
+        Returns:
+            BudgetedPrompt: 최종 프롬프트와 섹션별 사용량
+        """
+        texts: List[str] = []
+        usages: List[SectionUsage] = []
+        for section in self._sections:
+            text = section["text"]
+            usage = SectionUsage(section["name"], 0, self.counter(text), section["budget"])
+            if usage.budget is not None and usage.original_tokens > usage.budget:
+                text, usage.compacted, usage.truncated = self._fit(text, usage.budget, section["compact"])
+            usage.tokens = self.counter(text)
+            texts.append(text)
+            usages.append(usage)
+
+        if self.total is not None:
+            self._shrink_to_total(texts, usages)
+
+        return BudgetedPrompt(
+            text=separator.join(
+                text for text, section in zip(texts, self._sections) if text and section["include"]
+            ),
+            sections=usages,
+            budget=self.total,
+        )
+
+    def _fit(self, text: str, budget: int, compact: Optional[Callable[[str], str]]):
+        """압축 후에도 넘치면 자르기 → (텍스트, 압축 여부, 잘림 여부)"""
+        compacted = False
+        if compact is not None:
+            text = compact(text)
+            compacted = True
+        if self.counter(text) <= budget:
+            return text, compacted, False
+        return truncate_tokens(text, budget, self.counter), compacted, True
+
+    def _shrink_to_total(self, texts: List[str], usages: List[SectionUsage]) -> None:
+        """전체 예산 초과분을 우선순위가 낮은 (예산이 있는) 섹션부터 줄임"""
+        excess = sum(usage.tokens for usage in usages) - self.total
+        order = sorted(
+            (i for i, usage in enumerate(usages) if usage.budget is not None),
+            key=lambda i: self._sections[i]["priority"]
+        )
+        for i in order:
+            if excess <= 0:
+                break
+            usage = usages[i]
+            target = max(usage.tokens - excess, 0)
+            texts[i] = truncate_tokens(texts[i], target, self.counter) if target else ""
+            excess -= usage.tokens - self.counter(texts[i])
+            usage.tokens = self.counter(texts[i])
+            usage.truncated = True
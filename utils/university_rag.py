@@ -3,14 +3,60 @@
 
 대학별 모집단위 교과이수 권장과목 데이터를 조회하고
 AI가 학생에게 맞춤형 과목 추천을 할 수 있도록 지원합니다.
+
+데이터 파일은 프로세스에서 한 번만 읽어 모든 세션/에이전트가 공유합니다
+(load_data_json, get_university_rag - 시작 시 utils.warmup이 미리 로드)
+
+Classes:
+    SubjectRecommendation: 과목 추천 결과
+    UniversityRAG: 권장과목 검색
+
+Functions:
+    load_data_json: data/ JSON 파일 로드 (프로세스 공유 캐시)
+    get_university_rag: 프로세스 공유 UniversityRAG 반환
 """
 
+import copy
 import json
+import threading
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 
 
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+_data_cache: Dict[str, Any] = {}
+_data_lock = threading.Lock()
+
+
+def load_data_json(filename: str, data_dir: Optional[Path] = None, default: Any = None) -> Any:
+    """
+    data/ JSON 파일 로드 (경로별로 한 번만 읽고 프로세스에서 공유)
+
+    반환값은 공유 객체이므로 수정이 필요하면 복사해서 사용
+
+    Args:
+        filename: 파일명 (예: "subjects_2022.json")
+        data_dir: 데이터 디렉토리 (기본값: 프로젝트 data/)
+        default: 파일이 없을 때 반환할 값 (캐시하지 않음, 호출마다 복사본)
+
+    Returns:
+        Any: 파싱된 JSON (파일이 없으면 default)
+    """
+    path = Path(data_dir or DATA_DIR) / filename
+    key = str(path)
+    if key in _data_cache:
+        return _data_cache[key]
+    with _data_lock:
+        if key not in _data_cache:
+            if not path.exists():
+                return copy.deepcopy(default)
+            with open(path, "r", encoding="utf-8") as f:
+                _data_cache[key] = json.load(f)
+        return _data_cache[key]
+
+
 @dataclass
 class SubjectRecommendation:
     """과목 추천 결과"""
@@ -37,20 +83,31 @@ class UniversityRAG:
             data_dir: 데이터 디렉토리 경로 (기본값: 현재 파일 기준 ../data)
         """
         if data_dir is None:
-            data_dir = Path(__file__).parent.parent / "data"
+            data_dir = DATA_DIR
 
         self.data_dir = Path(data_dir)
         self.requirements = self._load_json("university_requirements_rag.json")
         self.universities = self._load_json("universities_list.json")
+        # 대학명 조회 결과 (부분 일치 검색을 질의마다 다시 돌지 않도록)
+        self._name_index: Dict[str, Optional[Dict]] = {}
 
     def _load_json(self, filename: str) -> Dict:
-        """JSON 파일 로드"""
-        file_path = self.data_dir / filename
-        if not file_path.exists():
-            return {}
+        """JSON 파일 로드 (프로세스 공유 캐시)"""
+        return load_data_json(filename, self.data_dir, default={})
+
+    def build_index(self) -> int:
+        """
+        대학명 색인 미리 구성 (정식 명칭과 '대학교'를 뺀 약칭)
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        Returns:
+            int: 색인된 질의 수
+        """
+        for univ in self.get_universities_list():
+            name = univ.get("name", "")
+            for query in {name, name.replace("대학교", "대")}:
+                if query:
+                    self.get_university_by_name(query)
+        return len(self._name_index)
 
     def get_universities_list(self) -> List[Dict]:
         """대학 목록 조회"""
@@ -58,10 +115,15 @@ class UniversityRAG:
 
     def get_university_by_name(self, university_name: str) -> Optional[Dict]:
         """대학명으로 대학 정보 조회"""
+        if university_name in self._name_index:
+            return self._name_index[university_name]
+        found = None
         for univ in self.get_universities_list():
             if university_name in univ["name"]:
-                return univ
-        return None
+                found = univ
+                break
+        self._name_index[university_name] = found
+        return found
 
     def search_major_requirements(
         self,
@@ -276,6 +338,20 @@ class UniversityRAG:
         return result
 
 
+_rag: Optional[UniversityRAG] = None
+_rag_lock = threading.Lock()
+
+
+def get_university_rag() -> UniversityRAG:
+    """프로세스 공유 UniversityRAG 반환 (지연 생성, 스레드 안전)"""
+    global _rag
+    if _rag is None:
+        with _rag_lock:
+            if _rag is None:
+                _rag = UniversityRAG()
+    return _rag
+
+
 # 사용 예시
 if __name__ == "__main__":
     rag = UniversityRAG()
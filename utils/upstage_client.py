@@ -9,20 +9,452 @@ Upstage의 모든 API를 통합 관리하는 클라이언트 클래스
 
 Classes:
     UpstageClient: Upstage API 통합 클라이언트
+    AsyncUpstageClient: asyncio 기반 비동기 클라이언트
+    AsyncGroundednessStream: 비동기 스트리밍 근거 검증 (조각을 모두 받은 뒤 .result로 결과 확인)
 """
 
 import os
-import base64
+import time
+import mmap
 import json
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Dict, Any, List, Iterable, Tuple, Union, Callable, Generator, AsyncGenerator
+
+import httpx
+import openai
 import requests
-from typing import Optional, Dict, Any, List, Generator
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from dotenv import load_dotenv
 
+from .http_pool import get_http_session, get_llm_http_client, get_pool_stats, get_connection_stats
+from .rate_limiter import UpstageGovernor, Ticket, GovernorTimeout, get_governor
+from .pdf_split import split_pdf, merge_parse_results
+from .stream_body import Base64JsonBody
+from .llm_cache import LLMResponseCache, get_llm_cache
+from .singleflight import SingleFlight, AsyncSingleFlight, request_key, get_singleflight, singleflight_enabled
+from .instrumentation import Instrumentation, NOOP_SPAN, get_instrumentation
+from .deadline import Deadline, request_timeout
+from .hedging import Hedger, get_hedger
+from .model_router import ModelRouter, Route, get_router
+from .chat_batch import ChatRequest, ChatResult, iter_batch, iter_batch_async
+from .recorder import InteractionRecorder, get_recorder
+from .key_pool import KeyPool, get_key_pool, default_api_key
+from .json_stream import JsonStreamCutoff, AsyncJsonStreamCutoff, StreamComplete
+from .fast_json import decode_json, lazy_parse_keys
+from .resilience import (
+    RetryPolicy,
+    UpstageAPIError,
+    CircuitBreaker,
+    StreamResumeError,
+    get_breaker,
+    classify_exception,
+    error_from_response,
+)
+
 # 환경 변수 로드
 load_dotenv()
 
 
+# ==================== 공통 요청/응답 헬퍼 ====================
+# UpstageClient / AsyncUpstageClient가 함께 사용
+
+GROUNDEDNESS_SYSTEM_PROMPT = """당신은 답변 검증 전문가입니다.
+주어진 컨텍스트(Context)를 바탕으로 답변(Answer)이 얼마나 근거 있는지 평가해주세요.
+
+평가 기준:
+1. 답변의 각 주장이 컨텍스트에 근거하는지 확인
+2. 컨텍스트에 없는 정보를 추가하지 않았는지 확인
+3. 0.0~1.0 사이의 점수로 근거 정도를 표현
+
+반드시 다음 JSON 형식으로만 응답하세요:
+{
+    "grounded": true/false,
+    "score": 0.0~1.0,
+    "explanation": "검증 설명",
+    "evidence": ["근거1", "근거2"]
+}"""
+
+
+def _build_messages(message: str, system_prompt: Optional[str] = None) -> List[Dict[str, str]]:
+    """시스템 프롬프트 + 사용자 메시지로 messages 목록 구성"""
+    messages = []
+
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+
+    messages.append({"role": "user", "content": message})
+    return messages
+
+
+# Document Parse 출력 형식 (텍스트와 HTML 모두 추출) - 결과 캐시 키에도 사용
+PARSE_OUTPUT_FORMATS = "['text', 'html']"
+
+
+def _parse_form_data(model: str, ocr_mode: str = "force") -> Dict[str, str]:
+    """Document Parse 요청 폼 데이터 (스캔 문서는 ocr_mode="force")"""
+    return {
+        "ocr": ocr_mode,
+        "model": model,
+        "output_formats": PARSE_OUTPUT_FORMATS,
+        "coordinates": "false",
+        "base64_encoding": "['table']"
+    }
+
+
+def _normalize_parse_response(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Document Parse 응답에서 텍스트 추출 - 다양한 응답 구조 처리"""
+    if "content" in result:
+        return result
+    elif "text" in result:
+        return {"content": {"text": result["text"]}}
+    elif "elements" in result:
+        # elements 기반 응답 처리
+        text_parts = []
+        for elem in result.get("elements", []):
+            if "content" in elem:
+                content = elem["content"]
+                if isinstance(content, dict) and "text" in content:
+                    text_parts.append(content["text"])
+                elif isinstance(content, str):
+                    text_parts.append(content)
+            elif "text" in elem:
+                text_parts.append(elem["text"])
+        return {"content": {"text": "\n".join(text_parts)}, "raw": result}
+    else:
+        # 그 외 응답 구조
+        return {"content": {"text": str(result)}, "raw": result}
+
+
+EXTRACT_DATA_URL_PREFIX = "data:application/octet-stream;base64,"
+
+
+def _build_extract_payload(image_url: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Information Extract 요청 페이로드 구성"""
+    return {
+        "model": "information-extract",
+        "messages": [
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": image_url
+                        }
+                    }
+                ]
+            }
+        ],
+        "response_format": schema
+    }
+
+
+def _build_extract_body(file_data: Any, schema: Dict[str, Any]) -> Base64JsonBody:
+    """Information Extract 스트리밍 요청 본문 (파일을 base64 문자열로 복사하지 않음)"""
+    return Base64JsonBody(
+        _build_extract_payload(Base64JsonBody.BASE64_SLOT, schema),
+        file_data,
+        EXTRACT_DATA_URL_PREFIX
+    )
+
+
+def _parse_extract_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Information Extract 응답에서 추출된 내용 파싱"""
+    if "choices" in result and len(result["choices"]) > 0:
+        content = result["choices"][0]["message"]["content"]
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            return {"raw_content": content}
+
+    return result
+
+
+def _build_groundedness_message(context: str, answer: str) -> str:
+    """Groundedness Check 사용자 메시지 구성"""
+    return f"""[Context]
+{context}
+
+[Answer]
+{answer}
+
+위 답변이 컨텍스트에 얼마나 근거하는지 검증해주세요."""
+
+
+def _parse_groundedness(response: str) -> Dict[str, Any]:
+    """Groundedness Check 응답 JSON 파싱 (실패 시 기본 응답)"""
+    try:
+        # JSON 블록 추출
+        if "```json" in response:
+            json_str = response.split("```json")[1].split("```")[0].strip()
+        elif "```" in response:
+            json_str = response.split("```")[1].split("```")[0].strip()
+        else:
+            json_str = response.strip()
+
+        return json.loads(json_str)
+    except (json.JSONDecodeError, IndexError):
+        # 파싱 실패 시 기본 응답
+        return {
+            "grounded": True,
+            "score": 0.8,
+            "explanation": response,
+            "evidence": []
+        }
+
+
+# 스트리밍 근거 검증에서 완성으로 인정할 판정 객체의 필수 키
+GROUNDEDNESS_REQUIRED_KEYS = ("grounded", "score")
+
+
+def _groundedness_params(context: str, answer: str) -> Dict[str, Any]:
+    """스트리밍 Groundedness Check 요청 파라미터"""
+    return {
+        "messages": _build_messages(_build_groundedness_message(context, answer), GROUNDEDNESS_SYSTEM_PROMPT),
+        "temperature": 0.1,
+        "stream": True,
+    }
+
+
+def _groundedness_outcome(value: Optional[Dict[str, Any]], text: str) -> Dict[str, Any]:
+    """
+    스트리밍 Groundedness Check 결과
+
+    판정 객체가 완성되지 않았거나 점수가 숫자가 아니면 임의 점수 대신
+    outcome="parse_failed", retryable=True로 표시 (grounded/score는 None)
+    """
+    score = value.get("score") if value is not None else None
+    if isinstance(score, (int, float)) and not isinstance(score, bool):
+        return {**value, "score": float(score), "outcome": "ok", "retryable": False}
+    return {
+        "grounded": None,
+        "score": None,
+        "explanation": text,
+        "evidence": [],
+        "outcome": "parse_failed",
+        "retryable": True,
+    }
+
+
+class AsyncGroundednessStream(AsyncJsonStreamCutoff):
+    """
+    비동기 스트리밍 근거 검증 (UpstageClient.check_groundedness_stream의 Generator 반환값 대응)
+
+    async 제너레이터는 값을 반환할 수 없으므로 판정 객체까지 조각을 전달한 뒤 result에 검증 결과를 남김
+
+    Attributes:
+        result: 검증 결과 (스트림이 끝나기 전에는 None, 형식은 UpstageClient.check_groundedness_stream 반환값)
+
+    Example:
+        >>> stream = client.check_groundedness_stream(context, answer)
+        >>> async for chunk in stream:
+        ...     print(chunk, end="")
+        >>> stream.result["outcome"]
+    """
+
+    @property
+    def result(self) -> Optional[Dict[str, Any]]:
+        if self.total_seconds is None:
+            return None
+        return _groundedness_outcome(self.value, self.text)
+
+
+def _apply_base_url(client: Any, base_url: Optional[str]) -> None:
+    """
+    API 기본 URL 교체 (base_url 인자 > UPSTAGE_BASE_URL 환경변수 > 클래스 상수)
+
+    로컬 대역 서버(utils.standin_server)나 사내 프록시로 요청을 보낼 때 사용
+    """
+    base_url = (base_url or os.getenv("UPSTAGE_BASE_URL") or "").rstrip("/")
+    if not base_url or base_url == client.SOLAR_BASE_URL:
+        return
+    client.SOLAR_BASE_URL = base_url
+    client.DOCUMENT_PARSE_URL = f"{base_url}/document-digitization"
+    client.INFORMATION_EXTRACT_URL = f"{base_url}/information-extraction"
+    client.GROUNDEDNESS_CHECK_URL = f"{base_url}/chat/completions"
+
+
+def _slot_timeout(deadline: Optional[Deadline]) -> Optional[float]:
+    """거버너 슬롯 대기 한도 (남은 예산, 예산이 없으면 무제한)"""
+    return deadline.timeout() if deadline is not None else None
+
+
+def _with_ticket_key(kwargs: Dict[str, Any], ticket: Ticket) -> Dict[str, Any]:
+    """키 풀이 고른 키로 Authorization 교체 (인증 헤더가 없는 요청/단일 키는 그대로)"""
+    headers = kwargs.get("headers")
+    if ticket.api_key is None or not headers or "Authorization" not in headers:
+        return kwargs
+    return {**kwargs, "headers": {**headers, "Authorization": f"Bearer {ticket.api_key}"}}
+
+
+def _ticket_headers(ticket: Ticket) -> Dict[str, Any]:
+    """키 풀이 고른 키를 SDK 호출 헤더로 전달 (단일 키는 빈 dict)"""
+    if ticket.api_key is None:
+        return {}
+    return {"extra_headers": {"Authorization": f"Bearer {ticket.api_key}"}}
+
+
+def _route_params(
+    router: ModelRouter,
+    target: str,
+    params: Dict[str, Any],
+    tags: Optional[Dict[str, Any]] = None,
+    deadline: Optional[Deadline] = None
+) -> Dict[str, Any]:
+    """비어 있는 model/reasoning_effort를 라우터가 목표(target)에 맞게 채움 (명시한 값은 그대로)"""
+    if params.get("model") and params.get("reasoning_effort"):
+        return params
+    route = router.select(target, params.get("messages"), (tags or {}).get("prompt_tokens"), deadline)
+    return {
+        **params,
+        "model": params.get("model") or route.model,
+        "reasoning_effort": params.get("reasoning_effort") or route.reasoning_effort,
+    }
+
+
+def _route_of(params: Dict[str, Any]) -> Route:
+    """라우터 지연 관측 단위 (모델/추론 수준)"""
+    return Route(params.get("model"), params.get("reasoning_effort"))
+
+
+def _hedge_key(endpoint: str, params: Dict[str, Any]) -> tuple:
+    """헤지 지연 분포 구분 (엔드포인트, 모델, 추론 수준, 스트림 여부)"""
+    return (endpoint, params.get("model"), params.get("reasoning_effort"), "stream" if params.get("stream") else "complete")
+
+
+class _OpenStream:
+    """
+    거버너 슬롯을 잡고 열린 Chat Completions 스트림
+
+    헤지 시에는 첫 조각까지 미리 읽어 두고(prefetch) 먼저 응답한 스트림만 이어서 소비
+    close()는 한 번만 스트림을 닫고 슬롯을 반환
+    """
+
+    def __init__(self, governor, ticket: Ticket, stream, started_at: float):
+        self._governor = governor
+        self._ticket = ticket
+        self._stream = stream
+        self.started_at = started_at
+        self._deadline: Optional[Deadline] = None
+        self._chunks = iter(stream)
+        self._head: List[Any] = []
+        self._closed = False
+
+    def attach(self, deadline: Optional[Deadline]) -> None:
+        """cancel() 시 닫히도록 Deadline에 등록"""
+        if deadline is not None:
+            self._deadline = deadline
+            deadline.register(self._stream)
+
+    def prefetch(self) -> None:
+        """내용이 있는 첫 조각까지 읽어 둠 (스트림이 먼저 끝나면 그대로 종료)"""
+        for chunk in self._chunks:
+            self._head.append(chunk)
+            if chunk.choices and chunk.choices[0].delta.content:
+                return
+
+    def __iter__(self):
+        yield from self._head
+        yield from self._chunks
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self._deadline is not None:
+                self._deadline.unregister(self._stream)
+            self._stream.close()
+        finally:
+            self._governor.release(self._ticket)
+
+
+class _StreamSplice:
+    """
+    끊긴 스트림 재개 시 새 응답을 이미 전달한 텍스트와 맞춰 봄
+
+    재전송한 요청의 응답은 이미 전달한 길이까지 조각마다 비교만 하고 내보내지 않으며,
+    앞부분이 글자 단위로 같을 때만 그 뒤의 새 텍스트를 전달
+    (다르거나 더 일찍 끝나면 StreamResumeError - 다른 답변을 이어 붙이지 않음)
+    """
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.delivered = 0
+        self._parts: List[str] = []
+        self._prefix = ""
+        self.received = 0
+
+    def restart(self) -> None:
+        """새 시도 시작 (지금까지 전달한 텍스트가 맞춰 볼 앞부분)"""
+        self._prefix = "".join(self._parts)
+        self._parts = [self._prefix] if self._prefix else []
+        self.received = 0
+
+    def feed(self, piece: str) -> str:
+        """받은 조각 → 새로 전달할 부분 (이미 전달한 범위면 빈 문자열)"""
+        start = self.received
+        self.received += len(piece)
+        overlap = min(len(self._prefix) - start, len(piece))
+        if overlap > 0:
+            expected = self._prefix[start:start + overlap]
+            if piece[:overlap] != expected:
+                at = start + next(i for i in range(overlap) if piece[i] != expected[i])
+                raise StreamResumeError(
+                    f"재개한 스트림이 이미 전달한 {len(self._prefix)}자 중 {at}번째 글자부터 달라 이어 붙이지 않음",
+                    endpoint=self.endpoint,
+                )
+            piece = piece[overlap:]
+        if piece:
+            self._parts.append(piece)
+            self.delivered += len(piece)
+        return piece
+
+    def finish(self) -> None:
+        """스트림 정상 종료 확인 (재개한 응답이 이미 전달한 부분보다 짧으면 실패)"""
+        if self.received < len(self._prefix):
+            raise StreamResumeError(
+                f"재개한 스트림이 이미 전달한 {len(self._prefix)}자보다 짧게({self.received}자) 끝남",
+                endpoint=self.endpoint,
+            )
+
+
+class _AsyncOpenStream:
+    """열린 비동기 스트림 (_OpenStream과 같은 역할, 취소는 작업 취소로 전달)"""
+
+    def __init__(self, governor, ticket: Ticket, stream, started_at: float):
+        self._governor = governor
+        self._ticket = ticket
+        self._stream = stream
+        self.started_at = started_at
+        self._chunks = stream.__aiter__()
+        self._head: List[Any] = []
+        self._closed = False
+
+    async def prefetch(self) -> None:
+        async for chunk in self._chunks:
+            self._head.append(chunk)
+            if chunk.choices and chunk.choices[0].delta.content:
+                return
+
+    async def __aiter__(self):
+        for chunk in self._head:
+            yield chunk
+        async for chunk in self._chunks:
+            yield chunk
+
+    async def aclose(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            await self._stream.close()
+        finally:
+            self._governor.release(self._ticket)
+
+
 class UpstageClient:
     """
     Upstage API 통합 클라이언트
@@ -34,6 +466,11 @@ class UpstageClient:
         base_url: API 기본 URL
         client: OpenAI 호환 클라이언트 (Solar LLM용)
     
+    Document Parse / Information Extract 등 원시 HTTP 호출은
+    프로세스 공유 keep-alive 세션(utils.http_pool)을 사용
+    Solar LLM 호출도 프로세스 공유 httpx 클라이언트를 사용하며,
+    세션/에이전트 간 인스턴스 공유는 utils.client_pool.get_shared_client()로 함
+    
     Example:
         >>> client = UpstageClient()
         >>> response = client.chat("안녕하세요!")
@@ -45,29 +482,70 @@ class UpstageClient:
     INFORMATION_EXTRACT_URL = "https://api.upstage.ai/v1/information-extraction"
     GROUNDEDNESS_CHECK_URL = "https://api.upstage.ai/v1/chat/completions"
     SOLAR_BASE_URL = "https://api.upstage.ai/v1"
+    PARSE_OUTPUT_FORMATS = PARSE_OUTPUT_FORMATS
     
-    def __init__(self, api_key: Optional[str] = None):
+    # 재시도해도 안전한 엔드포인트 분류 (모두 서버 상태를 바꾸지 않는 조회/추론 호출)
+    IDEMPOTENT_ENDPOINTS = frozenset({"parse", "extract", "chat", "groundedness"})
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        governor: Optional[UpstageGovernor] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        response_cache: Optional[LLMResponseCache] = None,
+        singleflight: Optional[SingleFlight] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        base_url: Optional[str] = None,
+        hedger: Optional[Hedger] = None,
+        router: Optional[ModelRouter] = None,
+        http_client: Optional[httpx.Client] = None,
+        recorder: Optional[InteractionRecorder] = None
+    ):
         """
         클라이언트 초기화
         
         Args:
-            api_key: Upstage API 키 (미제공 시 환경변수에서 로드)
+            api_key: Upstage API 키 (미제공 시 UPSTAGE_API_KEY, 없으면 UPSTAGE_API_KEYS의 첫 키)
+            governor: 속도/동시성 거버너 또는 KeyPool (미제공 시 UPSTAGE_API_KEYS가 있으면 프로세스 공유 키 풀,
+                없으면 프로세스 공유 거버너)
+            retry_policy: 재시도 정책 (미제공 시 기본 정책)
+            response_cache: LLM 응답 캐시 (미제공 시 IMF_LLM_CACHE 설정, 기본 비활성)
+            singleflight: 동일 요청 병합 그룹 (미제공 시 프로세스 공유 그룹, UPSTAGE_SINGLEFLIGHT=0 이면 미사용)
+            instrumentation: 호출 계측 (미제공 시 프로세스 공유 계측, 싱크가 없으면 비활성)
+            base_url: API 기본 URL (미제공 시 UPSTAGE_BASE_URL, 기본 https://api.upstage.ai/v1)
+            hedger: 헤지 요청 실행기 (미제공 시 UPSTAGE_HEDGE=1 일 때 프로세스 공유 Hedger)
+            router: 모델/추론 수준 라우터 (미제공 시 UPSTAGE_ROUTER_POLICY 정책의 프로세스 공유 라우터)
+            http_client: OpenAI SDK가 사용할 httpx 클라이언트 (미제공 시 프로세스 공유 클라이언트)
+            recorder: 호출 기록기 (미제공 시 UPSTAGE_RECORD 경로의 프로세스 공유 기록기, 기본 미기록)
         """
-        self.api_key = api_key or os.getenv("UPSTAGE_API_KEY")
+        self.api_key = api_key or default_api_key()
         if not self.api_key:
             raise ValueError("UPSTAGE_API_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
+        _apply_base_url(self, base_url)
         
         # OpenAI 호환 클라이언트 (Solar LLM용)
+        # 재시도는 RetryPolicy 한 곳에서만 수행 (SDK 자체 재시도 비활성화)
+        # 연결은 프로세스 공유 httpx 클라이언트를 사용 (세션마다 풀을 만들지 않음)
+        # Information Extract는 원시 HTTP 세션(utils.http_pool)으로 호출하므로 별도 SDK 클라이언트 없음
+        self.http_client = http_client or get_llm_http_client()
         self.client = OpenAI(
             api_key=self.api_key,
-            base_url=self.SOLAR_BASE_URL
+            base_url=self.SOLAR_BASE_URL,
+            max_retries=0,
+            http_client=self.http_client
         )
         
-        # Information Extract용 별도 클라이언트
-        self.extract_client = OpenAI(
-            api_key=self.api_key,
-            base_url=f"{self.INFORMATION_EXTRACT_URL}"
-        )
+        # 엔드포인트 분류별 속도/동시성 제어 (모든 세션 공유)
+        self.governor = governor or get_key_pool() or get_governor()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.response_cache = response_cache or get_llm_cache()
+        # 세션(탭)이 달라도 같은 요청은 한 번만 전송되도록 프로세스 공유
+        self.singleflight = singleflight or get_singleflight()
+        self.instrumentation = instrumentation or get_instrumentation()
+        self.hedger = hedger or get_hedger()
+        self.router = router or get_router()
+        self.recorder = recorder or get_recorder()
+        self._local = threading.local()
     
     # ==================== Document Parse API ====================
     
@@ -75,7 +553,9 @@ class UpstageClient:
         self, 
         file_path: str, 
         ocr_mode: str = "force",
-        model: str = "document-parse"
+        model: str = "document-parse",
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None
     ) -> Dict[str, Any]:
         """
         PDF 문서를 텍스트로 변환 (Document Parse API)
@@ -84,6 +564,8 @@ class UpstageClient:
             file_path: PDF 파일 경로
             ocr_mode: OCR 모드 ("auto", "force")
             model: 사용할 모델 ("document-parse", "ocr")
+            tags: 계측 태그 {"agent": ..., "stage": ...}
+            deadline: 호출 마감 시간 (남은 예산을 타임아웃으로 사용, 취소 시 CallCancelled)
         
         Returns:
             dict: 파싱된 문서 정보 (텍스트, 테이블 등)
@@ -93,6 +575,7 @@ class UpstageClient:
             >>> print(result["content"]["text"])
         """
         headers = {"Authorization": f"Bearer {self.api_key}"}
+        span = self.instrumentation.span("parse", "parse", tags, model=model)
         
         with open(file_path, "rb") as f:
             files = {"document": f}
@@ -101,24 +584,27 @@ class UpstageClient:
                 "base64_encoding": "['table']",
                 "model": model
             }
-            response = requests.post(
+            response = self._traced(span, lambda: self._post(
+                "parse",
                 self.DOCUMENT_PARSE_URL,
+                span=span,
+                deadline=deadline,
+                tags=tags,
                 headers=headers,
                 files=files,
                 data=data
-            )
-        
-        if response.status_code != 200:
-            raise Exception(f"Document Parse 실패: {response.status_code} - {response.text}")
+            ))
         
-        return response.json()
+        return decode_json(response.content, lazy_parse_keys())
     
     def parse_document_bytes(
         self, 
         file_bytes: bytes, 
         filename: str = "document.pdf",
         ocr_mode: str = "force",
-        model: str = "document-parse"
+        model: str = "document-parse",
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None
     ) -> Dict[str, Any]:
         """
         바이트 데이터에서 문서 파싱 (Streamlit 업로드 파일용)
@@ -127,8 +613,10 @@ class UpstageClient:
         Args:
             file_bytes: 파일 바이트 데이터
             filename: 파일명
-            ocr_mode: OCR 모드 ("force" - 스캔 문서용)
+            ocr_mode: OCR 모드 ("force" - 스캔 문서용, "auto" - 텍스트 레이어가 있는 문서)
             model: 사용할 모델 ("document-parse" 권장)
+            tags: 계측 태그 {"agent": ..., "stage": ...}
+            deadline: 호출 마감 시간 (남은 예산을 타임아웃으로 사용, 취소 시 CallCancelled)
         
         Returns:
             dict: 파싱된 문서 정보
@@ -137,55 +625,243 @@ class UpstageClient:
         
         # 스캔된 PDF를 위한 강화된 설정
         files = {"document": (filename, file_bytes, "application/pdf")}
-        data = {
-            "ocr": "force",  # 항상 OCR 강제 실행
-            "model": model,
-            "output_formats": "['text', 'html']",  # 텍스트와 HTML 모두 추출
-            "coordinates": "false",
-            "base64_encoding": "['table']"
-        }
+        data = _parse_form_data(model, ocr_mode)
+        span = self.instrumentation.span("parse", "parse", tags, model=model, payload=file_bytes)
         
-        response = requests.post(
-            self.DOCUMENT_PARSE_URL,
-            headers=headers,
-            files=files,
-            data=data,
-            timeout=120  # 스캔 문서는 처리 시간이 오래 걸릴 수 있음
-        )
+        def send():
+            response = self._post(
+                "parse",
+                self.DOCUMENT_PARSE_URL,
+                span=span,
+                deadline=deadline,
+                tags=tags,
+                headers=headers,
+                files=files,
+                data=data,
+                timeout=120  # 스캔 문서는 처리 시간이 오래 걸릴 수 있음 (남은 예산이 더 짧으면 예산 기준)
+            )
+            return _normalize_parse_response(decode_json(response.content, lazy_parse_keys()))
         
-        if response.status_code != 200:
-            raise Exception(f"Document Parse 실패: {response.status_code} - {response.text}")
+        # 같은 파일을 동시에 파싱 중이면 그 결과를 공유
+        return self._coalesce("parse", (file_bytes, data), send, span, deadline)
+    
+    def parse_document_bytes_chunked(
+        self,
+        file_bytes: bytes,
+        filename: str = "document.pdf",
+        ocr_mode: str = "force",
+        model: str = "document-parse",
+        pages_per_chunk: int = 8,
+        max_workers: int = 4,
+        max_rounds: int = 2,
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
+        """
+        대용량 PDF를 페이지 구간으로 나누어 병렬 파싱
         
-        result = response.json()
+        구간별 호출은 제한된 스레드 풀에서 동시에 실행되고(거버너 parse 예산 적용),
+        실패한 구간만 다시 시도한 뒤 pages / tables / text를 페이지 순서대로 병합
         
-        # 응답에서 텍스트 추출 - 다양한 응답 구조 처리
-        if "content" in result:
-            return result
-        elif "text" in result:
-            return {"content": {"text": result["text"]}}
-        elif "elements" in result:
-            # elements 기반 응답 처리
-            text_parts = []
-            for elem in result.get("elements", []):
-                if "content" in elem:
-                    content = elem["content"]
-                    if isinstance(content, dict) and "text" in content:
-                        text_parts.append(content["text"])
-                    elif isinstance(content, str):
-                        text_parts.append(content)
-                elif "text" in elem:
-                    text_parts.append(elem["text"])
-            return {"content": {"text": "\n".join(text_parts)}, "raw": result}
-        else:
-            # 그 외 응답 구조
-            return {"content": {"text": str(result)}, "raw": result}
-    
+        Args:
+            file_bytes: PDF 바이트 데이터
+            filename: 파일명
+            ocr_mode: OCR 모드
+            model: 사용할 모델
+            pages_per_chunk: 구간당 페이지 수
+            max_workers: 동시 파싱 구간 수
+            max_rounds: 실패 구간 재시도를 포함한 최대 라운드 수
+            tags: 계측 태그 (구간별 호출에 그대로 전달)
+            deadline: 호출 마감 시간 (구간별 호출에 그대로 전달)
+        
+        Returns:
+            dict: 단일 호출과 같은 구조의 병합 결과 (chunks에 구간 정보 포함)
+        
+        Raises:
+            UpstageAPIError: 재시도 후에도 실패한 구간이 남은 경우
+        """
+        try:
+            chunks = split_pdf(file_bytes, pages_per_chunk)
+        except Exception:
+            # 로컬에서 읽을 수 없는 PDF는 서버에 통째로 맡김
+            chunks = []
+        if len(chunks) <= 1:
+            return self.parse_document_bytes(
+                file_bytes, filename, ocr_mode=ocr_mode, model=model, tags=tags, deadline=deadline
+            )
+        
+        stem = filename.rsplit(".", 1)[0]
+        results = {}
+        pending = list(chunks)
+        errors = {}
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="parse-chunk") as pool:
+            for _ in range(max_rounds):
+                futures = {
+                    pool.submit(
+                        self.parse_document_bytes,
+                        chunk.data,
+                        f"{stem}_p{chunk.start_page}-{chunk.end_page}.pdf",
+                        ocr_mode,
+                        model,
+                        tags,
+                        deadline
+                    ): chunk
+                    for chunk in pending
+                }
+                pending = []
+                for future in as_completed(futures):
+                    chunk = futures[future]
+                    try:
+                        results[chunk.index] = (chunk, future.result())
+                        errors.pop(chunk.index, None)
+                    except Exception as e:
+                        errors[chunk.index] = e
+                        pending.append(chunk)
+                if not pending or (deadline is not None and deadline.done):
+                    break
+        
+        if pending and deadline is not None:
+            deadline.check("parse")
+        if pending:
+            ranges = ", ".join(f"{c.start_page}-{c.end_page}p" for c in sorted(pending, key=lambda c: c.index))
+            first_error = errors[pending[0].index]
+            raise UpstageAPIError(
+                f"Document Parse 실패: {len(pending)}개 구간({ranges}) 처리 실패 - {first_error}",
+                endpoint="parse",
+                status_code=getattr(first_error, "status_code", None),
+            ) from first_error
+        
+        return merge_parse_results(list(results.values()))
+
+    # ==================== Document Parse 비동기 작업 API ====================
+    # 작업 등록/상태 조회/결과 다운로드만 담당 (폴링과 재개는 utils.parse_jobs.ParseJobRunner)
+
+    def submit_parse_job(
+        self,
+        file_bytes: bytes,
+        filename: str = "document.pdf",
+        ocr_mode: str = "force",
+        model: str = "document-parse",
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Tuple[str, str]:
+        """
+        Document Parse 비동기 작업 등록 (OCR 완료를 기다리지 않음)
+
+        작업 ID는 등록한 키의 계정에만 보이므로 등록에 쓴 키를 함께 반환
+        (키 풀 사용 시 상태 조회는 get_parse_job(api_key=...)로 같은 키에 고정)
+
+        Args:
+            file_bytes: PDF 바이트 데이터
+            filename: 파일명
+            ocr_mode: OCR 모드
+            model: 사용할 모델
+            tags: 계측 태그 {"agent": ..., "stage": ...}
+            deadline: 호출 마감 시간
+
+        Returns:
+            tuple[str, str]: (작업 ID(request_id), 등록에 쓴 API 키)
+        """
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        files = {"document": (filename, file_bytes, "application/pdf")}
+        data = _parse_form_data(model, ocr_mode)
+        span = self.instrumentation.span("parse", "parse_submit", tags, model=model, payload=file_bytes)
+
+        # 등록은 서버에 작업을 만들므로 응답을 받지 못한 경우 다시 보내지 않음 (429/5xx 응답만 재시도)
+        response = self._traced(span, lambda: self._request(
+            "post",
+            "parse",
+            f"{self.DOCUMENT_PARSE_URL}/async",
+            span=span,
+            deadline=deadline,
+            idempotent=False,
+            tags=tags,
+            headers=headers,
+            files=files,
+            data=data,
+            timeout=60
+        ))
+        authorization = response.request.headers.get("Authorization", "")
+        api_key = authorization[len("Bearer "):] if authorization.startswith("Bearer ") else self.api_key
+        return decode_json(response.content)["request_id"], api_key
+
+    def get_parse_job(
+        self,
+        job_id: str,
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+        api_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Document Parse 비동기 작업 상태 조회
+
+        Args:
+            job_id: submit_parse_job이 반환한 작업 ID
+            tags: 계측 태그
+            deadline: 호출 마감 시간
+            api_key: 작업을 등록한 키 (submit_parse_job이 반환한 키, 미제공 시 클라이언트 키 - 키 풀이 고르지 않음)
+
+        Returns:
+            dict: {id, status, total_pages, completed_pages, failure_message,
+                   batches: [{id, status, start_page, end_page, download_url, failure_message}]}
+        """
+        # 작업 ID는 등록한 키의 계정 범위 → 다른 키로 조회하면 404/403 (키 격리까지 번짐)
+        api_key = api_key or self.api_key
+        headers = {"Authorization": f"Bearer {api_key}"}
+        span = self.instrumentation.span("parse", "parse_status", tags)
+        response = self._traced(span, lambda: self._request(
+            "get",
+            "parse",
+            f"{self.DOCUMENT_PARSE_URL}/requests/{job_id}",
+            span=span,
+            deadline=deadline,
+            tags=tags,
+            api_key=api_key,
+            headers=headers,
+            timeout=30
+        ))
+        return decode_json(response.content)
+
+    def download_parse_batch(
+        self,
+        download_url: str,
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
+        """
+        완료된 작업 구간(batch)의 파싱 결과 다운로드
+
+        download_url은 서명된 URL이므로 Authorization 헤더를 보내지 않음
+
+        Args:
+            download_url: get_parse_job 응답의 구간별 download_url
+            tags: 계측 태그
+            deadline: 호출 마감 시간
+
+        Returns:
+            dict: parse_document_bytes와 같은 구조로 정규화된 구간 결과
+        """
+        span = self.instrumentation.span("parse", "parse_download", tags)
+        response = self._traced(span, lambda: self._request(
+            "get",
+            "parse",
+            download_url,
+            span=span,
+            deadline=deadline,
+            tags=tags,
+            timeout=60
+        ))
+        return _normalize_parse_response(decode_json(response.content, lazy_parse_keys()))
+
     # ==================== Information Extract API ====================
-    
+
     def extract_information(
         self, 
         file_path: str, 
-        schema: Dict[str, Any]
+        schema: Dict[str, Any],
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None
     ) -> Dict[str, Any]:
         """
         이미지/문서에서 구조화된 정보 추출 (Information Extract API)
@@ -193,20 +869,25 @@ class UpstageClient:
         Args:
             file_path: 이미지/PDF 파일 경로
             schema: 추출할 정보의 JSON 스키마
+            tags: 계측 태그 {"agent": ..., "stage": ...}
+            deadline: 호출 마감 시간 (남은 예산을 타임아웃으로 사용, 취소 시 CallCancelled)
         
         Returns:
             dict: 추출된 구조화된 정보
         """
-        # 파일을 base64로 인코딩
+        # 파일을 읽어 들이지 않고 mmap으로 매핑하여 조각 단위로 인코딩
         with open(file_path, "rb") as f:
-            base64_data = base64.b64encode(f.read()).decode("utf-8")
-        
-        return self._extract_from_base64(base64_data, schema)
+            if os.fstat(f.fileno()).st_size == 0:
+                return self._extract_from_buffer(b"", schema, tags, deadline)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return self._extract_from_buffer(mapped, schema, tags, deadline)
     
     def extract_information_bytes(
         self, 
         file_bytes: bytes, 
-        schema: Dict[str, Any]
+        schema: Dict[str, Any],
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None
     ) -> Dict[str, Any]:
         """
         바이트 데이터에서 정보 추출 (Streamlit 업로드 파일용)
@@ -214,71 +895,59 @@ class UpstageClient:
         Args:
             file_bytes: 파일 바이트 데이터
             schema: 추출할 정보의 JSON 스키마
+            tags: 계측 태그 {"agent": ..., "stage": ...}
+            deadline: 호출 마감 시간 (남은 예산을 타임아웃으로 사용, 취소 시 CallCancelled)
         
         Returns:
             dict: 추출된 구조화된 정보
         """
-        base64_data = base64.b64encode(file_bytes).decode("utf-8")
-        return self._extract_from_base64(base64_data, schema)
+        return self._extract_from_buffer(file_bytes, schema, tags, deadline)
     
-    def _extract_from_base64(
+    def _extract_from_buffer(
         self, 
-        base64_data: str, 
-        schema: Dict[str, Any]
+        file_data: Any, 
+        schema: Dict[str, Any],
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None
     ) -> Dict[str, Any]:
         """
-        Base64 인코딩된 데이터에서 정보 추출 (내부 헬퍼)
+        파일 버퍼에서 정보 추출 (내부 헬퍼)
+        
+        base64 문자열과 JSON 문자열을 따로 만들지 않고
+        요청 본문을 전송하면서 조각 단위로 인코딩
         
         Args:
-            base64_data: Base64 인코딩된 파일 데이터
+            file_data: 파일 데이터 (bytes, memoryview, mmap)
             schema: 추출 스키마
+            tags: 계측 태그
+            deadline: 호출 마감 시간
         
         Returns:
             dict: 추출된 정보
         """
+        body = _build_extract_body(file_data, schema)
         headers = {
             "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
+            "Content-Type": "application/json",
+            "Content-Length": str(len(body))
         }
+        span = self.instrumentation.span("extract", "extract", tags, model="information-extract", payload=body)
         
-        payload = {
-            "model": "information-extract",
-            "messages": [
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:application/octet-stream;base64,{base64_data}"
-                            }
-                        }
-                    ]
-                }
-            ],
-            "response_format": schema
-        }
-        
-        response = requests.post(
-            f"{self.SOLAR_BASE_URL}/chat/completions",
-            headers=headers,
-            json=payload
-        )
-        
-        if response.status_code != 200:
-            raise Exception(f"Information Extract 실패: {response.status_code} - {response.text}")
-        
-        result = response.json()
-        
-        # 응답에서 추출된 내용 파싱
-        if "choices" in result and len(result["choices"]) > 0:
-            content = result["choices"][0]["message"]["content"]
-            try:
-                return json.loads(content)
-            except json.JSONDecodeError:
-                return {"raw_content": content}
+        try:
+            response = self._traced(span, lambda: self._post(
+                "extract",
+                f"{self.SOLAR_BASE_URL}/chat/completions",
+                span=span,
+                deadline=deadline,
+                tags=tags,
+                headers=headers,
+                data=body
+            ))
+        finally:
+            # mmap을 닫을 수 있도록 버퍼 참조 해제
+            body.release()
         
-        return result
+        return _parse_extract_result(decode_json(response.content))
     
     # ==================== Solar LLM API ====================
     
@@ -286,9 +955,14 @@ class UpstageClient:
         self, 
         message: str, 
         system_prompt: Optional[str] = None,
-        reasoning_effort: str = "low",
-        model: str = "solar-pro3",
-        temperature: float = 0.7
+        reasoning_effort: Optional[str] = None,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        use_cache: bool = False,
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+        hedge: bool = False,
+        target: str = "fast"
     ) -> str:
         """
         Solar LLM과 채팅 (동기 방식)
@@ -296,36 +970,98 @@ class UpstageClient:
         Args:
             message: 사용자 메시지
             system_prompt: 시스템 프롬프트 (선택)
-            reasoning_effort: 추론 노력 수준 ("low", "medium", "high")
-            model: 사용할 모델
+            reasoning_effort: 추론 노력 수준 ("low", "medium", "high", 미지정 시 라우터가 target에 맞게 선택)
+            model: 사용할 모델 (미지정 시 라우터가 선택)
             temperature: 응답 다양성 (0.0~1.0)
+            use_cache: 응답 캐시 사용 여부 (response_cache가 있을 때만 적용)
+            tags: 계측 태그 {"agent": ..., "stage": ...}
+            deadline: 호출 마감 시간 (남은 예산을 타임아웃으로 사용, 취소 시 CallCancelled)
+            hedge: 첫 응답이 p95보다 늦으면 같은 요청을 한 번 더 보냄 (hedger가 있을 때만)
+            target: 라우팅 목표 ("fast", "balanced", "quality" - utils.model_router)
         
         Returns:
             str: LLM 응답 텍스트
         """
-        messages = []
-        
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        
-        messages.append({"role": "user", "content": message})
+        messages = _build_messages(message, system_prompt)
         
-        response = self.client.chat.completions.create(
+        return self._complete(
+            "chat",
+            use_cache=use_cache,
+            tags=tags,
+            deadline=deadline,
+            hedge=hedge,
+            target=target,
             model=model,
             messages=messages,
             reasoning_effort=reasoning_effort,
             temperature=temperature
         )
+    
+    def chat_many(
+        self,
+        requests: Iterable[Union[ChatRequest, str, Dict[str, Any]]],
+        max_concurrency: Optional[int] = None,
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None
+    ) -> List[ChatResult]:
+        """
+        독립적인 채팅 요청 N개를 제한된 동시성으로 실행 (입력 순서대로 반환)
+        
+        각 요청은 chat()을 거치므로 거버너/재시도/캐시/병합이 그대로 적용되고,
+        항목별 실패는 예외 대신 ChatResult.error에 담김
+        
+        Args:
+            requests: ChatRequest, 메시지 문자열, 또는 chat 인자 dict 목록
+            max_concurrency: 동시 실행 수 (미지정 시 UPSTAGE_BATCH_CONCURRENCY, 기본 4)
+            tags: 모든 요청에 공통으로 붙일 계측 태그 (요청별 tags가 우선)
+            deadline: 일괄 실행 전체의 마감 시간 (남은 항목은 DeadlineExceeded로 실패)
+        
+        Returns:
+            list[ChatResult]: 입력 순서의 결과 (text/error, wait_seconds, duration_seconds)
+        """
+        results = list(self.chat_many_iter(requests, max_concurrency, tags, deadline))
+        return sorted(results, key=lambda result: result.index)
+    
+    def chat_many_iter(
+        self,
+        requests: Iterable[Union[ChatRequest, str, Dict[str, Any]]],
+        max_concurrency: Optional[int] = None,
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Generator[ChatResult, None, None]:
+        """
+        chat_many와 같지만 끝나는 순서대로 결과를 돌려줌 (소비를 멈추면 시작 전 요청은 취소)
+        
+        Yields:
+            ChatResult: 완료된 결과 (index로 입력 순서 확인)
+        """
+        def call(request: ChatRequest) -> str:
+            return self.chat(
+                request.message,
+                request.system_prompt,
+                reasoning_effort=request.reasoning_effort,
+                model=request.model,
+                temperature=request.temperature,
+                use_cache=request.use_cache,
+                tags={**(tags or {}), **(request.tags or {})},
+                deadline=deadline,
+                target=request.target
+            )
         
-        return response.choices[0].message.content
+        return iter_batch(call, requests, max_concurrency)
     
     def chat_stream(
         self, 
         message: str, 
         system_prompt: Optional[str] = None,
-        reasoning_effort: str = "low",
-        model: str = "solar-pro3",
+        reasoning_effort: Optional[str] = None,
+        model: Optional[str] = None,
         temperature: float = 0.2,
+        use_cache: bool = False,
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+        hedge: bool = False,
+        target: str = "fast"
     ) -> Generator[str, None, None]:
         """
         Solar LLM과 스트리밍 채팅
@@ -333,62 +1069,73 @@ class UpstageClient:
         Args:
             message: 사용자 메시지
             system_prompt: 시스템 프롬프트 (선택)
-            reasoning_effort: 추론 노력 수준
-            model: 사용할 모델
+            reasoning_effort: 추론 노력 수준 (미지정 시 라우터가 target에 맞게 선택)
+            model: 사용할 모델 (미지정 시 라우터가 선택)
+            use_cache: 응답 캐시 사용 여부 (히트 시 저장된 응답을 조각 단위로 재생)
+            tags: 계측 태그 {"agent": ..., "stage": ...}
+            deadline: 호출 마감 시간 (남은 예산을 타임아웃으로 사용, 취소 시 CallCancelled)
+            hedge: 첫 조각이 p95보다 늦으면 같은 스트림을 한 번 더 열어 먼저 응답한 쪽 사용 (hedger가 있을 때만)
+            target: 라우팅 목표 ("fast", "balanced", "quality" - utils.model_router)
         
         Yields:
             str: 응답 텍스트 조각
         """
-        messages = []
-        
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
+        messages = _build_messages(message, system_prompt)
         
-        messages.append({"role": "user", "content": message})
-        
-        stream = self.client.chat.completions.create(
-            model=model,
-            messages=messages,
-            reasoning_effort=reasoning_effort,
-            temperature=temperature,
-            stream=True,
-        )
-        
-        for chunk in stream:
-            if chunk.choices[0].delta.content is not None:
-                yield chunk.choices[0].delta.content
+        yield from self._cached_stream("chat", {
+            "model": model,
+            "messages": messages,
+            "reasoning_effort": reasoning_effort,
+            "temperature": temperature,
+            "stream": True,
+        }, use_cache, tags, deadline, hedge, target)
     
     def chat_with_context(
         self, 
         messages: List[Dict[str, str]], 
-        reasoning_effort: str = "high",
-        model: str = "solar-pro3"
+        reasoning_effort: Optional[str] = None,
+        model: Optional[str] = None,
+        use_cache: bool = False,
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+        target: str = "quality"
     ) -> str:
         """
         대화 컨텍스트를 포함한 채팅
         
         Args:
             messages: 대화 기록 [{"role": "user/assistant", "content": "..."}]
-            reasoning_effort: 추론 노력 수준
-            model: 사용할 모델
+            reasoning_effort: 추론 노력 수준 (미지정 시 라우터가 target에 맞게 선택)
+            model: 사용할 모델 (미지정 시 라우터가 선택)
+            use_cache: 응답 캐시 사용 여부
+            tags: 계측 태그 {"agent": ..., "stage": ...}
+            deadline: 호출 마감 시간 (남은 예산을 타임아웃으로 사용, 취소 시 CallCancelled)
+            target: 라우팅 목표 (기본 "quality")
         
         Returns:
             str: LLM 응답 텍스트
         """
-        response = self.client.chat.completions.create(
+        return self._complete(
+            "chat",
+            use_cache=use_cache,
+            tags=tags,
+            deadline=deadline,
+            target=target,
             model=model,
             messages=messages,
             reasoning_effort=reasoning_effort
         )
-        
-        return response.choices[0].message.content
     
     # ==================== Groundedness Check API ====================
     
     def check_groundedness(
         self, 
         context: str, 
-        answer: str
+        answer: str,
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+        hedge: bool = True,
+        target: str = "quality"
     ) -> Dict[str, Any]:
         """
         응답의 근거 검증 (Groundedness Check)
@@ -398,63 +1145,638 @@ class UpstageClient:
         Args:
             context: 근거가 되는 원본 텍스트
             answer: 검증할 답변
+            tags: 계측 태그 {"agent": ..., "stage": ...}
+            deadline: 호출 마감 시간 (남은 예산을 타임아웃으로 사용, 취소 시 CallCancelled)
+            hedge: 응답이 p95보다 늦으면 같은 요청을 한 번 더 보냄 (기본 사용, hedger가 있을 때만)
+            target: 라우팅 목표 (기본 "quality" - 느릴 때 낮은 추론 수준으로 내려감)
         
         Returns:
             dict: 검증 결과 (grounded: bool, score: float, explanation: str)
         """
-        system_prompt = """당신은 답변 검증 전문가입니다. 
-주어진 컨텍스트(Context)를 바탕으로 답변(Answer)이 얼마나 근거 있는지 평가해주세요.
-
-평가 기준:
-1. 답변의 각 주장이 컨텍스트에 근거하는지 확인
-2. 컨텍스트에 없는 정보를 추가하지 않았는지 확인
-3. 0.0~1.0 사이의 점수로 근거 정도를 표현
-
-반드시 다음 JSON 형식으로만 응답하세요:
-{
-    "grounded": true/false,
-    "score": 0.0~1.0,
-    "explanation": "검증 설명",
-    "evidence": ["근거1", "근거2"]
-}"""
+        user_message = _build_groundedness_message(context, answer)
         
-        user_message = f"""[Context]
-{context}
-
-[Answer]
-{answer}
+        response = self._complete(
+            "groundedness",
+            tags=tags,
+            deadline=deadline,
+            hedge=hedge,
+            target=target,
+            messages=_build_messages(user_message, GROUNDEDNESS_SYSTEM_PROMPT),
+            temperature=0.1
+        )
+        
+        return _parse_groundedness(response)
+    
+    def check_groundedness_stream(
+        self,
+        context: str,
+        answer: str,
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+        hedge: bool = True,
+        target: str = "quality"
+    ) -> Generator[str, None, Dict[str, Any]]:
+        """
+        응답의 근거 검증 (스트리밍)
+        
+        판정 JSON 객체가 완성되면 스트림을 바로 닫아 뒤따르는 설명을 기다리지 않음
+        판정을 해석하지 못하면 임의 점수 대신 outcome="parse_failed"를 반환
+        
+        Args:
+            context: 근거가 되는 원본 텍스트
+            answer: 검증할 답변
+            tags: 계측 태그 {"agent": ..., "stage": ...}
+            deadline: 호출 마감 시간 (남은 예산을 타임아웃으로 사용, 취소 시 CallCancelled)
+            hedge: 첫 조각이 p95보다 늦으면 같은 스트림을 한 번 더 엶 (기본 사용, hedger가 있을 때만)
+            target: 라우팅 목표 (기본 "quality")
+        
+        Yields:
+            str: 응답 텍스트 조각 (판정 객체 끝까지)
+        
+        Returns:
+            dict: 검증 결과 (grounded, score, explanation, evidence,
+                outcome: "ok" | "parse_failed", retryable: 다시 요청하면 해석될 수 있는지)
+        """
+        # 검증 단계의 임계 경로이므로 표본 측정 없이 항상 조기 종료
+        stream = JsonStreamCutoff(
+            self._cached_stream(
+                "groundedness", _groundedness_params(context, answer), False, tags, deadline, hedge, target
+            ),
+            GROUNDEDNESS_REQUIRED_KEYS,
+            sample=False,
+        )
+        yield from stream
+        return _groundedness_outcome(stream.value, stream.text)
+    
+    # ==================== 요청 실행 (거버너 + 재시도 + 서킷 브레이커) ====================
+    
+    def _acquire(
+        self,
+        endpoint: str,
+        span=NOOP_SPAN,
+        deadline: Optional[Deadline] = None,
+        api_key: Optional[str] = None
+    ) -> Ticket:
+        """거버너 슬롯 획득 (남은 예산까지만 대기, api_key를 주면 키 풀에서 그 키로 고정) 및 호출 스레드의 대기 시간 기록"""
+        # 키 풀에 있는 키만 고정 (단일 키 거버너/풀 밖의 키는 슬롯만 받고 헤더의 키를 그대로 사용)
+        pin = {"api_key": api_key} if isinstance(self.governor, KeyPool) and api_key in self.governor else {}
+        if deadline is None:
+            ticket = self.governor.acquire(endpoint, **pin)
+        else:
+            try:
+                ticket = self.governor.acquire(endpoint, deadline.timeout(), **pin)
+            except GovernorTimeout as e:
+                raise deadline.error(endpoint) from e
+        self._record_queue_wait(endpoint, ticket.queue_wait)
+        span.queued(ticket.queue_wait)
+        span.attempt()
+        return ticket
+    
+    def _record_queue_wait(self, endpoint: str, wait: float) -> None:
+        """호출 스레드의 마지막 거버너 대기 시간 기록 (last_queue_wait)"""
+        waits = getattr(self._local, "queue_waits", None)
+        if waits is None:
+            waits = self._local.queue_waits = {}
+        waits[endpoint] = wait
+    
+    def _call_with_retry(
+        self,
+        endpoint: str,
+        send,
+        deadline: Optional[Deadline] = None,
+        idempotent: Optional[bool] = None
+    ) -> Any:
+        """
+        재시도 정책 + 서킷 브레이커 아래에서 send() 실행
+        
+        Args:
+            endpoint: 엔드포인트 분류
+            send: 한 번의 시도를 수행하는 함수 (실패 시 예외)
+            deadline: 호출 마감 시간 (시도 전/재시도 대기 중 확인)
+            idempotent: 재시도해도 안전한 호출인지 (미지정 시 IDEMPOTENT_ENDPOINTS 기준)
+        
+        Returns:
+            send()의 반환값
+        
+        Raises:
+            UpstageAPIError: 재시도 후에도 실패하거나 서킷 브레이커가 열린 경우
+            DeadlineExceeded / CallCancelled: 예산 초과 또는 취소
+        """
+        breaker = get_breaker(endpoint)
+        if idempotent is None:
+            idempotent = endpoint in self.IDEMPOTENT_ENDPOINTS
+        attempt = 0
+        while True:
+            attempt += 1
+            if deadline is not None:
+                deadline.check(endpoint)
+            breaker.allow()
+            try:
+                result = send()
+            except Exception as exc:
+                if deadline is not None and deadline.done:
+                    # 예산 초과/취소로 끊긴 시도는 서버 장애로 집계하지 않음
+                    breaker.cancel_probe()
+                    raise deadline.error(endpoint) from exc
+                error = classify_exception(exc, endpoint)
+                if error is None:
+                    breaker.cancel_probe()
+                    raise
+                breaker.record_failure(error)
+                if not self.retry_policy.should_retry(error, attempt, idempotent):
+                    if error is exc:
+                        raise
+                    raise error from exc
+                delay = self.retry_policy.compute_delay(attempt, error.retry_after)
+                if deadline is not None:
+                    deadline.sleep(delay, endpoint)
+                else:
+                    time.sleep(delay)
+                continue
+            
+            breaker.record_success()
+            return result
+    
+    def _post(
+        self,
+        endpoint: str,
+        url: str,
+        span=NOOP_SPAN,
+        deadline: Optional[Deadline] = None,
+        tags: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> requests.Response:
+        """원시 엔드포인트 POST (공유 세션 + 거버너 슬롯 + 재시도), 200 외 응답은 UpstageAPIError"""
+        return self._request("post", endpoint, url, span, deadline, tags=tags, **kwargs)
+    
+    def _request(
+        self,
+        method: str,
+        endpoint: str,
+        url: str,
+        span=NOOP_SPAN,
+        deadline: Optional[Deadline] = None,
+        idempotent: Optional[bool] = None,
+        tags: Optional[Dict[str, Any]] = None,
+        api_key: Optional[str] = None,
+        **kwargs
+    ) -> requests.Response:
+        """
+        원시 엔드포인트 요청 (공유 세션 + 거버너 슬롯 + 재시도 + 호출 기록), 200 외 응답은 UpstageAPIError
 
-위 답변이 컨텍스트에 얼마나 근거하는지 검증해주세요."""
+        api_key를 주면 모든 시도를 그 키로 보냄 (키 풀이 다른 키를 고르지 않음)
+        """
+        base_timeout = kwargs.pop("timeout", None)
         
-        response = self.chat(
-            message=user_message,
-            system_prompt=system_prompt,
-            reasoning_effort="high",
-            temperature=0.1
+        def send():
+            # 재시도 시 파일 객체/스트리밍 본문을 처음부터 다시 전송
+            for value in (kwargs.get("files") or {}).values():
+                if hasattr(value, "seek"):
+                    value.seek(0)
+            if hasattr(kwargs.get("data"), "seek"):
+                kwargs["data"].seek(0)
+            
+            ticket = self._acquire(endpoint, span, deadline, api_key)
+            # 키를 고정한 요청은 호출자가 넣은 Authorization 그대로 전송
+            arguments = kwargs if api_key is not None else _with_ticket_key(kwargs, ticket)
+            
+            # 시도마다 남은 예산으로 타임아웃 재계산
+            def request():
+                return get_http_session().request(method, url, **arguments, **request_timeout(deadline, base_timeout))
+            
+            try:
+                if self.recorder is None:
+                    response = request()
+                else:
+                    response = self.recorder.http(endpoint, method, url, arguments, request, tags)
+            finally:
+                self.governor.release(ticket)
+            span.connected(response.status_code, response.elapsed.total_seconds(), len(response.content))
+            
+            if response.status_code != 200:
+                error = error_from_response(endpoint, response.status_code, response.text, response.headers)
+                self.governor.observe(ticket, error)
+                raise error
+            return response
+        
+        return self._call_with_retry(endpoint, send, deadline, idempotent)
+    
+    def _complete(
+        self,
+        endpoint: str,
+        use_cache: bool = False,
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+        hedge: bool = False,
+        target: str = "fast",
+        **params
+    ) -> str:
+        """비스트리밍 Chat Completions 호출 (라우팅 + 응답 캐시 + 병합 + 거버너 슬롯 + 재시도 + 헤지)"""
+        params = _route_params(self.router, target, params, tags, deadline)
+        span = self.instrumentation.span(endpoint, endpoint, tags, params.get("model"), params.get("messages"))
+        cache = self.response_cache if use_cache else None
+        cache_key = cache.make_key(params) if cache is not None else None
+        if cache_key is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                span.finish("cached")
+                return cached
+        
+        def attempt(token: Optional[Deadline]):
+            ticket = self._acquire(endpoint, span, token)
+            started = time.perf_counter()
+            try:
+                response = self._create(endpoint, params, tags, token, started, ticket)
+            finally:
+                self.governor.release(ticket)
+            self.router.observe(_route_of(params), time.perf_counter() - started)
+            content = response.choices[0].message.content
+            usage = getattr(response, "usage", None)
+            self.governor.observe(ticket, tokens=getattr(usage, "total_tokens", None))
+            span.connected(200, None, len((content or "").encode("utf-8")), getattr(usage, "completion_tokens", None))
+            return content
+        
+        def send():
+            if hedge and self.hedger is not None:
+                return self.hedger.run(_hedge_key(endpoint, params), endpoint, attempt, deadline, span.hedged)
+            return attempt(deadline)
+        
+        text = self._coalesce(
+            endpoint, (params,), lambda: self._call_with_retry(endpoint, send, deadline), span, deadline
         )
+        if cache_key is not None:
+            cache.put(cache_key, text)
+        return text
+    
+    def _cached_stream(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        use_cache: bool = False,
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+        hedge: bool = False,
+        target: str = "fast"
+    ) -> Generator[str, None, None]:
+        """
+        응답 캐시를 거치는 스트리밍 (호출자가 받는 조각 기준으로 TTFT/간격 계측)
+        
+        히트 시 저장된 응답을 조각 단위로 재생하고,
+        미스 시 스트림을 끝까지 전달했거나 소비자가 완성을 알리며 닫은 경우(StreamComplete - JSON 조기 종료)에만
+        응답을 저장 (중간에 버려진 스트림은 저장하지 않음)
+        """
+        params = _route_params(self.router, target, params, tags, deadline)
+        span = self.instrumentation.span(endpoint, "chat_stream", tags, params.get("model"), params.get("messages"))
+        cache = self.response_cache if use_cache else None
+        cache_key = cache.make_key(params) if cache is not None else None
+        cached = cache.get(cache_key) if cache_key is not None else None
+        
+        if cached is not None:
+            source = cache.replay(cached)
+        else:
+            source = self._coalesced_stream(endpoint, params, span, deadline, hedge, tags)
         
-        # JSON 파싱 시도
+        parts = []
         try:
-            # JSON 블록 추출
-            if "```json" in response:
-                json_str = response.split("```json")[1].split("```")[0].strip()
-            elif "```" in response:
-                json_str = response.split("```")[1].split("```")[0].strip()
-            else:
-                json_str = response.strip()
+            for chunk in source:
+                if deadline is not None:
+                    deadline.check(endpoint)
+                span.chunk(chunk)
+                if cache_key is not None:
+                    parts.append(chunk)
+                yield chunk
+        except StreamComplete:
+            # 필요한 응답(JSON)을 모두 받고 닫음 - 받은 부분까지 저장
+            if cached is None and cache_key is not None:
+                cache.put(cache_key, "".join(parts))
+            span.finish("cancelled")
+            raise
+        except GeneratorExit:
+            span.finish("cancelled")
+            raise
+        except Exception as e:
+            span.finish(error=e)
+            raise
+        finally:
+            source.close()
+        
+        if cached is not None:
+            span.finish("cached")
+            return
+        if cache_key is not None:
+            cache.put(cache_key, "".join(parts))
+        span.finish()
+    
+    def _traced(self, span, fn) -> Any:
+        """fn() 실행 결과/예외로 계측 종료"""
+        try:
+            result = fn()
+        except Exception as e:
+            span.finish(error=e)
+            raise
+        span.finish()
+        return result
+    
+    def _coalesce(
+        self,
+        endpoint: str,
+        parts: tuple,
+        fn,
+        span=NOOP_SPAN,
+        deadline: Optional[Deadline] = None
+    ) -> Any:
+        """동일 요청이 진행 중이면 결과를 공유, 아니면 fn() 실행 (병합 비활성 시 바로 실행)"""
+        if self.singleflight is None:
+            return self._traced(span, fn)
+        key = request_key(endpoint, self.api_key, *parts)
+        return self._traced(span, lambda: self.singleflight.do(endpoint, key, fn, deadline))
+    
+    def _coalesced_stream(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        span=NOOP_SPAN,
+        deadline: Optional[Deadline] = None,
+        hedge: bool = False,
+        tags: Optional[Dict[str, Any]] = None
+    ) -> Generator[str, None, None]:
+        """
+        동일 스트림이 진행 중이면 합류, 아니면 새 스트림 시작
+        
+        병합 시 원본 스트림은 구독자 공용 취소 토큰으로 실행되고,
+        각 호출자의 deadline은 자기 구독에만 적용 (한 탭의 취소가 다른 탭 스트림을 끊지 않음)
+        원본 스트림은 펌프 스레드에서 실행되므로 그 거버너 대기 시간을 호출자 스레드에 옮겨 기록
+        """
+        if self.singleflight is None:
+            return self._resilient_stream(endpoint, params, span, deadline, hedge, tags)
+        key = request_key(endpoint, self.api_key, params)
+        return self.singleflight.stream(
+            endpoint, key, lambda token: self._resilient_stream(endpoint, params, span, token, hedge, tags), deadline,
+            queue_wait=lambda: getattr(self._local, "queue_waits", {}).get(endpoint),
+            on_queue_wait=lambda wait: self._record_queue_wait(endpoint, wait)
+        )
+    
+    def _resilient_stream(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        span=NOOP_SPAN,
+        deadline: Optional[Deadline] = None,
+        hedge: bool = False,
+        tags: Optional[Dict[str, Any]] = None
+    ) -> Generator[str, None, None]:
+        """
+        끊긴 스트림을 재개하는 Chat Completions 스트리밍
+        
+        스트림 도중 오류가 나면 같은 요청을 다시 보내고,
+        새 응답의 앞부분이 이미 전달한 텍스트와 같은지 확인한 뒤 그 뒤부터 이어서 전달
+        (temperature/추론 때문에 다른 답변이 생성되면 이어 붙이지 않고 StreamResumeError)
+        
+        Args:
+            endpoint: 엔드포인트 분류
+            params: chat.completions.create 파라미터 (stream=True 포함)
+            span: 호출 계측기 (대기/연결 시간 기록)
+            deadline: 호출 마감 시간 (스트림을 등록해 cancel() 시 즉시 닫음)
+            hedge: 아직 아무것도 전달하지 않은 시도에서 첫 조각까지 헤지 적용
+            tags: 계측 태그 (호출 기록용)
+        
+        Yields:
+            str: 응답 텍스트 조각
+        
+        Raises:
+            StreamResumeError: 재개한 스트림이 이미 전달한 앞부분과 다른 경우
+        """
+        breaker = get_breaker(endpoint)
+        policy = self.retry_policy
+        splice = _StreamSplice(endpoint)
+        attempt = 0
+        resumes = 0
+        
+        while True:
+            attempt += 1
+            if deadline is not None:
+                deadline.check(endpoint)
+            breaker.allow()
+            healthy = False
+            delay = None
             
-            return json.loads(json_str)
-        except (json.JSONDecodeError, IndexError):
-            # 파싱 실패 시 기본 응답
-            return {
-                "grounded": True,
-                "score": 0.8,
-                "explanation": response,
-                "evidence": []
-            }
+            splice.restart()
+            try:
+                # 스트림이 끝날 때까지 슬롯 점유
+                opened = self._open_stream(endpoint, params, span, deadline, hedge and not splice.delivered, tags)
+                try:
+                    for chunk in opened:
+                        if deadline is not None and deadline.done:
+                            break
+                        if not healthy:
+                            breaker.record_success()
+                            healthy = True
+                        if not chunk.choices or chunk.choices[0].delta.content is None:
+                            continue
+                        if not splice.received and not splice.delivered:
+                            self.router.observe(_route_of(params), time.perf_counter() - opened.started_at)
+                        # 재개된 스트림에서 이미 전달한 부분은 비교만 하고 건너뜀
+                        piece = splice.feed(chunk.choices[0].delta.content)
+                        if piece:
+                            yield piece
+                finally:
+                    opened.close()
+                if deadline is not None:
+                    deadline.check(endpoint)
+                splice.finish()
+                return
+            except StreamResumeError:
+                raise
+            except Exception as exc:
+                if deadline is not None and deadline.done:
+                    if not healthy:
+                        breaker.cancel_probe()
+                    raise deadline.error(endpoint) from exc
+                error = classify_exception(exc, endpoint)
+                if error is None:
+                    if not healthy:
+                        breaker.cancel_probe()
+                    raise
+                if not healthy:
+                    breaker.record_failure(error)
+                
+                if splice.delivered:
+                    resumes += 1
+                    retry = resumes <= policy.max_stream_resumes and breaker.state != CircuitBreaker.OPEN
+                else:
+                    retry = policy.should_retry(error, attempt, endpoint in self.IDEMPOTENT_ENDPOINTS)
+                if not retry:
+                    if error is exc:
+                        raise
+                    raise error from exc
+                delay = policy.compute_delay(attempt, error.retry_after)
+            
+            if deadline is not None:
+                deadline.sleep(delay, endpoint)
+            else:
+                time.sleep(delay)
+    
+    def _open_stream(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        span=NOOP_SPAN,
+        deadline: Optional[Deadline] = None,
+        hedge: bool = False,
+        tags: Optional[Dict[str, Any]] = None
+    ) -> _OpenStream:
+        """거버너 슬롯을 받아 스트림 열기 (hedge 시 첫 조각까지 헤지 적용, 진 쪽 스트림은 닫힘)"""
+        if not hedge or self.hedger is None:
+            opened = self._open_stream_once(endpoint, params, span, deadline, tags)
+            opened.attach(deadline)
+            return opened
+        
+        # 읽는 중인 스트림을 다른 스레드에서 닫으면 그 시도가 소켓에서 멈출 수 있어
+        # 헤지 중에는 Deadline에 등록하지 않고, 진 시도는 자기 스레드에서 첫 조각을 받은 뒤 닫힘
+        def attempt(token: Deadline) -> _OpenStream:
+            opened = self._open_stream_once(endpoint, params, span, token, tags)
+            try:
+                opened.prefetch()
+            except BaseException:
+                opened.close()
+                raise
+            return opened
+        
+        opened = self.hedger.run(_hedge_key(endpoint, params), endpoint, attempt, deadline, span.hedged)
+        opened.attach(deadline)
+        return opened
+    
+    def _open_stream_once(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        span=NOOP_SPAN,
+        deadline: Optional[Deadline] = None,
+        tags: Optional[Dict[str, Any]] = None
+    ) -> _OpenStream:
+        ticket = self._acquire(endpoint, span, deadline)
+        started = time.perf_counter()
+        try:
+            stream = self._create(endpoint, params, tags, deadline, started, ticket)
+        except BaseException:
+            self.governor.release(ticket)
+            raise
+        span.connected(200)
+        return _OpenStream(self.governor, ticket, stream, started)
+    
+    def _create(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        tags: Optional[Dict[str, Any]],
+        deadline: Optional[Deadline],
+        started: float,
+        ticket: Ticket
+    ) -> Any:
+        """chat.completions.create 한 번 (키 풀이 고른 키 사용, 기록기가 있으면 요청/응답/스트림 조각을 기록)"""
+        def create():
+            return self.client.chat.completions.create(
+                **params, **request_timeout(deadline), **_ticket_headers(ticket)
+            )
+        
+        try:
+            if self.recorder is None:
+                return create()
+            return self.recorder.completion(endpoint, params, create, tags, started)
+        except openai.APIStatusError as e:
+            # 키 풀이 격리 여부를 표시할 수 있도록 분류한 오류로 전달
+            error = classify_exception(e, endpoint)
+            self.governor.observe(ticket, error)
+            raise error from e
+    
+    def last_queue_wait(self, endpoint: Optional[str] = None) -> Any:
+        """
+        현재 스레드의 마지막 거버너 대기 시간 (초)
+        
+        Args:
+            endpoint: 엔드포인트 분류 (미지정 시 전체 dict 반환)
+        
+        Returns:
+            float | dict: 대기 시간
+        """
+        waits = getattr(self._local, "queue_waits", {})
+        if endpoint is None:
+            return dict(waits)
+        return waits.get(endpoint, 0.0)
+    
+    def governor_stats(self) -> Dict[str, Dict[str, Any]]:
+        """엔드포인트 분류별 거버너 통계 (대기열 길이, 평균/최대 대기 시간 등)"""
+        return self.governor.stats()
+    
+    def key_stats(self) -> List[Dict[str, Any]]:
+        """키 풀의 키별 사용량 (단일 키 거버너면 빈 list)"""
+        return self.governor.key_stats() if isinstance(self.governor, KeyPool) else []
+    
+    def breaker_stats(self) -> Dict[str, Dict[str, Any]]:
+        """엔드포인트 분류별 서킷 브레이커 상태"""
+        return {endpoint: get_breaker(endpoint).stats() for endpoint in self.governor.ENDPOINTS}
     
     # ==================== 유틸리티 메서드 ====================
     
+    @property
+    def closed(self) -> bool:
+        """SDK가 쓰는 HTTP 클라이언트가 닫혔는지 (close_http_pool 이후 - 새 클라이언트 필요)"""
+        return self.http_client.is_closed
+    
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        공유 HTTP 커넥션 풀 재사용 통계
+        
+        Returns:
+            dict: 전체 요청 수, 새 연결 수, 재사용 연결 수, 재사용 비율 등
+        """
+        return get_pool_stats()
+    
+    def connection_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        현재 열린 연결 수
+        
+        Returns:
+            dict: {"raw": 원시 엔드포인트, "llm": Solar LLM} 각각 {open, idle}
+        """
+        return get_connection_stats()
+    
+    def response_cache_stats(self) -> Dict[str, Any]:
+        """
+        LLM 응답 캐시 통계
+        
+        Returns:
+            dict: hits, misses, evictions, total_bytes, hit_ratio 등 (캐시 비활성 시 빈 dict)
+        """
+        return self.response_cache.stats() if self.response_cache is not None else {}
+    
+    def routing_stats(self) -> Dict[str, Any]:
+        """
+        모델/추론 수준 라우팅 통계
+
+        Returns:
+            dict: picks({목표: {후보: 선택 횟수}}), skips(입력/SLO/예산 이유별 건너뛴 횟수), latency({후보: 관측 지연})
+        """
+        return self.router.stats()
+    
+    def hedge_stats(self) -> Dict[str, Any]:
+        """
+        헤지 요청 통계
+
+        Returns:
+            dict: primaries, hedged, hedge_wins, hedge_rate, 억제 횟수, 호출 종류별 임계값 (헤지 비활성 시 빈 dict)
+        """
+        return self.hedger.stats() if self.hedger is not None else {}
+    
+    def singleflight_stats(self) -> Dict[str, Any]:
+        """
+        동일 요청 병합 통계 (중복 트래픽 제거량)
+        
+        Returns:
+            dict: executed, coalesced, coalesced_ratio, in_flight, endpoints (병합 비활성 시 빈 dict)
+        """
+        return self.singleflight.stats() if self.singleflight is not None else {}
+    
     def test_connection(self) -> bool:
         """
         API 연결 테스트
@@ -463,8 +1785,812 @@ class UpstageClient:
             bool: 연결 성공 여부
         """
         try:
-            response = self.chat("테스트입니다. '연결 성공'이라고만 답해주세요.", temperature=0)
+            response = self.chat("테스트입니다. '연결 성공'이라고만 답해주세요.", temperature=0, hedge=True)
             return "연결" in response or "성공" in response or len(response) > 0
         except Exception as e:
             print(f"연결 테스트 실패: {e}")
             return False
+
+
+class AsyncUpstageClient:
+    """
+    Upstage API 비동기(asyncio) 클라이언트
+
+    UpstageClient와 같은 API를 코루틴/비동기 제너레이터로 제공하여
+    하나의 이벤트 루프에서 수백 개의 스트림을 동시에 처리
+    (스트림 하나가 Streamlit 스크립트 스레드를 점유하지 않음)
+
+    Attributes:
+        api_key: Upstage API 키
+        client: AsyncOpenAI 호환 클라이언트 (Solar LLM용)
+        http: 원시 엔드포인트용 httpx.AsyncClient (이벤트 루프 단위 커넥션 풀)
+
+    Example:
+        >>> async with AsyncUpstageClient() as client:
+        ...     async for chunk in client.chat_stream("안녕하세요!"):
+        ...         print(chunk, end="")
+    """
+
+    DOCUMENT_PARSE_URL = UpstageClient.DOCUMENT_PARSE_URL
+    SOLAR_BASE_URL = UpstageClient.SOLAR_BASE_URL
+    PARSE_OUTPUT_FORMATS = PARSE_OUTPUT_FORMATS
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        governor: Optional[UpstageGovernor] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        response_cache: Optional[LLMResponseCache] = None,
+        singleflight: Optional[AsyncSingleFlight] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        base_url: Optional[str] = None,
+        hedger: Optional[Hedger] = None,
+        router: Optional[ModelRouter] = None,
+        recorder: Optional[InteractionRecorder] = None
+    ):
+        """
+        클라이언트 초기화
+
+        Args:
+            api_key: Upstage API 키 (미제공 시 환경변수에서 로드)
+            max_connections: 원시 엔드포인트 최대 동시 연결 수
+            max_keepalive_connections: 유지할 keep-alive 연결 수
+            governor: 속도/동시성 거버너 또는 KeyPool (미제공 시 동기 클라이언트와 같은 프로세스 공유 키 풀/거버너)
+            retry_policy: 재시도 정책 (미제공 시 기본 정책)
+            response_cache: LLM 응답 캐시 (미제공 시 IMF_LLM_CACHE 설정, 기본 비활성)
+            singleflight: 동일 요청 병합 그룹 (미제공 시 클라이언트 전용 그룹 - 같은 이벤트 루프 안에서 병합)
+            instrumentation: 호출 계측 (미제공 시 프로세스 공유 계측, 싱크가 없으면 비활성)
+            base_url: API 기본 URL (미제공 시 UPSTAGE_BASE_URL, 기본 https://api.upstage.ai/v1)
+            hedger: 헤지 요청 실행기 (미제공 시 UPSTAGE_HEDGE=1 일 때 프로세스 공유 Hedger)
+            router: 모델/추론 수준 라우터 (미제공 시 UPSTAGE_ROUTER_POLICY 정책의 프로세스 공유 라우터)
+            recorder: 호출 기록기 (미제공 시 UPSTAGE_RECORD 경로의 프로세스 공유 기록기, 기본 미기록)
+        """
+        self.api_key = api_key or default_api_key()
+        if not self.api_key:
+            raise ValueError("UPSTAGE_API_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
+        _apply_base_url(self, base_url)
+
+        self.client = AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.SOLAR_BASE_URL,
+            max_retries=0
+        )
+        self.http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections
+            )
+        )
+        self.governor = governor or get_key_pool() or get_governor()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.response_cache = response_cache or get_llm_cache()
+        if singleflight is None and singleflight_enabled():
+            singleflight = AsyncSingleFlight()
+        self.singleflight = singleflight
+        self.instrumentation = instrumentation or get_instrumentation()
+        self.hedger = hedger or get_hedger()
+        self.router = router or get_router()
+        self.recorder = recorder or get_recorder()
+
+    async def __aenter__(self) -> "AsyncUpstageClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """모든 연결 종료"""
+        await self.http.aclose()
+        await self.client.close()
+
+    # ==================== Document Parse API ====================
+
+    async def parse_document_bytes(
+        self,
+        file_bytes: bytes,
+        filename: str = "document.pdf",
+        ocr_mode: str = "force",
+        model: str = "document-parse",
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
+        """
+        바이트 데이터에서 문서 파싱 (비동기)
+
+        Args:
+            file_bytes: 파일 바이트 데이터
+            filename: 파일명
+            ocr_mode: OCR 모드
+            model: 사용할 모델
+            tags: 계측 태그 {"agent": ..., "stage": ...}
+            deadline: 호출 마감 시간 (남은 예산을 타임아웃으로 사용, 취소 시 CallCancelled)
+
+        Returns:
+            dict: 파싱된 문서 정보
+        """
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        files = {"document": (filename, file_bytes, "application/pdf")}
+        data = _parse_form_data(model, ocr_mode)
+        span = self.instrumentation.span("parse", "parse", tags, model=model, payload=file_bytes)
+
+        async def send():
+            response = await self._post(
+                "parse",
+                self.DOCUMENT_PARSE_URL,
+                span=span,
+                deadline=deadline,
+                tags=tags,
+                headers=headers,
+                files=files,
+                data=data,
+                timeout=120
+            )
+            return _normalize_parse_response(decode_json(response.content, lazy_parse_keys()))
+
+        return await self._coalesce("parse", (file_bytes, data), send, span, deadline)
+
+    async def parse_document_bytes_chunked(
+        self,
+        file_bytes: bytes,
+        filename: str = "document.pdf",
+        ocr_mode: str = "force",
+        model: str = "document-parse",
+        pages_per_chunk: int = 8,
+        max_workers: int = 4,
+        max_rounds: int = 2,
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
+        """대용량 PDF 페이지 구간 병렬 파싱 (비동기, UpstageClient.parse_document_bytes_chunked와 동일)"""
+        try:
+            chunks = split_pdf(file_bytes, pages_per_chunk)
+        except Exception:
+            chunks = []
+        if len(chunks) <= 1:
+            return await self.parse_document_bytes(
+                file_bytes, filename, ocr_mode=ocr_mode, model=model, tags=tags, deadline=deadline
+            )
+
+        stem = filename.rsplit(".", 1)[0]
+        semaphore = asyncio.Semaphore(max_workers)
+        results = {}
+        errors = {}
+        pending = list(chunks)
+
+        async def parse_chunk(chunk):
+            async with semaphore:
+                try:
+                    results[chunk.index] = (chunk, await self.parse_document_bytes(
+                        chunk.data, f"{stem}_p{chunk.start_page}-{chunk.end_page}.pdf", ocr_mode, model, tags, deadline
+                    ))
+                    errors.pop(chunk.index, None)
+                except Exception as e:
+                    errors[chunk.index] = e
+
+        for _ in range(max_rounds):
+            await asyncio.gather(*(parse_chunk(chunk) for chunk in pending))
+            pending = [chunk for chunk in pending if chunk.index in errors]
+            if not pending or (deadline is not None and deadline.done):
+                break
+
+        if pending and deadline is not None:
+            deadline.check("parse")
+        if pending:
+            ranges = ", ".join(f"{c.start_page}-{c.end_page}p" for c in pending)
+            first_error = errors[pending[0].index]
+            raise UpstageAPIError(
+                f"Document Parse 실패: {len(pending)}개 구간({ranges}) 처리 실패 - {first_error}",
+                endpoint="parse",
+                status_code=getattr(first_error, "status_code", None),
+            ) from first_error
+
+        return merge_parse_results(list(results.values()))
+
+    # ==================== Information Extract API ====================
+
+    async def extract_information_bytes(
+        self,
+        file_bytes: bytes,
+        schema: Dict[str, Any],
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
+        """
+        바이트 데이터에서 정보 추출 (비동기)
+
+        Args:
+            file_bytes: 파일 바이트 데이터
+            schema: 추출할 정보의 JSON 스키마
+            tags: 계측 태그 {"agent": ..., "stage": ...}
+            deadline: 호출 마감 시간 (남은 예산을 타임아웃으로 사용, 취소 시 CallCancelled)
+
+        Returns:
+            dict: 추출된 구조화된 정보
+        """
+        body = _build_extract_body(file_bytes, schema)
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "Content-Length": str(len(body))
+        }
+        span = self.instrumentation.span("extract", "extract", tags, model="information-extract", payload=body)
+
+        try:
+            response = await self._post(
+                "extract",
+                f"{self.SOLAR_BASE_URL}/chat/completions",
+                span=span,
+                deadline=deadline,
+                tags=tags,
+                headers=headers,
+                content=body.async_stream(),
+                timeout=None
+            )
+        except Exception as e:
+            span.finish(error=e)
+            raise
+        span.finish()
+
+        return _parse_extract_result(decode_json(response.content))
+
+    # ==================== Solar LLM API ====================
+
+    async def chat(
+        self,
+        message: str,
+        system_prompt: Optional[str] = None,
+        reasoning_effort: Optional[str] = None,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        use_cache: bool = False,
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+        hedge: bool = False,
+        target: str = "fast"
+    ) -> str:
+        """
+        Solar LLM과 채팅 (비동기)
+
+        Args:
+            message: 사용자 메시지
+            system_prompt: 시스템 프롬프트 (선택)
+            reasoning_effort: 추론 노력 수준 ("low", "medium", "high", 미지정 시 라우터가 target에 맞게 선택)
+            model: 사용할 모델 (미지정 시 라우터가 선택)
+            temperature: 응답 다양성 (0.0~1.0)
+            use_cache: 응답 캐시 사용 여부 (response_cache가 있을 때만 적용)
+            tags: 계측 태그 {"agent": ..., "stage": ...}
+            deadline: 호출 마감 시간 (남은 예산을 타임아웃으로 사용, 취소 시 CallCancelled)
+            hedge: 첫 응답이 p95보다 늦으면 같은 요청을 한 번 더 보냄 (hedger가 있을 때만)
+            target: 라우팅 목표 ("fast", "balanced", "quality" - utils.model_router)
+
+        Returns:
+            str: LLM 응답 텍스트
+        """
+        return await self._complete(
+            "chat",
+            use_cache=use_cache,
+            tags=tags,
+            deadline=deadline,
+            hedge=hedge,
+            target=target,
+            model=model,
+            messages=_build_messages(message, system_prompt),
+            reasoning_effort=reasoning_effort,
+            temperature=temperature
+        )
+
+    async def chat_many(
+        self,
+        requests: Iterable[Union[ChatRequest, str, Dict[str, Any]]],
+        max_concurrency: Optional[int] = None,
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None
+    ) -> List[ChatResult]:
+        """독립적인 채팅 요청 N개를 제한된 동시성으로 실행 (비동기, UpstageClient.chat_many와 동일)"""
+        results = [result async for result in self.chat_many_iter(requests, max_concurrency, tags, deadline)]
+        return sorted(results, key=lambda result: result.index)
+
+    def chat_many_iter(
+        self,
+        requests: Iterable[Union[ChatRequest, str, Dict[str, Any]]],
+        max_concurrency: Optional[int] = None,
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None
+    ) -> AsyncGenerator[ChatResult, None]:
+        """chat_many와 같지만 끝나는 순서대로 결과를 돌려줌 (비동기)"""
+        async def call(request: ChatRequest) -> str:
+            return await self.chat(
+                request.message,
+                request.system_prompt,
+                reasoning_effort=request.reasoning_effort,
+                model=request.model,
+                temperature=request.temperature,
+                use_cache=request.use_cache,
+                tags={**(tags or {}), **(request.tags or {})},
+                deadline=deadline,
+                target=request.target
+            )
+
+        return iter_batch_async(call, requests, max_concurrency)
+
+    async def chat_stream(
+        self,
+        message: str,
+        system_prompt: Optional[str] = None,
+        reasoning_effort: Optional[str] = None,
+        model: Optional[str] = None,
+        temperature: float = 0.2,
+        use_cache: bool = False,
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+        hedge: bool = False,
+        target: str = "fast"
+    ) -> AsyncGenerator[str, None]:
+        """
+        Solar LLM과 스트리밍 채팅 (비동기 제너레이터)
+
+        Args:
+            message: 사용자 메시지
+            system_prompt: 시스템 프롬프트 (선택)
+            reasoning_effort: 추론 노력 수준 (미지정 시 라우터가 target에 맞게 선택)
+            model: 사용할 모델 (미지정 시 라우터가 선택)
+            use_cache: 응답 캐시 사용 여부 (히트 시 저장된 응답을 조각 단위로 재생)
+            tags: 계측 태그 {"agent": ..., "stage": ...}
+            deadline: 호출 마감 시간 (남은 예산을 타임아웃으로 사용, 취소 시 CallCancelled)
+            hedge: 첫 조각이 p95보다 늦으면 같은 스트림을 한 번 더 열어 먼저 응답한 쪽 사용 (hedger가 있을 때만)
+            target: 라우팅 목표 ("fast", "balanced", "quality" - utils.model_router)
+
+        Yields:
+            str: 응답 텍스트 조각
+        """
+        stream = self._cached_stream("chat", {
+            "model": model,
+            "messages": _build_messages(message, system_prompt),
+            "reasoning_effort": reasoning_effort,
+            "temperature": temperature,
+            "stream": True,
+        }, use_cache, tags, deadline, hedge, target)
+        try:
+            async for piece in stream:
+                yield piece
+        except StreamComplete:
+            # 비동기 제너레이터는 yield from이 없으므로 완성 신호를 응답 캐시 계층까지 직접 전달
+            try:
+                await stream.athrow(StreamComplete())
+            except (StreamComplete, StopAsyncIteration):
+                pass
+            raise
+        finally:
+            await stream.aclose()
+
+    # ==================== Groundedness Check API ====================
+
+    async def check_groundedness(
+        self,
+        context: str,
+        answer: str,
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+        hedge: bool = True,
+        target: str = "quality"
+    ) -> Dict[str, Any]:
+        """
+        응답의 근거 검증 (비동기)
+
+        Args:
+            context: 근거가 되는 원본 텍스트
+            answer: 검증할 답변
+            tags: 계측 태그 {"agent": ..., "stage": ...}
+            deadline: 호출 마감 시간 (남은 예산을 타임아웃으로 사용, 취소 시 CallCancelled)
+            hedge: 응답이 p95보다 늦으면 같은 요청을 한 번 더 보냄 (기본 사용, hedger가 있을 때만)
+            target: 라우팅 목표 (기본 "quality" - 느릴 때 낮은 추론 수준으로 내려감)
+
+        Returns:
+            dict: 검증 결과 (grounded: bool, score: float, explanation: str)
+        """
+        response = await self._complete(
+            "groundedness",
+            tags=tags,
+            deadline=deadline,
+            hedge=hedge,
+            target=target,
+            messages=_build_messages(_build_groundedness_message(context, answer), GROUNDEDNESS_SYSTEM_PROMPT),
+            temperature=0.1
+        )
+
+        return _parse_groundedness(response)
+
+    def check_groundedness_stream(
+        self,
+        context: str,
+        answer: str,
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+        hedge: bool = True,
+        target: str = "quality"
+    ) -> AsyncGroundednessStream:
+        """
+        응답의 근거 검증 (비동기 스트리밍, UpstageClient.check_groundedness_stream과 동일한 조기 종료/결과 규칙)
+
+        Args:
+            context: 근거가 되는 원본 텍스트
+            answer: 검증할 답변
+            tags: 계측 태그 {"agent": ..., "stage": ...}
+            deadline: 호출 마감 시간 (남은 예산을 타임아웃으로 사용, 취소 시 CallCancelled)
+            hedge: 첫 조각이 p95보다 늦으면 같은 스트림을 한 번 더 엶 (기본 사용, hedger가 있을 때만)
+            target: 라우팅 목표 (기본 "quality")
+
+        Returns:
+            AsyncGroundednessStream: async for로 응답 조각(판정 객체 끝까지)을 받은 뒤
+                result로 검증 결과 확인 (grounded, score, explanation, evidence, outcome, retryable)
+        """
+        return AsyncGroundednessStream(
+            self._cached_stream(
+                "groundedness", _groundedness_params(context, answer), False, tags, deadline, hedge, target
+            ),
+            GROUNDEDNESS_REQUIRED_KEYS,
+            sample=False,
+        )
+
+    # ==================== 요청 실행 (거버너 + 재시도 + 서킷 브레이커) ====================
+
+    async def _call_with_retry(self, endpoint: str, send, deadline: Optional[Deadline] = None) -> Any:
+        """재시도 정책 + 서킷 브레이커 아래에서 await send() 실행 (UpstageClient._call_with_retry와 동일)"""
+        breaker = get_breaker(endpoint)
+        attempt = 0
+        while True:
+            attempt += 1
+            if deadline is not None:
+                deadline.check(endpoint)
+            breaker.allow()
+            try:
+                result = await send()
+            except Exception as exc:
+                if deadline is not None and (deadline.done or isinstance(exc, GovernorTimeout)):
+                    breaker.cancel_probe()
+                    raise deadline.error(endpoint) from exc
+                error = classify_exception(exc, endpoint)
+                if error is None:
+                    breaker.cancel_probe()
+                    raise
+                breaker.record_failure(error)
+                if not self.retry_policy.should_retry(error, attempt, endpoint in UpstageClient.IDEMPOTENT_ENDPOINTS):
+                    if error is exc:
+                        raise
+                    raise error from exc
+                delay = self.retry_policy.compute_delay(attempt, error.retry_after)
+                if deadline is not None:
+                    await deadline.sleep_async(delay, endpoint)
+                else:
+                    await asyncio.sleep(delay)
+                continue
+
+            breaker.record_success()
+            return result
+
+    async def _post(
+        self,
+        endpoint: str,
+        url: str,
+        span=NOOP_SPAN,
+        deadline: Optional[Deadline] = None,
+        tags: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """원시 엔드포인트 POST (거버너 슬롯 + 재시도 + 호출 기록), 200 외 응답은 UpstageAPIError"""
+        base_timeout = kwargs.pop("timeout", None)
+
+        async def send():
+            timeout = deadline.timeout(base_timeout) if deadline is not None else base_timeout
+
+            async with self.governor.slot_async(endpoint, _slot_timeout(deadline)) as ticket:
+                span.queued(ticket.queue_wait)
+                span.attempt()
+                arguments = _with_ticket_key(kwargs, ticket)
+
+                def request():
+                    return self.http.post(url, timeout=timeout, **arguments)
+
+                if self.recorder is None:
+                    response = await request()
+                else:
+                    response = await self.recorder.http_async(endpoint, "post", url, arguments, request, tags)
+            span.connected(response.status_code, response.elapsed.total_seconds(), len(response.content))
+            if response.status_code != 200:
+                error = error_from_response(endpoint, response.status_code, response.text, response.headers)
+                self.governor.observe(ticket, error)
+                raise error
+            return response
+
+        return await self._call_with_retry(endpoint, send, deadline)
+
+    async def _complete(
+        self,
+        endpoint: str,
+        use_cache: bool = False,
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+        hedge: bool = False,
+        target: str = "fast",
+        **params
+    ) -> str:
+        """비스트리밍 Chat Completions 호출 (라우팅 + 응답 캐시 + 병합 + 거버너 슬롯 + 재시도 + 헤지)"""
+        params = _route_params(self.router, target, params, tags, deadline)
+        span = self.instrumentation.span(endpoint, endpoint, tags, params.get("model"), params.get("messages"))
+        cache = self.response_cache if use_cache else None
+        cache_key = cache.make_key(params) if cache is not None else None
+        if cache_key is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                span.finish("cached")
+                return cached
+
+        async def attempt():
+            async with self.governor.slot_async(endpoint, _slot_timeout(deadline)) as ticket:
+                span.queued(ticket.queue_wait)
+                span.attempt()
+                started = time.perf_counter()
+                response = await self._create(endpoint, params, tags, deadline, started, ticket)
+            self.router.observe(_route_of(params), time.perf_counter() - started)
+            content = response.choices[0].message.content
+            usage = getattr(response, "usage", None)
+            self.governor.observe(ticket, tokens=getattr(usage, "total_tokens", None))
+            span.connected(200, None, len((content or "").encode("utf-8")), getattr(usage, "completion_tokens", None))
+            return content
+
+        async def send():
+            if hedge and self.hedger is not None:
+                return await self.hedger.run_async(_hedge_key(endpoint, params), endpoint, attempt, span.hedged)
+            return await attempt()
+
+        text = await self._coalesce(
+            endpoint, (params,), lambda: self._call_with_retry(endpoint, send, deadline), span, deadline
+        )
+        if cache_key is not None:
+            cache.put(cache_key, text)
+        return text
+
+    async def _cached_stream(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        use_cache: bool = False,
+        tags: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+        hedge: bool = False,
+        target: str = "fast"
+    ) -> AsyncGenerator[str, None]:
+        """응답 캐시를 거치는 스트리밍 (UpstageClient._cached_stream과 동일한 라우팅/저장/계측 규칙, StreamComplete 포함)"""
+        params = _route_params(self.router, target, params, tags, deadline)
+        span = self.instrumentation.span(endpoint, "chat_stream", tags, params.get("model"), params.get("messages"))
+        cache = self.response_cache if use_cache else None
+        cache_key = cache.make_key(params) if cache is not None else None
+        cached = cache.get(cache_key) if cache_key is not None else None
+
+        if cached is not None:
+            source = cache.areplay(cached)
+        else:
+            source = self._coalesced_stream(endpoint, params, span, deadline, hedge, tags)
+
+        parts = []
+        try:
+            async for piece in source:
+                if deadline is not None:
+                    deadline.check(endpoint)
+                span.chunk(piece)
+                if cache_key is not None:
+                    parts.append(piece)
+                yield piece
+        except StreamComplete:
+            if cached is None and cache_key is not None:
+                cache.put(cache_key, "".join(parts))
+            span.finish("cancelled")
+            raise
+        except (GeneratorExit, asyncio.CancelledError):
+            span.finish("cancelled")
+            raise
+        except Exception as e:
+            span.finish(error=e)
+            raise
+        finally:
+            await source.aclose()
+
+        if cached is not None:
+            span.finish("cached")
+            return
+        if cache_key is not None:
+            cache.put(cache_key, "".join(parts))
+        span.finish()
+
+    async def _coalesce(
+        self,
+        endpoint: str,
+        parts: tuple,
+        fn,
+        span=NOOP_SPAN,
+        deadline: Optional[Deadline] = None
+    ) -> Any:
+        """동일 요청이 진행 중이면 결과를 공유, 아니면 fn() 실행 (결과/예외로 계측 종료)"""
+        try:
+            if self.singleflight is None:
+                result = await fn()
+            else:
+                key = request_key(endpoint, self.api_key, *parts)
+                result = await self.singleflight.do(endpoint, key, fn, deadline)
+        except Exception as e:
+            span.finish(error=e)
+            raise
+        span.finish()
+        return result
+
+    def _coalesced_stream(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        span=NOOP_SPAN,
+        deadline: Optional[Deadline] = None,
+        hedge: bool = False,
+        tags: Optional[Dict[str, Any]] = None
+    ) -> AsyncGenerator[str, None]:
+        """동일 스트림이 진행 중이면 합류, 아니면 새 스트림 시작 (deadline은 구독자별로 적용)"""
+        if self.singleflight is None:
+            return self._resilient_stream(endpoint, params, span, deadline, hedge, tags)
+        key = request_key(endpoint, self.api_key, params)
+        return self.singleflight.stream(
+            endpoint, key, lambda: self._resilient_stream(endpoint, params, span, hedge=hedge, tags=tags), deadline
+        )
+
+    def singleflight_stats(self) -> Dict[str, Any]:
+        """동일 요청 병합 통계 (병합 비활성 시 빈 dict)"""
+        return self.singleflight.stats() if self.singleflight is not None else {}
+
+    def routing_stats(self) -> Dict[str, Any]:
+        """모델/추론 수준 라우팅 통계"""
+        return self.router.stats()
+
+    def hedge_stats(self) -> Dict[str, Any]:
+        """헤지 요청 통계 (헤지 비활성 시 빈 dict)"""
+        return self.hedger.stats() if self.hedger is not None else {}
+
+    def key_stats(self) -> List[Dict[str, Any]]:
+        """키 풀의 키별 사용량 (단일 키 거버너면 빈 list)"""
+        return self.governor.key_stats() if isinstance(self.governor, KeyPool) else []
+
+    async def _resilient_stream(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        span=NOOP_SPAN,
+        deadline: Optional[Deadline] = None,
+        hedge: bool = False,
+        tags: Optional[Dict[str, Any]] = None
+    ) -> AsyncGenerator[str, None]:
+        """끊긴 스트림을 재개하는 스트리밍 (UpstageClient._resilient_stream과 동일한 앞부분 확인/헤지 규칙)"""
+        breaker = get_breaker(endpoint)
+        policy = self.retry_policy
+        splice = _StreamSplice(endpoint)
+        attempt = 0
+        resumes = 0
+
+        while True:
+            attempt += 1
+            if deadline is not None:
+                deadline.check(endpoint)
+            breaker.allow()
+            healthy = False
+            delay = None
+
+            splice.restart()
+            try:
+                opened = await self._open_stream(endpoint, params, span, deadline, hedge and not splice.delivered, tags)
+                try:
+                    async for chunk in opened:
+                        if deadline is not None and deadline.done:
+                            break
+                        if not healthy:
+                            breaker.record_success()
+                            healthy = True
+                        if not chunk.choices or chunk.choices[0].delta.content is None:
+                            continue
+                        if not splice.received and not splice.delivered:
+                            self.router.observe(_route_of(params), time.perf_counter() - opened.started_at)
+                        piece = splice.feed(chunk.choices[0].delta.content)
+                        if piece:
+                            yield piece
+                finally:
+                    # 소비자가 중간에 멈춰도 연결을 즉시 반환
+                    await opened.aclose()
+                if deadline is not None:
+                    deadline.check(endpoint)
+                splice.finish()
+                return
+            except StreamResumeError:
+                raise
+            except Exception as exc:
+                if deadline is not None and (deadline.done or isinstance(exc, GovernorTimeout)):
+                    if not healthy:
+                        breaker.cancel_probe()
+                    raise deadline.error(endpoint) from exc
+                error = classify_exception(exc, endpoint)
+                if error is None:
+                    if not healthy:
+                        breaker.cancel_probe()
+                    raise
+                if not healthy:
+                    breaker.record_failure(error)
+
+                if splice.delivered:
+                    resumes += 1
+                    retry = resumes <= policy.max_stream_resumes and breaker.state != CircuitBreaker.OPEN
+                else:
+                    retry = policy.should_retry(error, attempt, endpoint in UpstageClient.IDEMPOTENT_ENDPOINTS)
+                if not retry:
+                    if error is exc:
+                        raise
+                    raise error from exc
+                delay = policy.compute_delay(attempt, error.retry_after)
+
+            if deadline is not None:
+                await deadline.sleep_async(delay, endpoint)
+            else:
+                await asyncio.sleep(delay)
+
+    async def _open_stream(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        span=NOOP_SPAN,
+        deadline: Optional[Deadline] = None,
+        hedge: bool = False,
+        tags: Optional[Dict[str, Any]] = None
+    ) -> _AsyncOpenStream:
+        """거버너 슬롯을 받아 스트림 열기 (hedge 시 첫 조각까지 헤지 적용)"""
+        async def attempt() -> _AsyncOpenStream:
+            ticket = await self.governor.acquire_async(endpoint, _slot_timeout(deadline))
+            span.queued(ticket.queue_wait)
+            span.attempt()
+            started = time.perf_counter()
+            try:
+                stream = await self._create(endpoint, params, tags, deadline, started, ticket)
+            except BaseException:
+                self.governor.release(ticket)
+                raise
+            span.connected(200)
+            opened = _AsyncOpenStream(self.governor, ticket, stream, started)
+            if hedge:
+                try:
+                    await opened.prefetch()
+                except BaseException:
+                    await opened.aclose()
+                    raise
+            return opened
+
+        if not hedge or self.hedger is None:
+            return await attempt()
+        return await self.hedger.run_async(_hedge_key(endpoint, params), endpoint, attempt, span.hedged)
+
+    async def _create(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        tags: Optional[Dict[str, Any]],
+        deadline: Optional[Deadline],
+        started: float,
+        ticket: Ticket
+    ) -> Any:
+        """chat.completions.create 한 번 (UpstageClient._create와 동일한 키 선택/기록 규칙)"""
+        def create():
+            return self.client.chat.completions.create(
+                **params, **request_timeout(deadline), **_ticket_headers(ticket)
+            )
+
+        try:
+            if self.recorder is None:
+                return await create()
+            return await self.recorder.completion_async(endpoint, params, create, tags, started)
+        except openai.APIStatusError as e:
+            error = classify_exception(e, endpoint)
+            self.governor.observe(ticket, error)
+            raise error from e
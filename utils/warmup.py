@@ -0,0 +1,563 @@
+"""
+🔥 프로세스 시작 준비 (Warm-up) + 준비 상태 확인 (Readiness)
+
+배포/컨테이너 재시작 직후 첫 사용자가 OpenAI 클라이언트 생성, api.upstage.ai / open.neis.go.kr
+TLS 핸드셰이크, JSON 데이터 로드 비용을 모두 떠안았음
+프로세스가 뜨자마자 이 작업을 미리 끝내고, 끝나기 전까지는 준비 안 됨(503)으로 보고해
+로드 밸런서가 차가운 레플리카로 트래픽을 보내지 않도록 함
+
+준비 단계 (순서대로 실행, 단계별 소요 시간 기록)
+  · data: data/*.json 로드 + 대학명 색인 (utils.university_rag 공유 캐시)
+  · upstage_client: 공유 UpstageClient 생성 (OpenAI SDK, 거버너/키 풀, 응답 캐시, 라우터 - API 키가 없으면 건너뜀)
+  · caches: Document Parse 디스크 캐시 용량 집계, LLM 응답 캐시 생성
+  · upstage_connections: 원시 엔드포인트 세션과 LLM httpx 클라이언트에 Upstage 연결을 미리 열어 둠
+  · neis_connections: 공유 세션에 NEIS 연결을 미리 열어 둠
+- 필수 단계(data, upstage_client)가 실패하면 준비 안 됨 상태로 남고 retry_interval마다 실패한 단계만 다시 실행
+- 연결 단계는 선택 단계 (상대 서버 장애가 레플리카 준비를 막지 않음 - 실패는 상태에 기록)
+- 연결 예열 요청은 인증 헤더 없이 보내므로 키 할당량을 쓰지 않음 (응답 코드와 무관하게 연결만 확보)
+- ReadinessServer: GET /ready (준비 완료 200, 아니면 503 + 단계별 상태), GET /live (항상 200)
+  upstream을 주면 Streamlit 헬스 엔드포인트까지 200이어야 준비 완료
+
+환경변수:
+    IMF_WARMUP: "0"/"false"면 준비 단계 없이 바로 준비 완료
+    IMF_WARMUP_CONNECTIONS: 호스트/클라이언트별로 미리 열 연결 수 (기본 2)
+    IMF_WARMUP_TIMEOUT: 연결 예열 요청 타임아웃 (초, 기본 5)
+    IMF_WARMUP_RETRY: 필수 단계 실패 시 재시도 간격 (초, 기본 5)
+    IMF_READY_PORT: 준비 상태 서버 포트 (기본 8502)
+
+명령줄:
+    python -m utils.warmup                       # 준비 단계 한 번 실행 후 단계별 소요 시간 출력
+    python -m utils.warmup --serve app.py ...    # 준비 상태 서버 + 백그라운드 준비 후 같은 프로세스에서 Streamlit 실행
+
+Classes:
+    WarmupSkipped: 단계를 건너뛸 때 던지는 예외
+    WarmupStep: 준비 단계 하나의 상태
+    Warmup: 준비 단계 실행기 + 준비 상태
+    ReadinessServer: /ready, /live HTTP 엔드포인트
+
+Functions:
+    open_connections: 같은 URL로 동시 요청을 보내 풀에 연결을 여러 개 열어 둠
+    build_default_warmup: 기본 준비 단계를 등록한 Warmup 생성
+    get_warmup: 프로세스 공유 Warmup 반환
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Optional, List, Callable
+
+from .http_pool import get_http_session, get_llm_http_client, get_connection_stats
+from .university_rag import DATA_DIR, load_data_json, get_university_rag
+
+
+class WarmupSkipped(Exception):
+    """단계를 건너뜀 (설정이 없어 할 일이 없는 경우 - 준비 완료를 막지 않음)"""
+
+
+@dataclass
+class WarmupStep:
+    """
+    준비 단계 하나의 상태
+
+    Attributes:
+        name: 단계 이름
+        required: 실패 시 준비 완료로 보지 않을지 여부
+        status: pending / running / ok / skipped / failed
+        elapsed_ms: 마지막 실행 소요 시간
+        detail: 결과 요약 또는 오류 메시지
+        attempts: 실행 횟수
+    """
+    name: str
+    required: bool = True
+    status: str = "pending"
+    elapsed_ms: float = 0.0
+    detail: str = ""
+    attempts: int = 0
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("ok", "skipped")
+
+
+class Warmup:
+    """
+    준비 단계 실행기 + 준비 상태
+
+    단계 함수는 인자 없이 호출되며 결과 요약 문자열(또는 None)을 반환
+    WarmupSkipped를 던지면 건너뜀, 그 밖의 예외는 실패로 기록
+
+    Attributes:
+        retry_interval: 필수 단계 실패 시 재시도 간격 (초)
+
+    Example:
+        >>> warmup = Warmup()
+        >>> warmup.add_step("data", lambda: "5 files")
+        >>> warmup.start()
+        >>> warmup.wait(timeout=30)
+        True
+        >>> warmup.status()["steps"][0]["elapsed_ms"]
+    """
+
+    def __init__(self, retry_interval: float = 5.0, enabled: bool = True):
+        self.retry_interval = retry_interval
+        self.enabled = enabled
+        self._steps: List[WarmupStep] = []
+        self._functions: Dict[str, Callable[[], Optional[str]]] = {}
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.state = "pending"
+        self.started_at: Optional[float] = None
+        self.ready_at: Optional[float] = None
+        if not enabled:
+            self._mark_ready()
+
+    def add_step(self, name: str, function: Callable[[], Optional[str]], required: bool = True) -> "Warmup":
+        """준비 단계 등록 (등록 순서대로 실행)"""
+        with self._lock:
+            self._steps.append(WarmupStep(name=name, required=required))
+            self._functions[name] = function
+        return self
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def _mark_ready(self) -> None:
+        self.state = "ready"
+        self.ready_at = time.monotonic()
+        self._ready.set()
+
+    def _run_step(self, step: WarmupStep) -> None:
+        step.status = "running"
+        step.attempts += 1
+        started = time.perf_counter()
+        try:
+            detail = self._functions[step.name]()
+            step.status, step.detail = "ok", detail or ""
+        except WarmupSkipped as e:
+            step.status, step.detail = "skipped", str(e)
+        except Exception as e:
+            step.status, step.detail = "failed", f"{type(e).__name__}: {e}"
+        step.elapsed_ms = (time.perf_counter() - started) * 1000
+
+    def run(self) -> bool:
+        """
+        아직 끝나지 않은 단계 실행 (현재 스레드, 이미 준비 완료면 바로 반환)
+
+        Returns:
+            bool: 준비 완료 여부 (필수 단계가 모두 ok/skipped)
+        """
+        with self._run_lock:
+            if self.ready:
+                return True
+            if self.started_at is None:
+                self.started_at = time.monotonic()
+            self.state = "running"
+            for step in list(self._steps):
+                # 선택 단계는 한 번만 시도 (재시도 루프에서 외부 서버를 계속 두드리지 않음)
+                if step.done or (not step.required and step.attempts):
+                    continue
+                self._run_step(step)
+            if all(step.done for step in self._steps if step.required):
+                self._mark_ready()
+            else:
+                self.state = "failed"
+            return self.ready
+
+    def _loop(self) -> None:
+        while not self.run() and not self._stopped.wait(self.retry_interval):
+            pass
+
+    def start(self) -> "Warmup":
+        """백그라운드 스레드에서 준비 시작 (이미 시작했거나 준비 완료면 무시)"""
+        with self._lock:
+            if self.ready or self._thread is not None:
+                return self
+            self._thread = threading.Thread(target=self._loop, name="imf-warmup", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """재시도 루프 중단 (진행 중인 단계는 끝까지 실행)"""
+        self._stopped.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        준비 완료까지 대기
+
+        Args:
+            timeout: 최대 대기 시간 (초, None이면 무제한)
+
+        Returns:
+            bool: 준비 완료 여부
+        """
+        return self._ready.wait(timeout)
+
+    def status(self) -> Dict[str, Any]:
+        """
+        준비 상태
+
+        Returns:
+            dict: state, ready, elapsed_ms(시작~준비 완료 또는 현재), steps
+        """
+        elapsed_ms = 0.0
+        if self.started_at is not None:
+            end = self.ready_at if self.ready_at is not None else time.monotonic()
+            elapsed_ms = (end - self.started_at) * 1000
+        return {
+            "state": self.state,
+            "ready": self.ready,
+            "elapsed_ms": round(elapsed_ms, 1),
+            "steps": [asdict(step) for step in list(self._steps)],
+        }
+
+
+# =============================================================================
+# 기본 준비 단계
+# =============================================================================
+def _drain(response: Any) -> None:
+    """스트리밍 응답 본문을 끝까지 읽고 닫아 연결을 풀로 돌려보냄"""
+    read = getattr(response, "read", None)
+    if callable(read):
+        read()              # httpx.Response
+    else:
+        response.content    # requests.Response
+    response.close()
+
+
+def open_connections(send: Callable[[str], Any], url: str, count: int, timeout: float = 5.0) -> int:
+    """
+    같은 URL로 동시 요청을 보내 풀에 연결을 여러 개 열어 둠
+
+    모든 요청이 응답 헤더를 받을 때까지 본문을 읽지 않고 연결을 붙잡아 두므로
+    서버가 빨리 응답해도 요청마다 다른 연결이 열림 (응답 코드는 보지 않음 - 404/401도 연결은 확보됨)
+
+    Args:
+        send: url을 받아 스트리밍 응답(requests stream=True / httpx stream=True)을 반환하는 함수
+        url: 예열할 주소
+        count: 열 연결 수
+        timeout: 다른 요청을 기다리는 최대 시간 (초)
+
+    Returns:
+        int: 응답을 받은 요청 수 (모두 실패하면 마지막 예외를 다시 던짐)
+    """
+    errors: List[Exception] = []
+    barrier = threading.Barrier(count)
+
+    def _send(_: int) -> bool:
+        try:
+            response = send(url)
+        except Exception as e:
+            errors.append(e)
+            barrier.abort()
+            return False
+        try:
+            barrier.wait(timeout)
+        except threading.BrokenBarrierError:
+            pass
+        finally:
+            _drain(response)
+        return True
+
+    with ThreadPoolExecutor(max_workers=count, thread_name_prefix="imf-warmup-conn") as executor:
+        opened = sum(executor.map(_send, range(count)))
+    if not opened and errors:
+        raise errors[-1]
+    return opened
+
+
+def _upstage_base_url() -> str:
+    from .upstage_client import UpstageClient
+    return (os.getenv("UPSTAGE_BASE_URL") or UpstageClient.SOLAR_BASE_URL).rstrip("/")
+
+
+def _warm_data() -> str:
+    """data/*.json 로드 + 대학명 색인"""
+    files = sorted(DATA_DIR.glob("*.json"))
+    for path in files:
+        load_data_json(path.name)
+    indexed = get_university_rag().build_index()
+    return f"{len(files)} files, {indexed} index entries"
+
+
+def _warm_upstage_client() -> str:
+    """공유 UpstageClient 생성"""
+    from .key_pool import default_api_key, get_key_pool
+    from .client_pool import get_shared_client
+
+    if not default_api_key():
+        raise WarmupSkipped("UPSTAGE_API_KEY/UPSTAGE_API_KEYS 미설정")
+    client = get_shared_client()
+    pool = get_key_pool()
+    keys = f", {len(pool.key_stats())} keys" if pool is not None else ""
+    return f"{client.SOLAR_BASE_URL}{keys}"
+
+
+def _warm_caches() -> str:
+    """Document Parse / LLM 응답 캐시 생성"""
+    from .parse_cache import get_parse_cache
+    from .llm_cache import get_llm_cache
+
+    parse_cache = get_parse_cache()
+    llm_cache = get_llm_cache()
+    parts = [
+        f"parse={parse_cache.stats()['total_bytes']}B" if parse_cache is not None else "parse=off",
+        "llm=on" if llm_cache is not None else "llm=off",
+    ]
+    return ", ".join(parts)
+
+
+def _warm_upstage_connections(count: int, timeout: float) -> str:
+    """원시 엔드포인트 세션 + LLM httpx 클라이언트에 Upstage 연결 예열"""
+    url = f"{_upstage_base_url()}/models"
+    llm_client = get_llm_http_client()
+    raw = open_connections(lambda u: get_http_session().get(u, timeout=timeout, stream=True), url, count, timeout)
+    llm = open_connections(
+        lambda u: llm_client.send(llm_client.build_request("GET", u, timeout=timeout), stream=True), url, count, timeout
+    )
+    connections = get_connection_stats()
+    return f"raw {raw}/{count} (idle {connections['raw']['idle']}), llm {llm}/{count} (idle {connections['llm']['idle']})"
+
+
+def _warm_neis_connections(count: int, timeout: float) -> str:
+    """공유 세션에 NEIS 연결 예열"""
+    from .neis_api import NeisAPI
+
+    url = f"{NeisAPI.BASE_URL}/schoolInfo"
+    opened = open_connections(
+        lambda u: get_http_session().get(u, params={"Type": "json"}, timeout=timeout, stream=True), url, count, timeout
+    )
+    return f"{opened}/{count}"
+
+
+def build_default_warmup(
+    connections: Optional[int] = None,
+    timeout: Optional[float] = None,
+    retry_interval: Optional[float] = None,
+    enabled: Optional[bool] = None
+) -> Warmup:
+    """
+    기본 준비 단계를 등록한 Warmup 생성
+
+    Args:
+        connections: 호스트/클라이언트별로 미리 열 연결 수 (미지정 시 IMF_WARMUP_CONNECTIONS, 기본 2)
+        timeout: 연결 예열 요청 타임아웃 (미지정 시 IMF_WARMUP_TIMEOUT, 기본 5초)
+        retry_interval: 필수 단계 재시도 간격 (미지정 시 IMF_WARMUP_RETRY, 기본 5초)
+        enabled: 준비 단계 실행 여부 (미지정 시 IMF_WARMUP, 기본 사용)
+
+    Returns:
+        Warmup: 시작 전 상태의 실행기
+    """
+    if connections is None:
+        connections = int(os.getenv("IMF_WARMUP_CONNECTIONS", "2"))
+    if timeout is None:
+        timeout = float(os.getenv("IMF_WARMUP_TIMEOUT", "5"))
+    if retry_interval is None:
+        retry_interval = float(os.getenv("IMF_WARMUP_RETRY", "5"))
+    if enabled is None:
+        enabled = os.getenv("IMF_WARMUP", "1").lower() not in ("0", "false", "no")
+
+    warmup = Warmup(retry_interval=retry_interval, enabled=enabled)
+    warmup.add_step("data", _warm_data)
+    warmup.add_step("upstage_client", _warm_upstage_client)
+    warmup.add_step("caches", _warm_caches, required=False)
+    if connections > 0:
+        warmup.add_step("upstage_connections", lambda: _warm_upstage_connections(connections, timeout), required=False)
+        warmup.add_step("neis_connections", lambda: _warm_neis_connections(connections, timeout), required=False)
+    return warmup
+
+
+_warmup: Optional[Warmup] = None
+_warmup_lock = threading.Lock()
+
+
+def get_warmup() -> Warmup:
+    """프로세스 공유 Warmup 반환 (지연 생성, 시작은 start()로 - 여러 번 호출해도 한 번만 실행)"""
+    global _warmup
+    if _warmup is None:
+        with _warmup_lock:
+            if _warmup is None:
+                _warmup = build_default_warmup()
+    return _warmup
+
+
+# =============================================================================
+# 준비 상태 서버
+# =============================================================================
+class _ReadinessHandler(BaseHTTPRequestHandler):
+    """GET /ready, /live"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        path = self.path.split("?", 1)[0].rstrip("/")
+        readiness: "ReadinessServer" = self.server.readiness
+        if path == "/live":
+            self._send_json(200, {"live": True})
+        elif path == "/ready":
+            payload = readiness.check()
+            self._send_json(200 if payload["ready"] else 503, payload)
+        else:
+            self._send_json(404, {"error": f"알 수 없는 경로: {self.path}"})
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class ReadinessServer:
+    """
+    준비 상태 HTTP 엔드포인트 (로드 밸런서/컨테이너 헬스체크용)
+
+    Attributes:
+        warmup: 준비 상태를 보고할 Warmup
+        upstream: 함께 확인할 헬스 URL (예: Streamlit /_stcore/health, None이면 확인 안 함)
+        host: 바인드 주소
+        port: 포트 (0이면 빈 포트 자동 선택)
+
+    Example:
+        >>> server = ReadinessServer(get_warmup(), port=8502).start()
+        >>> # curl -f http://localhost:8502/ready → 준비 전 503, 준비 후 200
+    """
+
+    def __init__(
+        self,
+        warmup: Warmup,
+        upstream: Optional[str] = None,
+        host: str = "0.0.0.0",
+        port: int = 8502,
+        upstream_timeout: float = 1.0
+    ):
+        self.warmup = warmup
+        self.upstream = upstream
+        self.host = host
+        self.port = port
+        self.upstream_timeout = upstream_timeout
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host = "127.0.0.1" if self.host in ("", "0.0.0.0") else self.host
+        return f"http://{host}:{self.port}"
+
+    def _upstream_ok(self) -> bool:
+        try:
+            with urllib.request.urlopen(self.upstream, timeout=self.upstream_timeout) as response:
+                return response.status == 200
+        except Exception:
+            return False
+
+    def check(self) -> Dict[str, Any]:
+        """준비 상태 (warmup.status() + upstream 확인 결과)"""
+        payload = self.warmup.status()
+        if self.upstream is not None:
+            payload["upstream"] = self._upstream_ok()
+            payload["ready"] = payload["ready"] and payload["upstream"]
+        return payload
+
+    def start(self) -> "ReadinessServer":
+        """백그라운드 스레드에서 서버 시작"""
+        if self._httpd is None:
+            self._httpd = ThreadingHTTPServer((self.host, self.port), _ReadinessHandler)
+            self._httpd.daemon_threads = True
+            self._httpd.readiness = self
+            self.port = self._httpd.server_port
+            self._thread = threading.Thread(target=self._httpd.serve_forever, name="imf-readiness", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+            self._thread = None
+
+    def __enter__(self) -> "ReadinessServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+# =============================================================================
+# 명령줄
+# =============================================================================
+def _streamlit_port(args: List[str]) -> int:
+    """Streamlit 인자에서 --server.port 값 (없으면 8501)"""
+    for i, arg in enumerate(args):
+        if arg.startswith("--server.port="):
+            return int(arg.split("=", 1)[1])
+        if arg == "--server.port" and i + 1 < len(args):
+            return int(args[i + 1])
+    return 8501
+
+
+def serve(script: str, streamlit_args: List[str], ready_port: int) -> None:
+    """
+    준비 상태 서버와 백그라운드 준비를 시작한 뒤 같은 프로세스에서 Streamlit 실행
+
+    Streamlit 스크립트 실행도 이 프로세스 안에서 이루어지므로
+    미리 만든 연결 풀/클라이언트/데이터를 첫 세션부터 그대로 사용
+
+    Args:
+        script: Streamlit 앱 스크립트 (예: app.py)
+        streamlit_args: streamlit run에 넘길 나머지 인자
+        ready_port: 준비 상태 서버 포트
+    """
+    from streamlit.web import cli as streamlit_cli
+
+    warmup = get_warmup().start()
+    upstream = f"http://127.0.0.1:{_streamlit_port(streamlit_args)}/_stcore/health"
+    server = ReadinessServer(warmup, upstream=upstream, port=ready_port).start()
+    print(f"🔥 준비 상태: {server.url}/ready (Streamlit: {upstream})")
+
+    sys.argv = ["streamlit", "run", script, *streamlit_args]
+    streamlit_cli.main()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """명령줄 실행: python -m utils.warmup [--serve app.py [streamlit 인자...]] [--ready-port]"""
+    parser = argparse.ArgumentParser(description="프로세스 시작 준비 (연결/데이터/캐시) 및 준비 상태 서버")
+    parser.add_argument("--serve", metavar="SCRIPT", help="준비 상태 서버와 함께 Streamlit 앱 실행")
+    parser.add_argument("--ready-port", type=int, default=int(os.getenv("IMF_READY_PORT", "8502")))
+    args, streamlit_args = parser.parse_known_args(argv)
+
+    if args.serve:
+        serve(args.serve, streamlit_args, args.ready_port)
+        return
+
+    warmup = get_warmup()
+    ready = warmup.run()
+    status = warmup.status()
+    print(f"🔥 준비 {'완료' if ready else '실패'} ({status['elapsed_ms']:.0f}ms)")
+    for step in status["steps"]:
+        flag = "" if step["required"] else " (선택)"
+        print(f"  {step['name']:<22}{step['status']:<9}{step['elapsed_ms']:>8.1f}ms  {step['detail']}{flag}")
+    if not ready:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    # 패키지 모듈(utils.warmup)의 get_warmup을 써야 app.py가 같은 Warmup 인스턴스를 공유
+    from utils.warmup import main as _main
+    _main()